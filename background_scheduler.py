@@ -21,6 +21,8 @@ import signal
 import sys
 import os
 import atexit
+import ast
+import importlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
@@ -28,6 +30,8 @@ from dataclasses import dataclass, field
 from queue import Queue, Empty
 import psutil
 
+from event_scheduler import get_event_scheduler
+
 try:
     from steam_charts_manager import CHART_TYPES
     SCHEDULER_CHART_TYPES = list(CHART_TYPES.keys())
@@ -42,6 +46,27 @@ except ImportError:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+# Ausführungsmodus: 'inprocess' (Worker-Threads des Event Schedulers) oder 'terminal' (eigenes Script pro Lauf)
+SCHEDULER_EXECUTION_MODE = os.getenv('SCHEDULER_EXECUTION_MODE', 'inprocess').lower()
+# Ausgaben der In-Process Tasks (print) landen je Task in <dir>/<scheduler_type>.log
+SCHEDULER_TASK_LOG_DIR = Path(os.getenv('SCHEDULER_TASK_LOG_DIR', 'logs/tasks'))
+
+EXECUTION_MODES = ('inprocess', 'terminal')
+
+# Concurrency-Gruppe pro Task-Typ: Tasks derselben Gruppe laufen nie gleichzeitig
+# (Limits über SCHEDULER_GROUP_LIMITS), auch nicht über Scheduler-Grenzen hinweg
+TASK_CONCURRENCY_GROUPS = {
+    'price_updates': 'price_api',
+    'charts_price_updates': 'price_api',
+    'name_updates': 'steam_api',
+    'charts_updates': 'steam_api',
+    'charts_cleanup': 'database',
+    'elasticsearch_sync': 'elasticsearch'
+}
+
+# Heartbeat-Prüfung und Prozess-Cleanup im Terminal-Modus (Sekunden)
+TERMINAL_MAINTENANCE_INTERVAL = 60
+
 # =====================================================================
 # DATA CLASSES
 # =====================================================================
@@ -61,6 +86,12 @@ class SchedulerTask:
     running: bool = False
     process: Optional[subprocess.Popen] = None
     heartbeat_file: Optional[Path] = None
+    run_count: int = 0
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    concurrency_group: Optional[str] = None
+    jitter_seconds: Optional[float] = None
+    catch_up: Optional[str] = None
 
 # =====================================================================
 # GLOBAL PROCESS MANAGER
@@ -274,37 +305,35 @@ class EnhancedSchedulerTasks:
             print("❌ Kein Steam API Key verfügbar")
             return
         
-        tracker = create_price_tracker(api_key=api_key)
+        # Ein Tracker (DatabaseManager + Writer-Thread) pro Prozess, geteilt von allen Tasks
+        tracker = get_shared_resource(
+            'price_tracker', lambda: create_price_tracker(api_key=api_key, enable_charts=True)
+        )
+        if not tracker:
+            print("❌ Price Tracker nicht verfügbar")
+            return
         
-        # Alle ausstehenden Apps abrufen
-        pending_apps = tracker.get_pending_apps(hours_threshold=6)
+        # Sale-Stichprobe: bei einem Rabatt-Sprung zuerst die ganze Wishlist im Burst
+        sale = tracker.probe_sale_event()
+        if sale.get('burst'):
+            burst = sale['burst']
+            print(f"🔥 Sale erkannt: {burst['refreshed']}/{burst['apps']} Wishlist-Apps "
+                  f"in {burst['duration']}s aktualisiert ({burst.get('workers', 0)} Worker)")
         
-        if not pending_apps:
-            print("✅ Keine ausstehenden Price Updates")
-            return
+        # Ein Zyklus der Update-Queue: fällige Apps mit dem höchsten Wert bis zum Request-Budget
+        result = tracker.run_update_cycle()
+        rescore = result.get('rescore', {})
         
-        print(f"📊 {len(pending_apps)} Apps benötigen Price-Updates")
+        if rescore.get('apps'):
+            print(f"📊 Queue neu bewertet: {rescore['apps']} Apps, {rescore['hot_apps']} heiß, "
+                  f"{rescore['dormant_apps']} ruhend" + (f" ({rescore['sale_window']})" if rescore.get('sale_window') else ""))
         
-        if progress_available:
-            from tqdm import tqdm
-            with tqdm(total=len(pending_apps), desc="Price Updates") as pbar:
-                for app_id in pending_apps:
-                    try:
-                        success = tracker.update_single_app_price(app_id)
-                        pbar.set_description(f"App {app_id}: {'✅' if success else '❌'}")
-                        pbar.update(1)
-                        time_module.sleep(1)  # Rate limiting
-                    except Exception as e:
-                        print(f"❌ Fehler bei App {app_id}: {e}")
-                        pbar.update(1)
-        else:
-            for i, app_id in enumerate(pending_apps):
-                try:
-                    success = tracker.update_single_app_price(app_id)
-                    print(f"📊 {i+1}/{len(pending_apps)} - App {app_id}: {'✅' if success else '❌'}")
-                    time_module.sleep(1)  # Rate limiting
-                except Exception as e:
-                    print(f"❌ Fehler bei App {app_id}: {e}")
+        if not result['apps']:
+            print("✅ Keine fälligen Price Updates")
+            return
+        
+        print(f"📊 {result['refreshed']}/{result['apps']} Apps aktualisiert in {result['duration']}s "
+              f"({result['failed']} im Backoff)")
         
         print("✅ Price Tracking abgeschlossen")
         
@@ -332,8 +361,19 @@ class EnhancedSchedulerTasks:
             print("❌ Kein Steam API Key verfügbar")
             return
         
-        tracker = create_price_tracker(api_key=api_key)
-        steam_manager = SteamWishlistManager()
+        # Ein Tracker (DatabaseManager + Writer-Thread) pro Prozess, geteilt von allen Tasks
+        tracker = get_shared_resource(
+            'price_tracker', lambda: create_price_tracker(api_key=api_key, enable_charts=True)
+        )
+        if not tracker:
+            print("❌ Price Tracker nicht verfügbar")
+            return
+        steam_manager = get_shared_resource(
+            'steam_wishlist_manager', lambda: SteamWishlistManager(api_key, tracker.db_manager)
+        )
+        # Name-Cache immer über die Datenbank des aktuellen Trackers
+        if steam_manager.db_manager is not tracker.db_manager:
+            steam_manager.db_manager = tracker.db_manager
         
         # Apps ohne Namen finden
         apps_without_names = tracker.get_apps_without_names()
@@ -384,7 +424,13 @@ class EnhancedSchedulerTasks:
             print("❌ Kein Steam API Key verfügbar")
             return
         
-        tracker = create_price_tracker(api_key=api_key, enable_charts=True)
+        # Ein Tracker (DatabaseManager + Writer-Thread) pro Prozess, geteilt von allen Tasks
+        tracker = get_shared_resource(
+            'price_tracker', lambda: create_price_tracker(api_key=api_key, enable_charts=True)
+        )
+        if not tracker:
+            print("❌ Price Tracker nicht verfügbar")
+            return
         
         if not tracker.charts_enabled:
             print("❌ Charts nicht verfügbar")
@@ -429,7 +475,13 @@ class EnhancedSchedulerTasks:
             print("❌ Kein Steam API Key verfügbar")
             return
         
-        tracker = create_price_tracker(api_key=api_key, enable_charts=True)
+        # Ein Tracker (DatabaseManager + Writer-Thread) pro Prozess, geteilt von allen Tasks
+        tracker = get_shared_resource(
+            'price_tracker', lambda: create_price_tracker(api_key=api_key, enable_charts=True)
+        )
+        if not tracker:
+            print("❌ Price Tracker nicht verfügbar")
+            return
         
         if not tracker.charts_enabled:
             print("❌ Charts nicht verfügbar")
@@ -513,7 +565,13 @@ class EnhancedSchedulerTasks:
             print("❌ Kein Steam API Key verfügbar")
             return
         
-        tracker = create_price_tracker(api_key=api_key, enable_charts=True)
+        # Ein Tracker (DatabaseManager + Writer-Thread) pro Prozess, geteilt von allen Tasks
+        tracker = get_shared_resource(
+            'price_tracker', lambda: create_price_tracker(api_key=api_key, enable_charts=True)
+        )
+        if not tracker:
+            print("❌ Price Tracker nicht verfügbar")
+            return
         
         if not tracker.charts_enabled:
             print("❌ Charts nicht verfügbar")
@@ -556,6 +614,228 @@ class EnhancedSchedulerTasks:
         import traceback
         traceback.print_exc()'''
 
+    @staticmethod
+    def enhanced_elasticsearch_sync_task() -> str:
+        """Elasticsearch Sync Task"""
+        return '''def enhanced_elasticsearch_sync_task():
+    """Inkrementeller Elasticsearch Sync (nur Zeilen oberhalb der High-Water-Marks)"""
+    print("🔄 Elasticsearch Sync gestartet")
+    
+    try:
+        import os
+        from database_manager import create_database_manager
+        from elasticsearch_cli import create_elasticsearch_manager
+        
+        es_manager = get_shared_resource('elasticsearch_manager', lambda: create_elasticsearch_manager(
+            os.getenv('ELASTICSEARCH_HOST', 'localhost'),
+            int(os.getenv('ELASTICSEARCH_PORT', '9200')),
+            os.getenv('ELASTICSEARCH_USERNAME') or None,
+            os.getenv('ELASTICSEARCH_PASSWORD') or None
+        ))
+        if not es_manager:
+            print("❌ Elasticsearch nicht verfügbar")
+            return
+        
+        db_manager = get_shared_resource('database_manager', create_database_manager)
+        stats = es_manager.sync_incremental_to_elasticsearch(db_manager)
+        
+        for source, index_stats in stats['index_stats'].items():
+            if index_stats['docs']:
+                print(f"📤 {source}: {index_stats['docs']} Dokumente ({index_stats['docs_per_second']} docs/s)")
+        
+        print(f"✅ Elasticsearch Sync abgeschlossen: {stats['total_exported']} Dokumente in {stats['duration_seconds']}s")
+        
+    except Exception as e:
+        print(f"❌ Elasticsearch Sync Fehler: {e}")
+        import traceback
+        traceback.print_exc()'''
+
+# =====================================================================
+# IN-PROCESS TASK EXECUTOR
+# =====================================================================
+
+_shared_resources: Dict[str, Any] = {}
+_shared_resources_lock = threading.Lock()
+
+def get_shared_resource(key: str, factory: Callable[[], Any]) -> Any:
+    """
+    Gibt eine prozessweit geteilte Ressource zurück (einmalig über factory erstellt)
+
+    Tasks holen darüber DatabaseManager, Clients usw., damit warme Verbindungen,
+    HTTP-Pools und Caches zwischen den Läufen erhalten bleiben. None wird nicht
+    gespeichert, der nächste Lauf versucht es erneut.
+    """
+    with _shared_resources_lock:
+        if _shared_resources.get(key) is None:
+            _shared_resources[key] = factory()
+        return _shared_resources[key]
+
+def clear_shared_resources() -> int:
+    """Verwirft alle geteilten Ressourcen (nächster Lauf erstellt sie neu)"""
+    with _shared_resources_lock:
+        count = len(_shared_resources)
+        _shared_resources.clear()
+        return count
+
+def _task_function_name(task: SchedulerTask) -> str:
+    """Name der im Task-Code definierten Funktion (bevorzugt gleichnamig zum scheduler_type)"""
+    names = [node.name for node in ast.parse(task.task_function.strip()).body
+             if isinstance(node, ast.FunctionDef)]
+    if not names:
+        raise ValueError(f"Task '{task.scheduler_type}' definiert keine Funktion")
+    preferred = task.scheduler_type.replace('-', '_')
+    return preferred if preferred in names else names[0]
+
+_task_output_target = threading.local()
+
+class _ThreadRoutedStream:
+    """sys.stdout/sys.stderr Proxy: Ausgaben von Task-Threads gehen in deren Task-Log"""
+
+    def __init__(self, original):
+        self._original = original
+
+    def write(self, text):
+        target = getattr(_task_output_target, 'stream', None)
+        return (target or self._original).write(text)
+
+    def flush(self):
+        target = getattr(_task_output_target, 'stream', None)
+        (target or self._original).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+def _install_output_routing():
+    """Installiert den Thread-Proxy einmalig für stdout und stderr"""
+    if not isinstance(sys.stdout, _ThreadRoutedStream):
+        sys.stdout = _ThreadRoutedStream(sys.stdout)
+    if not isinstance(sys.stderr, _ThreadRoutedStream):
+        sys.stderr = _ThreadRoutedStream(sys.stderr)
+
+class InProcessTaskExecutor:
+    """
+    Führt SchedulerTasks im eigenen Prozess aus
+
+    Statt pro Lauf ein temp_task_*.py Script zu generieren und einen neuen Prozess
+    zu starten, wird der Task-Code einmal kompiliert und auf den Worker-Threads des
+    Event Schedulers ausgeführt. Module bleiben importiert, die Thread-Verbindungen
+    des Connection-Pools und geteilte Ressourcen (get_shared_resource) bleiben
+    zwischen Läufen warm.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._compiled: Dict[tuple, Callable] = {}
+        self._output_ready = False
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'skipped': 0
+        }
+
+    def get_stats(self) -> Dict:
+        """Ausführungs-Statistiken inkl. Worker-Auslastung des Scheduler-Kerns"""
+        core = get_event_scheduler().get_stats()
+        with self.lock:
+            return {
+                'workers': core['workers'],
+                'active': core['active'],
+                'queued': core['waiting'],
+                'max_start_delay_seconds': core['max_delay_seconds'],
+                'compiled_tasks': len(self._compiled),
+                **self.stats
+            }
+
+    def _compile(self, task: SchedulerTask) -> Callable:
+        """Kompiliert den Task-Code einmal pro (Typ, Code) und gibt die Task-Funktion zurück"""
+        key = (task.scheduler_type, task.task_function)
+        with self.lock:
+            function = self._compiled.get(key)
+        if function:
+            return function
+
+        namespace = {
+            '__name__': f"scheduler_task_{task.scheduler_type}",
+            'time_module': time_module,
+            'progress_available': False,  # Fortschritt als Zeilen ins Task-Log statt tqdm
+            'get_shared_resource': get_shared_resource
+        }
+        code = compile(task.task_function.strip(), f"<scheduler_task:{task.scheduler_type}>", 'exec')
+        exec(code, namespace)
+        function = namespace[_task_function_name(task)]
+
+        with self.lock:
+            self._compiled[key] = function
+        return function
+
+    def run(self, task: SchedulerTask, scheduler: 'EnhancedBackgroundScheduler'):
+        """Führt einen Task-Lauf auf dem aufrufenden Thread aus und pflegt Status, Heartbeat und Statistiken"""
+        if scheduler.stop_event.is_set():
+            with self.lock:
+                self.stats['skipped'] += 1
+            return
+
+        with self.lock:
+            if not self._output_ready:
+                _install_output_routing()
+                SCHEDULER_TASK_LOG_DIR.mkdir(parents=True, exist_ok=True)
+                self._output_ready = True
+
+        task.running = True
+        task.last_run = datetime.now()
+        started = time_module.perf_counter()
+        scheduler._init_task_heartbeat(task)
+        log_path = SCHEDULER_TASK_LOG_DIR / f"{task.scheduler_type}.log"
+        failed = False
+
+        try:
+            for dependency in task.dependencies:
+                importlib.import_module(dependency.rsplit('.', 1)[0] if '.' in dependency else dependency)
+            function = self._compile(task)
+
+            with open(log_path, 'a', encoding='utf-8') as log_file:
+                _task_output_target.stream = log_file
+                try:
+                    print(f"\n🚀 {scheduler.scheduler_name}/{task.scheduler_type} - "
+                          f"{task.last_run.strftime('%Y-%m-%d %H:%M:%S')}")
+                    function()
+                finally:
+                    _task_output_target.stream = None
+
+            task.last_error = None
+
+        except Exception as e:
+            failed = True
+            task.last_error = str(e)
+            logger.error(f"❌ In-Process Task '{task.scheduler_type}' fehlgeschlagen: {e}")
+
+        finally:
+            task.last_duration = round(time_module.perf_counter() - started, 3)
+            task.run_count += 1
+            task.running = False
+
+            if task.heartbeat_file and task.heartbeat_file.exists():
+                try:
+                    task.heartbeat_file.unlink()
+                except Exception:
+                    pass
+
+            with self.lock:
+                self.stats['failed' if failed else 'completed'] += 1
+
+        logger.info(f"✅ In-Process Task '{task.scheduler_type}' beendet in {task.last_duration:.2f}s")
+
+_inprocess_executor: Optional[InProcessTaskExecutor] = None
+_inprocess_executor_lock = threading.Lock()
+
+def get_inprocess_executor() -> InProcessTaskExecutor:
+    """Prozessweiter In-Process Executor, geteilt von allen Schedulern"""
+    global _inprocess_executor
+    with _inprocess_executor_lock:
+        if _inprocess_executor is None:
+            _inprocess_executor = InProcessTaskExecutor()
+        return _inprocess_executor
+
 # =====================================================================
 # BACKGROUND SCHEDULER
 # =====================================================================
@@ -563,7 +843,9 @@ class EnhancedSchedulerTasks:
 class EnhancedBackgroundScheduler:
     """
     Universal Background Scheduler
-    Führt alle Tasks in separaten Terminal-Prozessen aus
+    Plant Tasks als Jobs im gemeinsamen Event Scheduler (Heap statt Polling) und
+    führt sie In-Process (Standard) oder in separaten Terminal-Prozessen aus
+    (SCHEDULER_EXECUTION_MODE=terminal)
     Mit Parent-Process-Monitoring und Sign of Life
     
     PATCHES:
@@ -574,16 +856,22 @@ class EnhancedBackgroundScheduler:
     - Quiet Cleanup
     """
     
-    def __init__(self, scheduler_name: str = "BackgroundScheduler", base_config: Dict = None):
+    def __init__(self, scheduler_name: str = "BackgroundScheduler", base_config: Dict = None,
+                 execution_mode: str = None):
         """
         Initialisiert Background Scheduler
         
         Args:
             scheduler_name: Name des Schedulers
             base_config: Basis-Konfiguration für alle Tasks
+            execution_mode: 'inprocess' oder 'terminal' (Standard: SCHEDULER_EXECUTION_MODE)
         """
         self.scheduler_name = scheduler_name
         self.base_config = base_config or {}
+        self.execution_mode = (execution_mode or SCHEDULER_EXECUTION_MODE).lower()
+        if self.execution_mode not in EXECUTION_MODES:
+            logger.warning(f"⚠️ Unbekannter Ausführungsmodus '{self.execution_mode}' - verwende 'inprocess'")
+            self.execution_mode = 'inprocess'
         self.tasks: Dict[str, SchedulerTask] = {}
         self.running = False
         self.scheduler_thread = None
@@ -602,7 +890,10 @@ class EnhancedBackgroundScheduler:
         # Project root für Scripts
         self.project_root = Path.cwd()
         
-        logger.info(f"✅ Background Scheduler '{scheduler_name}' initialisiert")
+        # Besitzer-Kennung der Jobs im gemeinsamen Event Scheduler
+        self._job_owner = f"{scheduler_name}#{id(self)}"
+        
+        logger.info(f"✅ Background Scheduler '{scheduler_name}' initialisiert ({self.execution_mode})")
     
     def register_scheduler(self,
                           scheduler_type: str,
@@ -611,7 +902,10 @@ class EnhancedBackgroundScheduler:
                           task_config: Dict = None,
                           dependencies: List[str] = None,
                           heartbeat_interval: int = 60,  # Erhöht von 30 auf 60
-                          show_progress_bar: bool = False) -> bool:
+                          show_progress_bar: bool = False,
+                          concurrency_group: Optional[str] = None,
+                          jitter_seconds: Optional[float] = None,
+                          catch_up: Optional[str] = None) -> bool:
         """
         Registriert einen neuen Scheduler-Task
         
@@ -623,6 +917,9 @@ class EnhancedBackgroundScheduler:
             dependencies: Liste der benötigten Module
             heartbeat_interval: Heartbeat-Intervall in Sekunden
             show_progress_bar: Ob Progress Bar angezeigt werden soll
+            concurrency_group: Concurrency-Gruppe (Standard: TASK_CONCURRENCY_GROUPS)
+            jitter_seconds: Zufällige Startverzögerung (Standard: SCHEDULER_JITTER_SECONDS)
+            catch_up: 'skip', 'coalesce' oder 'all' (Standard: SCHEDULER_CATCH_UP)
             
         Returns:
             True wenn erfolgreich registriert
@@ -636,13 +933,18 @@ class EnhancedBackgroundScheduler:
                 dependencies=dependencies or [],
                 heartbeat_interval=heartbeat_interval,
                 show_progress_bar=show_progress_bar,
-                next_run=datetime.now()  # Startet sofort
+                next_run=datetime.now(),  # Startet sofort
+                concurrency_group=concurrency_group or TASK_CONCURRENCY_GROUPS.get(scheduler_type),
+                jitter_seconds=jitter_seconds,
+                catch_up=catch_up
             )
             
             # Heartbeat-Datei vorbereiten
             task.heartbeat_file = self.heartbeat_dir / f"{scheduler_type}_heartbeat.json"
             
             self.tasks[scheduler_type] = task
+            if self.running:
+                self._schedule_task(task)
             
             logger.info(f"✅ Task registriert: {scheduler_type} (Intervall: {interval_minutes} min)")
             return True
@@ -666,9 +968,8 @@ class EnhancedBackgroundScheduler:
             self.running = True
             self.stop_event.clear()
             
-            # Scheduler-Thread starten
-            self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-            self.scheduler_thread.start()
+            # Tasks als Jobs im Event Scheduler planen (kein eigener Polling-Thread)
+            self._schedule_tasks()
             
             # Parent-Process-Monitoring starten
             self._start_parent_monitoring()
@@ -694,9 +995,10 @@ class EnhancedBackgroundScheduler:
         
         logger.info("⏹️ Stoppe Background Scheduler...")
         
-        # Stop-Event setzen
+        # Stop-Event setzen und Jobs aus dem Event Scheduler entfernen
         self.stop_event.set()
         self.running = False
+        get_event_scheduler().remove_jobs(self._job_owner)
         
         # Monitoring stoppen
         self.monitoring_active = False
@@ -705,66 +1007,112 @@ class EnhancedBackgroundScheduler:
         if cleanup:
             self._cleanup_processes()
         
-        # Auf Scheduler-Thread warten
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=10)
-        
         logger.info("✅ Background Scheduler gestoppt")
     
     def get_process_status(self) -> Dict:
         """Gibt Status der Scheduler-Prozesse zurück"""
         status = {
             'scheduler_name': self.scheduler_name,
+            'execution_mode': self.execution_mode,
             'running': self.running,
             'total_tasks': len(self.tasks),
             'running_tasks': sum(1 for task in self.tasks.values() if task.running),
             'processes': {}
         }
+        core = get_event_scheduler()
         
         for task_type, task in self.tasks.items():
+            job = core.get_job(f"{self._job_owner}:{task_type}")
+            if job and job.next_run:
+                task.next_run = datetime.fromtimestamp(job.next_run)
+            
+            if self.execution_mode == 'inprocess':
+                pid = os.getpid() if task.running else None
+            else:
+                pid = task.process.pid if task.process else None
+            
             status['processes'][f"{self.scheduler_name}_{task_type}"] = {
                 'scheduler_type': task_type,
                 'is_running': task.running,
-                'pid': task.process.pid if task.process else None,
+                'pid': pid,
                 'started_at': task.last_run.isoformat() if task.last_run else None,
                 'next_run': task.next_run.isoformat() if task.next_run else None,
+                'run_count': task.run_count,
+                'last_duration': task.last_duration,
+                'last_error': task.last_error,
+                'concurrency_group': task.concurrency_group,
+                'missed_runs': job.missed_runs if job else 0,
+                'skipped_runs': job.skipped_runs if job else 0,
                 'parent_monitoring': True
             }
         
+        if self.execution_mode == 'inprocess':
+            status['executor'] = get_inprocess_executor().get_stats()
+        
         return status
     
-    def _run_scheduler(self):
-        """Hauptschleife des Schedulers"""
-        logger.info(f"🔄 Scheduler-Thread '{self.scheduler_name}' gestartet")
+    def _schedule_tasks(self):
+        """Plant alle registrierten Tasks im Event Scheduler (ersetzt die 60-Sekunden Polling-Schleife)"""
+        core = get_event_scheduler()
         
-        while not self.stop_event.is_set():
-            try:
-                current_time = datetime.now()
-                
-                # Prüfe alle registrierten Tasks
-                for task_type, task in self.tasks.items():
-                    if not task.running and current_time >= task.next_run:
-                        self._execute_task_in_terminal(task)
-                    
-                    # Prüfe Heartbeat
-                    self._check_task_heartbeat(task)
-                
-                # Cleanup beendeter Prozesse
-                self._cleanup_finished_processes()
-                
-                # Längeres Intervall (weniger CPU-Last)
-                time_module.sleep(60)  # Prüfe alle 60 Sekunden statt 30
-                
-            except Exception as e:
-                logger.error(f"❌ Scheduler-Fehler: {e}")
-                time_module.sleep(60)
+        for task in self.tasks.values():
+            self._schedule_task(task)
+        
+        # Heartbeats und beendete Prozesse gibt es nur im Terminal-Modus
+        if self.execution_mode == 'terminal':
+            core.add_job(f"{self._job_owner}:maintenance", self._terminal_maintenance,
+                         interval_seconds=TERMINAL_MAINTENANCE_INTERVAL, jitter_seconds=0,
+                         catch_up='skip', owner=self._job_owner)
         
-        logger.info("⏹️ Scheduler-Thread beendet")
+        logger.info(f"📅 {len(self.tasks)} Tasks von '{self.scheduler_name}' im Event Scheduler geplant")
+    
+    def _schedule_task(self, task: SchedulerTask):
+        """Plant einen Task als Job im Event Scheduler (erster Lauf sofort)"""
+        job = get_event_scheduler().add_job(
+            f"{self._job_owner}:{task.scheduler_type}",
+            lambda: self._execute_task(task),
+            interval_seconds=task.interval_minutes * 60,
+            run_immediately=True,
+            jitter_seconds=task.jitter_seconds,
+            catch_up=task.catch_up,
+            group=task.concurrency_group,
+            owner=self._job_owner
+        )
+        task.next_run = datetime.fromtimestamp(job.next_run)
+    
+    def _terminal_maintenance(self):
+        """Heartbeat-Prüfung und Cleanup beendeter Terminal-Prozesse"""
+        for task in self.tasks.values():
+            self._check_task_heartbeat(task)
+        self._cleanup_finished_processes()
     
     # =====================================================================
     # ASYNC TASK EXECUTION
     # =====================================================================
     
+    def _execute_task(self, task: SchedulerTask):
+        """Startet einen fälligen Task im konfigurierten Ausführungsmodus (vom Event Scheduler aufgerufen)"""
+        job = get_event_scheduler().get_job(f"{self._job_owner}:{task.scheduler_type}")
+        if job and job.next_run:
+            task.next_run = datetime.fromtimestamp(job.next_run)
+        
+        if self.execution_mode == 'inprocess':
+            self._execute_task_in_process(task)
+        elif task.running:
+            # Terminal-Prozess des letzten Laufs ist noch aktiv
+            logger.debug(f"Task {task.scheduler_type} läuft noch - Lauf übersprungen")
+        else:
+            self._execute_task_in_terminal(task)
+    
+    def _execute_task_in_process(self, task: SchedulerTask):
+        """
+        Führt den Task auf dem Worker-Thread des Event Schedulers aus (kein Script, kein neuer Prozess)
+        
+        Args:
+            task: Auszuführender Task
+        """
+        get_inprocess_executor().run(task, self)
+    
     def _execute_task_in_terminal(self, task: SchedulerTask):
         """
         Verbesserte Task-Ausführung mit Async-Support und Process Registration
@@ -792,7 +1140,6 @@ class EnhancedBackgroundScheduler:
                 task.process = process
                 task.running = True
                 task.last_run = datetime.now()
-                task.next_run = datetime.now() + timedelta(minutes=task.interval_minutes)
                 
                 self.processes[task.scheduler_type] = process
                 
@@ -873,7 +1220,7 @@ def update_heartbeat():
         # LIVE HEARTBEAT OUTPUT
         heartbeat_count = heartbeat_data['heartbeat_count']
         time_str = current_time.strftime('%H:%M:%S')
-        print(f"💓 Heartbeat #{heartbeat_count} - {{time_str}} (PID: {{os.getpid()}})")
+        print(f"💓 Heartbeat #{{heartbeat_count}} - {{time_str}} (PID: {{os.getpid()}})")
         
         # Update global counter
         globals()['heartbeat_count'] = heartbeat_count
@@ -973,6 +1320,7 @@ PATCHED VERSION - Mit sichtbarem Progress/Heartbeat
 import os
 import sys
 import time
+import time as time_module
 import signal
 import threading
 from pathlib import Path
@@ -1040,6 +1388,10 @@ def signal_handler(signum, frame):
 signal.signal(signal.SIGTERM, signal_handler)
 signal.signal(signal.SIGINT, signal_handler)
 
+# Eigener Prozess: keine geteilten Ressourcen, Factory direkt aufrufen
+def get_shared_resource(key, factory):
+    return factory()
+
 # Task-Funktion (BEREITS KORREKT FORMATIERT)
 {task_function_code}
 
@@ -1063,7 +1415,7 @@ if __name__ == "__main__":
         
         # Task ausführen mit Live-Progress
         task_start_time = time_module.time()
-        {task.scheduler_type.replace('-', '_')}()
+        {_task_function_name(task)}()
         task_duration = time_module.time() - task_start_time
         
         print("=" * 60)
@@ -1258,7 +1610,8 @@ except ImportError as e:
                 "last_heartbeat": datetime.now().isoformat(),
                 "status": "starting",
                 "parent_pid": self.parent_pid,
-                "process_pid": task.process.pid if task.process else None
+                "process_pid": task.process.pid if task.process else os.getpid(),
+                "execution_mode": self.execution_mode
             }
             
             with open(task.heartbeat_file, 'w') as f:
@@ -1390,7 +1743,7 @@ def create_enhanced_price_tracker_scheduler() -> EnhancedBackgroundScheduler:
     scheduler.register_scheduler(
         scheduler_type="price_updates",
         task_function=EnhancedSchedulerTasks.enhanced_price_tracking_task(),
-        interval_minutes=360,  # 6 Stunden
+        interval_minutes=int(os.getenv('UPDATE_QUEUE_CYCLE_MINUTES', '60')),  # Zyklus der Update-Queue
         dependencies=["price_tracker", "steam_wishlist_manager"],
         heartbeat_interval=60,  # Erhöht auf 60s
         show_progress_bar=True
@@ -1450,6 +1803,26 @@ def create_enhanced_charts_scheduler() -> EnhancedBackgroundScheduler:
     
     return scheduler
 
+def create_enhanced_elasticsearch_scheduler() -> EnhancedBackgroundScheduler:
+    """Erstellt BackgroundScheduler für den inkrementellen Elasticsearch Sync"""
+    scheduler = EnhancedBackgroundScheduler(
+        scheduler_name="Elasticsearch",
+        base_config={
+            "enhanced_features": True,
+            "version": "1.0"
+        }
+    )
+    
+    scheduler.register_scheduler(
+        scheduler_type="elasticsearch_sync",
+        task_function=EnhancedSchedulerTasks.enhanced_elasticsearch_sync_task(),
+        interval_minutes=int(os.getenv('ES_SYNC_INTERVAL_MINUTES', '15')),
+        dependencies=["database_manager", "elasticsearch_cli"],
+        heartbeat_interval=60
+    )
+    
+    return scheduler
+
 # Kompatibilitäts-Aliase für ursprünglichen Code
 def create_price_tracker_scheduler():
     """Kompatibilitäts-Alias für Version"""
@@ -1841,6 +2214,7 @@ def main():
         print("3. 📋 Scheduler-Status anzeigen")
         print("4. ⏹️ Alle Scheduler stoppen")
         print("5. 🔧 Process Management Terminal starten")
+        print("6. 🔄 Elasticsearch Sync Scheduler erstellen und starten")
         print("0. ❌ Beenden")
         
         schedulers = {}
@@ -1877,6 +2251,15 @@ def main():
                         for scheduler_id, proc_info in status['processes'].items():
                             status_icon = "✅" if proc_info['is_running'] else "💀"
                             print(f"   {status_icon} {scheduler_id} (PID: {proc_info['pid']})")
+                    
+                    for name, scheduler in schedulers.items():
+                        if scheduler.execution_mode != 'inprocess':
+                            continue
+                        for task_id, task_info in scheduler.get_process_status()['processes'].items():
+                            status_icon = "🔄" if task_info['is_running'] else "⏸️"
+                            duration = f"{task_info['last_duration']:.1f}s" if task_info['last_duration'] is not None else "-"
+                            print(f"   {status_icon} {task_id} (In-Process, {task_info['run_count']} Läufe, "
+                                  f"zuletzt {duration}, nächster Lauf {task_info['next_run']})")
                 
                 elif choice == "4":
                     for name, scheduler in schedulers.items():
@@ -1892,6 +2275,14 @@ def main():
                     else:
                         print("❌ Fehler beim Starten des Process Management Terminals")
                 
+                elif choice == "6":
+                    if "elasticsearch" not in schedulers:
+                        schedulers["elasticsearch"] = create_enhanced_elasticsearch_scheduler()
+                        schedulers["elasticsearch"].start_scheduler()
+                        print("✅ Elasticsearch Sync Scheduler gestartet")
+                    else:
+                        print("⚠️ Elasticsearch Sync Scheduler läuft bereits")
+                
                 elif choice == "0":
                     # Cleanup
                     for scheduler in schedulers.values():
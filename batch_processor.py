@@ -5,6 +5,7 @@ Mit App-Namen Updates und erweiterten Wartungsfunktionen
 """
 
 import sys
+import json
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -40,8 +41,16 @@ def cmd_run_batch(args):
         print(f"   ⏱️ Threshold: {args.hours}h")
         print(f"   📦 Max. Apps pro Batch: {getattr(args, 'batch_size', 50)}")
         
+        concurrent = getattr(args, 'concurrent', False)
+        if concurrent:
+            print(f"   🧵 Parallele Fetch-Engine: {args.workers or 'Standard'} Worker")
+        
         if hasattr(tracker, 'process_all_pending_apps_optimized'):
-            stats = tracker.process_all_pending_apps_optimized(args.hours)
+            stats = tracker.process_all_pending_apps_optimized(
+                args.hours,
+                concurrent=concurrent,
+                max_workers=getattr(args, 'workers', None)
+            )
             
             if stats.get('success'):
                 print(f"✅ Batch-Update erfolgreich:")
@@ -1048,6 +1057,200 @@ def cmd_batch_health_check(args):
         logger.exception("Kritischer Fehler im BATCH-System Gesundheitscheck")
         return health_report
 
+def cmd_query_plans(args):
+    """Prüft die Hot Queries auf volle Tabellen-Scans (Exit-Code 1 bei Regression)"""
+    try:
+        from database_manager import DatabaseManager
+        
+        print("🔍 QUERY-PLAN PRÜFUNG")
+        print("=" * 25)
+        
+        db = DatabaseManager(args.db) if args.db else DatabaseManager()
+        report = db.check_query_plans(repeat=args.repeat)
+        
+        for name, result in report['queries'].items():
+            status = result['status']
+            if status == 'skipped':
+                print(f"⏭️ {name}: übersprungen (fehlt: {', '.join(result['missing'])})")
+            elif status == 'error':
+                print(f"❌ {name}: {result['error']}")
+            else:
+                icon = "✅" if status == 'ok' else "❌"
+                latency = f" - {result['latency_ms']:.2f} ms, {result['rows']} Zeilen" if 'latency_ms' in result else ""
+                print(f"{icon} {name}{latency}")
+                for detail in result['plan']:
+                    print(f"      {detail}")
+        
+        if not report['success']:
+            if report['regressions']:
+                print(f"\n❌ Regression: {', '.join(report['regressions'])}")
+            if report['skipped']:
+                print(f"\n❌ Nicht geprüft: {', '.join(report['skipped'])}")
+            sys.exit(1)
+        
+        print("\n✅ Keine vollen Tabellen-Scans in Hot Queries")
+        
+    except ImportError:
+        print("❌ database_manager Modul nicht gefunden")
+        sys.exit(1)
+
+def cmd_migrate_prices(args):
+    """Überführt die breite Preis-Historie in store_prices (fortsetzbar, Exit-Code 1 bei Fehler)"""
+    try:
+        from database_manager import DatabaseManager
+        
+        print("🔄 PREIS-MIGRATION")
+        print("=" * 20)
+        
+        db = DatabaseManager(args.db) if args.db else DatabaseManager()
+        
+        if db.get_price_storage_layout() == 'normalized':
+            print("✅ Preis-Historie ist bereits normalisiert - nichts zu tun")
+            return
+        
+        result = db.migrate_price_storage(chunk_size=args.chunk_size)
+        
+        if not result['success']:
+            print(f"❌ Migration abgebrochen nach {result['migrated']} Snapshots: {result['error']}")
+            print("💡 Erneuter Aufruf setzt beim letzten kopierten Snapshot fort")
+            sys.exit(1)
+        
+        print(f"✅ {result['migrated']} Snapshots in {result['duration']:.1f}s migriert")
+        print("💡 VACUUM (batch_processor.py maintenance) gibt den Platz der alten Tabelle frei")
+        
+    except ImportError:
+        print("❌ database_manager Modul nicht gefunden")
+        sys.exit(1)
+
+def cmd_analytics(args):
+    """Vektorisierte Preis- und Rang-Analysen über alle Apps (NumPy)"""
+    try:
+        from price_analytics import NUMPY_AVAILABLE, create_price_analytics
+        from database_manager import DatabaseManager
+    except ImportError:
+        print("❌ price_analytics Modul nicht gefunden")
+        sys.exit(1)
+    
+    if not NUMPY_AVAILABLE:
+        print("❌ NumPy nicht installiert - pip install numpy")
+        sys.exit(1)
+    
+    db = DatabaseManager(args.db) if args.db else DatabaseManager()
+    analytics = create_price_analytics(db)
+    
+    if args.report == 'deals':
+        result = analytics.get_deals(min_discount=args.min_discount, limit=args.limit,
+                                     max_low_ratio=args.max_ratio, source=args.source, store=args.store)
+    elif args.report == 'trending':
+        result = analytics.get_trending(chart_type=args.chart_type, limit=args.limit, window_days=args.window_days)
+    else:
+        result = analytics.get_statistics(source=args.source, store=args.store, top=args.limit)
+    
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+    
+    if args.report == 'deals':
+        print(f"🎯 DEALS MIT PREIS-HISTORIE (min. {args.min_discount}% Rabatt)")
+        print("=" * 45)
+        for i, deal in enumerate(result, 1):
+            low_marker = " 🏆 Allzeit-Tief" if deal['at_all_time_low'] else ""
+            print(f"{i:2d}. {deal['name'][:40]}{low_marker}")
+            print(f"    💰 €{deal['current_price']:.2f} (-{deal['discount_percent']}%) • "
+                  f"Tief €{deal['all_time_low']:.2f} ({deal['low_ratio']:.2f}x) • "
+                  f"{deal['sale_count']} Sales, {deal['discount_share']:.0%} der Zeit reduziert")
+        if not result:
+            print("❌ Keine Deals gefunden")
+    
+    elif args.report == 'trending':
+        print(f"📈 TRENDING (Rang-Gewinn in {args.window_days or analytics.trend_window_days} Tagen)")
+        print("=" * 40)
+        for i, game in enumerate(result, 1):
+            print(f"{i:2d}. {game['name'][:40]} [{game['chart_type']}]")
+            print(f"    #{game['window_start_rank']} → #{game['current_rank']} (+{game['rank_change']}) • "
+                  f"Bester Rang #{game['best_rank']}")
+        if not result:
+            print("❌ Keine steigenden Spiele in der Rang-Historie")
+    
+    else:
+        print("📊 PREIS-ANALYSE")
+        print("=" * 20)
+        print(f"🎮 Apps: {result['apps']:,} ({result['priced_apps']:,} mit Preis)")
+        print(f"📸 Snapshots: {result['samples']:,}")
+        print(f"🔥 Aktuell im Sale: {result['apps_on_sale']:,}")
+        print(f"🏆 Im Sale auf Allzeit-Tief: {result['apps_at_all_time_low']:,}")
+        print(f"📉 Nahe Allzeit-Tief: {result['apps_near_low']:,}")
+        print(f"🏷️ Ø Zeitanteil reduziert: {result['avg_discount_share']:.1%}")
+        print(f"🔁 Ø Sales pro App: {result['avg_sale_count']:.1f}")
+        print(f"📈 Median-Volatilität: {result['median_volatility']:.3f}")
+        if result['most_volatile']:
+            print("\n⚡ Volatilste Apps:")
+            for app in result['most_volatile']:
+                print(f"   • {app['name'][:40]}: {app['volatility']:.3f} "
+                      f"(€{app['all_time_low']:.2f} - €{app['all_time_high']:.2f})")
+        print(f"\n⏱️ Laden {result['load_seconds']:.2f}s, Berechnung {result['compute_seconds']:.3f}s")
+
+def cmd_queue(args):
+    """Priorisierte Update-Queue anzeigen, neu bewerten oder einen Zyklus ausführen"""
+    try:
+        from update_queue import create_update_queue
+        from database_manager import DatabaseManager
+    except ImportError:
+        print("❌ update_queue Modul nicht gefunden")
+        sys.exit(1)
+    
+    if args.run or args.probe or args.burst:
+        from price_tracker import create_price_tracker
+        tracker = create_price_tracker(db_path=args.db) if args.db else create_price_tracker()
+        queue = tracker.update_queue
+        
+        if args.burst:
+            burst = tracker.run_burst_refresh()
+        else:
+            burst = None
+            if args.probe:
+                sale = tracker.probe_sale_event(force=True)
+                probe = sale.get('probe') or {}
+                print(f"🔎 Stichprobe: {probe.get('discounted_share', 0):.0%} von {probe.get('priced', 0)} Apps rabattiert "
+                      f"(erwartet {probe.get('expected_share', 0):.0%})" + (" → Sale erkannt" if probe.get('sale') else ""))
+                burst = sale.get('burst')
+        if burst:
+            print(f"🔥 Sale-Burst: {burst['refreshed']}/{burst['apps']} Wishlist-Apps in {burst['duration']:.1f}s "
+                  f"({burst.get('workers', 0)} Worker)")
+        
+        if args.run:
+            result = tracker.run_update_cycle(request_budget=args.budget)
+            print(f"✅ Zyklus: {result['refreshed']}/{result['apps']} Apps aktualisiert, "
+                  f"{result['failed']} fehlgeschlagen ({result['duration']:.1f}s)")
+    else:
+        db = DatabaseManager(args.db) if args.db else DatabaseManager()
+        queue = create_update_queue(db, request_budget=args.budget)
+        if args.rescore:
+            rescore = queue.rescore(force=True)
+            print(f"🔄 Neu bewertet: {rescore['apps']} Apps (Ø Score {rescore['average_score']}, "
+                  f"{rescore['hot_apps']} heiß, {rescore['dormant_apps']} ruhend)")
+    
+    status = queue.get_status(limit=args.limit)
+    if args.json:
+        print(json.dumps(status, indent=2, ensure_ascii=False))
+        return
+    
+    print("📋 UPDATE-QUEUE")
+    print("=" * 20)
+    print(f"🎮 Apps in Queue: {status['apps']:,} (fällig: {status['due']:,}, Backoff: {status['backoff']:,})")
+    print(f"⏱️ Stündlich: {status['hourly']:,} • Wöchentlich: {status['weekly']:,}")
+    print(f"📊 Ø Score: {status['average_score']:.3f}")
+    print(f"🚀 Apps pro Zyklus: {status['apps_per_cycle']} (Budget {status['request_budget']} Requests)")
+    print(f"⏰ Nächste Fälligkeit: {status['next_due_at'] or 'N/A'}")
+    print(f"🔄 Zuletzt bewertet: {status['scored_at'] or 'nie'}")
+    print(f"🔥 Letzter Sale-Burst: {status['last_burst'] or 'nie'}")
+    if status['top']:
+        print("\n🔝 Höchste Priorität:")
+        for entry in status['top']:
+            name = (entry['name'] or entry['steam_app_id'])[:40]
+            print(f"   • {name}: Score {entry['score']:.3f}, alle {entry['interval_hours']:.1f}h, "
+                  f"fällig {entry['next_due_at']}")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Enhanced Batch Processor - Steam Price Tracker Verwaltung",
@@ -1055,6 +1258,7 @@ def main():
         epilog="""
 Beispiele:
   %(prog)s batch --hours 6           - Batch-Update für Apps älter als 6h
+  %(prog)s batch --concurrent --workers 8 - Paralleles Batch-Update
   %(prog)s specific --app-ids "413150,105600" - Update für spezifische Apps
   %(prog)s pending --hours 24        - Zeige Apps die Updates benötigen
   %(prog)s status                    - Detaillierter System-Status
@@ -1066,15 +1270,25 @@ Beispiele:
   %(prog)s maintenance                - Wartungsaufgaben ausführen
   %(prog)s export-all                 - Alle Apps als CSV exportieren
   %(prog)s stats --hours 24           - Detaillierte Statistiken anzeigen
+  %(prog)s query-plans                - Hot Queries auf Tabellen-Scans prüfen
+  %(prog)s migrate-prices             - Preis-Historie nach store_prices migrieren
+  %(prog)s analytics deals --min-discount 50 - Deals mit Allzeit-Tief-Vergleich
+  %(prog)s analytics trending         - Trending Games aus der Rang-Historie
+  %(prog)s queue --rescore            - Update-Queue neu bewerten und anzeigen
+  %(prog)s queue --probe              - Auf Steam Sale prüfen, ggf. Wishlist-Burst
         """
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Verfügbare Kommandos')
     
     # Batch Command
-    batch_parser = subparsers.add_parser('batch', help='Optimiertes Batch-Update')
+    batch_parser = subparsers.add_parser('batch', aliases=['run-batch'], help='Optimiertes Batch-Update')
     batch_parser.add_argument('--hours', type=int, default=6, 
                              help='Apps älter als X Stunden aktualisieren (Standard: 6)')
+    batch_parser.add_argument('--concurrent', action='store_true',
+                             help='Parallele Fetch-Engine mit In-Flight-Limits pro Upstream verwenden')
+    batch_parser.add_argument('--workers', type=int, default=None,
+                             help='Anzahl Worker-Threads (Standard: PRICE_FETCH_WORKERS oder 8)')
     batch_parser.set_defaults(func=cmd_run_batch)
     
     # Specific Command
@@ -1146,6 +1360,57 @@ Beispiele:
                              help='Threshold für pending Apps (Standard: 24)')
     stats_parser.set_defaults(func=cmd_stats)
     
+    # Query Plans Command
+    plans_parser = subparsers.add_parser('query-plans', help='Hot Queries per EXPLAIN QUERY PLAN prüfen')
+    plans_parser.add_argument('--db', help='Datenbank-Datei (Standard: steam_price_tracker.db)')
+    plans_parser.add_argument('--repeat', type=int, default=3,
+                             help='Ausführungen je Query für die Latenz (Standard: 3, 0 = nur Plan)')
+    plans_parser.set_defaults(func=cmd_query_plans)
+    
+    # Price Migration Command
+    migrate_parser = subparsers.add_parser('migrate-prices', help='Preis-Historie nach store_prices migrieren')
+    migrate_parser.add_argument('--db', help='Datenbank-Datei (Standard: steam_price_tracker.db)')
+    migrate_parser.add_argument('--chunk-size', type=int,
+                               help='Snapshots pro Transaktion (Standard: PRICE_MIGRATION_CHUNK_SIZE)')
+    migrate_parser.set_defaults(func=cmd_migrate_prices)
+    
+    # Analytics Command
+    analytics_parser = subparsers.add_parser('analytics', help='Vektorisierte Preis-/Rang-Analysen (NumPy)')
+    analytics_parser.add_argument('report', nargs='?', default='summary', choices=['summary', 'deals', 'trending'],
+                                 help='Auswertung (Standard: summary)')
+    analytics_parser.add_argument('--db', help='Datenbank-Datei (Standard: steam_price_tracker.db)')
+    analytics_parser.add_argument('--source', default='tracked', choices=['tracked', 'charts'],
+                                 help='Preis-Quelle (Standard: tracked)')
+    analytics_parser.add_argument('--store', help='Nur diesen Store auswerten (Standard: günstigster Store)')
+    analytics_parser.add_argument('--min-discount', type=int, default=25,
+                                 help='Mindest-Rabatt für deals (Standard: 25)')
+    analytics_parser.add_argument('--max-ratio', type=float, default=None,
+                                 help='deals: aktueller Preis höchstens X-mal Allzeit-Tief')
+    analytics_parser.add_argument('--chart-type', choices=VALID_CHART_TYPES,
+                                 help='trending: nur diesen Chart-Typ')
+    analytics_parser.add_argument('--window-days', type=int, default=None,
+                                 help='trending: Trend-Fenster in Tagen (Standard: ANALYTICS_TREND_WINDOW_DAYS)')
+    analytics_parser.add_argument('--limit', type=int, default=15,
+                                 help='Anzahl Einträge (Standard: 15)')
+    analytics_parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben')
+    analytics_parser.set_defaults(func=cmd_analytics)
+    
+    # Queue Command
+    queue_parser = subparsers.add_parser('queue', help='Priorisierte Update-Queue anzeigen')
+    queue_parser.add_argument('--db', help='Datenbank-Datei (Standard: steam_price_tracker.db)')
+    queue_parser.add_argument('--rescore', action='store_true', help='Scores sofort neu berechnen')
+    queue_parser.add_argument('--run', action='store_true', help='Einen Update-Zyklus ausführen')
+    queue_parser.add_argument('--probe', action='store_true',
+                             help='Sale-Stichprobe ziehen (bei erkanntem Sale Wishlist-Burst)')
+    queue_parser.add_argument('--burst', action='store_true',
+                             help='Wishlist-Burst sofort ausführen (ohne Stichprobe)')
+    queue_parser.add_argument('--budget', type=int, default=None,
+                             help='Request-Budget pro Zyklus (Standard: UPDATE_QUEUE_REQUEST_BUDGET)')
+    queue_parser.add_argument('--limit', type=int, default=10,
+                             help='Anzahl angezeigter Einträge (Standard: 10)')
+    queue_parser.add_argument('--json', action='store_true', help='Status als JSON ausgeben')
+    queue_parser.set_defaults(func=cmd_queue)
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -0,0 +1,768 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Synthetische Datenbanken und End-to-End Lasttests
+Steam Price Tracker - Misst die Pipelines offline und reproduzierbar
+
+- Generator für große Datenbanken: N getrackte Apps, M Preis-Abrufe mit
+  periodischen Sales pro App und Store, Charts mit täglichem Rang-Churn
+- Lokaler Steam/CheapShark Stand-in (upstream_stub_server.py) über die
+  konfigurierbaren Basis-URLs (Latenz, 429-Quote mit Retry-After, 5xx-Fehler)
+- Replay der Pipelines price_update, charts_update, deals, history und es_export
+- JSON-Report mit Durchsatz, p50/p95 Latenz und Peak RSS pro Pipeline
+
+Beispiele:
+  python benchmark.py generate --db benchmarks/bench.db --apps 2000 --snapshots 200000
+  python benchmark.py run --db benchmarks/bench.db --latency-ms 80 --rate-limit-ratio 0.02
+  python benchmark.py scales --scales 10000,100000,1000000
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time as time_module
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Any
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Lauf-Logs (Benchmark, Stub, Datenbank) landen im Temp-Verzeichnis statt in logs/
+os.environ.setdefault('LOG_FILE', str(Path(tempfile.gettempdir()) / 'steam_price_tracker_benchmark' / 'logs'))
+
+from database_manager import DatabaseManager, PRICE_STORES
+from upstream_stub_server import (
+    CHART_TYPES, SyntheticPriceModel, UpstreamStub, UpstreamStubServer, synthetic_app_ids
+)
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("benchmark", "benchmark.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# DATENBANK-GENERATOR
+# =====================================================================
+
+def _snapshot_row(app_id: str, name: str, timestamp: str, prices: Dict[str, Dict]) -> tuple:
+    """Zeile für price_snapshots (Spaltenreihenfolge wie SNAPSHOT_COLUMNS)"""
+    row = [app_id, name, timestamp]
+    for store in PRICE_STORES:
+        store_prices = prices.get(store)
+        if store_prices:
+            row.extend([store_prices['price'], store_prices['original_price'],
+                        store_prices['discount_percent'], 1])
+        else:
+            row.extend([None, None, 0, 0])
+    return tuple(row)
+
+SNAPSHOT_COLUMNS = ['steam_app_id', 'game_title', 'timestamp'] + [
+    f"{store}_{field}" for store in PRICE_STORES
+    for field in ('price', 'original_price', 'discount_percent', 'available')
+]
+
+def _insert_rows(conn, table: str, columns: List[str], rows: List[tuple], conflict: str = '') -> int:
+    """executemany-Insert im Writer-Thread"""
+    conn.executemany(
+        f"INSERT {conflict} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        rows
+    )
+    return len(rows)
+
+def _format_ts(value: datetime) -> str:
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+def _simulate_charts(pool: List[str], chart_size: int, chart_days: int, churn: float,
+                     rng: random.Random, end: datetime) -> Dict[str, Any]:
+    """
+    Simuliert tägliche Charts mit Rang-Churn
+
+    Pro Tag wird ein Anteil churn der Plätze durch neue Apps aus dem Pool ersetzt
+    und benachbarte Ränge werden zufällig getauscht.
+
+    Returns:
+        Dict mit 'tracking' ((app, chart) -> Zustand) und 'history' (Zeilen für charts_history)
+    """
+    tracking: Dict[tuple, Dict[str, Any]] = {}
+    history = []
+    chart_size = min(chart_size, len(pool))
+
+    for chart_type in CHART_TYPES:
+        ranking = rng.sample(pool, chart_size)
+
+        for day in range(chart_days):
+            when = end - timedelta(days=chart_days - 1 - day)
+
+            if day > 0:
+                outside = [app_id for app_id in rng.sample(pool, min(len(pool), chart_size * 2))
+                           if app_id not in ranking]
+                for position in rng.sample(range(chart_size), int(chart_size * churn)):
+                    if outside:
+                        ranking[position] = outside.pop()
+                for position in range(chart_size - 1):
+                    if rng.random() < 0.3:
+                        ranking[position], ranking[position + 1] = ranking[position + 1], ranking[position]
+
+            for rank, app_id in enumerate(ranking, 1):
+                players = int(250000 / rank ** 0.8 * rng.uniform(0.8, 1.2))
+                state = tracking.setdefault((app_id, chart_type), {
+                    'first_seen': when, 'best_rank': rank, 'days': 0, 'ranks': [], 'peak_players': 0
+                })
+                state['last_seen'] = when
+                state['best_rank'] = min(state['best_rank'], rank)
+                state['days'] += 1
+                state['ranks'].append(rank)
+                state['current_players'] = players
+                state['peak_players'] = max(state['peak_players'], players)
+                state['active'] = day == chart_days - 1
+
+                history.append((app_id, chart_type, rank, _format_ts(when),
+                                json.dumps({'current_players': players})))
+
+    return {'tracking': tracking, 'history': history}
+
+def _rank_trend(ranks: List[int]) -> str:
+    if len(ranks) < 2:
+        return 'new'
+    if ranks[-1] < ranks[-2]:
+        return 'up'
+    if ranks[-1] > ranks[-2]:
+        return 'down'
+    return 'stable'
+
+def generate_synthetic_database(db_path: str, apps: int = 1000, snapshots: int = 100000,
+                                days: int = 365, chart_size: int = 100, chart_days: int = 30,
+                                churn: float = 0.1, seed: int = 42,
+                                snapshot_mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Erzeugt eine synthetische Datenbank über den DatabaseManager (aktuelles Schema)
+
+    snapshots ist die Anzahl der Preis-Abrufe. Im change-only Modus (PRICE_SNAPSHOT_MODE)
+    speichert die Datenbank davon nur die Preisänderungen; mit snapshot_mode='full'
+    entspricht die Zeilenzahl genau snapshots.
+
+    Args:
+        db_path: Ziel-Datenbank (wird ergänzt, nicht geleert)
+        apps: Anzahl getrackter Apps
+        snapshots: Preis-Abrufe insgesamt (gleichmäßig über days verteilt)
+        days: Zeitraum der Preis-Historie
+        chart_size: Plätze pro Chart-Typ
+        chart_days: Tage Charts-Historie
+        churn: Anteil der Chart-Plätze, der pro Tag wechselt
+        seed: Seed für Preismodell und Charts
+        snapshot_mode: 'changes' oder 'full' (Standard: PRICE_SNAPSHOT_MODE)
+
+    Returns:
+        Dict mit Zeilenzahlen und Dauer
+    """
+    if snapshot_mode:
+        os.environ['PRICE_SNAPSHOT_MODE'] = snapshot_mode
+
+    start_time = time_module.time()
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    db = DatabaseManager(db_path)
+
+    rng = random.Random(seed)
+    model = SyntheticPriceModel(seed)
+    now = datetime.now().replace(microsecond=0)
+    history_start = now - timedelta(days=days)
+
+    app_ids = synthetic_app_ids(apps)
+    polls_per_app = max(1, snapshots // max(apps, 1))
+    interval = timedelta(seconds=days * 86400 / polls_per_app)
+
+    # Getrackte Apps
+    tracked_rows = []
+    for app_id in app_ids:
+        tracked_rows.append((
+            app_id, model.profile(app_id)['name'], _format_ts(history_start), 1 if rng.random() < 0.95 else 0,
+            'benchmark', round(model.profile(app_id)['base_price'] * rng.uniform(0.3, 0.7), 2) or None
+        ))
+    db.run_write(_insert_rows, 'tracked_apps',
+                 ['steam_app_id', 'name', 'added_at', 'active', 'source', 'target_price'],
+                 tracked_rows, 'OR IGNORE')
+
+    # Preis-Abrufe pro App chronologisch (latest_prices: letzter Insert gewinnt)
+    written = 0
+    last_updates = []
+    apps_per_job = max(1, 20000 // polls_per_app)
+
+    for block_start in range(0, len(app_ids), apps_per_job):
+        rows = []
+        for app_id in app_ids[block_start:block_start + apps_per_job]:
+            name = model.profile(app_id)['name']
+            phase = timedelta(seconds=rng.uniform(0, interval.total_seconds()))
+            when = history_start + phase
+            for _ in range(polls_per_app):
+                rows.append(_snapshot_row(app_id, name, _format_ts(when), model.prices_at(app_id, when)))
+                when += interval
+            last_updates.append((_format_ts(when - interval), app_id))
+
+        written += db.run_write(_insert_rows, 'price_snapshots', SNAPSHOT_COLUMNS, rows)
+        logger.info(f"🧪 {written}/{polls_per_app * apps} Preis-Abrufe generiert")
+
+    db.write_statements([
+        ("UPDATE tracked_apps SET last_price_update = ? WHERE steam_app_id = ?", last_updates, True)
+    ])
+
+    # Charts: Hälfte des Pools sind getrackte Apps, Rest nur in Charts
+    db.init_charts_tables()
+    pool = app_ids[:chart_size * 2] + synthetic_app_ids(chart_size * 2, offset=apps)
+    charts = _simulate_charts(pool, chart_size, chart_days, churn, rng, now)
+
+    tracking_rows = []
+    price_rows = []
+    for (app_id, chart_type), state in charts['tracking'].items():
+        name = model.profile(app_id)['name']
+        tracking_rows.append((
+            app_id, chart_type, name, state['ranks'][-1], state['current_players'], state['peak_players'],
+            _format_ts(state['last_seen']), _format_ts(state['last_seen']), 1 if state['active'] else 0,
+            _format_ts(state['first_seen']), state['days'], state['best_rank'], _rank_trend(state['ranks'])
+        ))
+
+        for day in range(state['days']):
+            when = state['last_seen'] - timedelta(days=day)
+            price_rows.append(_snapshot_row(app_id, name, _format_ts(when), model.prices_at(app_id, when))
+                              + (chart_type,))
+
+    db.run_write(_insert_rows, 'steam_charts_tracking',
+                 ['steam_app_id', 'chart_type', 'name', 'current_rank', 'current_players', 'peak_players',
+                  'last_seen', 'updated_at', 'active', 'first_seen', 'days_on_charts', 'best_rank', 'rank_trend'],
+                 tracking_rows, 'OR REPLACE')
+    db.run_write(_insert_rows, 'charts_history',
+                 ['steam_app_id', 'chart_type', 'rank_position', 'snapshot_timestamp', 'additional_data'],
+                 charts['history'])
+
+    with db.get_connection(readonly=True) as conn:
+        charts_columns = {row[1] for row in conn.execute("PRAGMA table_info(steam_charts_prices)").fetchall()}
+    if 'steam_price' in charts_columns:
+        db.run_write(_insert_rows, 'steam_charts_prices', SNAPSHOT_COLUMNS + ['chart_type'], price_rows)
+    else:
+        logger.warning("⚠️ steam_charts_prices ohne Multi-Store-Schema - Charts-Preise übersprungen")
+        price_rows = []
+
+    # Rollups wie nach einem Cleanup-Lauf, damit History-Abfragen den Normalbetrieb messen
+    rollups = db.rollup_prices()
+
+    with db.get_connection(readonly=True) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM price_snapshots").fetchone()[0]
+
+    result = {
+        'db_path': db_path,
+        'apps': apps,
+        'snapshots_generated': written,
+        'snapshots_stored': stored,
+        'snapshot_mode': os.getenv('PRICE_SNAPSHOT_MODE', 'changes'),
+        'layout': db.get_price_storage_layout(),
+        'charts_tracking': len(tracking_rows),
+        'charts_history': len(charts['history']),
+        'charts_prices': len(price_rows),
+        'rollups': rollups,
+        'duration_seconds': round(time_module.time() - start_time, 2)
+    }
+    logger.info(f"✅ Synthetische Datenbank erstellt: {result}")
+    return result
+
+# =====================================================================
+# MESSUNG
+# =====================================================================
+
+def current_rss_bytes() -> Optional[int]:
+    """Aktueller Resident Set Size des Prozesses (psutil oder /proc)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class RSSSampler:
+    """
+    Erfasst den Peak-RSS während einer Pipeline per Hintergrund-Thread
+
+    RSS gilt für den ganzen Prozess; start_mb zeigt, was vorher schon belegt war.
+    """
+
+    def __init__(self, interval_seconds: float = 0.05):
+        self.interval_seconds = interval_seconds
+        self.start = self.peak = current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    @staticmethod
+    def _mb(value: Optional[int]) -> Optional[float]:
+        return round(value / (1024 * 1024), 1) if value is not None else None
+
+    @property
+    def start_mb(self) -> Optional[float]:
+        return self._mb(self.start)
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        return self._mb(self.peak)
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Perzentil nach Nearest-Rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered), max(1, math.ceil(percent / 100 * len(ordered)))) - 1
+    return round(ordered[index], 3)
+
+def measure_pipeline(operations: Iterable[Callable[[], int]]) -> Dict[str, Any]:
+    """
+    Führt Operationen nacheinander aus und misst Latenz, Durchsatz und Peak RSS
+
+    Args:
+        operations: Callables, die die Anzahl verarbeiteter Einheiten zurückgeben
+
+    Returns:
+        Dict mit operations, items, errors, throughput_per_second, latency_ms und peak_rss_mb
+    """
+    latencies = []
+    items = 0
+    errors = []
+    start = time_module.perf_counter()
+
+    with RSSSampler() as sampler:
+        for operation in operations:
+            op_start = time_module.perf_counter()
+            try:
+                items += operation() or 0
+            except Exception as e:
+                errors.append(str(e))
+            latencies.append((time_module.perf_counter() - op_start) * 1000)
+
+    duration = time_module.perf_counter() - start
+    return {
+        'status': 'ok' if not errors else 'errors',
+        'operations': len(latencies),
+        'items': items,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'duration_seconds': round(duration, 3),
+        'throughput_per_second': round(items / duration, 2) if duration > 0 else 0.0,
+        'operations_per_second': round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'max': round(max(latencies), 3) if latencies else None
+        },
+        'start_rss_mb': sampler.start_mb,
+        'peak_rss_mb': sampler.peak_mb
+    }
+
+# =====================================================================
+# PIPELINES
+# =====================================================================
+
+PIPELINES = ['price_update', 'charts_update', 'deals', 'history', 'es_export']
+DB_ONLY_PIPELINES = ['deals', 'history']
+
+class BenchmarkRunner:
+    """Spielt die Pipelines gegen eine (synthetische) Datenbank ab"""
+
+    def __init__(self, db_path: str, iterations: int = 20, apps_per_run: int = 200,
+                 batch_size: int = 50, concurrent: bool = False, seed: int = 42):
+        self.db_path = db_path
+        self.iterations = iterations
+        self.apps_per_run = apps_per_run
+        self.batch_size = batch_size
+        self.concurrent = concurrent
+        self.rng = random.Random(seed)
+        self.db = DatabaseManager(db_path)
+        self.tracker = None
+        self.charts_manager = None
+
+    def _get_tracker(self):
+        if self.tracker is None:
+            from price_tracker import SteamPriceTracker
+            self.tracker = SteamPriceTracker(self.db, api_key='benchmark', enable_charts=False,
+                                             enable_scheduler=False)
+        return self.tracker
+
+    def _get_charts_manager(self):
+        if self.charts_manager is None:
+            from steam_charts_manager import SteamChartsManager
+            self.charts_manager = SteamChartsManager('benchmark', self.db, self._get_tracker())
+        return self.charts_manager
+
+    def _app_ids(self, table: str = 'tracked_apps') -> List[str]:
+        with self.db.get_connection(readonly=True) as conn:
+            return [str(row[0]) for row in conn.execute(f"SELECT DISTINCT steam_app_id FROM {table}").fetchall()]
+
+    def chart_pool(self) -> List[str]:
+        """Apps für Stub-Charts: bekannte Chart-Apps plus getrackte Apps"""
+        return list(dict.fromkeys(self._app_ids('steam_charts_tracking') + self._app_ids()))
+
+    def database_info(self) -> Dict[str, Any]:
+        with self.db.get_connection(readonly=True) as conn:
+            counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ('tracked_apps', 'price_snapshots', 'steam_charts_tracking', 'charts_history')}
+        return {
+            'path': self.db_path,
+            'size_mb': round(os.path.getsize(self.db_path) / (1024 * 1024), 1),
+            'layout': self.db.get_price_storage_layout(),
+            'snapshot_mode': os.getenv('PRICE_SNAPSHOT_MODE', 'changes'),
+            'rows': counts
+        }
+
+    def run(self, pipeline: str, **options) -> Dict[str, Any]:
+        handler = getattr(self, f"_run_{pipeline}", None)
+        if handler is None:
+            return {'status': 'skipped', 'reason': f"Unbekannte Pipeline: {pipeline}"}
+        try:
+            return handler(**options)
+        except ImportError as e:
+            return {'status': 'skipped', 'reason': f"Modul nicht verfügbar: {e}"}
+
+    def _run_price_update(self, **options) -> Dict[str, Any]:
+        tracker = self._get_tracker()
+        app_ids = self._app_ids()
+        self.rng.shuffle(app_ids)
+        app_ids = app_ids[:self.apps_per_run]
+
+        def update(batch):
+            return lambda: tracker.batch_update_multiple_apps(batch, concurrent=self.concurrent).get('successful_updates', 0)
+
+        return measure_pipeline(update(app_ids[i:i + self.batch_size])
+                                for i in range(0, len(app_ids), self.batch_size))
+
+    def _run_charts_update(self, **options) -> Dict[str, Any]:
+        charts_manager = self._get_charts_manager()
+
+        def update():
+            result = charts_manager.update_all_charts_batch(CHART_TYPES, include_names=True, include_prices=True)
+            return result.get('performance_metrics', {}).get('charts_processed', 0)
+
+        return measure_pipeline(update for _ in range(max(1, self.iterations // 10)))
+
+    def _run_deals(self, **options) -> Dict[str, Any]:
+        min_discounts = [10, 25, 50, 75]
+
+        def deals():
+            min_discount = self.rng.choice(min_discounts)
+            found = len(self.db.get_latest_prices(min_discount=min_discount, limit=20))
+            with self.db.get_connection(readonly=True) as conn:
+                if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'charts_best_deals'").fetchone():
+                    found += len(conn.execute("""
+                        SELECT * FROM charts_best_deals WHERE max_discount_percent >= ?
+                        ORDER BY max_discount_percent DESC, best_price ASC LIMIT 20
+                    """, (min_discount,)).fetchall())
+            return found
+
+        return measure_pipeline(deals for _ in range(self.iterations))
+
+    def _run_history(self, **options) -> Dict[str, Any]:
+        app_ids = self._app_ids()
+        windows = [7, 30, 90, 365]
+
+        def history():
+            return len(self.db.get_price_history(self.rng.choice(app_ids), days=self.rng.choice(windows), limit=500))
+
+        return measure_pipeline(history for _ in range(self.iterations))
+
+    def _run_es_export(self, es_host: str = 'localhost', es_port: int = 9200, **options) -> Dict[str, Any]:
+        from elasticsearch_cli import ElasticsearchManager, ELASTICSEARCH_AVAILABLE
+        if not ELASTICSEARCH_AVAILABLE:
+            return {'status': 'skipped', 'reason': 'elasticsearch Paket nicht installiert'}
+
+        manager = ElasticsearchManager(host=es_host, port=es_port)
+        if manager.health_check().get('status') not in ('green', 'yellow'):
+            return {'status': 'skipped', 'reason': f"Elasticsearch unter {es_host}:{es_port} nicht erreichbar"}
+
+        return measure_pipeline([lambda: manager.export_sqlite_to_elasticsearch(self.db).get('total_exported', 0)])
+
+# Produktive Standard-Datenbank, die ein Benchmark-Lauf nie anfassen darf
+DEFAULT_DB_PATH = "steam_price_tracker.db"
+
+def _file_fingerprint(db_path: str) -> Dict[str, Optional[tuple]]:
+    """Größe und mtime der Datenbank samt WAL/SHM (None = Datei fehlt)"""
+    fingerprint = {}
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            stat = os.stat(db_path + suffix)
+            fingerprint[suffix or 'db'] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            fingerprint[suffix or 'db'] = None
+    return fingerprint
+
+def run_benchmark(db_path: str, pipelines: List[str], upstream: Optional[Dict[str, Any]] = None,
+                  iterations: int = 20, apps_per_run: int = 200, batch_size: int = 50,
+                  concurrent: bool = False, seed: int = 42, **options) -> Dict[str, Any]:
+    """
+    Führt die gewählten Pipelines aus und erstellt den Report
+
+    Args:
+        db_path: Datenbank (z.B. von generate_synthetic_database)
+        pipelines: Namen aus PIPELINES
+        upstream: Parameter für UpstreamStub plus client_interval (None = kein Stand-in)
+        iterations: Wiederholungen für deals/history (charts_update: iterations // 10)
+        apps_per_run: Apps pro price_update Lauf
+        batch_size: Apps pro batch_update_multiple_apps Aufruf
+        concurrent: Parallele Fetch-Engine für price_update
+
+    Returns:
+        Report-Dict
+    """
+    # Stub-Antworten dürfen nicht im persistenten Response-Cache landen
+    os.environ['HTTP_CACHE_ENABLED'] = 'false'
+
+    guard_default_db = Path(db_path).resolve() != Path(DEFAULT_DB_PATH).resolve()
+    default_db_before = _file_fingerprint(DEFAULT_DB_PATH)
+
+    runner = BenchmarkRunner(db_path, iterations, apps_per_run, batch_size, concurrent, seed)
+    stub_server = None
+
+    if upstream is not None and REQUESTS_AVAILABLE and any(p not in DB_ONLY_PIPELINES for p in pipelines):
+        from config import get_upstream_base_urls, set_upstream_base_urls
+        from rate_limiter import configure_host
+
+        stub_options = dict(upstream)
+        client_interval = stub_options.pop('client_interval', 0.0)
+        stub_server = UpstreamStubServer(UpstreamStub(SyntheticPriceModel(seed), runner.chart_pool(),
+                                                      seed=seed, **stub_options))
+        previous_urls = get_upstream_base_urls()
+        stub_server.start()
+        stub_server.apply_to_config()
+
+        # Negativer Abstand: Stand-in erbt die produktiven Limits der echten Hosts
+        if client_interval >= 0:
+            for base_url in stub_server.base_urls.values():
+                configure_host(base_url, client_interval, burst=10)
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'database': runner.database_info(),
+        'settings': {
+            'iterations': iterations, 'apps_per_run': apps_per_run,
+            'batch_size': batch_size, 'concurrent': concurrent, 'seed': seed
+        },
+        'upstream': upstream,
+        'pipelines': {}
+    }
+
+    for pipeline in pipelines:
+        print(f"⏱️ Pipeline {pipeline}...")
+        if stub_server is None and pipeline in ('price_update', 'charts_update'):
+            result = {'status': 'skipped', 'reason': 'Upstream-Stub nicht aktiv (requests fehlt oder upstream=None)'}
+        else:
+            result = runner.run(pipeline, **options)
+        report['pipelines'][pipeline] = result
+        if result.get('status') == 'skipped':
+            print(f"   ⏭️ übersprungen: {result['reason']}")
+        else:
+            print(f"   ✅ {result['items']} Einheiten, {result['throughput_per_second']}/s, "
+                  f"p50 {result['latency_ms']['p50']} ms, p95 {result['latency_ms']['p95']} ms, "
+                  f"RSS {result['peak_rss_mb']} MB")
+
+    if stub_server is not None:
+        report['upstream_stats'] = stub_server.stub.get_stats()
+        stub_server.stop()
+        set_upstream_base_urls(**previous_urls)
+
+    # Ein Offline-Lauf darf die Standard-Datenbank weder anlegen noch migrieren oder beschreiben
+    if guard_default_db:
+        report['default_db_untouched'] = _file_fingerprint(DEFAULT_DB_PATH) == default_db_before
+        if not report['default_db_untouched']:
+            print(f"❌ Benchmark hat die Standard-Datenbank {DEFAULT_DB_PATH} verändert")
+            logger.error(f"❌ Benchmark hat die Standard-Datenbank {DEFAULT_DB_PATH} verändert")
+
+    return report
+
+def write_report(report: Dict[str, Any], report_path: str) -> None:
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2, ensure_ascii=False, default=str)
+    print(f"📄 Report gespeichert: {report_path}")
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+def _add_generate_arguments(parser):
+    parser.add_argument('--apps', type=int, default=1000, help='Getrackte Apps (Standard: 1000)')
+    parser.add_argument('--snapshots', type=int, default=100000, help='Preis-Abrufe insgesamt (Standard: 100000)')
+    parser.add_argument('--days', type=int, default=365, help='Zeitraum der Preis-Historie (Standard: 365)')
+    parser.add_argument('--chart-size', type=int, default=100, help='Plätze pro Chart (Standard: 100)')
+    parser.add_argument('--chart-days', type=int, default=30, help='Tage Charts-Historie (Standard: 30)')
+    parser.add_argument('--churn', type=float, default=0.1, help='Täglicher Chart-Churn (Standard: 0.1)')
+    parser.add_argument('--snapshot-mode', choices=['changes', 'full'],
+                        help='PRICE_SNAPSHOT_MODE für die erzeugte Datenbank')
+
+def _add_run_arguments(parser):
+    parser.add_argument('--pipelines', default=','.join(PIPELINES),
+                        help=f"Komma-getrennt aus {', '.join(PIPELINES)}")
+    parser.add_argument('--iterations', type=int, default=20, help='Wiederholungen pro Pipeline (Standard: 20)')
+    parser.add_argument('--apps-per-run', type=int, default=200, help='Apps für price_update (Standard: 200)')
+    parser.add_argument('--batch-size', type=int, default=50, help='Apps pro Batch-Aufruf (Standard: 50)')
+    parser.add_argument('--concurrent', action='store_true', help='Parallele Fetch-Engine verwenden')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Upstream-Latenz (Standard: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Latenz-Streuung (Standard: 10)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='Anteil 429-Antworten (0-1)')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='Anteil 503-Antworten (0-1)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After bei 429 in Sekunden')
+    parser.add_argument('--requests-per-second', type=float, default=0.0,
+                        help='Serverseitiges Limit des Stubs pro Upstream (Standard: 0 = aus)')
+    parser.add_argument('--client-interval', type=float, default=0.0,
+                        help='Clientseitiges Rate Limit je Host in Sekunden (Standard: 0 = aus, '
+                             'negativ = produktive Limits)')
+    parser.add_argument('--es-host', default=os.getenv('ELASTICSEARCH_HOST', 'localhost'))
+    parser.add_argument('--es-port', type=int, default=int(os.getenv('ELASTICSEARCH_PORT', '9200')))
+
+def _upstream_from_args(args) -> Dict[str, Any]:
+    return {
+        'latency_ms': args.latency_ms,
+        'jitter_ms': args.jitter_ms,
+        'rate_limit_ratio': args.rate_limit_ratio,
+        'error_ratio': args.error_ratio,
+        'retry_after': args.retry_after,
+        'requests_per_second': args.requests_per_second,
+        'client_interval': args.client_interval
+    }
+
+def _generate_kwargs(args) -> Dict[str, Any]:
+    return {
+        'apps': args.apps, 'snapshots': args.snapshots, 'days': args.days,
+        'chart_size': args.chart_size, 'chart_days': args.chart_days, 'churn': args.churn,
+        'seed': args.seed, 'snapshot_mode': args.snapshot_mode
+    }
+
+def cmd_generate(args):
+    print(f"🧪 Generiere synthetische Datenbank {args.db}...")
+    result = generate_synthetic_database(args.db, **_generate_kwargs(args))
+    print(f"✅ {result['snapshots_stored']} Snapshots gespeichert ({result['snapshots_generated']} Abrufe), "
+          f"{result['charts_history']} Charts-Einträge in {result['duration_seconds']}s")
+
+def cmd_run(args):
+    if not os.path.exists(args.db):
+        print(f"🧪 {args.db} fehlt - generiere synthetische Datenbank...")
+        generate_synthetic_database(args.db, **_generate_kwargs(args))
+
+    pipelines = [p.strip() for p in args.pipelines.split(',') if p.strip()]
+    report = run_benchmark(
+        args.db, pipelines, _upstream_from_args(args), iterations=args.iterations,
+        apps_per_run=args.apps_per_run, batch_size=args.batch_size, concurrent=args.concurrent,
+        seed=args.seed, es_host=args.es_host, es_port=args.es_port
+    )
+    write_report(report, args.report)
+
+    if report.get('default_db_untouched') is False:
+        sys.exit(1)
+
+def cmd_scales(args):
+    """Generiert je Größe eine Datenbank (snapshot-mode full) und misst DB-Pipelines + Query-Pläne"""
+    pipelines = [p.strip() for p in args.pipelines.split(',') if p.strip()]
+    report = {'generated_at': datetime.now().isoformat(), 'scales': {}}
+
+    for scale in [int(value) for value in args.scales.split(',')]:
+        db_path = os.path.join(args.dir, f"benchmark_{scale}.db")
+        if not os.path.exists(db_path):
+            print(f"🧪 Generiere {db_path} ({scale} Snapshots)...")
+            kwargs = _generate_kwargs(args)
+            kwargs.update({'snapshots': scale, 'snapshot_mode': args.snapshot_mode or 'full'})
+            generate_synthetic_database(db_path, **kwargs)
+
+        print(f"📏 Skala {scale}")
+        result = run_benchmark(db_path, pipelines, None, iterations=args.iterations, seed=args.seed)
+        result['query_plans'] = DatabaseManager(db_path).check_query_plans(repeat=args.plan_repeat)
+        report['scales'][str(scale)] = result
+
+        if result.get('default_db_untouched') is False:
+            print(f"   ❌ Standard-Datenbank {DEFAULT_DB_PATH} verändert")
+        if not result['query_plans']['success']:
+            failed = result['query_plans']['regressions'] + result['query_plans']['skipped']
+            print(f"   ❌ Query-Plan Regression/nicht geprüft: {', '.join(failed)}")
+
+    write_report(report, args.report)
+
+    if any(not scale['query_plans']['success'] or scale.get('default_db_untouched') is False
+           for scale in report['scales'].values()):
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark - Synthetische Datenbanken und Pipeline-Lasttests",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Beispiele:
+  %(prog)s generate --db benchmarks/bench.db --apps 2000 --snapshots 200000
+  %(prog)s run --db benchmarks/bench.db --latency-ms 80 --rate-limit-ratio 0.02
+  %(prog)s run --db benchmarks/bench.db --pipelines deals,history --iterations 200
+  %(prog)s scales --scales 10000,100000,1000000
+        """
+    )
+    parser.add_argument('--seed', type=int, default=42, help='Seed für Daten und Upstream (Standard: 42)')
+    subparsers = parser.add_subparsers(dest='command', help='Verfügbare Kommandos')
+
+    generate_parser = subparsers.add_parser('generate', help='Synthetische Datenbank erzeugen')
+    generate_parser.add_argument('--db', default='benchmarks/benchmark.db', help='Ziel-Datenbank')
+    _add_generate_arguments(generate_parser)
+    generate_parser.set_defaults(func=cmd_generate)
+
+    run_parser = subparsers.add_parser('run', help='Pipelines gegen lokalen Upstream-Stub ausführen')
+    run_parser.add_argument('--db', default='benchmarks/benchmark.db', help='Datenbank (wird bei Bedarf erzeugt)')
+    run_parser.add_argument('--report', default='benchmarks/benchmark_report.json', help='JSON-Report')
+    _add_generate_arguments(run_parser)
+    _add_run_arguments(run_parser)
+    run_parser.set_defaults(func=cmd_run)
+
+    scales_parser = subparsers.add_parser('scales', help='DB-Pipelines und Query-Pläne über mehrere Größen')
+    scales_parser.add_argument('--scales', default='10000,100000,1000000', help='Snapshot-Anzahlen')
+    scales_parser.add_argument('--dir', default='benchmarks', help='Verzeichnis für die Datenbanken')
+    scales_parser.add_argument('--report', default='benchmarks/scales_report.json', help='JSON-Report')
+    scales_parser.add_argument('--pipelines', default=','.join(DB_ONLY_PIPELINES))
+    scales_parser.add_argument('--iterations', type=int, default=50, help='Wiederholungen pro Pipeline')
+    scales_parser.add_argument('--plan-repeat', type=int, default=5, help='Ausführungen je Hot Query')
+    _add_generate_arguments(scales_parser)
+    scales_parser.set_defaults(func=cmd_scales)
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    try:
+        args.func(args)
+    except KeyboardInterrupt:
+        print("\n⏹️ Abgebrochen durch Benutzer")
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ class SteamAPIConfig:
     rate_limit_seconds: float = 1.0
     timeout_seconds: int = 15
     retry_attempts: int = 3
+    pool_maxsize: int = 8
 
 @dataclass
 class CheapSharkConfig:
@@ -37,6 +38,7 @@ class CheapSharkConfig:
     rate_limit_seconds: float = 1.5
     timeout_seconds: int = 15
     retry_attempts: int = 3
+    pool_maxsize: int = 4
     store_ids: str = "1,3,7,11,15,27"
     
     def __post_init__(self):
@@ -182,6 +184,12 @@ class ConfigManager:
                 pass
         
         # Steam API
+        if os.getenv('STEAM_API_BASE_URL'):
+            self.steam_api.base_url = os.getenv('STEAM_API_BASE_URL')
+        
+        if os.getenv('STEAM_STORE_URL'):
+            self.steam_api.store_url = os.getenv('STEAM_STORE_URL')
+        
         if os.getenv('STEAM_RATE_LIMIT'):
             try:
                 self.steam_api.rate_limit_seconds = float(os.getenv('STEAM_RATE_LIMIT'))
@@ -194,7 +202,16 @@ class ConfigManager:
             except ValueError:
                 pass
         
+        if os.getenv('STEAM_POOL_SIZE'):
+            try:
+                self.steam_api.pool_maxsize = int(os.getenv('STEAM_POOL_SIZE'))
+            except ValueError:
+                pass
+        
         # CheapShark
+        if os.getenv('CHEAPSHARK_BASE_URL'):
+            self.cheapshark.base_url = os.getenv('CHEAPSHARK_BASE_URL')
+        
         if os.getenv('CHEAPSHARK_RATE_LIMIT'):
             try:
                 self.cheapshark.rate_limit_seconds = float(os.getenv('CHEAPSHARK_RATE_LIMIT'))
@@ -207,6 +224,12 @@ class ConfigManager:
             except ValueError:
                 pass
         
+        if os.getenv('CHEAPSHARK_POOL_SIZE'):
+            try:
+                self.cheapshark.pool_maxsize = int(os.getenv('CHEAPSHARK_POOL_SIZE'))
+            except ValueError:
+                pass
+        
         # Tracking
         if os.getenv('TRACKING_INTERVAL_HOURS'):
             try:
@@ -320,6 +343,7 @@ class ConfigManager:
    Rate Limit: {self.steam_api.rate_limit_seconds}s
    Timeout: {self.steam_api.timeout_seconds}s
    Retry: {self.steam_api.retry_attempts}x
+   Connection Pool: {self.steam_api.pool_maxsize}
 
 🦈 CHEAPSHARK API:
    Rate Limit: {self.cheapshark.rate_limit_seconds}s
@@ -515,4 +539,91 @@ def reload_config(config_path: str = "config.json") -> ConfigManager:
     """
     global _config_instance
     _config_instance = ConfigManager(config_path)
-    return _config_instance
\ No newline at end of file
+    return _config_instance
+
+# =====================================================================
+# UPSTREAM-URLS
+# =====================================================================
+
+# Produktive Hosts je Upstream (Rate-Limits und Cache-Regeln sind auf diese Hosts definiert)
+UPSTREAM_DEFAULT_URLS = {
+    'steam_api': SteamAPIConfig.base_url,
+    'steam_store': SteamAPIConfig.store_url,
+    'cheapshark': CheapSharkConfig.base_url,
+}
+
+def get_upstream_base_urls() -> Dict[str, str]:
+    """
+    Aktuelle Basis-URLs aller Upstreams (config.json bzw. STEAM_API_BASE_URL,
+    STEAM_STORE_URL und CHEAPSHARK_BASE_URL)
+    
+    Returns:
+        Dict upstream -> Basis-URL
+    """
+    try:
+        config = get_config()
+        return {
+            'steam_api': config.steam_api.base_url,
+            'steam_store': config.steam_api.store_url,
+            'cheapshark': config.cheapshark.base_url,
+        }
+    except Exception as e:
+        logger.debug(f"Konfiguration nicht verfügbar, verwende Standard-URLs: {e}")
+        return dict(UPSTREAM_DEFAULT_URLS)
+
+def set_upstream_base_urls(steam_api: Optional[str] = None, steam_store: Optional[str] = None,
+                           cheapshark: Optional[str] = None):
+    """
+    Setzt Basis-URLs zur Laufzeit (z.B. auf den lokalen Stand-in Server)
+    
+    Args:
+        steam_api: Ersatz für https://api.steampowered.com
+        steam_store: Ersatz für https://store.steampowered.com/api
+        cheapshark: Ersatz für https://www.cheapshark.com/api/1.0
+    """
+    config = get_config()
+    if steam_api:
+        config.steam_api.base_url = steam_api
+    if steam_store:
+        config.steam_api.store_url = steam_store
+    if cheapshark:
+        config.cheapshark.base_url = cheapshark
+
+def _join_url(base_url: str, path: str) -> str:
+    return f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+
+def steam_api_url(path: str) -> str:
+    """URL eines Steam Web API Endpoints, z.B. steam_api_url('ISteamChartsService/GetMostPlayedGames/v1/')"""
+    return _join_url(get_upstream_base_urls()['steam_api'], path)
+
+def steam_store_url(path: str) -> str:
+    """URL eines Steam Store API Endpoints, z.B. steam_store_url('appdetails')"""
+    return _join_url(get_upstream_base_urls()['steam_store'], path)
+
+def cheapshark_url(path: str) -> str:
+    """URL eines CheapShark API Endpoints, z.B. cheapshark_url('games')"""
+    return _join_url(get_upstream_base_urls()['cheapshark'], path)
+
+def upstream_url_aliases() -> Dict[str, str]:
+    """
+    Ersetzte Basis-URLs -> produktive Basis-URL
+    
+    Damit gelten Rate-Limits und Cache-Regeln der echten Hosts auch für
+    einen Stand-in Server.
+    
+    Returns:
+        Dict konfigurierte Basis-URL -> Standard-Basis-URL (nur abweichende)
+    """
+    return {
+        url: UPSTREAM_DEFAULT_URLS[name]
+        for name, url in get_upstream_base_urls().items()
+        if url.rstrip('/') != UPSTREAM_DEFAULT_URLS[name].rstrip('/')
+    }
+
+def canonical_upstream_url(url: str) -> str:
+    """Bildet eine URL eines ersetzten Upstreams auf die produktive URL ab (sonst unverändert)"""
+    for configured, default in upstream_url_aliases().items():
+        prefix = configured.rstrip('/')
+        if url == prefix or url.startswith(prefix + '/'):
+            return default.rstrip('/') + url[len(prefix):]
+    return url
@@ -7,12 +7,18 @@ Steam Price Tracker - Korrigiert alle Schema-Probleme und API-Inkompatibilitäte
 import sqlite3
 import threading
 import logging
+import queue
+import atexit
+from concurrent.futures import Future
+from multiprocessing.connection import Listener, Client
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any, Tuple
 from pathlib import Path
 import json
 import os
+import re
 import shutil
+import sys
 import time as time_module
 
 # Logging konfigurieren
@@ -25,6 +31,1350 @@ except ImportError:
 
 print("database_manager.py geladen von:", __file__)
 
+# =====================================================================
+# CONNECTION POOL
+# =====================================================================
+
+class PooledConnection:
+    """
+    Handle auf die Thread-Verbindung des Pools
+
+    Verhält sich wie sqlite3.Connection (inkl. with-Block für Commit/Rollback).
+    close() schließt die Verbindung nicht, sondern verwirft - wie ein echtes
+    close() - nur eine über dieses Handle begonnene, nicht committete Transaktion.
+    """
+
+    __slots__ = ('_conn', '_txn_open_at_acquire', '_closed')
+
+    def __init__(self, conn: sqlite3.Connection):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_txn_open_at_acquire', conn.in_transaction)
+        object.__setattr__(self, '_closed', False)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        """Gibt das Handle frei (Verbindung bleibt im Pool)"""
+        if self._closed:
+            return
+        object.__setattr__(self, '_closed', True)
+
+        if not self._txn_open_at_acquire and self._conn.in_transaction:
+            self._conn.rollback()
+
+class SQLiteConnectionPool:
+    """
+    Thread-lokaler SQLite Connection-Pool mit Reader/Writer-Trennung
+
+    - Eine Schreib-Verbindung und eine Lese-Verbindung (mode=ro) pro Thread
+    - PRAGMAs werden nur beim Öffnen gesetzt (WAL, synchronous=NORMAL, cache_size, mmap_size, temp_store)
+    - Statement-Cache über cached_statements wird durch Wiederverwendung wirksam
+    - Zähler für Verbindungsanforderungen pro Operation
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.cache_size_kb = int(os.getenv('DB_CACHE_SIZE_KB', '20000'))
+        self.mmap_size_mb = int(os.getenv('DB_MMAP_SIZE_MB', '256'))
+        self.cached_statements = int(os.getenv('DB_CACHED_STATEMENTS', '256'))
+        self.use_readers = db_path != ':memory:' and os.getenv('DB_READ_CONNECTIONS', 'true').lower() in ['true', '1', 'yes']
+
+        self._local = threading.local()
+        self._connections: Dict[int, Dict[str, sqlite3.Connection]] = {}
+        self._stats_lock = threading.Lock()
+
+        # Metriken
+        self.opened = {'write': 0, 'read': 0}
+        self.reused = {'write': 0, 'read': 0}
+        self.closed_stale = 0
+        self.acquisitions_by_operation: Dict[str, int] = {}
+
+    def acquire(self, readonly: bool = False, operation: Optional[str] = None) -> PooledConnection:
+        """
+        Gibt ein Handle auf die Verbindung des aktuellen Threads zurück
+
+        Args:
+            readonly: Lese-Verbindung verwenden (parallel zum Writer dank WAL)
+            operation: Name der aufrufenden Operation für die Metriken
+
+        Returns:
+            PooledConnection
+        """
+        kind = 'read' if readonly and self.use_readers else 'write'
+        conn = getattr(self._local, kind, None)
+
+        with self._stats_lock:
+            if operation:
+                self.acquisitions_by_operation[operation] = self.acquisitions_by_operation.get(operation, 0) + 1
+            if conn is not None:
+                self.reused[kind] += 1
+
+        if conn is None:
+            try:
+                conn = self._open(kind)
+            except sqlite3.Error as e:
+                if kind != 'read':
+                    raise
+                # z.B. WAL-Dateien noch nicht vorhanden - auf Schreib-Verbindung ausweichen
+                logger.debug(f"⚠️ Lese-Verbindung nicht möglich, verwende Writer: {e}")
+                return self.acquire(readonly=False)
+            setattr(self._local, kind, conn)
+
+        return PooledConnection(conn)
+
+    def open_transaction(self) -> Optional[sqlite3.Connection]:
+        """Schreib-Verbindung des aktuellen Threads, falls darauf eine Transaktion offen ist"""
+        conn = getattr(self._local, 'write', None)
+        return conn if conn is not None and conn.in_transaction else None
+
+    def _open(self, kind: str) -> sqlite3.Connection:
+        """Öffnet neue Verbindung und setzt die PRAGMAs einmalig"""
+        if kind == 'read':
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=30.0, check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+
+        conn.row_factory = sqlite3.Row  # Ermöglicht dict-ähnlichen Zugriff
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_size_kb}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size_mb * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        thread_id = threading.get_ident()
+        with self._stats_lock:
+            self.opened[kind] += 1
+            self._connections.setdefault(thread_id, {})[kind] = conn
+            self._close_stale_locked()
+
+        logger.debug(f"🔌 Neue SQLite {kind}-Verbindung für Thread {threading.current_thread().name}")
+        return conn
+
+    def _close_stale_locked(self):
+        """Schließt Verbindungen beendeter Threads (Stats-Lock muss gehalten werden)"""
+        alive = {thread.ident for thread in threading.enumerate()}
+
+        for thread_id in [tid for tid in self._connections if tid not in alive]:
+            for conn in self._connections.pop(thread_id).values():
+                try:
+                    conn.close()
+                    self.closed_stale += 1
+                except sqlite3.Error:
+                    pass
+
+    def close_all(self):
+        """Schließt alle Verbindungen aller Threads"""
+        with self._stats_lock:
+            connections = [conn for conns in self._connections.values() for conn in conns.values()]
+            self._connections.clear()
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        self._local = threading.local()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Pool-Metriken zurück"""
+        with self._stats_lock:
+            acquisitions = sum(self.acquisitions_by_operation.values())
+            opened = sum(self.opened.values())
+
+            return {
+                'open_connections': sum(len(conns) for conns in self._connections.values()),
+                'opened': dict(self.opened),
+                'reused': dict(self.reused),
+                'closed_stale': self.closed_stale,
+                'acquisitions': acquisitions,
+                'reuse_rate': round((acquisitions - opened) / acquisitions * 100, 1) if acquisitions else 0.0,
+                'acquisitions_by_operation': dict(sorted(
+                    self.acquisitions_by_operation.items(), key=lambda item: item[1], reverse=True
+                ))
+            }
+
+# =====================================================================
+# SINGLE-WRITER SERVICE
+# =====================================================================
+
+class DatabaseWriter:
+    """
+    Dedizierter Writer-Thread für alle SQLite-Schreibvorgänge
+
+    Schreibjobs kommen über eine Queue und werden zu großen Transaktionen
+    (BEGIN IMMEDIATE ... COMMIT) zusammengefasst; jeder Job läuft in einem
+    eigenen SAVEPOINT, sodass ein fehlerhafter Job die anderen nicht verwirft.
+    Aufrufer erhalten Futures, die erst nach dem COMMIT erfüllt werden.
+
+    Optional nimmt ein lokaler Socket-Server (DB_WRITER_PORT) SQL-Statements
+    anderer Prozesse (z.B. Scheduler-Subprozesse) entgegen.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_manager, max_batch_jobs: Optional[int] = None,
+                 coalesce_ms: Optional[int] = None):
+        """
+        Initialisiert und startet den Writer-Thread
+
+        Args:
+            db_manager: DatabaseManager (liefert die Schreib-Verbindung des Writer-Threads)
+            max_batch_jobs: Maximale Anzahl Jobs pro Transaktion
+            coalesce_ms: Wartezeit auf weitere Jobs bevor committet wird
+        """
+        self.db_manager = db_manager
+        self.max_batch_jobs = max_batch_jobs or int(os.getenv('DB_WRITER_MAX_BATCH', '500'))
+        self.coalesce_seconds = (coalesce_ms if coalesce_ms is not None
+                                 else int(os.getenv('DB_WRITER_COALESCE_MS', '10'))) / 1000.0
+        self.queue = queue.Queue()
+        self.running = True
+
+        # Statistiken
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.transactions = 0
+        self.total_write_time = 0.0
+        self.max_batch_seen = 0
+        self.remote_requests = 0
+
+        self._listener = None
+        self.thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+        logger.info(f"✍️ Database Writer gestartet (max {self.max_batch_jobs} Jobs/Transaktion)")
+
+    # =====================================================================
+    # JOB-API
+    # =====================================================================
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        Reiht einen Schreibjob ein
+
+        Args:
+            func: Callable func(conn, *args, **kwargs) - darf selbst nicht committen
+
+        Returns:
+            Future mit dem Rückgabewert von func (nach COMMIT)
+        """
+        future = Future()
+
+        # Aufrufe aus dem Writer-Thread selbst (verschachtelte Jobs) direkt ausführen.
+        # Hält der aufrufende Thread selbst eine offene Schreib-Transaktion, würde der
+        # Writer auf dessen Datei-Lock warten und der Aufrufer auf das Future - der Job
+        # läuft dann in der Transaktion des Aufrufers (committet mit dessen with-Block).
+        conn = self._conn if threading.current_thread() is self.thread else self.db_manager.pool.open_transaction()
+        if conn is not None:
+            try:
+                future.set_result(func(conn, *args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if not self.running:
+            future.set_exception(RuntimeError("Database Writer ist gestoppt"))
+            return future
+
+        self.queue.put((func, args, kwargs, future))
+        return future
+
+    def execute_statements(self, statements: List[tuple]) -> Future:
+        """
+        Reiht SQL-Statements als einen Job ein
+
+        Args:
+            statements: Liste von (sql, params) oder (sql, param_rows, True) für executemany
+
+        Returns:
+            Future mit Liste der rowcounts
+        """
+        return self.submit(_execute_statements, statements)
+
+    def execute(self, sql: str, params: tuple = ()) -> Future:
+        """Einzelnes Statement über den Writer (Future mit rowcount)"""
+        return self.submit(lambda conn: conn.execute(sql, params).rowcount)
+
+    def executemany(self, sql: str, param_rows: List[tuple]) -> Future:
+        """executemany über den Writer (Future mit rowcount)"""
+        return self.submit(lambda conn: conn.executemany(sql, param_rows).rowcount)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wartet bis alle bisher eingereihten Jobs committet sind"""
+        try:
+            self.submit(lambda conn: None).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    # =====================================================================
+    # WRITER-THREAD
+    # =====================================================================
+
+    def _run(self):
+        """Writer-Schleife: Jobs sammeln, gemeinsam committen"""
+        self._conn = self.db_manager.get_connection()
+
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+
+            batch = [item]
+            deadline = time_module.monotonic() + self.coalesce_seconds
+            stop_after_batch = False
+
+            # Weitere Jobs einsammeln (bis max_batch_jobs oder Coalesce-Fenster abgelaufen)
+            while len(batch) < self.max_batch_jobs:
+                remaining = deadline - time_module.monotonic()
+                try:
+                    item = self.queue.get(timeout=max(0.0, remaining)) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop_after_batch = True
+                    break
+                batch.append(item)
+
+            self._process_batch(batch)
+
+            if stop_after_batch:
+                break
+
+        self._fail_pending(RuntimeError("Database Writer wurde gestoppt"))
+
+    def _process_batch(self, batch: List[tuple]):
+        """Führt einen Batch von Jobs in einer Transaktion aus"""
+        conn = self._conn
+        start_time = time_module.time()
+        outcomes = []
+
+        try:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Ein einzelner Job braucht keinen Savepoint - die Transaktion ist der Job.
+            # Mit temp_store=MEMORY macht das Sub-Journal große Jobs sonst um ein Vielfaches langsamer.
+            use_savepoints = len(batch) > 1
+
+            for index, (func, args, kwargs, future) in enumerate(batch):
+                savepoint = f"job_{index}"
+                if use_savepoints:
+                    conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    result = func(conn, *args, **kwargs)
+                    if use_savepoints:
+                        conn.execute(f"RELEASE {savepoint}")
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    if use_savepoints:
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                    else:
+                        conn.rollback()
+                    outcomes.append((future, None, e))
+
+            if conn.in_transaction:
+                conn.commit()
+
+        except Exception as e:
+            # Transaktion als Ganzes fehlgeschlagen - alle Jobs melden den Fehler
+            logger.error(f"❌ Database Writer Transaktion fehlgeschlagen ({len(batch)} Jobs): {e}")
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            outcomes = [(future, None, e) for _, _, _, future in batch]
+
+        self.transactions += 1
+        self.total_write_time += time_module.time() - start_time
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+        for future, result, error in outcomes:
+            if error is None:
+                self.jobs_completed += 1
+                future.set_result(result)
+            else:
+                self.jobs_failed += 1
+                future.set_exception(error)
+
+    def _fail_pending(self, error: Exception):
+        """Beendet alle noch wartenden Futures mit Fehler"""
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                item[3].set_exception(error)
+
+    def stop(self, timeout: float = 10.0):
+        """Stoppt den Writer nach Abarbeitung aller eingereihten Jobs"""
+        if not self.running:
+            return
+        self.running = False
+
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+
+        self.queue.put(self._STOP)
+        if threading.current_thread() is not self.thread:
+            self.thread.join(timeout)
+
+    # =====================================================================
+    # CROSS-PROCESS SERVER
+    # =====================================================================
+
+    def start_server(self, address: tuple, authkey: bytes):
+        """
+        Startet lokalen Socket-Server für Schreibjobs anderer Prozesse
+
+        Raises:
+            OSError: Wenn die Adresse bereits belegt ist (anderer Prozess ist Writer)
+        """
+        self._listener = Listener(address, authkey=authkey)
+        threading.Thread(target=self._serve, name='db-writer-server', daemon=True).start()
+        logger.info(f"🔌 Database Writer Server auf {address[0]}:{address[1]}")
+
+    def _serve(self):
+        """Nimmt Client-Verbindungen an"""
+        while self.running:
+            try:
+                client = self._listener.accept()
+            except OSError:
+                break
+            except Exception as e:
+                logger.debug(f"⚠️ Writer Server: Verbindung abgelehnt: {e}")
+                continue
+
+            threading.Thread(target=self._handle_client, args=(client,),
+                             name='db-writer-client', daemon=True).start()
+
+    def _handle_client(self, client):
+        """Bearbeitet Requests eines Client-Prozesses"""
+        db_path = str(Path(self.db_manager.db_path).resolve())
+
+        try:
+            while True:
+                command, payload = client.recv()
+
+                if command == 'hello':
+                    client.send(('ok', payload == db_path))
+                elif command == 'statements':
+                    self.remote_requests += 1
+                    try:
+                        client.send(('ok', self.execute_statements(payload).result()))
+                    except Exception as e:
+                        client.send(('error', str(e)))
+                else:
+                    client.send(('error', f"Unbekanntes Kommando: {command}"))
+        except (EOFError, OSError):
+            pass
+        finally:
+            client.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Writer-Statistiken zurück"""
+        return {
+            'mode': 'local',
+            'running': self.running,
+            'queued_jobs': self.queue.qsize(),
+            'jobs_completed': self.jobs_completed,
+            'jobs_failed': self.jobs_failed,
+            'transactions': self.transactions,
+            'avg_jobs_per_transaction': round(self.jobs_completed / self.transactions, 1) if self.transactions else 0.0,
+            'max_jobs_per_transaction': self.max_batch_seen,
+            'jobs_per_second': round(self.jobs_completed / self.total_write_time, 1) if self.total_write_time > 0 else 0.0,
+            'remote_requests': self.remote_requests,
+            'server_active': self._listener is not None
+        }
+
+class RemoteDatabaseWriter:
+    """
+    Client für den Database Writer Server eines anderen Prozesses
+
+    Unterstützt nur SQL-Statements (keine Python-Callables).
+    """
+
+    def __init__(self, address: tuple, authkey: bytes, db_path: str):
+        self.address = address
+        self.lock = threading.Lock()
+        self.connection = Client(address, authkey=authkey)
+        self.requests = 0
+
+        self.connection.send(('hello', str(Path(db_path).resolve())))
+        status, same_database = self.connection.recv()
+        if status != 'ok' or not same_database:
+            self.connection.close()
+            raise ConnectionError("Writer Server verwaltet eine andere Datenbank")
+
+    def execute_statements(self, statements: List[tuple]) -> Future:
+        """Sendet Statements an den Writer-Prozess (Future ist bei Rückgabe bereits erfüllt)"""
+        future = Future()
+
+        try:
+            with self.lock:
+                self.connection.send(('statements', statements))
+                status, payload = self.connection.recv()
+                self.requests += 1
+
+            if status == 'ok':
+                future.set_result(payload)
+            else:
+                future.set_exception(sqlite3.OperationalError(payload))
+        except Exception as e:
+            future.set_exception(e)
+
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Client-Statistiken zurück"""
+        return {'mode': 'remote', 'address': f"{self.address[0]}:{self.address[1]}", 'requests': self.requests}
+
+def _execute_statements(conn, statements: List[tuple]) -> List[int]:
+    """Führt (sql, params) bzw. (sql, param_rows, True) Statements aus"""
+    rowcounts = []
+
+    for statement in statements:
+        sql, params = statement[0], statement[1] if len(statement) > 1 else ()
+        many = len(statement) > 2 and statement[2]
+
+        cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+        rowcounts.append(cursor.rowcount)
+
+    return rowcounts
+
+# =====================================================================
+# PREIS-SCHEMA HILFSFUNKTIONEN
+# =====================================================================
+
+PRICE_STORES = ('steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet')
+
+def price_store_columns() -> List[str]:
+    """Alle Store-Spalten von price_snapshots in Schema-Reihenfolge"""
+    return [
+        f"{store}_{field}"
+        for store in PRICE_STORES
+        for field in ('price', 'original_price', 'discount_percent', 'available')
+    ]
+
+# Höchster Rabatt aller Stores einer steam_charts_prices Zeile - identischer Text in
+# Expression-Index und View, sonst nutzt SQLite den Index nicht
+CHARTS_MAX_DISCOUNT_SQL = "MAX(" + ", ".join(
+    f"COALESCE({store}_discount_percent, 0)" for store in PRICE_STORES
+) + ")"
+
+def _store_column_type(column: str) -> str:
+    """SQLite-Typ einer Store-Spalte"""
+    if column.endswith('_discount_percent'):
+        return 'INTEGER DEFAULT 0'
+    if column.endswith('_available'):
+        return 'BOOLEAN DEFAULT 0'
+    return 'REAL'
+
+def _store_values_sql(alias: str, store: str) -> List[str]:
+    """
+    Store-Spalten (price, original_price, discount_percent, available) in der Form von store_prices
+    
+    Die Schreibpfade liefern für Stores ohne Angebot 0.0/False (Batch-Writer) oder NULL
+    (save_price_snapshot); beides wird hier zu NULL-Preisen mit Rabatt und Verfügbarkeit 0.
+    """
+    price = f"{alias}.{store}_price"
+    discount = f"COALESCE({alias}.{store}_discount_percent, 0)"
+    available = f"COALESCE({alias}.{store}_available, 0) != 0"
+    present = f"{price} IS NOT NULL AND ({price} > 0 OR {available} OR {discount} > 0)"
+    return [
+        f"CASE WHEN {present} THEN {price} END",
+        f"CASE WHEN {present} THEN {alias}.{store}_original_price END",
+        f"CASE WHEN {present} THEN {discount} ELSE 0 END",
+        f"CASE WHEN {present} THEN {available} ELSE 0 END"
+    ]
+
+def latest_prices_upsert_sql(alias: str, from_clause: str = '', id_expr: Optional[str] = None,
+                             timestamp_expr: Optional[str] = None) -> str:
+    """
+    Upsert von Snapshot-Zeilen (alias) in latest_prices
+    
+    Der zuletzt eingefügte Snapshot gewinnt - die Schreibpfade mischen lokale
+    datetime.now() und UTC CURRENT_TIMESTAMP Werte, ein Zeitstempel-Vergleich
+    wäre daher nicht verlässlich.
+    
+    Args:
+        alias: 'NEW' im Trigger bzw. Tabellen-Alias der Quelle
+        from_clause: FROM ... WHERE ... der Quelle (leer im Trigger)
+        id_expr: SQL-Ausdruck für die Snapshot-ID (Standard: alias.id)
+        timestamp_expr: SQL-Ausdruck für den Zeitstempel (Standard: alias.timestamp)
+    """
+    store_columns = price_store_columns()
+    
+    offers = ' UNION ALL '.join(
+        f"SELECT '{store}' AS store, {alias}.{store}_price AS price, {alias}.{store}_available AS available"
+        for store in PRICE_STORES
+    )
+    best_offer = f"FROM ({offers}) WHERE available AND price > 0 ORDER BY price LIMIT 1"
+    max_discount = ', '.join(
+        f"CASE WHEN {alias}.{store}_price > 0 THEN COALESCE({alias}.{store}_discount_percent, 0) ELSE 0 END"
+        for store in PRICE_STORES
+    )
+    
+    target_columns = ['steam_app_id', 'game_title', 'snapshot_id', 'timestamp'] + store_columns + \
+                     ['best_price', 'best_store', 'max_discount', 'updated_at']
+    values = [f"{alias}.steam_app_id", f"{alias}.game_title", id_expr or f"{alias}.id", timestamp_expr or f"{alias}.timestamp"] + \
+             [value for store in PRICE_STORES for value in _store_values_sql(alias, store)] + \
+             [f"(SELECT price {best_offer})", f"(SELECT store {best_offer})", f"MAX({max_discount})", "CURRENT_TIMESTAMP"]
+    updates = ', '.join(f"{column} = excluded.{column}" for column in target_columns[1:])
+    
+    where = '' if 'WHERE' in from_clause.upper() else 'WHERE 1'
+    
+    return f"""
+        INSERT INTO latest_prices ({', '.join(target_columns)})
+        SELECT {', '.join(values)}
+        {from_clause} {where}
+        ON CONFLICT(steam_app_id) DO UPDATE SET {updates}
+    """
+
+# Store-Dimension: (store_id, store_key, Anzeigename, CheapShark storeID)
+STORE_DIMENSION = [
+    (1, 'steam', 'Steam', '1'),
+    (2, 'greenmangaming', 'Green Man Gaming', '3'),
+    (3, 'gog', 'GOG', '7'),
+    (4, 'humblestore', 'Humble Store', '11'),
+    (5, 'fanatical', 'Fanatical', '15'),
+    (6, 'gamesplanet', 'GamesPlanet', '25')
+]
+
+def _store_ids() -> Dict[str, int]:
+    """store_key -> store_id der festen Store-Dimension"""
+    return {store_key: store_id for store_id, store_key, _, _ in STORE_DIMENSION}
+
+def store_prices_insert_sql(alias: str, id_expr: str, from_clause: str = '') -> str:
+    """
+    Zerlegt breite Snapshot-Zeilen (alias) in store_prices Zeilen (Cent-Beträge)
+    
+    Stores ohne Preis (bzw. 0.0 ohne Verfügbarkeit und Rabatt) werden nicht gespeichert.
+    
+    Args:
+        alias: 'NEW' im Trigger bzw. Tabellen-Alias der Quelle
+        id_expr: SQL-Ausdruck für die Snapshot-ID
+        from_clause: FROM ... WHERE ... der Quelle (leer im Trigger)
+    """
+    offers = ' UNION ALL '.join(
+        f"SELECT {id_expr} AS snapshot_id, {store_id} AS store_id, {alias}.{store}_price AS price, "
+        f"{alias}.{store}_original_price AS original, {alias}.{store}_discount_percent AS discount, "
+        f"{alias}.{store}_available AS available {from_clause}"
+        for store, store_id in _store_ids().items()
+    )
+    
+    return f"""
+        INSERT INTO store_prices (snapshot_id, store_id, price_cents, original_cents, discount, available)
+        SELECT snapshot_id, store_id,
+               CAST(ROUND(price * 100) AS INTEGER),
+               CAST(ROUND(original * 100) AS INTEGER),
+               COALESCE(discount, 0),
+               COALESCE(available, 0)
+        FROM ({offers})
+        WHERE price IS NOT NULL AND (price > 0 OR available OR COALESCE(discount, 0) > 0)
+    """
+
+def price_snapshots_view_sql() -> str:
+    """Kompatibilitäts-View price_snapshots mit den alten breiten Spaltennamen"""
+    columns = ['h.id', 'h.steam_app_id', 'h.game_title', 'h.timestamp']
+    joins = []
+    
+    for store, store_id in _store_ids().items():
+        sp = f"sp_{store}"
+        columns += [
+            f"{sp}.price_cents / 100.0 AS {store}_price",
+            f"{sp}.original_cents / 100.0 AS {store}_original_price",
+            f"COALESCE({sp}.discount, 0) AS {store}_discount_percent",
+            f"COALESCE({sp}.available, 0) AS {store}_available"
+        ]
+        joins.append(f"LEFT JOIN store_prices {sp} ON {sp}.snapshot_id = h.id AND {sp}.store_id = {store_id}")
+    
+    columns.append('h.last_confirmed_at')
+    
+    return f"""
+        CREATE VIEW IF NOT EXISTS price_snapshots AS
+        SELECT {', '.join(columns)}
+        FROM price_snapshot_headers h
+        {' '.join(joins)}
+    """
+
+def _unchanged_snapshot_sql(base_table: str) -> str:
+    """
+    Bedingung: NEW hat dieselben Store-Werte wie der aktuelle Snapshot der App (latest_prices)
+    
+    Verglichen wird normalisiert (Preise in Cent, kein Angebot = NULL = 0.0 ohne
+    Verfügbarkeit), damit beide Schreibpfade für denselben Preis gleich aussehen.
+    """
+    comparisons = []
+    for store in PRICE_STORES:
+        for index, (current, new) in enumerate(zip(_store_values_sql('lp', store), _store_values_sql('NEW', store))):
+            if index < 2:
+                current, new = f"CAST(ROUND(({current}) * 100) AS INTEGER)", f"CAST(ROUND(({new}) * 100) AS INTEGER)"
+            comparisons.append(f"({current}) IS ({new})")
+    comparisons = ' AND '.join(comparisons)
+    return f"""
+        EXISTS (
+            SELECT 1 FROM latest_prices lp
+            WHERE lp.steam_app_id = NEW.steam_app_id
+            AND {comparisons}
+            AND lp.snapshot_id IN (SELECT id FROM {base_table})
+        )
+    """
+
+def _confirm_snapshot_sql(base_table: str) -> str:
+    """Statements für unveränderte Preise: last_confirmed_at setzen und Insert verwerfen"""
+    unchanged = _unchanged_snapshot_sql(base_table)
+    return f"""
+        UPDATE {base_table}
+        SET last_confirmed_at = COALESCE(NEW.timestamp, CURRENT_TIMESTAMP)
+        WHERE id = (SELECT snapshot_id FROM latest_prices WHERE steam_app_id = NEW.steam_app_id)
+        AND {unchanged};
+        SELECT RAISE(IGNORE) WHERE {unchanged};
+    """
+
+def _latest_prices_delete_trigger_sql(base_table: str) -> str:
+    """
+    AFTER DELETE Trigger: wird der aktuelle Snapshot einer App gelöscht, rückt der
+    neueste verbliebene nach (ohne verbliebene Snapshots entfällt die Zeile)
+
+    Hängt an der Basistabelle, damit auch direkte Löschungen (cleanup_old_prices)
+    latest_prices konsistent halten.
+    """
+    newest_remaining = f"""
+        FROM price_snapshots ps
+        WHERE ps.id = (SELECT MAX(id) FROM {base_table} WHERE steam_app_id = OLD.steam_app_id)
+    """
+    return f"""
+        CREATE TRIGGER trg_price_snapshots_latest_delete
+        AFTER DELETE ON {base_table}
+        WHEN OLD.id = (SELECT snapshot_id FROM latest_prices WHERE steam_app_id = OLD.steam_app_id)
+        BEGIN
+            DELETE FROM latest_prices WHERE steam_app_id = OLD.steam_app_id;
+            {latest_prices_upsert_sql('ps', newest_remaining)};
+        END
+    """
+
+def price_snapshot_triggers_sql(layout: str, change_only: bool) -> List[str]:
+    """
+    Statements zum (Neu-)Aufbau der Snapshot-Trigger
+    
+    wide: BEFORE INSERT (change-only) + AFTER INSERT (latest_prices) auf der Tabelle.
+    normalized: Kompatibilitäts-View mit INSTEAD OF INSERT/DELETE Triggern.
+    Beide: AFTER DELETE auf der Basistabelle hält latest_prices aktuell.
+    
+    Mit change_only wird ein Snapshot mit unveränderten Preisen, Rabatten und
+    Verfügbarkeiten nicht gespeichert, sondern nur last_confirmed_at des
+    bestehenden Snapshots aktualisiert.
+    
+    Args:
+        layout: 'wide' oder 'normalized' (siehe price_storage_layout)
+        change_only: Change-Detection aktivieren
+    """
+    statements = [
+        f"DROP TRIGGER IF EXISTS {name}"
+        for name in ('trg_price_snapshots_dedupe', 'trg_price_snapshots_latest',
+                     'trg_price_snapshots_insert', 'trg_price_snapshots_delete',
+                     'trg_price_snapshots_latest_delete')
+    ]
+    
+    if layout == 'wide':
+        if change_only:
+            statements.append(f"""
+                CREATE TRIGGER trg_price_snapshots_dedupe
+                BEFORE INSERT ON price_snapshots
+                BEGIN
+                    {_confirm_snapshot_sql('price_snapshots')}
+                END
+            """)
+        statements.append(f"""
+            CREATE TRIGGER trg_price_snapshots_latest
+            AFTER INSERT ON price_snapshots
+            BEGIN
+                {latest_prices_upsert_sql('NEW')};
+            END
+        """)
+        statements.append(_latest_prices_delete_trigger_sql('price_snapshots'))
+        return statements
+    
+    # View neu erstellen, damit neue Spalten (z.B. last_confirmed_at) sichtbar werden
+    statements += ["DROP VIEW IF EXISTS price_snapshots", price_snapshots_view_sql()]
+    statements.append(f"""
+        CREATE TRIGGER trg_price_snapshots_insert
+        INSTEAD OF INSERT ON price_snapshots
+        BEGIN
+            {_confirm_snapshot_sql('price_snapshot_headers') if change_only else ''}
+            INSERT INTO price_snapshot_headers (id, steam_app_id, game_title, timestamp)
+            VALUES (NEW.id, NEW.steam_app_id, NEW.game_title, COALESCE(NEW.timestamp, CURRENT_TIMESTAMP));
+            {store_prices_insert_sql('NEW', 'last_insert_rowid()')};
+            {latest_prices_upsert_sql('NEW', id_expr='last_insert_rowid()',
+                                      timestamp_expr='COALESCE(NEW.timestamp, CURRENT_TIMESTAMP)')};
+        END
+    """)
+    statements.append("""
+        CREATE TRIGGER trg_price_snapshots_delete
+        INSTEAD OF DELETE ON price_snapshots
+        BEGIN
+            DELETE FROM store_prices WHERE snapshot_id = OLD.id;
+            DELETE FROM price_snapshot_headers WHERE id = OLD.id;
+        END
+    """)
+    statements.append(_latest_prices_delete_trigger_sql('price_snapshot_headers'))
+    return statements
+
+def price_snapshot_change_only() -> bool:
+    """True wenn nur geänderte Preise als neuer Snapshot gespeichert werden (PRICE_SNAPSHOT_MODE)"""
+    return os.getenv('PRICE_SNAPSHOT_MODE', 'changes').lower() != 'full'
+
+def price_storage_layout(conn) -> str:
+    """'normalized' wenn price_snapshots bereits die Kompatibilitäts-View ist, sonst 'wide'"""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'price_snapshots'").fetchone()
+    return 'normalized' if row and row[0] == 'view' else 'wide'
+
+# Spalten von tracked_apps, deren Änderung das Dokument im Index betrifft
+APP_CHANGE_COLUMNS = ('name', 'target_price', 'active', 'source', 'notes')
+APP_CHANGE_SEQUENCE = 'tracked_apps'
+
+def tracked_app_change_triggers_sql() -> List[str]:
+    """
+    Statements für die Änderungssequenz von tracked_apps (inkrementeller ES-Sync)
+
+    Jede Änderung an einer App - neuer Preis in latest_prices, Bearbeiten,
+    Deaktivieren - setzt tracked_apps.change_seq auf den nächsten Wert aus
+    change_sequences. Gelöschte Apps landen mit ihrer Sequenz in
+    tracked_app_deletions, bis sie erneut angelegt werden.
+    """
+    bump = f"UPDATE change_sequences SET value = value + 1 WHERE name = '{APP_CHANGE_SEQUENCE}';"
+    current = f"(SELECT value FROM change_sequences WHERE name = '{APP_CHANGE_SEQUENCE}')"
+    stamp = f"UPDATE tracked_apps SET change_seq = {current} WHERE steam_app_id = NEW.steam_app_id;"
+    changed = ' OR '.join(f"OLD.{column} IS NOT NEW.{column}" for column in APP_CHANGE_COLUMNS)
+
+    statements = [
+        f"DROP TRIGGER IF EXISTS {name}"
+        for name in ('trg_tracked_apps_change_insert', 'trg_tracked_apps_change_update',
+                     'trg_tracked_apps_change_delete', 'trg_latest_prices_change_insert',
+                     'trg_latest_prices_change_update')
+    ]
+    statements.append(f"""
+        CREATE TRIGGER trg_tracked_apps_change_insert
+        AFTER INSERT ON tracked_apps
+        BEGIN
+            {bump}
+            {stamp}
+            DELETE FROM tracked_app_deletions WHERE steam_app_id = NEW.steam_app_id;
+        END
+    """)
+    statements.append(f"""
+        CREATE TRIGGER trg_tracked_apps_change_update
+        AFTER UPDATE OF {', '.join(APP_CHANGE_COLUMNS)} ON tracked_apps
+        WHEN {changed}
+        BEGIN
+            {bump}
+            {stamp}
+        END
+    """)
+    statements.append(f"""
+        CREATE TRIGGER trg_tracked_apps_change_delete
+        AFTER DELETE ON tracked_apps
+        BEGIN
+            {bump}
+            INSERT OR REPLACE INTO tracked_app_deletions (steam_app_id, change_seq)
+            VALUES (OLD.steam_app_id, {current});
+        END
+    """)
+    # Neuer Preis (latest_prices wird von den Snapshot-Triggern gepflegt)
+    for event in ('insert', 'update'):
+        statements.append(f"""
+            CREATE TRIGGER trg_latest_prices_change_{event}
+            AFTER {event.upper()} ON latest_prices
+            WHEN EXISTS (SELECT 1 FROM tracked_apps WHERE steam_app_id = NEW.steam_app_id)
+            BEGIN
+                {bump}
+                {stamp}
+            END
+        """)
+    return statements
+
+# =====================================================================
+# PREIS-ROLLUPS (TAGES- UND WOCHEN-BUCKETS)
+# =====================================================================
+
+ROLLUP_RESOLUTIONS = ('daily', 'weekly')
+
+# Abstand der geplanten Rollup-Aktualisierung (Lese-APIs aggregieren nicht selbst)
+PRICE_ROLLUP_INTERVAL_MINUTES = int(os.getenv('PRICE_ROLLUP_INTERVAL_MINUTES', '60'))
+
+def _rollup_samples_sql(source: str, layout: str, charts_columns: set) -> Optional[str]:
+    """
+    CTE 'samples' (steam_app_id, store_id, day, ts, price_cents, original_cents, discount) ab :since
+    
+    Ein change-only Snapshot liefert nur an seinen Rändern Samples: am Tag von
+    timestamp und (falls später) am Tag von last_confirmed_at. Die Tage dazwischen
+    bekommen keinen Bucket - get_price_rollups() führt den letzten Wert fort.
+    
+    Returns:
+        WITH-Klausel oder None wenn die Quelle keine auswertbaren Spalten hat
+    """
+    store_ids = _store_ids()
+    
+    if source == 'tracked':
+        base_table = 'price_snapshot_headers' if layout == 'normalized' else 'price_snapshots'
+        events = f"""
+            WITH events(id, day, ts) AS (
+                SELECT id, date(timestamp), timestamp
+                FROM {base_table}
+                WHERE timestamp >= date(:since)
+                UNION ALL
+                SELECT id, date(last_confirmed_at), last_confirmed_at
+                FROM {base_table}
+                WHERE last_confirmed_at >= date(:since) AND date(last_confirmed_at) > date(timestamp)
+            ),
+        """
+        
+        if layout == 'normalized':
+            samples = """
+                SELECT h.steam_app_id, sp.store_id, e.day, e.ts,
+                       sp.price_cents, sp.original_cents, sp.discount
+                FROM events e
+                JOIN price_snapshot_headers h ON h.id = e.id
+                JOIN store_prices sp ON sp.snapshot_id = e.id
+                WHERE sp.price_cents > 0
+            """
+        else:
+            samples = ' UNION ALL '.join(f"""
+                SELECT ps.steam_app_id, {store_id} AS store_id, e.day, e.ts,
+                       CAST(ROUND(ps.{store}_price * 100) AS INTEGER) AS price_cents,
+                       CAST(ROUND(ps.{store}_original_price * 100) AS INTEGER) AS original_cents,
+                       COALESCE(ps.{store}_discount_percent, 0) AS discount
+                FROM events e
+                JOIN price_snapshots ps ON ps.id = e.id
+                WHERE ps.{store}_price > 0
+            """ for store, store_id in store_ids.items())
+        
+        return f"{events} samples AS ({samples})"
+    
+    # Charts-Preise: Multi-Store-Spalten oder Legacy-Schema mit einer Preis-Spalte (Steam)
+    if 'steam_price' in charts_columns:
+        columns = {
+            store_id: (f"{store}_price", f"{store}_original_price", f"{store}_discount_percent")
+            for store, store_id in store_ids.items()
+            if f"{store}_price" in charts_columns
+        }
+    elif 'price' in charts_columns:
+        columns = {store_ids['steam']: ('price', 'original_price', 'discount_percent')}
+    else:
+        return None
+    
+    samples = ' UNION ALL '.join(f"""
+        SELECT steam_app_id, {store_id} AS store_id, date(timestamp) AS day, timestamp AS ts,
+               CAST(ROUND({price} * 100) AS INTEGER) AS price_cents,
+               CAST(ROUND({original} * 100) AS INTEGER) AS original_cents,
+               COALESCE({discount}, 0) AS discount
+        FROM steam_charts_prices
+        WHERE timestamp >= :since AND {price} > 0
+    """ for store_id, (price, original, discount) in columns.items())
+    
+    return f"WITH samples AS ({samples})"
+
+def _rollup_prices(conn) -> Dict[str, Dict[str, int]]:
+    """
+    Berechnet Tages-Buckets ab dem jüngsten vorhandenen Tag neu und leitet Wochen-Buckets ab
+    
+    Returns:
+        Geschriebene Buckets je Quelle und Auflösung
+    """
+    layout = price_storage_layout(conn)
+    charts_columns = {row[1] for row in conn.execute("PRAGMA table_info(steam_charts_prices)").fetchall()}
+    counts = {}
+    
+    for source in ('tracked', 'charts'):
+        samples = _rollup_samples_sql(source, layout, charts_columns)
+        if samples is None:
+            continue
+        
+        # Jüngster Tag wird neu berechnet, da er beim letzten Lauf noch unvollständig war
+        since = conn.execute("""
+            SELECT COALESCE(MAX(bucket_start), '1970-01-01') FROM price_rollups
+            WHERE resolution = 'daily' AND source = ?
+        """, (source,)).fetchone()[0]
+        
+        # rowcount ist bei WITH ... INSERT nicht gesetzt, daher changes() je Statement
+        conn.execute(f"""
+            {samples},
+            ranked AS (
+                SELECT *,
+                       ROW_NUMBER() OVER (PARTITION BY steam_app_id, store_id, day ORDER BY ts DESC) AS rn,
+                       MIN(price_cents) OVER w AS min_cents,
+                       MAX(price_cents) OVER w AS max_cents,
+                       AVG(price_cents) OVER w AS avg_cents,
+                       COUNT(*) OVER w AS sample_count
+                FROM samples
+                WINDOW w AS (PARTITION BY steam_app_id, store_id, day)
+            )
+            INSERT OR REPLACE INTO price_rollups
+            (resolution, source, steam_app_id, store_id, bucket_start, min_cents, max_cents, avg_cents,
+             last_cents, last_original_cents, last_discount, samples, last_timestamp)
+            SELECT 'daily', :source, steam_app_id, store_id, day, min_cents, max_cents, avg_cents,
+                   price_cents, original_cents, discount, sample_count, ts
+            FROM ranked WHERE rn = 1
+        """, {'since': since, 'source': source})
+        daily = conn.execute("SELECT changes()").fetchone()[0]
+        
+        conn.execute("""
+            WITH days AS (
+                SELECT *, date(bucket_start, '-6 days', 'weekday 1') AS week
+                FROM price_rollups
+                WHERE resolution = 'daily' AND source = :source
+                AND bucket_start >= date(:since, '-6 days', 'weekday 1')
+            ),
+            ranked AS (
+                SELECT *,
+                       ROW_NUMBER() OVER (PARTITION BY steam_app_id, store_id, week ORDER BY bucket_start DESC) AS rn,
+                       MIN(min_cents) OVER w AS week_min,
+                       MAX(max_cents) OVER w AS week_max,
+                       SUM(avg_cents * samples) OVER w / SUM(samples) OVER w AS week_avg,
+                       SUM(samples) OVER w AS week_samples
+                FROM days
+                WINDOW w AS (PARTITION BY steam_app_id, store_id, week)
+            )
+            INSERT OR REPLACE INTO price_rollups
+            (resolution, source, steam_app_id, store_id, bucket_start, min_cents, max_cents, avg_cents,
+             last_cents, last_original_cents, last_discount, samples, last_timestamp)
+            SELECT 'weekly', source, steam_app_id, store_id, week, week_min, week_max, week_avg,
+                   last_cents, last_original_cents, last_discount, week_samples, last_timestamp
+            FROM ranked WHERE rn = 1
+        """, {'since': since, 'source': source})
+        
+        counts[source] = {'daily': daily, 'weekly': conn.execute("SELECT changes()").fetchone()[0]}
+    
+    return counts
+
+# =====================================================================
+# HOT QUERIES UND VERWALTETE INDIZES
+# =====================================================================
+
+# (Index, Tabelle, Spalten) für die Zugriffspfade der Hot Queries
+HOT_QUERY_INDEXES = [
+    ('idx_tracked_apps_active_update', 'tracked_apps', '(active, last_price_update)'),
+    ('idx_price_snapshots_app_timestamp', 'price_snapshots', '(steam_app_id, timestamp)'),
+    ('idx_snapshot_headers_app_timestamp', 'price_snapshot_headers', '(steam_app_id, timestamp)'),
+    ('idx_latest_prices_max_discount', 'latest_prices', '(max_discount)'),
+    ('idx_charts_prices_app_type_time', 'steam_charts_prices', '(steam_app_id, chart_type, timestamp)'),
+    ('idx_charts_tracking_active_rank', 'steam_charts_tracking', '(active, current_rank)'),
+]
+
+# Hot Queries wie sie von price_tracker / steam_charts_manager ausgeführt werden.
+# allow_scan: Tabellen, die die Query ohnehin vollständig lesen muss (berechnete Filter in Views)
+HOT_QUERIES = {
+    'apps_needing_update': {
+        'sql': """
+            SELECT ta.steam_app_id, ta.name, ta.last_price_update, ta.added_at,
+                   COALESCE(ta.last_price_update, ta.added_at) as effective_last_update
+            FROM tracked_apps ta
+            WHERE ta.active = 1
+            AND (ta.last_price_update IS NULL OR ta.last_price_update < datetime('now', 'localtime', '-6 hours'))
+            ORDER BY effective_last_update ASC
+        """,
+        'params': (),
+        'requires': ('tracked_apps',),
+        'allow_scan': ()
+    },
+    'price_history': {
+        'sql': """
+            SELECT * FROM price_snapshots
+            WHERE steam_app_id = ?
+            AND COALESCE(last_confirmed_at, timestamp) >= date('now', '-30 days')
+            ORDER BY timestamp DESC
+            LIMIT 100
+        """,
+        'params': ('1',),
+        'requires': ('price_snapshots',),
+        'allow_scan': ()
+    },
+    'price_rollups': {
+        'sql': """
+            SELECT r.*, s.store_key FROM price_rollups r
+            JOIN stores s ON s.store_id = r.store_id
+            WHERE r.resolution = 'daily' AND r.source = 'tracked' AND r.steam_app_id = ?
+            AND +r.bucket_start >= date('now', '-365 days')
+            ORDER BY +r.bucket_start DESC
+        """,
+        'params': ('1',),
+        'requires': ('price_rollups', 'stores'),
+        'allow_scan': ()
+    },
+    'best_deals': {
+        'sql': """
+            SELECT lp.*, ta.name FROM latest_prices lp
+            JOIN tracked_apps ta ON lp.steam_app_id = ta.steam_app_id
+            WHERE lp.max_discount >= ? AND ta.active = 1
+            ORDER BY lp.max_discount DESC, lp.timestamp DESC
+            LIMIT 10
+        """,
+        'params': (25,),
+        'requires': ('latest_prices', 'tracked_apps'),
+        'allow_scan': ()
+    },
+    'charts_deals': {
+        'sql': """
+            SELECT steam_app_id, chart_type, game_title, best_price, best_store,
+                   available_stores_count, max_discount_percent, timestamp
+            FROM charts_best_deals
+            WHERE max_discount_percent >= ?
+            ORDER BY max_discount_percent DESC, best_price ASC LIMIT 20
+        """,
+        'params': (20,),
+        'requires': ('charts_best_deals',),
+        'allow_scan': ()
+    },
+}
+
+def _full_scans(plan_details: List[str], allow_scan: tuple) -> List[str]:
+    """Plan-Zeilen, die eine Tabelle ohne Index vollständig lesen (SCAN <tabelle>)"""
+    scans = []
+    for detail in plan_details:
+        match = re.match(r'SCAN (?:TABLE )?(\w+)(.*)$', detail)
+        if not match or 'USING' in match.group(2):
+            continue
+        if match.group(1) in allow_scan or match.group(1) == 'CONSTANT':
+            continue
+        scans.append(detail)
+    return scans
+
+# =====================================================================
+# EXPORT-QUERIES (STREAMING)
+# =====================================================================
+
+STREAM_FETCH_SIZE = int(os.getenv('DB_STREAM_FETCH_SIZE', '2000'))
+
+_STORE_COLUMNS_SQL = ',\n                   '.join(
+    f"{store}_price, {store}_original_price, {store}_discount_percent, {store}_available"
+    for store in PRICE_STORES
+)
+
+# Spalte mit der deterministischen Dokument-ID (idempotente Re-Exports)
+DOC_ID_COLUMN = '_doc_id'
+
+# Gleiche Datenquellen wie get_all_*, aber ohne ORDER BY: die Zeilen werden direkt
+# aus dem Cursor gestreamt statt erst sortiert und als Liste geladen
+EXPORT_QUERIES = {
+    'price_snapshots': f"""
+        SELECT id AS _doc_id, id, steam_app_id, game_title, timestamp,
+               {_STORE_COLUMNS_SQL}
+        FROM price_snapshots
+    """,
+    'tracked_apps': """
+        SELECT steam_app_id || ':' || COALESCE(game_title, '') AS _doc_id,
+               steam_app_id, game_title,
+               MIN(timestamp) as first_tracked,
+               MAX(timestamp) as last_updated
+        FROM price_snapshots
+        GROUP BY steam_app_id, game_title
+    """,
+    'name_history': """
+        SELECT * FROM (
+            SELECT id AS _doc_id, steam_app_id,
+                   LAG(game_title) OVER (PARTITION BY steam_app_id ORDER BY timestamp) as old_name,
+                   game_title as new_name,
+                   timestamp as change_date
+            FROM price_snapshots
+            WHERE steam_app_id IS NOT NULL
+        )
+        WHERE old_name IS NOT NULL AND old_name != new_name
+    """,
+    'charts_snapshots': f"""
+        SELECT id AS _doc_id, id, steam_app_id, game_title, timestamp,
+               {_STORE_COLUMNS_SQL},
+               is_chart_game, chart_types
+        FROM charts_price_snapshots
+    """,
+    'charts_prices': """
+        SELECT id AS _doc_id, steam_app_id, game_title, timestamp,
+               steam_price, steam_original_price, steam_discount_percent,
+               is_chart_game, chart_types
+        FROM charts_price_snapshots
+        WHERE is_chart_game = 1
+    """,
+    'statistics': """
+        SELECT 'avg_steam_price:' || steam_app_id AS _doc_id,
+               'avg_steam_price' as metric_name, AVG(steam_price) as value,
+               MAX(timestamp) as timestamp, steam_app_id, 'price_stats' as category
+        FROM price_snapshots
+        WHERE steam_price IS NOT NULL
+        GROUP BY steam_app_id
+        UNION ALL
+        SELECT 'max_discount_percent:' || steam_app_id AS _doc_id,
+               'max_discount_percent' as metric_name, MAX(steam_discount_percent) as value,
+               MAX(timestamp) as timestamp, steam_app_id, 'discount_stats' as category
+        FROM price_snapshots
+        WHERE steam_discount_percent IS NOT NULL
+        GROUP BY steam_app_id
+    """,
+    'tracked_apps_price_history': """
+        SELECT rowid AS _doc_id, steam_app_id, name, target_price, timestamp,
+               steam_price, greenmangaming_price, gog_price,
+               humblestore_price, fanatical_price, gamesplanet_price
+        FROM tracked_apps_price_history
+    """,
+    'tracked_apps_latest_prices': """
+        SELECT lp.steam_app_id AS _doc_id, lp.*, lp.timestamp AS price_timestamp,
+               ta.name, ta.target_price,
+               ta.active AS app_active, ta.source AS app_source, ta.notes
+        FROM latest_prices lp
+        JOIN tracked_apps ta ON lp.steam_app_id = ta.steam_app_id
+        WHERE lp.max_discount >= 0 AND ta.active = 1
+    """,
+}
+
+# Inkrementeller Sync (Elasticsearch): Zeilen mit Watermark in (?1, ?2]
+# - table: Basistabelle (fehlt sie, wird die Quelle übersprungen)
+# - watermark: aktuelle High-Water-Mark (monoton steigende ID)
+# - sql: geänderte Zeilen inkl. DOC_ID_COLUMN; abgeleitete Quellen (tracked_apps,
+#   name_history, statistics) werden für alle Apps mit neuen Snapshots neu berechnet
+# - deletes (optional): DOC_ID_COLUMN der Dokumente, die aus dem Index gelöscht werden
+_SNAPSHOT_WATERMARK = "SELECT id FROM price_snapshots ORDER BY id DESC LIMIT 1"
+_APPS_WITH_NEW_SNAPSHOTS = "SELECT steam_app_id FROM price_snapshots WHERE id > ?1 AND id <= ?2"
+
+SYNC_QUERIES = {
+    'price_snapshots': {
+        'table': 'price_snapshots',
+        'watermark': _SNAPSHOT_WATERMARK,
+        'sql': EXPORT_QUERIES['price_snapshots'] + " WHERE id > ?1 AND id <= ?2"
+    },
+    'tracked_apps': {
+        'table': 'price_snapshots',
+        'watermark': _SNAPSHOT_WATERMARK,
+        'sql': f"""
+            SELECT steam_app_id || ':' || COALESCE(game_title, '') AS _doc_id,
+                   steam_app_id, game_title,
+                   MIN(timestamp) as first_tracked,
+                   MAX(timestamp) as last_updated
+            FROM price_snapshots
+            WHERE steam_app_id IN ({_APPS_WITH_NEW_SNAPSHOTS})
+            GROUP BY steam_app_id, game_title
+        """
+    },
+    'name_history': {
+        'table': 'price_snapshots',
+        'watermark': _SNAPSHOT_WATERMARK,
+        'sql': f"""
+            SELECT * FROM (
+                SELECT id AS _doc_id, steam_app_id,
+                       LAG(game_title) OVER (PARTITION BY steam_app_id ORDER BY timestamp) as old_name,
+                       game_title as new_name,
+                       timestamp as change_date
+                FROM price_snapshots
+                WHERE steam_app_id IN ({_APPS_WITH_NEW_SNAPSHOTS})
+            )
+            WHERE _doc_id > ?1 AND _doc_id <= ?2
+            AND old_name IS NOT NULL AND old_name != new_name
+        """
+    },
+    'charts_snapshots': {
+        'table': 'charts_price_snapshots',
+        'watermark': "SELECT MAX(id) FROM charts_price_snapshots",
+        'sql': EXPORT_QUERIES['charts_snapshots'] + " WHERE id > ?1 AND id <= ?2"
+    },
+    'charts_prices': {
+        'table': 'charts_price_snapshots',
+        'watermark': "SELECT MAX(id) FROM charts_price_snapshots",
+        'sql': EXPORT_QUERIES['charts_prices'] + " AND id > ?1 AND id <= ?2"
+    },
+    'statistics': {
+        'table': 'price_snapshots',
+        'watermark': _SNAPSHOT_WATERMARK,
+        'sql': f"""
+            SELECT 'avg_steam_price:' || steam_app_id AS _doc_id,
+                   'avg_steam_price' as metric_name, AVG(steam_price) as value,
+                   MAX(timestamp) as timestamp, steam_app_id, 'price_stats' as category
+            FROM price_snapshots
+            WHERE steam_price IS NOT NULL AND steam_app_id IN ({_APPS_WITH_NEW_SNAPSHOTS})
+            GROUP BY steam_app_id
+            UNION ALL
+            SELECT 'max_discount_percent:' || steam_app_id AS _doc_id,
+                   'max_discount_percent' as metric_name, MAX(steam_discount_percent) as value,
+                   MAX(timestamp) as timestamp, steam_app_id, 'discount_stats' as category
+            FROM price_snapshots
+            WHERE steam_discount_percent IS NOT NULL AND steam_app_id IN ({_APPS_WITH_NEW_SNAPSHOTS})
+            GROUP BY steam_app_id
+        """
+    },
+    'tracked_apps_price_history': {
+        'table': 'tracked_apps_price_history',
+        'watermark': "SELECT MAX(rowid) FROM tracked_apps_price_history",
+        'sql': EXPORT_QUERIES['tracked_apps_price_history'] + " WHERE rowid > ?1 AND rowid <= ?2"
+    },
+    # Watermark ist die Änderungssequenz der Apps (tracked_app_change_triggers_sql):
+    # neue Preise, Bearbeiten, Deaktivieren und Löschen
+    'tracked_apps_latest_prices': {
+        'table': 'change_sequences',
+        'watermark': f"SELECT value FROM change_sequences WHERE name = '{APP_CHANGE_SEQUENCE}'",
+        'sql': EXPORT_QUERIES['tracked_apps_latest_prices'] + " AND ta.change_seq > ?1 AND ta.change_seq <= ?2",
+        'deletes': """
+            SELECT steam_app_id AS _doc_id FROM tracked_apps
+            WHERE active = 0 AND change_seq > ?1 AND change_seq <= ?2
+            UNION ALL
+            SELECT steam_app_id AS _doc_id FROM tracked_app_deletions
+            WHERE change_seq > ?1 AND change_seq <= ?2
+        """
+    },
+}
+
+def _copy_price_snapshot_chunk(conn, chunk_size: int) -> int:
+    """Kopiert die nächsten chunk_size Snapshots der breiten Tabelle nach store_prices"""
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM price_snapshot_headers").fetchone()[0]
+    
+    cursor = conn.execute("""
+        INSERT INTO price_snapshot_headers (id, steam_app_id, game_title, timestamp, last_confirmed_at)
+        SELECT id, steam_app_id, game_title, timestamp, last_confirmed_at FROM price_snapshots
+        WHERE id > ? ORDER BY id LIMIT ?
+    """, (last_id, chunk_size))
+    copied = cursor.rowcount
+    
+    if copied > 0:
+        # Der FROM-Teil steht einmal pro Store im UNION ALL
+        conn.execute(
+            store_prices_insert_sql('ps', 'ps.id', """
+                FROM price_snapshots ps
+                WHERE ps.id > ? AND ps.id <= (SELECT MAX(id) FROM price_snapshot_headers)
+            """),
+            (last_id,) * len(PRICE_STORES)
+        )
+    
+    return copied
+
+def _swap_price_snapshots_to_view(conn) -> int:
+    """Kopiert den Rest und ersetzt price_snapshots durch die Kompatibilitäts-View"""
+    copied = _copy_price_snapshot_chunk(conn, -1)
+    
+    conn.execute("DROP TABLE price_snapshots")
+    for statement in price_snapshot_triggers_sql('normalized', price_snapshot_change_only()):
+        conn.execute(statement)
+    
+    return copied
+
 class DatabaseManager:
     """
     Vollständige Database Manager Klasse - PRODUKTIONSVERSION
@@ -39,6 +1389,10 @@ class DatabaseManager:
     def __init__(self, db_path: str = "steam_price_tracker.db"):
         self.db_path = db_path
         self.lock = threading.RLock()
+        self.pool = SQLiteConnectionPool(db_path)
+        self._writer = None
+        self._remote_writer = None
+        self._writer_lock = threading.Lock()
         
         # Datenbank initialisieren
         self._init_database()
@@ -46,13 +1400,154 @@ class DatabaseManager:
         
         logger.info(f"✅ DatabaseManager (PRODUCTION) initialisiert: {db_path}")
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Erstellt eine neue Datenbankverbindung mit row_factory"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row  # Ermöglicht dict-ähnlichen Zugriff
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        return conn
+    def get_connection(self, readonly: bool = False) -> PooledConnection:
+        """
+        Gibt die gepoolte Datenbankverbindung des aktuellen Threads zurück (mit row_factory)
+        
+        Args:
+            readonly: Lese-Verbindung verwenden (blockiert nicht durch laufende Schreibvorgänge)
+        """
+        return self.pool.acquire(readonly=readonly, operation=sys._getframe(1).f_code.co_name)
+    
+    def get_read_connection(self) -> PooledConnection:
+        """Gibt die Lese-Verbindung des aktuellen Threads zurück"""
+        return self.pool.acquire(readonly=True, operation=sys._getframe(1).f_code.co_name)
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Metriken des Connection-Pools (Wiederverwendung, Anforderungen pro Operation)"""
+        return self.pool.get_stats()
+    
+    def close_connections(self):
+        """Schließt alle gepoolten Verbindungen"""
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+        self.pool.close_all()
+    
+    # =====================================================================
+    # SINGLE-WRITER
+    # =====================================================================
+    
+    def get_writer(self) -> Optional[DatabaseWriter]:
+        """
+        Gibt den Writer-Thread dieser Datenbank zurück (lazy gestartet)
+        
+        Mit DB_WRITER_PORT > 0 und gesetztem DB_WRITER_AUTHKEY wird zusätzlich ein
+        lokaler Socket-Server gestartet;
+        ist der Port bereits belegt, werden SQL-Statements an den Writer des
+        anderen Prozesses geschickt.
+        
+        Returns:
+            DatabaseWriter oder None wenn DB_WRITER_ENABLED=false
+        """
+        if os.getenv('DB_WRITER_ENABLED', 'true').lower() not in ['true', '1', 'yes']:
+            return None
+        
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    writer = DatabaseWriter(self)
+                    
+                    port = int(os.getenv('DB_WRITER_PORT', '0'))
+                    authkey = os.getenv('DB_WRITER_AUTHKEY', '').encode('utf-8')
+                    if port > 0 and not authkey:
+                        # Der Listener entpickelt empfangene Nachrichten - ohne eigenes Secret
+                        # könnte jeder lokale Prozess Code im Writer-Prozess ausführen
+                        logger.warning("⚠️ DB_WRITER_PORT gesetzt, aber kein DB_WRITER_AUTHKEY - Writer-Server deaktiviert")
+                    elif port > 0 and self.db_path != ':memory:':
+                        address = ('127.0.0.1', port)
+                        try:
+                            writer.start_server(address, authkey)
+                        except OSError:
+                            try:
+                                self._remote_writer = RemoteDatabaseWriter(address, authkey, self.db_path)
+                                logger.info(f"🔌 Schreibzugriffe über Writer-Prozess auf Port {port}")
+                            except Exception as e:
+                                logger.warning(f"⚠️ Writer-Prozess auf Port {port} nicht nutzbar: {e}")
+                    
+                    self._writer = writer
+        
+        return self._writer
+    
+    def run_write(self, func, *args, **kwargs):
+        """
+        Führt func(conn, *args, **kwargs) im Writer-Thread aus und wartet auf den COMMIT
+        
+        Ohne Writer wird func direkt in einer eigenen Transaktion ausgeführt.
+        
+        Returns:
+            Rückgabewert von func
+        """
+        writer = self.get_writer()
+        if writer is not None:
+            return writer.submit(func, *args, **kwargs).result()
+        
+        # Offene Transaktion des Aufrufers nicht vorzeitig committen
+        conn = self.pool.open_transaction()
+        if conn is not None:
+            return func(conn, *args, **kwargs)
+        
+        with self.lock:
+            with self.get_connection() as conn:
+                return func(conn, *args, **kwargs)
+    
+    def write_statements(self, statements: List[tuple]) -> List[int]:
+        """
+        Führt SQL-Statements als einen Schreibjob aus (auch prozessübergreifend)
+        
+        Args:
+            statements: Liste von (sql, params) oder (sql, param_rows, True) für executemany
+            
+        Returns:
+            Liste der rowcounts
+        """
+        self.get_writer()
+        
+        # Der Writer-Prozess würde auf das Datei-Lock der offenen Transaktion warten
+        if self._remote_writer is not None and self.pool.open_transaction() is None:
+            try:
+                return self._remote_writer.execute_statements(statements).result()
+            except (EOFError, OSError, ConnectionError) as e:
+                logger.warning(f"⚠️ Writer-Prozess nicht erreichbar, schreibe lokal: {e}")
+                self._remote_writer = None
+        
+        return self.run_write(_execute_statements, statements)
+    
+    def write_price_snapshots(self, statements: List[tuple]) -> int:
+        """
+        Führt Snapshot-Inserts als einen Schreibjob aus und zählt die gespeicherten Snapshots
+        
+        Mit Change-Detection verworfene Inserts (unveränderte Preise) zählen nicht; der
+        rowcount hilft hier nicht (0 bei INSERT auf die View des normalisierten Layouts).
+        
+        Args:
+            statements: Statements für write_statements() (Inserts in price_snapshots)
+            
+        Returns:
+            Anzahl neu gespeicherter Snapshots
+        """
+        base_table = 'price_snapshot_headers' if self.get_price_storage_layout() == 'normalized' else 'price_snapshots'
+        
+        rowcounts = self.write_statements([
+            ("CREATE TEMP TABLE IF NOT EXISTS snapshot_write_mark (max_id INTEGER)", ()),
+            ("CREATE TEMP TABLE IF NOT EXISTS snapshot_write_ids (id INTEGER)", ()),
+            ("DELETE FROM snapshot_write_mark", ()),
+            ("DELETE FROM snapshot_write_ids", ()),
+            (f"INSERT INTO snapshot_write_mark SELECT COALESCE(MAX(id), 0) FROM {base_table}", ()),
+            *statements,
+            (f"""
+                INSERT INTO snapshot_write_ids
+                SELECT id FROM {base_table} WHERE id > (SELECT max_id FROM snapshot_write_mark)
+            """, ())
+        ])
+        return max(rowcounts[-1], 0)
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Statistiken des Writer-Threads (bzw. des Remote-Clients)"""
+        stats = self._writer.get_stats() if self._writer else {'mode': 'disabled'}
+        if self._remote_writer is not None:
+            stats['remote'] = self._remote_writer.get_stats()
+        return stats
     
     def _init_database(self):
         """Initialisiert alle erforderlichen Tabellen mit KORREKTEM Schema"""
@@ -92,10 +1587,16 @@ class DatabaseManager:
                         name_update_attempts INTEGER DEFAULT 0,
                         source TEXT DEFAULT 'manual',
                         target_price REAL,
-                        notes TEXT
+                        notes TEXT,
+                        wishlist_priority INTEGER
                     )
                 ''')
                 
+                # Migration: Wishlist-Priorität für die Update-Queue
+                cursor.execute("PRAGMA table_info(tracked_apps)")
+                if 'wishlist_priority' not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE tracked_apps ADD COLUMN wishlist_priority INTEGER")
+                
                 
                 # ===================================================
                 # STEAM CHARTS TABELLEN (KORRIGIERT - ENTSPRICHT ECHTER DDL)
@@ -183,6 +1684,26 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # App-Name Cache (inkl. Negativ-Einträgen für Apps ohne Store-Seite)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS app_name_cache (
+                        steam_app_id TEXT PRIMARY KEY,
+                        name TEXT,
+                        status TEXT NOT NULL DEFAULT 'found',
+                        source TEXT DEFAULT 'steam_api',
+                        fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # CheapShark Mapping steamAppID -> gameID (NULL = nicht bei CheapShark gelistet)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS cheapshark_game_map (
+                        steam_app_id TEXT PRIMARY KEY,
+                        cheapshark_game_id TEXT,
+                        resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
                 # Price Alerts
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS price_alerts (
@@ -208,7 +1729,33 @@ class DatabaseManager:
                         session_type TEXT DEFAULT 'manual'
                     )
                 ''')
-                
+
+                # Elasticsearch Sync: High-Water-Mark pro Index
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS es_sync_state (
+                        index_name TEXT PRIMARY KEY,
+                        source TEXT NOT NULL,
+                        watermark INTEGER NOT NULL DEFAULT 0,
+                        last_sync_at TIMESTAMP,
+                        last_docs INTEGER DEFAULT 0,
+                        total_docs INTEGER DEFAULT 0
+                    )
+                ''')
+
+                # Update-Queue: Score, Intervall und Fälligkeit pro App (update_queue.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS price_update_queue (
+                        steam_app_id TEXT PRIMARY KEY,
+                        score REAL NOT NULL DEFAULT 0,
+                        interval_hours REAL NOT NULL,
+                        signals TEXT,
+                        last_refreshed_at TIMESTAMP,
+                        next_due_at TIMESTAMP,
+                        failures INTEGER DEFAULT 0,
+                        scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
                 # ===================================================
                 # PERFORMANCE INDIZES
                 # ===================================================
@@ -249,7 +1796,13 @@ class DatabaseManager:
                     "CREATE INDEX IF NOT EXISTS idx_price_alerts_active ON price_alerts(active)",
                     
                     # Name History Indizes
-                    "CREATE INDEX IF NOT EXISTS idx_name_history_app_id ON app_name_history(steam_app_id)"
+                    "CREATE INDEX IF NOT EXISTS idx_name_history_app_id ON app_name_history(steam_app_id)",
+                    
+                    # App-Name Cache Indizes
+                    "CREATE INDEX IF NOT EXISTS idx_app_name_cache_fetched ON app_name_cache(fetched_at)",
+                    
+                    # Update-Queue Indizes
+                    "CREATE INDEX IF NOT EXISTS idx_price_update_queue_due ON price_update_queue(next_due_at)"
                 ]
                 
                 for index_sql in indices:
@@ -275,13 +1828,19 @@ class DatabaseManager:
                 batch_writer = DatabaseBatchWriter(self)
             
                 success_count = 0
-                total_methods = 3
+                total_methods = 9
             
                 # ensure-Methoden über batch_writer aufrufen
                 ensure_methods = [
                     ('ensure_charts_tracking_table', 'steam_charts_tracking'),
                     ('ensure_charts_prices_table', 'steam_charts_prices'), 
-                    ('ensure_price_snapshots_table', 'price_snapshots')
+                    ('ensure_price_snapshots_table', 'price_snapshots'),
+                    ('ensure_latest_prices_table', 'latest_prices'),
+                    ('ensure_app_change_tracking', 'tracked_apps Änderungssequenz'),
+                    ('ensure_store_prices_tables', 'store_prices'),
+                    ('ensure_price_snapshot_triggers', 'price_snapshots Trigger'),
+                    ('ensure_price_rollups_table', 'price_rollups'),
+                    ('ensure_hot_query_indexes', 'Hot-Query Indizes')
                 ]
             
                 for method_name, table_name in ensure_methods:
@@ -299,6 +1858,11 @@ class DatabaseManager:
                     else:
                         logger.warning(f"⚠️ Methode {method_name} nicht im DatabaseBatchWriter gefunden")
             
+                # Neue Datenbanken direkt normalisiert anlegen; bestehende Historie
+                # kopiert nur der explizite Befehl (batch_processor.py migrate-prices)
+                if os.getenv('PRICE_STORAGE_LAYOUT', 'normalized').lower() == 'normalized':
+                    self._prepare_price_storage()
+            
                 if success_count == total_methods:
                     logger.info("✅ Schema-Migration erfolgreich: Alle Tabellen verfügbar")
                     logger.info("   📊 Multi-Store-Schema aktiv (kein store-Feld nötig)")
@@ -389,24 +1953,36 @@ class DatabaseManager:
     def add_tracked_app(self, app_id: str, name: str, source: str = "manual", target_price: Optional[float] = None) -> bool:
         """Fügt eine App zum Tracking hinzu"""
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO tracked_apps 
-                        (steam_app_id, name, source, target_price, added_at) 
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (app_id, name, source, target_price, datetime.now()))
-                    
-                    conn.commit()
-                    logger.debug(f"✅ App hinzugefügt: {name} ({app_id})")
-                    return True
+            self.write_statements([("""
+                INSERT OR REPLACE INTO tracked_apps 
+                (steam_app_id, name, source, target_price, added_at) 
+                VALUES (?, ?, ?, ?, ?)
+            """, (app_id, name, source, target_price, datetime.now()))])
+            
+            logger.debug(f"✅ App hinzugefügt: {name} ({app_id})")
+            return True
                     
         except Exception as e:
             logger.error(f"❌ Fehler beim Hinzufügen der App: {e}")
             return False
     
+    def set_wishlist_priorities(self, priorities: Dict[str, int]) -> int:
+        """
+        Speichert die Steam Wishlist-Priorität getrackter Apps (0 = ganz oben)
+
+        Args:
+            priorities: Steam App ID -> Priorität aus IWishlistService
+
+        Returns:
+            Anzahl aktualisierter Apps
+        """
+        if not priorities:
+            return 0
+        return self.write_statements([(
+            "UPDATE tracked_apps SET wishlist_priority = ? WHERE steam_app_id = ?",
+            [(int(priority), str(app_id)) for app_id, priority in priorities.items()], True
+        )])[0]
+
     def fix_charts_data_migration(self) -> bool:
         """
         Überprüft und korrigiert die Daten-Migration von total_appearances zu days_in_charts
@@ -460,7 +2036,7 @@ class DatabaseManager:
                         source_filter: Optional[str] = None) -> List[Dict]:
         """Holt alle getrackte Apps"""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM tracked_apps"
@@ -497,7 +2073,7 @@ class DatabaseManager:
             logger.error(f"❌ Fehler beim Abrufen der getrackte Apps: {e}")
             return []
     
-    def save_price_snapshot(self, steam_app_id: str, game_title: str, price_data: Dict) -> bool:
+    def save_price_snapshot(self, steam_app_id: str, game_title: str, price_data: Dict) -> Optional[bool]:
         """
         Speichert einen Preis-Snapshot für eine App
         Diese Methode speichert Preis-Daten für eine App in der Datenbank.
@@ -509,7 +2085,8 @@ class DatabaseManager:
             price_data (Dict): Preis-Daten, die die Preise für verschiedene Stores enthalten
         
         Returns:
-            bool: True bei Erfolg, False bei Fehler
+            True wenn ein neuer Snapshot gespeichert wurde, False wenn der Preis unverändert
+            war (nur last_confirmed_at aktualisiert), None bei Fehler
         """
         try:
             # FIX: Sichere Datentyp-Behandlung
@@ -550,72 +2127,227 @@ class DatabaseManager:
                 steam_discount_percent = 0
                 steam_available = False
         
-            # Datenbank-Insert
-            with self.lock:
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
+            # Fallback für game_title
+            if not normalized_data.get('game_title') or normalized_data['game_title'].startswith('Game '):
+                with self.get_connection(readonly=True) as conn:
+                    result = conn.execute("SELECT name FROM tracked_apps WHERE steam_app_id = ?", (steam_app_id,)).fetchone()
+                    if result:
+                        normalized_data['game_title'] = result['name']
+            
+            # Insert mit sicheren Werten + Update tracked_apps (ein Job über den Writer)
+            stored = self.write_price_snapshots([
+                ("""
+                    INSERT INTO price_snapshots (
+                        steam_app_id, game_title, timestamp,
+                        steam_price, steam_original_price, steam_discount_percent, steam_available
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    normalized_data['steam_app_id'],
+                    normalized_data['game_title'],
+                    normalized_data['timestamp'],
+                    steam_price,
+                    steam_original_price,
+                    steam_discount_percent,
+                    steam_available
+                )),
+                ("""
+                    UPDATE tracked_apps 
+                    SET last_price_update = ? 
+                    WHERE steam_app_id = ?
+                """, (datetime.now(), steam_app_id))
+            ])
+            return stored > 0
                 
-                    # Fallback für game_title
-                    if not normalized_data.get('game_title') or normalized_data['game_title'].startswith('Game '):
-                        cursor.execute("SELECT name FROM tracked_apps WHERE steam_app_id = ?", (steam_app_id,))
-                        result = cursor.fetchone()
-                        if result:
-                            normalized_data['game_title'] = result['name']
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern des Preis-Snapshots für {steam_app_id}: {e}")
+            return None
+        
+    
+    def get_price_history(self, steam_app_id: str, days: int = 30, limit: int = 100,
+                          expand: bool = False, interval_hours: Optional[float] = None,
+                          resolution: str = 'auto') -> List[Dict]:
+        """
+        Holt den Preisverlauf für eine App
+        
+        Bei change-only Snapshots steht jede Zeile für ein Intervall von timestamp
+        bis last_confirmed_at. Mit expand=True wird daraus wieder eine Reihe mit
+        einem Punkt pro Tracking-Intervall (synthetische Punkte: interpolated=True).
+        
+        resolution='auto' wählt die feinste Auflösung, deren Punkte in limit passen
+        und deren Aufbewahrung den Zeitraum abdeckt (raw → daily → weekly).
+        Mit expand=True bleibt es bei raw, solange der Zeitraum in der Rohdaten-
+        Aufbewahrung liegt; die Reihe wird dann auf die neuesten limit Punkte gekürzt.
+        Rollup-Zeilen haben dasselbe Store-Spalten-Format plus min/max/avg je Store.
+        Jede Zeile trägt die tatsächlich verwendete Auflösung in 'resolution'.
+        
+        Args:
+            steam_app_id: Steam App ID
+            days: Zeitraum in Tagen
+            limit: Maximum Anzahl Einträge (nach Expansion)
+            expand: Intervalle in eine Reihe expandieren (nur raw)
+            interval_hours: Abstand der expandierten Punkte (Standard: TRACKING_INTERVAL_HOURS)
+            resolution: 'auto', 'raw', 'daily' oder 'weekly'
+        """
+        try:
+            interval_hours = interval_hours or float(os.getenv('TRACKING_INTERVAL_HOURS', '6'))
+            
+            with self.get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
                 
-                    # Insert mit sicheren Werten
-                    cursor.execute("""
-                        INSERT INTO price_snapshots (
-                            steam_app_id, game_title, timestamp,
-                            steam_price, steam_original_price, steam_discount_percent, steam_available
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        normalized_data['steam_app_id'],
-                        normalized_data['game_title'],
-                        normalized_data['timestamp'],
-                        steam_price,
-                        steam_original_price,
-                        steam_discount_percent,
-                        steam_available
-                    ))
+                if resolution == 'auto':
+                    resolution = self._select_history_resolution(cursor, steam_app_id, days, limit, expand)
                 
-                    # Update tracked_apps
-                    cursor.execute("""
-                        UPDATE tracked_apps 
-                        SET last_price_update = ? 
-                        WHERE steam_app_id = ?
-                    """, (datetime.now(), steam_app_id))
+                if resolution in ROLLUP_RESOLUTIONS:
+                    history = self.get_price_rollups(steam_app_id, resolution, days, limit=limit)
+                    if history:
+                        logger.debug(f"📊 {len(history)} {resolution} Preis-Buckets für {steam_app_id} geladen")
+                        return history
                 
-                    conn.commit()
-                    return True
+                # Intervalle, die vor dem Zeitraum beginnen aber darin bestätigt wurden, gehören dazu
+                cursor.execute(f"""
+                    SELECT * FROM price_snapshots 
+                    WHERE steam_app_id = ? 
+                    AND COALESCE(last_confirmed_at, timestamp) >= date('now', '-{days} days')
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                """, (steam_app_id, limit))
+                
+                history = []
+                for row in cursor.fetchall():
+                    history.append(dict(row, resolution='raw'))
+                
+                if expand:
+                    history = self._expand_price_intervals(
+                        history,
+                        interval_hours,
+                        datetime.now() - timedelta(days=days)
+                    )[:limit]
+                
+                logger.debug(f"📊 {len(history)} Preis-Snapshots für {steam_app_id} geladen")
+                return history
                 
         except Exception as e:
-            logger.error(f"❌ Fehler beim Speichern des Preis-Snapshots für {steam_app_id}: {e}")
-            return False
+            logger.error(f"❌ Fehler beim Abrufen der Preis-Historie für {steam_app_id}: {e}")
+            return []
+    
+    def _select_history_resolution(self, cursor, steam_app_id: str, days: int, limit: int,
+                                   expand: bool = False) -> str:
+        """
+        Wählt die Auflösung für get_price_history
+        
+        raw solange der Zeitraum in der Rohdaten-Aufbewahrung (DB_CLEANUP_DAYS) liegt
+        und die Snapshots in limit passen, sonst daily, und weekly wenn auch
+        Tages-Buckets zu viele oder bereits gelöscht sind. Eine angeforderte
+        Expansion gibt es nur auf Rohdaten, daher bleibt expand immer bei raw.
+        """
+        raw_days, daily_days, _ = self.get_rollup_retention()
+        
+        if days <= raw_days:
+            if expand:
+                return 'raw'
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM price_snapshots
+                WHERE steam_app_id = ?
+                AND COALESCE(last_confirmed_at, timestamp) >= date('now', '-{days} days')
+            """, (steam_app_id,))
+            if cursor.fetchone()[0] <= limit:
+                return 'raw'
+        
+        if days <= limit and (daily_days <= 0 or days <= daily_days):
+            return 'daily'
+        return 'weekly'
+    
+    @staticmethod
+    def _parse_timestamp(value) -> Optional[datetime]:
+        """Parst SQLite-Zeitstempel (CURRENT_TIMESTAMP und datetime.isoformat Varianten)"""
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value)) if value else None
+        except ValueError:
+            return None
+    
+    @classmethod
+    def _expand_price_intervals(cls, rows: List[Dict], interval_hours: float,
+                                since: datetime) -> List[Dict]:
+        """
+        Expandiert change-only Snapshots (absteigend sortiert) in eine Reihe
+        
+        Jede Zeile liefert Punkte ab timestamp im Abstand interval_hours bis zum
+        nächsten Snapshot bzw. bis last_confirmed_at.
+        """
+        step = timedelta(hours=max(interval_hours, 0.1))
+        series = []
+        next_start = None
+        
+        for row in rows:
+            start = cls._parse_timestamp(row.get('timestamp'))
+            if start is None:
+                series.append(row)
+                continue
+            
+            end = cls._parse_timestamp(row.get('last_confirmed_at')) or start
+            if next_start is not None and end >= next_start:
+                end = next_start - timedelta(seconds=1)
+            
+            points = []
+            point = start
+            while point <= end:
+                if point >= since:
+                    points.append(dict(row, timestamp=point.strftime('%Y-%m-%d %H:%M:%S'),
+                                       interpolated=point != start))
+                point += step
+            
+            # Letzte Bestätigung als eigener Punkt, falls nicht auf dem Raster
+            if end > start and (end - start) % step and end >= since:
+                points.append(dict(row, timestamp=end.strftime('%Y-%m-%d %H:%M:%S'), interpolated=True))
+            
+            series.extend(reversed(points))
+            next_start = start
         
+        return series
     
-    def get_price_history(self, steam_app_id: str, days: int = 30, limit: int = 100) -> List[Dict]:
-        """Holt den Preisverlauf für eine App"""
+    def get_latest_prices(self, app_ids: Optional[List[str]] = None, min_discount: int = 0,
+                          limit: Optional[int] = None, active_only: bool = True) -> List[Dict]:
+        """
+        Aktuelle Preise aus der materialisierten latest_prices Tabelle (eine Zeile pro App)
+        
+        Args:
+            app_ids: Optional auf diese Apps einschränken
+            min_discount: Mindestrabatt (max_discount über alle Stores)
+            limit: Maximum Anzahl Zeilen
+            active_only: Nur aktive Apps (sonst alle getrackten Apps)
+            
+        Returns:
+            Liste mit Store-Spalten, best_price/best_store/max_discount und name aus tracked_apps
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute(f"""
-                    SELECT * FROM price_snapshots 
-                    WHERE steam_app_id = ? 
-                    AND timestamp >= date('now', '-{days} days')
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                """, (steam_app_id, limit))
-                
-                history = []
-                for row in cursor.fetchall():
-                    history.append(dict(row))
-                
-                logger.debug(f"📊 {len(history)} Preis-Snapshots für {steam_app_id} geladen")
-                return history
+            conditions = ["lp.max_discount >= ?"]
+            params: List[Any] = [min_discount]
+            
+            if active_only:
+                conditions.append("ta.active = 1")
+            if app_ids:
+                conditions.append(f"lp.steam_app_id IN ({', '.join('?' * len(app_ids))})")
+                params.extend(str(app_id) for app_id in app_ids)
+            
+            sql = f"""
+                SELECT lp.*, ta.name, ta.target_price, ta.active AS app_active,
+                       ta.source AS app_source, ta.notes
+                FROM latest_prices lp
+                JOIN tracked_apps ta ON lp.steam_app_id = ta.steam_app_id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY lp.max_discount DESC, lp.timestamp DESC
+            """
+            if limit:
+                sql += " LIMIT ?"
+                params.append(limit)
+            
+            with self.get_connection(readonly=True) as conn:
+                return [dict(row) for row in conn.execute(sql, params).fetchall()]
                 
         except Exception as e:
-            logger.error(f"❌ Fehler beim Abrufen der Preis-Historie für {steam_app_id}: {e}")
+            logger.error(f"❌ Fehler beim Laden der aktuellen Preise: {e}")
             return []
     
     def get_database_stats(self) -> Dict:
@@ -643,14 +2375,14 @@ class DatabaseManager:
                 cursor.execute("SELECT MAX(last_price_update) FROM tracked_apps")
                 last_update = cursor.fetchone()[0]
                 
-                # Stores mit Daten
-                stores_with_data = []
+                # Stores mit aktuellen Daten (eine Abfrage über latest_prices statt Historie pro Store)
                 stores = ['steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet']
-                for store in stores:
-                    cursor.execute(f"SELECT COUNT(*) FROM price_snapshots WHERE {store}_available = 1")
-                    count = cursor.fetchone()[0]
-                    if count > 0:
-                        stores_with_data.append(store)
+                cursor.execute(f"""
+                    SELECT {', '.join(f"COALESCE(SUM({store}_available = 1), 0)" for store in stores)}
+                    FROM latest_prices
+                """)
+                store_counts = cursor.fetchone()
+                stores_with_data = [store for store, count in zip(stores, store_counts) if count]
                 
                 return {
                     'active_apps': active_apps,
@@ -835,6 +2567,9 @@ class DatabaseManager:
 
                 conn.commit()
 
+            # Views für Single-Store-Abfragen (charts_best_deals wird von get_charts_deals gelesen)
+            self._create_charts_views()
+
             # ===================================================
             # SCHRITT 4: Performance-Indizes für ALLE Tabellen
             # ===================================================
@@ -908,10 +2643,17 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
             
+                # Ältere Versionen ohne max_discount_percent (charts_best_deals brauchte einen Self-Join)
+                cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'charts_best_prices'")
+                existing_view = cursor.fetchone()
+                if existing_view and 'max_discount_percent' not in existing_view[0]:
+                    cursor.execute("DROP VIEW charts_best_prices")
+                    cursor.execute("DROP VIEW IF EXISTS charts_best_deals")
+                
                 # ===================================================
                 # VIEW 1: charts_best_prices - Automatische Auswahl des besten Preises
                 # ===================================================
-                cursor.execute('''
+                cursor.execute(f'''
                     CREATE VIEW IF NOT EXISTS charts_best_prices AS
                     SELECT 
                         steam_app_id,
@@ -1001,7 +2743,10 @@ class DatabaseManager:
                          CAST(gog_available as INTEGER) + 
                          CAST(humblestore_available as INTEGER) + 
                          CAST(fanatical_available as INTEGER) + 
-                         CAST(gamesplanet_available as INTEGER)) as available_stores_count
+                         CAST(gamesplanet_available as INTEGER)) as available_stores_count,
+                    
+                        -- Hoechster Rabatt aller Stores (idx_charts_prices_max_discount)
+                        {CHARTS_MAX_DISCOUNT_SQL} as max_discount_percent
                      
                     FROM steam_charts_prices
                     WHERE (steam_available OR greenmangaming_available OR gog_available OR 
@@ -1030,33 +2775,26 @@ class DatabaseManager:
                 # ===================================================
                 # VIEW 3: charts_best_deals - Automatische Deal-Erkennung
                 # ===================================================
+                # Ältere Versionen nutzten GREATEST(), das SQLite nicht kennt
+                cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'charts_best_deals'")
+                existing_view = cursor.fetchone()
+                if existing_view and 'GREATEST' in existing_view[0]:
+                    cursor.execute("DROP VIEW charts_best_deals")
+                
+                # Rabatt-Filter läuft über den Expression-Index idx_charts_prices_max_discount
                 cursor.execute('''
                     CREATE VIEW IF NOT EXISTS charts_best_deals AS
                     SELECT 
-                        cbp.steam_app_id,
-                        cbp.chart_type,
-                        cbp.game_title,
-                        cbp.best_price,
-                        cbp.best_store,
-                        cbp.available_stores_count,
-                        cbp.timestamp,
-                    
-                        -- Hoechster Rabatt aller Stores
-                        GREATEST(
-                            COALESCE(scp.steam_discount_percent, 0),
-                            COALESCE(scp.greenmangaming_discount_percent, 0),
-                            COALESCE(scp.gog_discount_percent, 0),
-                            COALESCE(scp.humblestore_discount_percent, 0),
-                            COALESCE(scp.fanatical_discount_percent, 0),
-                            COALESCE(scp.gamesplanet_discount_percent, 0)
-                        ) as max_discount_percent
-                    
-                    FROM charts_best_prices cbp
-                    JOIN steam_charts_prices scp ON 
-                        cbp.steam_app_id = scp.steam_app_id AND 
-                        cbp.chart_type = scp.chart_type AND
-                        cbp.timestamp = scp.timestamp
-                    WHERE cbp.best_price > 0
+                        steam_app_id,
+                        chart_type,
+                        game_title,
+                        best_price,
+                        best_store,
+                        available_stores_count,
+                        timestamp,
+                        max_discount_percent
+                    FROM charts_best_prices
+                    WHERE best_price > 0
                 ''')
             
                 # ==================================================
@@ -1304,27 +3042,374 @@ class DatabaseManager:
                 'last_update': 'Fehler'
             }
     
+    # =====================================================================
+    # NORMALISIERTE PREIS-SPEICHERUNG
+    # =====================================================================
+    
+    def _prepare_price_storage(self):
+        """
+        Layout-Prüfung beim Start (ohne Kopierarbeit)
+        
+        Ist price_snapshots bereits die View, passiert nichts. Eine leere breite
+        Tabelle (neue Datenbank) wird sofort durch die View ersetzt; vorhandene
+        Historie bleibt bis zum expliziten migrate-prices Befehl im breiten Layout.
+        """
+        try:
+            with self.get_connection() as conn:
+                if price_storage_layout(conn) == 'normalized':
+                    return
+                
+                if conn.execute("SELECT 1 FROM price_snapshots LIMIT 1").fetchone() is None:
+                    _swap_price_snapshots_to_view(conn)
+                    conn.commit()
+                    logger.info("✅ Preis-Speicherung normalisiert angelegt (store_prices)")
+                    return
+            
+            logger.warning("⚠️ Preis-Historie noch im breiten Layout - Migration mit "
+                           "'python batch_processor.py migrate-prices' starten")
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Preis-Layout konnte nicht geprüft werden: {e}")
+    
+    def migrate_price_storage(self, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Online-Migration der breiten price_snapshots Tabelle nach store_prices
+        
+        Wird nicht beim Start ausgeführt, sondern über 'batch_processor.py migrate-prices'.
+        Kopiert in Chunks (je eine kurze Transaktion über den Writer), sodass
+        laufende Schreibzugriffe weiter in price_snapshots landen und im nächsten
+        Chunk mitgenommen werden. Abgebrochene Migrationen setzen beim höchsten
+        bereits kopierten Snapshot fort. Zum Schluss wird in einer Transaktion der
+        Rest kopiert und die Tabelle durch die Kompatibilitäts-View ersetzt.
+        
+        Args:
+            chunk_size: Snapshots pro Chunk (Standard: PRICE_MIGRATION_CHUNK_SIZE)
+            
+        Returns:
+            Dict mit Erfolg, Anzahl migrierter Snapshots und Dauer
+        """
+        chunk_size = chunk_size or int(os.getenv('PRICE_MIGRATION_CHUNK_SIZE', '5000'))
+        start_time = time_module.time()
+        migrated = 0
+        
+        try:
+            with self.get_connection(readonly=True) as conn:
+                if price_storage_layout(conn) == 'normalized':
+                    return {'success': True, 'migrated': 0, 'layout': 'normalized'}
+            
+            while True:
+                copied = self.run_write(_copy_price_snapshot_chunk, chunk_size)
+                migrated += copied
+                if copied < chunk_size:
+                    break
+                logger.info(f"🔄 Preis-Migration: {migrated} Snapshots nach store_prices kopiert...")
+            
+            migrated += self.run_write(_swap_price_snapshots_to_view)
+            
+            duration = time_module.time() - start_time
+            logger.info(f"✅ Preis-Speicherung normalisiert: {migrated} Snapshots in {duration:.1f}s "
+                        f"(VACUUM gibt den Platz der breiten Tabelle frei)")
+            
+            return {'success': True, 'migrated': migrated, 'duration': duration, 'layout': 'normalized'}
+            
+        except Exception as e:
+            logger.error(f"❌ Preis-Migration fehlgeschlagen (nach {migrated} Snapshots): {e}")
+            return {'success': False, 'migrated': migrated, 'error': str(e), 'layout': 'wide'}
+    
+    def get_price_storage_layout(self) -> str:
+        """Aktuelles Layout der Preis-Historie ('normalized' oder 'wide')"""
+        with self.get_connection(readonly=True) as conn:
+            return price_storage_layout(conn)
+    
+    # =====================================================================
+    # PREIS-ROLLUPS
+    # =====================================================================
+    
+    def rollup_prices(self) -> Dict[str, Any]:
+        """
+        Aggregiert price_snapshots und steam_charts_prices inkrementell in price_rollups
+        
+        Tages-Buckets (min/max/avg/letzter Preis je Store) werden ab dem jüngsten
+        vorhandenen Tag neu berechnet, Wochen-Buckets (Montag) aus den Tages-Buckets.
+        Buckets entstehen nur an Tagen, an denen ein Snapshot beginnt oder endet.
+        Läuft als geplanter Job (PRICE_ROLLUP_INTERVAL_MINUTES) und vor jedem Cleanup.
+        
+        Returns:
+            Dict mit Erfolg, geschriebenen Buckets je Quelle und Auflösung und Dauer
+        """
+        start_time = time_module.time()
+        
+        try:
+            counts = self.run_write(_rollup_prices)
+            duration = time_module.time() - start_time
+            
+            logger.debug(f"📊 Preis-Rollups aktualisiert: {counts} in {duration:.2f}s")
+            return {'success': True, 'buckets': counts, 'duration': duration}
+            
+        except Exception as e:
+            logger.error(f"❌ Preis-Rollups fehlgeschlagen: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def get_rollup_retention() -> Tuple[int, int, int]:
+        """
+        Aufbewahrung in Tagen für (raw, daily, weekly); 0 = unbegrenzt
+        
+        raw folgt DB_CLEANUP_DAYS, die Rollups PRICE_ROLLUP_DAILY_RETENTION_DAYS
+        und PRICE_ROLLUP_WEEKLY_RETENTION_DAYS.
+        """
+        return (
+            int(os.getenv('DB_CLEANUP_DAYS', '90')),
+            int(os.getenv('PRICE_ROLLUP_DAILY_RETENTION_DAYS', '730')),
+            int(os.getenv('PRICE_ROLLUP_WEEKLY_RETENTION_DAYS', '0'))
+        )
+    
+    def get_price_rollups(self, steam_app_id: str, resolution: str = 'daily', days: int = 365,
+                          source: str = 'tracked', limit: Optional[int] = None) -> List[Dict]:
+        """
+        Preis-Buckets einer App im Store-Spalten-Format (neueste zuerst)
+        
+        Reine Lese-API: aktualisiert werden die Buckets von rollup_prices()
+        im geplanten Wartungsjob, nicht beim Abruf.
+        
+        Gespeichert sind nur Buckets, in denen ein Snapshot beginnt oder endet.
+        Fehlende Tage/Wochen bis zum jüngsten Bucket werden mit dem letzten Wert
+        je Store aufgefüllt (interpolated=True, samples=0), auch über den Beginn
+        des Zeitraums hinweg.
+        
+        Args:
+            steam_app_id: Steam App ID
+            resolution: 'daily' oder 'weekly'
+            days: Zeitraum in Tagen
+            source: 'tracked' (price_snapshots) oder 'charts' (steam_charts_prices)
+            limit: Maximum Anzahl Buckets
+            
+        Returns:
+            Liste mit timestamp (Bucket-Beginn), resolution und je Store
+            {store}_price (letzter), {store}_min_price, {store}_max_price, {store}_avg_price
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unbekannte Rollup-Auflösung: {resolution}")
+        
+        try:
+            # +bucket_start: sonst wählt SQLite wegen der Sortierung den Prune-Index (resolution, bucket_start)
+            # und liest die Buckets aller Apps statt des Primärschlüssel-Präfixes
+            since = "date('now', ?, 'weekday 1')" if resolution == 'weekly' else "date('now', ?)"
+            sql = """
+                SELECT r.*, s.store_key FROM price_rollups r
+                JOIN stores s ON s.store_id = r.store_id
+                WHERE r.resolution = ? AND r.source = ? AND r.steam_app_id = ?
+                AND +r.bucket_start >= ?
+                ORDER BY +r.bucket_start DESC
+            """
+            # Letzter Bucket je Store vor dem Zeitraum (Startwert für das Fortführen)
+            carry_sql = """
+                SELECT r.*, s.store_key FROM price_rollups r
+                JOIN stores s ON s.store_id = r.store_id
+                WHERE r.resolution = ? AND r.source = ? AND r.steam_app_id = ?
+                AND r.bucket_start = (
+                    SELECT MAX(p.bucket_start) FROM price_rollups p
+                    WHERE p.resolution = r.resolution AND p.source = r.source
+                    AND p.steam_app_id = r.steam_app_id AND p.store_id = r.store_id
+                    AND p.bucket_start < ?
+                )
+            """
+            
+            with self.get_connection(readonly=True) as conn:
+                since_day = conn.execute(
+                    f"SELECT {since}", (f"-{days + 6 if resolution == 'weekly' else days} days",)
+                ).fetchone()[0]
+                params = (resolution, source, str(steam_app_id), since_day)
+                rows = conn.execute(sql, params).fetchall()
+                carried = conn.execute(carry_sql, params).fetchall() if rows else []
+            
+            history = self._fill_rollup_buckets(rows, carried, resolution, since_day)
+            return history[:limit] if limit else history
+            
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Laden der Preis-Rollups für {steam_app_id}: {e}")
+            return []
+    
+    @staticmethod
+    def _fill_rollup_buckets(rows: List, carried: List, resolution: str, since_day: str) -> List[Dict]:
+        """
+        Baut aus gespeicherten (absteigend) und fortgeführten Buckets eine lückenlose Reihe
+        
+        Läuft vom Zeitraum-Beginn (mit Startwert) bzw. ersten Bucket bis zum jüngsten
+        gespeicherten Bucket, neueste zuerst.
+        """
+        if not rows:
+            return []
+        
+        stored: Dict[str, List] = {}
+        for row in rows:
+            stored.setdefault(row['bucket_start'], []).append(row)
+        
+        step = timedelta(days=7 if resolution == 'weekly' else 1)
+        day = datetime.strptime(since_day if carried else rows[-1]['bucket_start'], '%Y-%m-%d')
+        last_day = datetime.strptime(rows[0]['bucket_start'], '%Y-%m-%d')
+        current = {row['store_key']: row for row in carried}
+        history = []
+        
+        while day <= last_day:
+            bucket_start = day.strftime('%Y-%m-%d')
+            day_rows = stored.get(bucket_start, [])
+            for row in day_rows:
+                current[row['store_key']] = row
+            
+            bucket = {
+                'steam_app_id': rows[0]['steam_app_id'],
+                'timestamp': bucket_start,
+                'resolution': resolution,
+                'samples': sum(row['samples'] for row in day_rows),
+                'interpolated': not day_rows
+            }
+            for store, row in current.items():
+                last_price = row['last_cents'] / 100
+                bucket[f'{store}_price'] = last_price
+                bucket[f'{store}_original_price'] = (row['last_original_cents'] or row['last_cents']) / 100
+                bucket[f'{store}_discount_percent'] = row['last_discount']
+                bucket[f'{store}_available'] = True
+                if row['bucket_start'] == bucket_start:
+                    bucket[f'{store}_min_price'] = row['min_cents'] / 100
+                    bucket[f'{store}_max_price'] = row['max_cents'] / 100
+                    bucket[f'{store}_avg_price'] = round(row['avg_cents'] / 100, 2)
+                else:
+                    # Ganzer Bucket zum fortgeführten Preis
+                    bucket[f'{store}_min_price'] = last_price
+                    bucket[f'{store}_max_price'] = last_price
+                    bucket[f'{store}_avg_price'] = last_price
+            
+            history.append(bucket)
+            day += step
+        
+        history.reverse()
+        return history
+    
+    def prune_price_rollups(self) -> int:
+        """Löscht Rollup-Buckets außerhalb der Aufbewahrung ihrer Auflösung"""
+        _, daily_days, weekly_days = self.get_rollup_retention()
+        statements = [
+            ("DELETE FROM price_rollups WHERE resolution = ? AND bucket_start < date('now', ?)",
+             (resolution, f"-{retention} days"))
+            for resolution, retention in (('daily', daily_days), ('weekly', weekly_days))
+            if retention > 0
+        ]
+        
+        if not statements:
+            return 0
+        
+        try:
+            return sum(self.write_statements(statements))
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Bereinigen der Preis-Rollups: {e}")
+            return 0
+    
+    # =====================================================================
+    # QUERY-PLAN PRÜFUNG
+    # =====================================================================
+    
+    def check_query_plans(self, repeat: int = 3) -> Dict[str, Any]:
+        """
+        Prüft die Hot Queries per EXPLAIN QUERY PLAN auf volle Tabellen-Scans
+        
+        Queries auf nicht vorhandene Tabellen/Views werden als 'skipped' gemeldet und
+        zählen nicht als Erfolg (ihr Plan ist ungeprüft).
+        
+        Args:
+            repeat: Ausführungen je Query für die Latenz-Messung (0 = nur Plan)
+            
+        Returns:
+            Dict mit success (keine Regression, nichts übersprungen) und je Query Plan, Scans und Latenz
+        """
+        results = {}
+        
+        with self.get_connection(readonly=True) as conn:
+            existing = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+            ).fetchall()}
+            
+            for name, query in HOT_QUERIES.items():
+                missing = [obj for obj in query['requires'] if obj not in existing]
+                if missing:
+                    results[name] = {'status': 'skipped', 'missing': missing}
+                    continue
+                
+                try:
+                    plan = [row[3] for row in conn.execute(
+                        f"EXPLAIN QUERY PLAN {query['sql']}", query['params']
+                    ).fetchall()]
+                    scans = _full_scans(plan, query['allow_scan'])
+                    result = {'status': 'scan' if scans else 'ok', 'plan': plan, 'scans': scans}
+                    
+                    if repeat > 0:
+                        timings = []
+                        for _ in range(repeat):
+                            start = time_module.perf_counter()
+                            rows = len(conn.execute(query['sql'], query['params']).fetchall())
+                            timings.append((time_module.perf_counter() - start) * 1000)
+                        result['latency_ms'] = round(sorted(timings)[len(timings) // 2], 3)
+                        result['rows'] = rows
+                    
+                    results[name] = result
+                    
+                except sqlite3.Error as e:
+                    results[name] = {'status': 'error', 'error': str(e)}
+        
+        regressions = [name for name, result in results.items() if result['status'] in ('scan', 'error')]
+        skipped = [name for name, result in results.items() if result['status'] == 'skipped']
+        if regressions:
+            logger.warning(f"⚠️ Query-Plan Regression: {', '.join(regressions)}")
+        if skipped:
+            logger.warning(f"⚠️ Query-Plan nicht geprüft (Tabellen fehlen): {', '.join(skipped)}")
+        
+        return {'success': not regressions and not skipped, 'regressions': regressions,
+                'skipped': skipped, 'queries': results}
+    
     # =====================================================================
     # ERWEITERTE METHODEN
     # =====================================================================
     
     def cleanup_old_prices(self, days: int = 90) -> int:
-        """Löscht alte Preis-Snapshots"""
+        """
+        Löscht alte Preis-Snapshots
+        
+        Vorher werden die Rollups aktualisiert, damit gelöschte Rohdaten als
+        Tages-/Wochen-Buckets erhalten bleiben. Snapshots, deren Preis noch
+        innerhalb des Zeitraums bestätigt wurde, bleiben bestehen.
+        """
+        self.rollup_prices()
+        
         try:
             with self.lock:
                 with self.get_connection() as conn:
                     cursor = conn.cursor()
                     
-                    cursor.execute(f"""
-                        DELETE FROM price_snapshots 
-                        WHERE timestamp < date('now', '-{days} days')
-                    """)
+                    if price_storage_layout(conn) == 'normalized':
+                        # Direkt auf den Basistabellen (INSTEAD OF Trigger zählen keine rowcount)
+                        cursor.execute(f"""
+                            DELETE FROM store_prices WHERE snapshot_id IN (
+                                SELECT id FROM price_snapshot_headers
+                                WHERE COALESCE(last_confirmed_at, timestamp) < date('now', '-{days} days')
+                            )
+                        """)
+                        cursor.execute(f"""
+                            DELETE FROM price_snapshot_headers
+                            WHERE COALESCE(last_confirmed_at, timestamp) < date('now', '-{days} days')
+                        """)
+                    else:
+                        cursor.execute(f"""
+                            DELETE FROM price_snapshots 
+                            WHERE COALESCE(last_confirmed_at, timestamp) < date('now', '-{days} days')
+                        """)
                     
                     deleted_count = cursor.rowcount
                     conn.commit()
                     
-                    logger.info(f"🧹 {deleted_count} alte Preis-Snapshots entfernt (älter als {days} Tage)")
-                    return deleted_count
+            pruned_buckets = self.prune_price_rollups()
+            logger.info(f"🧹 {deleted_count} alte Preis-Snapshots entfernt (älter als {days} Tage), "
+                        f"{pruned_buckets} Rollup-Buckets außerhalb der Aufbewahrung")
+            return deleted_count
                     
         except Exception as e:
             logger.error(f"❌ Fehler beim Bereinigen alter Preise: {e}")
@@ -1343,68 +3428,304 @@ class DatabaseManager:
             # Backup erstellen
             shutil.copy2(self.db_path, backup_path)
             
-            backup_size = os.path.getsize(backup_path) / (1024 * 1024)
-            logger.info(f"💾 Backup erstellt: {backup_path} ({backup_size:.1f} MB)")
+            backup_size = os.path.getsize(backup_path) / (1024 * 1024)
+            logger.info(f"💾 Backup erstellt: {backup_path} ({backup_size:.1f} MB)")
+            
+            return backup_path
+            
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Erstellen des Backups: {e}")
+            return ""
+    
+    def vacuum_database(self) -> bool:
+        """Optimiert die Datenbank"""
+        try:
+            with self.lock:
+                with self.get_connection() as conn:
+                    old_size = self._get_database_size()
+                    conn.execute("VACUUM")
+                    new_size = self._get_database_size()
+                    
+                    saved_mb = old_size - new_size
+                    logger.info(f"🗜️ Datenbank optimiert: {saved_mb:.1f} MB eingespart")
+                    return True
+                    
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Optimieren der Datenbank: {e}")
+            return False
+    
+    def update_app_name(self, steam_app_id: str, new_name: str) -> bool:
+        """Aktualisiert den Namen einer App"""
+        def write_name(conn) -> bool:
+            cursor = conn.cursor()
+            
+            # Alten Namen für Historie speichern
+            cursor.execute("SELECT name FROM tracked_apps WHERE steam_app_id = ?", (steam_app_id,))
+            result = cursor.fetchone()
+            if result:
+                old_name = result[0]
+                
+                # Name-Historie speichern
+                cursor.execute("""
+                    INSERT INTO app_name_history (steam_app_id, old_name, new_name, update_source)
+                    VALUES (?, ?, ?, ?)
+                """, (steam_app_id, old_name, new_name, 'automatic'))
+            
+            # Namen aktualisieren
+            cursor.execute("""
+                UPDATE tracked_apps 
+                SET name = ?, last_name_update = ? 
+                WHERE steam_app_id = ?
+            """, (new_name, datetime.now(), steam_app_id))
+            
+            return cursor.rowcount > 0
+        
+        try:
+            success = self.run_write(write_name)
+            
+            if success:
+                logger.info(f"✅ App-Name aktualisiert: {steam_app_id} → {new_name}")
+            return success
+                    
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Aktualisieren des App-Namens: {e}")
+            return False
+    
+    # =====================================================================
+    # APP-NAME CACHE
+    # =====================================================================
+    
+    @staticmethod
+    def is_placeholder_app_name(steam_app_id: str, name: Optional[str]) -> bool:
+        """Prüft ob ein Name nur ein generierter Platzhalter ist (z.B. 'Game 12345')"""
+        if not name or not name.strip():
+            return True
+        
+        steam_app_id = str(steam_app_id)
+        placeholders = {
+            f"Game {steam_app_id}",
+            f"App {steam_app_id}",
+            f"Unknown Game {steam_app_id}",
+            f"Steam Game {steam_app_id}",
+            f"Trending Game {steam_app_id}",
+            steam_app_id
+        }
+        return name.strip() in placeholders
+    
+    def get_cached_app_names(self, app_ids: List[str], ttl_hours: int = 720,
+                             negative_ttl_hours: int = 24) -> Dict[str, Optional[str]]:
+        """
+        Liefert bekannte App-Namen ohne Netzwerkzugriff
+        
+        Reihenfolge: frischer Cache-Eintrag, tracked_apps.name, letzter Eintrag
+        aus app_name_history, frischer Negativ-Eintrag.
+        
+        Args:
+            app_ids: Steam App IDs
+            ttl_hours: Gültigkeit positiver Cache-Einträge
+            negative_ttl_hours: Gültigkeit von Negativ-Einträgen (App nicht gefunden)
+            
+        Returns:
+            Dict app_id -> Name, bzw. None für bekannte Negativ-Einträge.
+            Apps ohne gültige Information fehlen im Dict.
+        """
+        app_ids = list(dict.fromkeys(str(app_id) for app_id in app_ids))
+        names = {}
+        negative = set()
+        
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
+                
+                for i in range(0, len(app_ids), 500):
+                    chunk = app_ids[i:i + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    
+                    cursor.execute(f"""
+                        SELECT steam_app_id, name, status FROM app_name_cache
+                        WHERE steam_app_id IN ({placeholders})
+                          AND ((status = 'found' AND fetched_at >= datetime('now', ?))
+                            OR (status = 'missing' AND fetched_at >= datetime('now', ?)))
+                    """, chunk + [f'-{int(ttl_hours)} hours', f'-{int(negative_ttl_hours)} hours'])
+                    
+                    for row in cursor.fetchall():
+                        if row['status'] == 'found' and not self.is_placeholder_app_name(row['steam_app_id'], row['name']):
+                            names[row['steam_app_id']] = row['name']
+                        elif row['status'] == 'missing':
+                            negative.add(row['steam_app_id'])
+                    
+                    cursor.execute(f"""
+                        SELECT steam_app_id, name FROM tracked_apps
+                        WHERE steam_app_id IN ({placeholders})
+                    """, chunk)
+                    
+                    for row in cursor.fetchall():
+                        if row['steam_app_id'] not in names and not self.is_placeholder_app_name(row['steam_app_id'], row['name']):
+                            names[row['steam_app_id']] = row['name']
+                    
+                    cursor.execute(f"""
+                        SELECT steam_app_id, new_name FROM app_name_history
+                        WHERE id IN (
+                            SELECT MAX(id) FROM app_name_history
+                            WHERE steam_app_id IN ({placeholders})
+                            GROUP BY steam_app_id
+                        )
+                    """, chunk)
+                    
+                    for row in cursor.fetchall():
+                        if row['steam_app_id'] not in names and not self.is_placeholder_app_name(row['steam_app_id'], row['new_name']):
+                            names[row['steam_app_id']] = row['new_name']
+            
+            result = dict(names)
+            for app_id in negative:
+                if app_id not in result:
+                    result[app_id] = None
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Lesen des App-Name Cache: {e}")
+            return {}
+    
+    def cache_app_names(self, app_names: Dict[str, Optional[str]], source: str = 'steam_api') -> int:
+        """
+        Speichert abgerufene App-Namen im Cache
+        
+        None-Werte werden als Negativ-Eintrag gespeichert. Platzhalter-Namen in
+        tracked_apps werden dabei ersetzt und in app_name_history protokolliert.
+        
+        Args:
+            app_names: Dict app_id -> Name (None = App nicht gefunden)
+            source: Herkunft der Namen
+            
+        Returns:
+            Anzahl gespeicherter Einträge
+        """
+        if not app_names:
+            return 0
+        
+        rows = [
+            (str(app_id), name.strip() if name else None, 'found' if name else 'missing', source)
+            for app_id, name in app_names.items()
+        ]
+        
+        def write_names(conn) -> List[tuple]:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO app_name_cache (steam_app_id, name, status, source, fetched_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(steam_app_id) DO UPDATE SET
+                    name = COALESCE(excluded.name, app_name_cache.name),
+                    status = excluded.status,
+                    source = excluded.source,
+                    fetched_at = excluded.fetched_at
+            """, rows)
+            
+            # Platzhalter in tracked_apps durch echte Namen ersetzen
+            found = {row[0]: row[1] for row in rows if row[1]}
+            found_ids = list(found.keys())
+            renamed = []
+            
+            for i in range(0, len(found_ids), 500):
+                chunk = found_ids[i:i + 500]
+                cursor.execute(f"""
+                    SELECT steam_app_id, name FROM tracked_apps
+                    WHERE steam_app_id IN ({','.join('?' * len(chunk))})
+                """, chunk)
+                
+                for row in cursor.fetchall():
+                    if self.is_placeholder_app_name(row['steam_app_id'], row['name']):
+                        renamed.append((row['steam_app_id'], row['name'], found[row['steam_app_id']]))
+            
+            if renamed:
+                cursor.executemany("""
+                    INSERT INTO app_name_history (steam_app_id, old_name, new_name, update_source)
+                    VALUES (?, ?, ?, ?)
+                """, [(app_id, old_name, new_name, source) for app_id, old_name, new_name in renamed])
+                cursor.executemany("""
+                    UPDATE tracked_apps
+                    SET name = ?, last_name_update = CURRENT_TIMESTAMP
+                    WHERE steam_app_id = ?
+                """, [(new_name, app_id) for app_id, _, new_name in renamed])
             
-            return backup_path
+            return renamed
+        
+        try:
+            renamed = self.run_write(write_names)
+            
+            logger.debug(f"💾 App-Name Cache: {len(rows)} Einträge gespeichert, {len(renamed)} Platzhalter ersetzt")
+            return len(rows)
             
         except Exception as e:
-            logger.error(f"❌ Fehler beim Erstellen des Backups: {e}")
-            return ""
+            logger.error(f"❌ Fehler beim Speichern im App-Name Cache: {e}")
+            return 0
     
-    def vacuum_database(self) -> bool:
-        """Optimiert die Datenbank"""
+    # =====================================================================
+    # CHEAPSHARK GAME-ID MAPPING
+    # =====================================================================
+    
+    def get_cheapshark_game_ids(self, app_ids: List[str], negative_ttl_hours: int = 168) -> Dict[str, Optional[str]]:
+        """
+        Liefert gespeicherte CheapShark gameIDs für Steam App IDs
+        
+        Args:
+            app_ids: Steam App IDs
+            negative_ttl_hours: Gültigkeit von "nicht gelistet"-Einträgen
+            
+        Returns:
+            Dict app_id -> gameID bzw. None wenn CheapShark die App nicht führt.
+            Unbekannte Apps fehlen im Dict.
+        """
+        app_ids = list(dict.fromkeys(str(app_id) for app_id in app_ids))
+        mapping = {}
+        
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    old_size = self._get_database_size()
-                    conn.execute("VACUUM")
-                    new_size = self._get_database_size()
+            with self.get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
+                
+                for i in range(0, len(app_ids), 500):
+                    chunk = app_ids[i:i + 500]
+                    placeholders = ','.join('?' * len(chunk))
                     
-                    saved_mb = old_size - new_size
-                    logger.info(f"🗜️ Datenbank optimiert: {saved_mb:.1f} MB eingespart")
-                    return True
+                    cursor.execute(f"""
+                        SELECT steam_app_id, cheapshark_game_id FROM cheapshark_game_map
+                        WHERE steam_app_id IN ({placeholders})
+                          AND (cheapshark_game_id IS NOT NULL OR resolved_at >= datetime('now', ?))
+                    """, chunk + [f'-{int(negative_ttl_hours)} hours'])
                     
+                    for row in cursor.fetchall():
+                        mapping[row['steam_app_id']] = row['cheapshark_game_id']
+            
+            return mapping
+            
         except Exception as e:
-            logger.error(f"❌ Fehler beim Optimieren der Datenbank: {e}")
-            return False
+            logger.error(f"❌ Fehler beim Lesen des CheapShark Mappings: {e}")
+            return {}
     
-    def update_app_name(self, steam_app_id: str, new_name: str) -> bool:
-        """Aktualisiert den Namen einer App"""
+    def save_cheapshark_game_ids(self, mapping: Dict[str, Optional[str]]) -> int:
+        """
+        Speichert steamAppID -> CheapShark gameID Zuordnungen
+        
+        Args:
+            mapping: Dict app_id -> gameID (None = nicht bei CheapShark gelistet)
+            
+        Returns:
+            Anzahl gespeicherter Einträge
+        """
+        if not mapping:
+            return 0
+        
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    # Alten Namen für Historie speichern
-                    cursor.execute("SELECT name FROM tracked_apps WHERE steam_app_id = ?", (steam_app_id,))
-                    result = cursor.fetchone()
-                    if result:
-                        old_name = result[0]
-                        
-                        # Name-Historie speichern
-                        cursor.execute("""
-                            INSERT INTO app_name_history (steam_app_id, old_name, new_name, update_source)
-                            VALUES (?, ?, ?, ?)
-                        """, (steam_app_id, old_name, new_name, 'automatic'))
-                    
-                    # Namen aktualisieren
-                    cursor.execute("""
-                        UPDATE tracked_apps 
-                        SET name = ?, last_name_update = ? 
-                        WHERE steam_app_id = ?
-                    """, (new_name, datetime.now(), steam_app_id))
-                    
-                    success = cursor.rowcount > 0
-                    conn.commit()
-                    
-                    if success:
-                        logger.info(f"✅ App-Name aktualisiert: {steam_app_id} → {new_name}")
-                    return success
-                    
+            self.write_statements([("""
+                INSERT OR REPLACE INTO cheapshark_game_map (steam_app_id, cheapshark_game_id, resolved_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, [(str(app_id), str(game_id) if game_id else None) for app_id, game_id in mapping.items()], True)])
+            
+            return len(mapping)
+            
         except Exception as e:
-            logger.error(f"❌ Fehler beim Aktualisieren des App-Namens: {e}")
-            return False
+            logger.error(f"❌ Fehler beim Speichern des CheapShark Mappings: {e}")
+            return 0
     
     def update_price(self, steam_app_id: str, game_name: str = None, price_data: Dict = None, 
                  store: str = None, timestamp = None) -> bool:
@@ -1431,12 +3752,12 @@ class DatabaseManager:
             # Fall 1: Vollständige Preisdaten mit Store/Timestamp (5 Parameter)
             if game_name and price_data and store:
                 logger.debug(f"📊 update_price: Vollständige Daten für {steam_app_id}")
-                return self.save_price_snapshot(steam_app_id, game_name, price_data)
+                return self.save_price_snapshot(steam_app_id, game_name, price_data) is not None
         
             # Fall 2: Nur Preisdaten (3 Parameter)
             elif game_name and price_data:
                 logger.debug(f"📊 update_price: Standard-Aufruf für {steam_app_id}")
-                return self.save_price_snapshot(steam_app_id, game_name, price_data)
+                return self.save_price_snapshot(steam_app_id, game_name, price_data) is not None
         
             # Fall 3: Nur steam_app_id (1 Parameter) - Minimaler Eintrag
             else:
@@ -1579,6 +3900,58 @@ class DatabaseManager:
                 'error': str(e)
             }
         
+    def iter_query(self, sql: str, params: tuple = (), chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streamt ein Abfrageergebnis zeilenweise über fetchmany (konstanter Speicher)
+
+        Args:
+            sql: SELECT-Statement
+            params: Parameter
+            chunk_size: Zeilen pro fetchmany (Standard: DB_STREAM_FETCH_SIZE)
+
+        Yields:
+            Zeilen als Dict
+        """
+        conn = self.get_connection(readonly=True)
+        cursor = conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size or STREAM_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def iter_export_rows(self, source: str, chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Streamt eine Export-Datenquelle aus EXPORT_QUERIES (z.B. 'price_snapshots')"""
+        return self.iter_query(EXPORT_QUERIES[source], chunk_size=chunk_size)
+
+    def get_es_sync_state(self) -> Dict[str, Dict[str, Any]]:
+        """High-Water-Marks des inkrementellen Elasticsearch-Syncs (index_name -> Zustand)"""
+        with self.get_connection(readonly=True) as conn:
+            return {row['index_name']: dict(row) for row in conn.execute("SELECT * FROM es_sync_state")}
+
+    def save_es_sync_watermark(self, index_name: str, source: str, watermark: int, docs: int):
+        """Speichert die neue High-Water-Mark eines Index nach erfolgreichem Sync"""
+        self.write_statements([("""
+            INSERT INTO es_sync_state (index_name, source, watermark, last_sync_at, last_docs, total_docs)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?)
+            ON CONFLICT(index_name) DO UPDATE SET
+                source = excluded.source,
+                watermark = excluded.watermark,
+                last_sync_at = excluded.last_sync_at,
+                last_docs = excluded.last_docs,
+                total_docs = es_sync_state.total_docs + excluded.last_docs
+        """, (index_name, source, watermark, docs, docs))])
+
+    def reset_es_sync_state(self, index_name: Optional[str] = None) -> int:
+        """Setzt die High-Water-Marks zurück (nächster Sync exportiert alles erneut)"""
+        if index_name:
+            return self.write_statements([("DELETE FROM es_sync_state WHERE index_name = ?", (index_name,))])[0]
+        return self.write_statements([("DELETE FROM es_sync_state", ())])[0]
+
     def get_all_price_snapshots(self) -> List[Dict[str, Any]]:
         """Gibt alle Price Snapshots zurück"""
         try:
@@ -1798,12 +4171,11 @@ class DatabaseManager:
     def get_all_tracked_apps_latest_prices(self) -> List[Dict[str, Any]]:
         """Gibt alle aktuellen Preise der getrackten Apps zurück"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tracked_apps_latest_prices ORDER BY price_timestamp DESC")
-            rows = cursor.fetchall()
-            conn.close()
-            return [dict(row) for row in rows]
+            rows = self.get_latest_prices(active_only=False)
+            for row in rows:
+                row['price_timestamp'] = row['timestamp']
+            rows.sort(key=lambda row: row['price_timestamp'] or '', reverse=True)
+            return rows
         except sqlite3.Error as e:
             print(f" Datenbankfehler bei tracked_apps_latest_prices: {e}")
             return []
@@ -1872,15 +4244,24 @@ class DatabaseBatchWriter:
     - Lock-Konflikte: 99% Reduktion
     """
     
+    PRICE_STORES = PRICE_STORES
+    
+    # Zielwert aus der Klassenbeschreibung ("25+ apps/s")
+    TARGET_PRICE_ITEMS_PER_SECOND = 25
+    
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.lock = threading.RLock()
         self.metrics_history = []
         self.total_operations = 0
         self.total_time_saved = 0.0
+        
+        # Upserts über TEMP-Staging-Tabelle + INSERT ... SELECT
+        self.use_staging = os.getenv('DB_BULK_STAGING', 'true').lower() in ['true', '1', 'yes']
 
         try:
             self._ensure_charts_schema_compatibility()
+            self.ensure_charts_prices_table()
         except Exception as e:
             logger.warning(f"Schema-Kompatibilität nicht sichergestellt: {e}")
         
@@ -1891,22 +4272,26 @@ class DatabaseBatchWriter:
         Delegiert get_connection an den db_manager
         Erforderlich für Schema-Kompatibilitätsprüfungen
         """
+        pool = getattr(self.db_manager, 'pool', None)
+        if pool is not None:
+            return pool.acquire(operation=sys._getframe(1).f_code.co_name)
         return self.db_manager.get_connection()
     
-    def batch_write_charts(self, price_data: List[Dict]) -> Dict:
+    def batch_write_charts(self, charts_data: List[Dict]) -> Dict:
         """
         Batch-Schreiboperation für Steam Charts Tracking.
 
-        Diese Methode schreibt eine Liste von Chart-Datensätzen effizient in die Tabelle steam_charts_tracking.
-        Sie ist optimiert für große Datenmengen, reduziert Datenbank-Lock-Konflikte und stellt die Schema-Kompatibilität sicher.
-        Die Methode deaktiviert temporär Foreign-Key-Constraints für maximale Performance und erstellt bei Bedarf History-Einträge für Top-100-Charts.
-        Fehlerhafte oder unvollständige Datensätze werden übersprungen und im Ergebnis protokolliert.
+        Schreibt Chart-Datensätze als Bulk-Upsert in steam_charts_tracking:
+        Validierungs-Vorlauf über alle Rows, danach ein executemany pro Tabelle
+        in einer einzigen Transaktion. Mit Staging (DB_BULK_STAGING) landen die
+        Rows zuerst in einer TEMP-Tabelle und werden per INSERT ... SELECT gemergt.
+        Für Top-100 Platzierungen werden zusätzlich charts_history Einträge geschrieben.
 
         Args:
-            charts_data (List[Dict]): Liste von Chart-Datensätzen, die gespeichert werden sollen.
+            charts_data (List[Dict]): Liste von Chart-Datensätzen (steam_app_id, chart_type, rank, name, ...)
 
         Returns:
-            Dict: Ergebnis der Batch-Operation mit Angaben zu Erfolg, Anzahl geschriebener und fehlerhafter Datensätze, Dauer und Performance.
+            Dict: Ergebnis mit geschriebenen/verworfenen Rows, Dauer und Rows/s.
         """
         try:
             from logging_config import get_database_logger
@@ -1915,78 +4300,92 @@ class DatabaseBatchWriter:
             import logging
             logger = logging.getLogger(__name__)
     
-        if not price_data:
+        if not charts_data:
             return {'success': True, 'written_count': 0}
     
-        start_time = time.time()
+        start_time = time_module.time()
     
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            if not self.ensure_charts_tracking_table():
+                return {'success': False, 'error': 'steam_charts_tracking nicht verfügbar', 'written_count': 0}
             
-                # Stelle sicher dass steam_charts_prices Tabelle existiert
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS steam_charts_prices (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        steam_app_id TEXT NOT NULL,
-                        price REAL,
-                        currency TEXT DEFAULT 'EUR',
-                        discount_percent INTEGER DEFAULT 0,
-                        original_price REAL,
-                        on_sale BOOLEAN DEFAULT 0,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        chart_source TEXT DEFAULT 'steam_charts',
-                        INDEX(steam_app_id, timestamp)
-                    )
-                ''')
+            # Validierungs-Vorlauf (ungültige Rows werden vor der Transaktion aussortiert)
+            rows, rejected = self._normalize_rows(charts_data, self._normalize_chart_row)
+            if not rows:
+                return {'success': False, 'error': 'Keine gültigen Chart-Datensätze', 'written_count': 0,
+                        'rejected_count': rejected}
             
-                written_count = 0
+            columns = ['steam_app_id', 'chart_type', 'name', 'current_rank', 'current_players', 'peak_players']
+            merge_sql = """
+                INSERT INTO steam_charts_tracking
+                (steam_app_id, chart_type, name, current_rank, current_players, peak_players,
+                 best_rank, first_seen, last_seen, updated_at, active)
+                SELECT steam_app_id, chart_type, name, current_rank, current_players, peak_players,
+                       current_rank, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1
+                FROM {source} WHERE 1
+                ON CONFLICT(steam_app_id, chart_type) DO UPDATE SET
+                    name = COALESCE(excluded.name, steam_charts_tracking.name),
+                    current_rank = excluded.current_rank,
+                    current_players = excluded.current_players,
+                    peak_players = MAX(COALESCE(steam_charts_tracking.peak_players, 0), excluded.peak_players),
+                    best_rank = MIN(COALESCE(steam_charts_tracking.best_rank, 999), excluded.current_rank),
+                    last_seen = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP,
+                    active = 1
+            """
             
-                for price_entry in price_data:
-                    try:
-                        cursor.execute("""
-                            INSERT INTO steam_charts_prices 
-                            (steam_app_id, price, currency, discount_percent, original_price, on_sale, chart_source)
-                            VALUES (?, ?, ?, ?, ?, ?, 'batch_update')
-                        """, (
-                            str(price_entry.get('steam_app_id', '')),
-                            float(price_entry.get('price', 0.0)),
-                            price_entry.get('currency', 'EUR'),
-                            int(price_entry.get('discount_percent', 0)),
-                            float(price_entry.get('original_price', price_entry.get('price', 0.0))),
-                            bool(price_entry.get('on_sale', False))
-                        ))
-                        written_count += 1
-                    except Exception as row_error:
-                        logger.debug(f"Preis-Row-Fehler: {row_error}")
-                        continue
+            statements = self._upsert_statements('steam_charts_tracking', columns, rows, merge_sql)
             
-                conn.commit()
-                duration = time.time() - start_time
+            history_rows = [(row[0], row[1], row[3]) for row in rows if row[3] <= 100]
+            if history_rows:
+                statements.append(("""
+                    INSERT INTO charts_history (steam_app_id, chart_type, rank_position)
+                    VALUES (?, ?, ?)
+                """, history_rows, True))
             
-                logger.info(f"✅ Charts Preis Batch-Write: {written_count} Preise in {duration:.2f}s")
+            self.db_manager.write_statements(statements)
             
-                return {
-                    'success': True,
-                    'written_count': written_count,
-                    'duration': duration,
-                    'table_used': 'steam_charts_prices'
-                }
+            duration = time_module.time() - start_time
+            rows_per_second = self._record_metrics('charts', len(rows), duration)
+            
+            logger.info(f"✅ Charts Batch-Write: {len(rows)} Charts in {duration:.2f}s "
+                        f"({rows_per_second:.0f} Rows/s, {rejected} verworfen)")
+            
+            return {
+                'success': True,
+                'written_count': len(rows),
+                'rejected_count': rejected,
+                'history_count': len(history_rows),
+                'duration': duration,
+                'rows_per_second': rows_per_second,
+                'table_used': 'steam_charts_tracking'
+            }
             
         except Exception as e:
-            logger.error(f"❌ Charts Preis Batch Write fehlgeschlagen: {e}")
+            logger.error(f"❌ Charts Batch Write fehlgeschlagen: {e}")
             return {'success': False, 'error': str(e), 'written_count': 0}
 
-    
-    def batch_write_prices(self, price_data: List[Dict]) -> Dict:
+    def ingest_chart(self, chart_type: str, charts_data: List[Dict], auto_track: bool = True,
+                     cleanup_days: Optional[int] = 30, fetch_duration: float = 0.0) -> Dict:
         """
-        Price Batch Writer - Nutzt ensure-Pattern
+        Set-basierte Übernahme eines vollständig abgerufenen Charts.
+
+        Der Chart landet in einer TEMP-Tabelle; danach ist jeder Schritt ein einzelnes
+        SQL-Statement, alle in einer Transaktion:
+        neue Einträge markieren, Statistik schreiben, steam_charts_tracking upserten
+        (Trend, Bestrang, Tage in den Charts), steam_charts_rank_history anhängen,
+        neue Spiele in tracked_apps übernehmen, herausgefallene Einträge deaktivieren
+        und seit cleanup_days nicht mehr gesehene Spiele kaskadierend entfernen.
 
         Args:
-            price_data (List[Dict]): Liste von Preis-Daten, die geschrieben werden sollen.
-        
+            chart_type: Chart-Typ aller Datensätze
+            charts_data: Chart-Datensätze (steam_app_id, rank, name, ...)
+            auto_track: Neue Spiele als source='charts' in tracked_apps aufnehmen
+            cleanup_days: Kaskadierendes Cleanup nach X Tagen ohne Chart-Eintrag (None = aus)
+            fetch_duration: Dauer des API-Abrufs für steam_charts_statistics
+
         Returns:
-            Dict: Ergebnis der Batch-Schreibung.
+            Dict mit total, new, updated, dropped, removed, rejected und duration
         """
         try:
             from logging_config import get_database_logger
@@ -1994,135 +4393,388 @@ class DatabaseBatchWriter:
         except ImportError:
             import logging
             logger = logging.getLogger(__name__)
-    
-        if not price_data:
-            return {
+
+        start_time = time_module.time()
+
+        try:
+            if not self.ensure_charts_tracking_table():
+                return {'success': False, 'error': 'steam_charts_tracking nicht verfügbar'}
+
+            rows, rejected = self._normalize_rows(
+                [{**item, 'chart_type': chart_type} for item in charts_data], self._normalize_chart_row
+            )
+            if not rows:
+                return {'success': False, 'error': 'Keine gültigen Chart-Datensätze', 'rejected': rejected}
+
+            staging = "staging_chart_ingest"
+            statements = [
+                (f"""
+                    CREATE TEMP TABLE IF NOT EXISTS {staging} (
+                        steam_app_id TEXT PRIMARY KEY, name TEXT, current_rank INTEGER,
+                        current_players INTEGER, peak_players INTEGER, is_new INTEGER DEFAULT 0
+                    )
+                """, ()),
+                (f"DELETE FROM {staging}", ()),
+                # Laden (Duplikate im Chart behalten ihren besten Rang)
+                (f"""
+                    INSERT INTO {staging} (steam_app_id, name, current_rank, current_players, peak_players)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(steam_app_id) DO UPDATE SET current_rank = MIN(current_rank, excluded.current_rank)
+                """, [(row[0], row[2], row[3], row[4], row[5]) for row in rows], True)
+            ]
+            # Ergebnis-Zähler über die Position ihres Statements (rowcount in write_statements)
+            new_index = len(statements)
+            statements += [
+                # Neu = noch nie in diesem Chart getrackt
+                (f"""
+                    UPDATE {staging} SET is_new = 1
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM steam_charts_tracking t
+                        WHERE t.steam_app_id = {staging}.steam_app_id AND t.chart_type = ?
+                    )
+                """, (chart_type,)),
+                (f"""
+                    INSERT INTO steam_charts_statistics
+                    (chart_type, total_games, new_games, updated_games, update_duration, api_calls)
+                    SELECT ?, COUNT(*), COALESCE(SUM(is_new), 0), COUNT(*) - COALESCE(SUM(is_new), 0), ?, 1
+                    FROM {staging}
+                """, (chart_type, fetch_duration)),
+                (f"""
+                    INSERT INTO steam_charts_tracking
+                    (steam_app_id, chart_type, name, current_rank, best_rank, current_players, peak_players,
+                     first_seen, last_seen, updated_at, active, days_on_charts, rank_trend)
+                    SELECT steam_app_id, ?, name, current_rank, current_rank, current_players, peak_players,
+                           CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1, 1, 'new'
+                    FROM {staging} WHERE 1
+                    ON CONFLICT(steam_app_id, chart_type) DO UPDATE SET
+                        name = COALESCE(excluded.name, steam_charts_tracking.name),
+                        rank_trend = CASE
+                            WHEN steam_charts_tracking.active = 0 THEN 'new'
+                            WHEN excluded.current_rank < steam_charts_tracking.current_rank THEN 'rising'
+                            WHEN excluded.current_rank > steam_charts_tracking.current_rank THEN 'falling'
+                            ELSE 'stable'
+                        END,
+                        current_rank = excluded.current_rank,
+                        best_rank = MIN(COALESCE(steam_charts_tracking.best_rank, 999), excluded.current_rank),
+                        current_players = excluded.current_players,
+                        peak_players = MAX(COALESCE(steam_charts_tracking.peak_players, 0), excluded.peak_players),
+                        days_on_charts = COALESCE(steam_charts_tracking.days_on_charts, 0)
+                            + (date(steam_charts_tracking.last_seen) < date('now')),
+                        last_seen = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP,
+                        active = 1
+                """, (chart_type,)),
+                (f"""
+                    INSERT INTO steam_charts_rank_history (steam_app_id, chart_type, rank_position)
+                    SELECT steam_app_id, ?, current_rank FROM {staging}
+                """, (chart_type,))
+            ]
+            dropped_index = len(statements)
+            statements += [
+                # Herausgefallen = aktiv im Chart, aber nicht mehr im abgerufenen Stand
+                (f"""
+                    UPDATE steam_charts_tracking
+                    SET active = 0, updated_at = CURRENT_TIMESTAMP
+                    WHERE chart_type = ? AND active = 1
+                      AND steam_app_id NOT IN (SELECT steam_app_id FROM {staging})
+                """, (chart_type,))
+            ]
+            if auto_track:
+                statements.append((f"""
+                    INSERT INTO tracked_apps (steam_app_id, name, source)
+                    SELECT steam_app_id, COALESCE(name, 'Game ' || steam_app_id), 'charts'
+                    FROM {staging} WHERE is_new = 1
+                    ON CONFLICT(steam_app_id) DO NOTHING
+                """, ()))
+            removed_index = None
+            if cleanup_days is not None:
+                statements.extend(self.chart_cleanup_statements(cleanup_days, chart_type))
+                removed_index = len(statements) - 1
+            statements.append((f"DELETE FROM {staging}", ()))
+
+            counts = self.db_manager.write_statements(statements)
+
+            total_games = len({row[0] for row in rows})
+            new_games = counts[new_index]
+            result = {
                 'success': True,
-                'total_items': 0,
-                'total_duration': 0.0,
-                'items_per_second': 0,
-                'message': 'Keine Preis-Daten zum Schreiben'
+                'chart_type': chart_type,
+                'total': total_games,
+                'new': new_games,
+                'updated': total_games - new_games,
+                'dropped': counts[dropped_index],
+                'removed': counts[removed_index] if removed_index is not None else 0,
+                'rejected': rejected,
+                'duration': time_module.time() - start_time
             }
+            self._record_metrics('charts', total_games, result['duration'])
+
+            logger.info(f"✅ Charts-Ingestion {chart_type}: {result['new']} neu, {result['updated']} aktualisiert, "
+                        f"{result['dropped']} herausgefallen, {result['removed']} entfernt ({result['duration']:.2f}s)")
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Charts-Ingestion {chart_type} fehlgeschlagen: {e}")
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def chart_cleanup_statements(days_threshold: int, chart_type: Optional[str] = None) -> List[tuple]:
+        """
+        Kaskadierendes Cleanup seit days_threshold Tagen nicht mehr gesehener Charts-Spiele
+
+        Preise und Rang-Historie werden über die Schlüssel der betroffenen Tracking-Einträge
+        gelöscht, danach die Tracking-Einträge selbst (rowcount des letzten Statements =
+        entfernte Spiele).
+
+        Args:
+            days_threshold: Tage seit last_seen
+            chart_type: Nur diesen Chart-Typ bereinigen (Standard: alle)
+
+        Returns:
+            Statement-Liste für DatabaseManager.write_statements()
+        """
+        expired = "last_seen < datetime('now', ?)" + (" AND chart_type = ?" if chart_type else "")
+        params = (f"-{int(days_threshold)} days",) + ((chart_type,) if chart_type else ())
+        return [
+            (f"""
+                DELETE FROM {table}
+                WHERE (steam_app_id, chart_type) IN (
+                    SELECT steam_app_id, chart_type FROM steam_charts_tracking WHERE {expired}
+                )
+            """, params)
+            for table in ('steam_charts_prices', 'steam_charts_rank_history')
+        ] + [(f"DELETE FROM steam_charts_tracking WHERE {expired}", params)]
+
+    # =====================================================================
+    # BULK-HILFSMETHODEN
+    # =====================================================================
     
-        start_time = time_module.time()
+    @staticmethod
+    def _normalize_rows(rows: List[Dict], normalizer) -> Tuple[List[tuple], int]:
+        """
+        Validiert und normalisiert alle Rows in einem Durchlauf vor dem Schreiben
+        
+        Args:
+            rows: Eingangs-Dictionaries
+            normalizer: Funktion dict -> Parameter-Tupel (None für ungültige Rows)
+            
+        Returns:
+            Tuple (gültige Parameter-Tupel, Anzahl verworfener Rows)
+        """
+        valid = []
+        
+        for row in rows:
+            try:
+                params = normalizer(row)
+            except (TypeError, ValueError, AttributeError):
+                params = None
+            
+            if params is not None:
+                valid.append(params)
+        
+        return valid, len(rows) - len(valid)
     
-        try:
-            # Tabelle über ensure-Methode sicherstellen
-            if not self.ensure_price_snapshots_table():
-                logger.error("❌ Price-Snapshots-Tabelle konnte nicht sichergestellt werden")
-                return {
-                    'success': False,
-                    'error': 'Price-Snapshots-Tabelle nicht verfügbar',
-                    'total_items': len(price_data),
-                    'total_duration': time_module.time() - start_time
-                }
+    @staticmethod
+    def _normalize_chart_row(item: Dict) -> Optional[tuple]:
+        """Chart-Datensatz -> (app_id, chart_type, name, rank, current_players, peak_players)"""
+        app_id = str(item.get('steam_app_id') or item.get('appid') or '').strip()
+        chart_type = str(item.get('chart_type') or '').strip()
+        if not app_id or not chart_type:
+            return None
         
-            logger.info(f"💰 Price Batch Write: {len(price_data)} Items")
+        rank = item.get('current_rank', item.get('rank'))
         
-            temp_table_name = f"temp_prices_batch_{int(time_module.time() * 1000000)}"
+        return (
+            app_id,
+            chart_type,
+            item.get('name') or item.get('game_title') or None,
+            int(rank) if rank is not None else 999,
+            int(item.get('current_players', item.get('players')) or 0),
+            int(item.get('peak_players') or 0)
+        )
+    
+    @staticmethod
+    def _normalize_price_row(price: Dict) -> Optional[tuple]:
+        """Preis-Datensatz -> Parameter-Tupel in Spaltenreihenfolge von PRICE_STORES"""
+        app_id = str(price.get('steam_app_id') or '').strip()
+        if not app_id:
+            return None
         
-            with self.get_connection() as conn:
-                # Foreign Key Constraints temporär deaktivieren für Batch-Operation
-                conn.execute("PRAGMA foreign_keys = OFF")
-                cursor = conn.cursor()
-            
-                # Temporäre Tabelle erstellen
-                cursor.execute(f"""
-                    CREATE TEMP TABLE {temp_table_name} (
-                        steam_app_id TEXT,
-                        game_title TEXT,
-                        steam_price REAL,
-                        steam_original_price REAL,
-                        steam_discount_percent INTEGER DEFAULT 0,
-                        steam_available BOOLEAN DEFAULT 0,
-                        greenmangaming_price REAL,
-                        greenmangaming_original_price REAL,
-                        greenmangaming_discount_percent INTEGER DEFAULT 0,
-                        greenmangaming_available BOOLEAN DEFAULT 0,
-                        gog_price REAL,
-                        gog_original_price REAL,
-                        gog_discount_percent INTEGER DEFAULT 0,
-                        gog_available BOOLEAN DEFAULT 0,
-                        humblestore_price REAL,
-                        humblestore_original_price REAL,
-                        humblestore_discount_percent INTEGER DEFAULT 0,
-                        humblestore_available BOOLEAN DEFAULT 0,
-                        fanatical_price REAL,
-                        fanatical_original_price REAL,
-                        fanatical_discount_percent INTEGER DEFAULT 0,
-                        fanatical_available BOOLEAN DEFAULT 0,
-                        gamesplanet_price REAL,
-                        gamesplanet_original_price REAL,
-                        gamesplanet_discount_percent INTEGER DEFAULT 0,
-                        gamesplanet_available BOOLEAN DEFAULT 0
-                    )
-                """)
-            
-                # Daten vorbereiten
-                insert_data = []
-                for price in price_data:
-                    insert_data.append((
-                        price.get('steam_app_id', ''),
-                        price.get('game_title', ''),
-                        price.get('steam_price', 0.0),
-                        price.get('steam_original_price', 0.0),
-                        price.get('steam_discount_percent', 0),
-                        price.get('steam_available', False),
-                        price.get('greenmangaming_price', 0.0),
-                        price.get('greenmangaming_original_price', 0.0),
-                        price.get('greenmangaming_discount_percent', 0),
-                        price.get('greenmangaming_available', False),
-                        price.get('gog_price', 0.0),
-                        price.get('gog_original_price', 0.0),
-                        price.get('gog_discount_percent', 0),
-                        price.get('gog_available', False),
-                        price.get('humblestore_price', 0.0),
-                        price.get('humblestore_original_price', 0.0),
-                        price.get('humblestore_discount_percent', 0),
-                        price.get('humblestore_available', False),
-                        price.get('fanatical_price', 0.0),
-                        price.get('fanatical_original_price', 0.0),
-                        price.get('fanatical_discount_percent', 0),
-                        price.get('fanatical_available', False),
-                        price.get('gamesplanet_price', 0.0),
-                        price.get('gamesplanet_original_price', 0.0),
-                        price.get('gamesplanet_discount_percent', 0),
-                        price.get('gamesplanet_available', False)
-                    ))
-            
-                # Batch-Insert in temporäre Tabelle
-                cursor.executemany(f"""
-                    INSERT INTO {temp_table_name} 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, insert_data)
-            
-                # Direkte Übertragung zu price_snapshots
-                cursor.execute(f"""
-                    INSERT OR REPLACE INTO price_snapshots 
-                    SELECT NULL as id, *, CURRENT_TIMESTAMP as timestamp
-                    FROM {temp_table_name}
-                """)
-            
-                # Cleanup
-                cursor.execute(f"DROP TABLE {temp_table_name}")
-                conn.commit()
-            
-                # Foreign Key Constraints wieder aktivieren
-                conn.execute("PRAGMA foreign_keys = ON")
-            
-                total_duration = time_module.time() - start_time
-                items_per_second = len(price_data) / total_duration if total_duration > 0 else 0
+        row = [app_id, price.get('game_title', '')]
+        
+        for store in DatabaseBatchWriter.PRICE_STORES:
+            current = price.get(f'{store}_price', 0.0)
+            original = price.get(f'{store}_original_price', 0.0)
+            row.extend((
+                float(current) if current is not None else None,
+                float(original) if original is not None else None,
+                int(price.get(f'{store}_discount_percent') or 0),
+                bool(price.get(f'{store}_available', False))
+            ))
+        
+        return tuple(row)
+    
+    @staticmethod
+    def _normalize_charts_price_row(entry: Dict) -> Optional[tuple]:
+        """Charts-Preis-Datensatz -> Parameter-Tupel für steam_charts_prices (chart_type ist Pflicht)"""
+        app_id = str(entry.get('steam_app_id') or '').strip()
+        chart_type = entry.get('chart_type')
+        if not app_id or not chart_type:
+            return None
+        
+        price = float(entry.get('price', 0.0))
+        return (
+            app_id,
+            chart_type,
+            entry.get('game_title') or entry.get('name'),
+            price,
+            float(entry.get('original_price', price)),
+            int(entry.get('discount_percent', 0)),
+            bool(entry.get('available', True))
+        )
+    
+    def _upsert_statements(self, table: str, columns: List[str], rows: List[tuple],
+                           merge_sql: str) -> List[tuple]:
+        """
+        Baut die Statements für einen Bulk-Upsert
+        
+        Mit Staging werden die Rows per executemany in eine TEMP-Tabelle geschrieben
+        und mit einem einzigen INSERT ... SELECT gemergt; ohne Staging wird das
+        Merge-Statement direkt per executemany ausgeführt.
+        
+        Args:
+            table: Zieltabelle (für den Namen der Staging-Tabelle)
+            columns: Spalten der Parameter-Tupel
+            rows: Normalisierte Parameter-Tupel
+            merge_sql: INSERT ... SELECT ... FROM {source} ... ON CONFLICT Statement
             
-                result = {
-                    'success': True,
+        Returns:
+            Statement-Liste für DatabaseManager.write_statements()
+        """
+        column_list = ', '.join(columns)
+        placeholders = ', '.join('?' * len(columns))
+        
+        if not self.use_staging:
+            values_source = f"(SELECT {', '.join(f'? AS {column}' for column in columns)})"
+            return [(merge_sql.format(source=values_source), rows, True)]
+        
+        staging = f"staging_{table}"
+        return [
+            (f"CREATE TEMP TABLE IF NOT EXISTS {staging} ({column_list})", ()),
+            (f"DELETE FROM {staging}", ()),
+            (f"INSERT INTO {staging} ({column_list}) VALUES ({placeholders})", rows, True),
+            (merge_sql.format(source=staging), ()),
+            (f"DELETE FROM {staging}", ())
+        ]
+    
+    def _record_metrics(self, operation_type: str, total_items: int, duration: float) -> float:
+        """Speichert Durchsatz-Metriken einer Batch-Operation und gibt Rows/s zurück"""
+        items_per_second = total_items / duration if duration > 0 else 0.0
+        
+        with self.lock:
+            self.metrics_history.append(BatchPerformanceMetrics(
+                operation_type=operation_type,
+                total_items=total_items,
+                total_duration=duration,
+                items_per_second=items_per_second
+            ))
+            del self.metrics_history[:-100]
+            self.total_operations += 1
+        
+        return items_per_second
+    
+    def batch_write_prices(self, price_data: List[Dict]) -> Dict:
+        """
+        Price Batch Writer - Nutzt ensure-Pattern
+
+        Args:
+            price_data (List[Dict]): Liste von Preis-Daten, die geschrieben werden sollen.
+        
+        Returns:
+            Dict: Ergebnis der Batch-Schreibung.
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        if not price_data:
+            return {
+                'success': True,
+                'total_items': 0,
+                'total_duration': 0.0,
+                'items_per_second': 0,
+                'message': 'Keine Preis-Daten zum Schreiben'
+            }
+    
+        start_time = time_module.time()
+    
+        try:
+            # Tabelle über ensure-Methode sicherstellen
+            if not self.ensure_price_snapshots_table():
+                logger.error("❌ Price-Snapshots-Tabelle konnte nicht sichergestellt werden")
+                return {
+                    'success': False,
+                    'error': 'Price-Snapshots-Tabelle nicht verfügbar',
+                    'total_items': len(price_data),
+                    'total_duration': time_module.time() - start_time
+                }
+        
+            logger.info(f"💰 Price Batch Write: {len(price_data)} Items")
+        
+            # Validierungs-Vorlauf (ungültige Rows werden vor der Transaktion aussortiert)
+            insert_data, rejected = self._normalize_rows(price_data, self._normalize_price_row)
+            if not insert_data:
+                return {
+                    'success': False,
+                    'error': 'Keine gültigen Preis-Datensätze',
                     'total_items': len(price_data),
-                    'total_duration': total_duration,
-                    'items_per_second': items_per_second,
-                    'table_used': 'price_snapshots'
+                    'rejected_count': rejected,
+                    'total_duration': time_module.time() - start_time
                 }
+        
+            # Explizite Spalten, da timestamp in price_snapshots vor den Store-Spalten steht
+            store_columns = price_store_columns()
+            target_columns = ', '.join(['steam_app_id', 'game_title'] + store_columns + ['timestamp'])
+            placeholders = ', '.join('?' * (len(store_columns) + 2))
+            app_ids = list(dict.fromkeys(row[0] for row in insert_data))
+        
+            # Lokale Zeit wie save_price_snapshot() / add_tracked_app() - kein UTC CURRENT_TIMESTAMP
+            now = datetime.now()
+        
+            # Snapshots + Tracking-Zeitpunkt als ein Job über den Single-Writer
+            stored = self.db_manager.write_price_snapshots([
+                (f"""
+                    INSERT INTO price_snapshots ({target_columns})
+                    VALUES ({placeholders}, ?)
+                """, [row + (now,) for row in insert_data], True),
+                ("""
+                    UPDATE tracked_apps 
+                    SET last_price_update = ?
+                    WHERE steam_app_id = ?
+                """, [(now, app_id) for app_id in app_ids], True)
+            ])
             
-                logger.info(f"✅ Price Batch Write: {len(price_data)} Items in {total_duration:.2f}s ({items_per_second:.1f}/s)")
-                return result
+            total_duration = time_module.time() - start_time
+            items_per_second = self._record_metrics('prices', len(insert_data), total_duration)
+        
+            # total_items: neu gespeicherte Snapshots; unveränderte Preise nur bestätigt
+            result = {
+                'success': True,
+                'total_items': stored,
+                'confirmed_count': len(insert_data) - stored,
+                'rejected_count': rejected,
+                'total_duration': total_duration,
+                'items_per_second': items_per_second,
+                'meets_target': items_per_second >= self.TARGET_PRICE_ITEMS_PER_SECOND,
+                'table_used': 'price_snapshots'
+            }
+        
+            logger.info(f"✅ Price Batch Write: {stored}/{len(insert_data)} Snapshots neu in {total_duration:.2f}s "
+                        f"({items_per_second:.1f}/s, {rejected} verworfen)")
+            return result
             
         except Exception as e:
             logger.error(f"❌ Price Batch Write fehlgeschlagen: {e}")
@@ -2135,10 +4787,10 @@ class DatabaseBatchWriter:
     
     def batch_write_charts_prices(self, price_data: List[Dict]) -> Dict:
         """
-        Charts Preis Batch Writer - KORRIGIERT (ohne INDEX-Syntaxfehler)
+        Charts Preis Batch Writer (Steam-Spalten des Multi-Store-Schemas)
     
         Args:
-            price_data: Liste von Charts-Preis-Dictionaries
+            price_data: Liste von Charts-Preis-Dictionaries (steam_app_id, chart_type, price, ...)
     
         Returns:
             Write-Result Dictionary
@@ -2156,72 +4808,31 @@ class DatabaseBatchWriter:
         start_time = time.time()
 
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-
-                # Tabelle sicherstellen - KORRIGIERTES SQL ohne INDEX
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS steam_charts_prices (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        steam_app_id TEXT NOT NULL,
-                        price REAL,
-                        currency TEXT DEFAULT 'EUR',
-                        discount_percent INTEGER DEFAULT 0,
-                        original_price REAL,
-                        on_sale BOOLEAN DEFAULT 0,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        chart_source TEXT DEFAULT 'steam_charts'
-                    )
-                ''')
-
-                # Indizes SEPARAT erstellen - das ist korrekte SQLite Syntax
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_charts_prices_app_id 
-                    ON steam_charts_prices(steam_app_id)
-                ''')
-            
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_charts_prices_timestamp 
-                    ON steam_charts_prices(timestamp)
-                ''')
-            
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_charts_prices_app_timestamp 
-                    ON steam_charts_prices(steam_app_id, timestamp)
-                ''')
-
-                written_count = 0
+            # Tabelle kommt aus ensure_charts_prices_table() (__init__) - hier kein DDL mehr;
+            # Validierungs-Vorlauf, danach ein executemany über den Single-Writer
+            rows, rejected = self._normalize_rows(price_data, self._normalize_charts_price_row)
+            if rows:
+                self.db_manager.write_statements([("""
+                    INSERT INTO steam_charts_prices 
+                    (steam_app_id, chart_type, game_title,
+                     steam_price, steam_original_price, steam_discount_percent, steam_available)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows, True)])
 
-                for price_entry in price_data:
-                    try:
-                        cursor.execute("""
-                            INSERT INTO steam_charts_prices 
-                            (steam_app_id, price, currency, discount_percent, original_price, on_sale, chart_source)
-                            VALUES (?, ?, ?, ?, ?, ?, 'batch_update')
-                        """, (
-                            str(price_entry.get('steam_app_id', '')),
-                            float(price_entry.get('price', 0.0)),
-                            price_entry.get('currency', 'EUR'),
-                            int(price_entry.get('discount_percent', 0)),
-                            float(price_entry.get('original_price', price_entry.get('price', 0.0))),
-                            bool(price_entry.get('on_sale', False))
-                        ))
-                        written_count += 1
-                    except Exception as row_error:
-                        logger.debug(f"Preis-Row-Fehler: {row_error}")
-                        continue
-
-                conn.commit()
-                duration = time.time() - start_time
+            duration = time.time() - start_time
+            rows_per_second = self._record_metrics('charts_prices', len(rows), duration)
 
-                logger.info(f"✅ Charts Preis Batch-Write: {written_count} Preise in {duration:.2f}s")
+            logger.info(f"✅ Charts Preis Batch-Write: {len(rows)} Preise in {duration:.2f}s "
+                        f"({rows_per_second:.0f} Rows/s, {rejected} verworfen)")
 
-                return {
-                    'success': True,
-                    'written_count': written_count,
-                    'duration': duration,
-                    'table_used': 'steam_charts_prices'
-                }
+            return {
+                'success': True,
+                'written_count': len(rows),
+                'rejected_count': rejected,
+                'duration': duration,
+                'rows_per_second': rows_per_second,
+                'table_used': 'steam_charts_prices'
+            }
 
         except Exception as e:
             logger.error(f"❌ Charts Preis Batch Write fehlgeschlagen: {e}")
@@ -2409,7 +5020,8 @@ class DatabaseBatchWriter:
                     "CREATE INDEX IF NOT EXISTS idx_charts_prices_app_chart ON steam_charts_prices(steam_app_id, chart_type)",
                     "CREATE INDEX IF NOT EXISTS idx_charts_prices_timestamp ON steam_charts_prices(timestamp)",
                     "CREATE INDEX IF NOT EXISTS idx_charts_prices_game_title ON steam_charts_prices(game_title)",
-                    "CREATE INDEX IF NOT EXISTS idx_charts_prices_chart_type ON steam_charts_prices(chart_type)"
+                    "CREATE INDEX IF NOT EXISTS idx_charts_prices_chart_type ON steam_charts_prices(chart_type)",
+                    f"CREATE INDEX IF NOT EXISTS idx_charts_prices_max_discount ON steam_charts_prices({CHARTS_MAX_DISCOUNT_SQL})"
                 ]
             
                 for index_sql in indices:
@@ -2491,10 +5103,19 @@ class DatabaseBatchWriter:
                         gamesplanet_price REAL,
                         gamesplanet_original_price REAL,
                         gamesplanet_discount_percent INTEGER DEFAULT 0,
-                        gamesplanet_available BOOLEAN DEFAULT 0
+                        gamesplanet_available BOOLEAN DEFAULT 0,
+                    
+                        -- Letzte Bestätigung unveränderter Preise (change-only Snapshots)
+                        last_confirmed_at TIMESTAMP
                     )
                 ''')
             
+                # Bestehende breite Tabellen nachrüsten (View hat die Spalte bereits)
+                if price_storage_layout(conn) == 'wide':
+                    cursor.execute("PRAGMA table_info(price_snapshots)")
+                    if 'last_confirmed_at' not in {row[1] for row in cursor.fetchall()}:
+                        cursor.execute("ALTER TABLE price_snapshots ADD COLUMN last_confirmed_at TIMESTAMP")
+            
                 # ===================================================
                 # PERFORMANCE-INDIZES für price_snapshots
                 # ===================================================
@@ -2519,6 +5140,329 @@ class DatabaseBatchWriter:
             logger.error(f"❌ price_snapshots Tabellen-Sicherstellung fehlgeschlagen: {e}")
             return False
 
+    def ensure_latest_prices_table(self):
+        """
+        Stellt sicher dass die materialisierte latest_prices Tabelle existiert
+    
+        Eine Zeile pro App mit allen Store-Spalten des neuesten Snapshots sowie
+        best_price/best_store/max_discount. Gepflegt wird sie über die Snapshot-Trigger
+        (ensure_price_snapshot_triggers) - dadurch läuft die Aktualisierung in
+        derselben Transaktion wie jeder Snapshot-Insert, egal über welchen Pfad.
+        Beim ersten Anlegen wird die Tabelle aus den vorhandenen Snapshots befüllt.
+    
+        Returns:
+            bool: True wenn Tabelle bereit ist, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        try:
+            store_columns = price_store_columns()
+        
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS latest_prices (
+                        steam_app_id TEXT PRIMARY KEY,
+                        game_title TEXT,
+                        snapshot_id INTEGER,
+                        timestamp TIMESTAMP,
+                        {', '.join(f"{column} {_store_column_type(column)}" for column in store_columns)},
+                        best_price REAL,
+                        best_store TEXT,
+                        max_discount INTEGER DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_latest_prices_max_discount ON latest_prices(max_discount)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_latest_prices_best_price ON latest_prices(best_price)")
+            
+                # Einmaliges Befüllen aus der bestehenden Historie
+                cursor.execute("SELECT COUNT(*) FROM latest_prices")
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute(latest_prices_upsert_sql('ps', """
+                        FROM price_snapshots ps
+                        WHERE ps.id IN (SELECT MAX(id) FROM price_snapshots GROUP BY steam_app_id)
+                    """))
+                    if cursor.rowcount > 0:
+                        logger.info(f"✅ latest_prices aus Historie befüllt: {cursor.rowcount} Apps")
+            
+                conn.commit()
+                logger.debug("✅ latest_prices Tabelle und Trigger sichergestellt")
+                return True
+            
+        except Exception as e:
+            logger.error(f"❌ latest_prices Tabellen-Sicherstellung fehlgeschlagen: {e}")
+            return False
+
+    def ensure_app_change_tracking(self):
+        """
+        Stellt Änderungssequenz (tracked_apps.change_seq) und ihre Trigger sicher
+        
+        Grundlage des inkrementellen Syncs von tracked_apps_latest_prices: beim
+        Nachrüsten bekommen alle vorhandenen Apps eine Sequenz und die gespeicherte
+        Watermark des Index wird verworfen (der nächste Sync ist vollständig).
+        
+        Returns:
+            bool: True wenn Sequenz und Trigger bereit sind, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS change_sequences (
+                        name TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tracked_app_deletions (
+                        steam_app_id TEXT PRIMARY KEY,
+                        change_seq INTEGER NOT NULL,
+                        deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute("INSERT OR IGNORE INTO change_sequences (name, value) VALUES (?, 0)",
+                               (APP_CHANGE_SEQUENCE,))
+                
+                cursor.execute("PRAGMA table_info(tracked_apps)")
+                if 'change_seq' not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE tracked_apps ADD COLUMN change_seq INTEGER DEFAULT 0")
+                    cursor.execute("UPDATE tracked_apps SET change_seq = rowid")
+                    cursor.execute('''
+                        UPDATE change_sequences
+                        SET value = (SELECT COALESCE(MAX(change_seq), 0) FROM tracked_apps)
+                        WHERE name = ?
+                    ''', (APP_CHANGE_SEQUENCE,))
+                    cursor.execute("DELETE FROM es_sync_state WHERE source = 'tracked_apps_latest_prices'")
+                    logger.info("✅ tracked_apps: change_seq Spalte hinzugefügt")
+                
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracked_apps_change_seq ON tracked_apps(change_seq)")
+                
+                for statement in tracked_app_change_triggers_sql():
+                    cursor.execute(statement)
+                
+                conn.commit()
+                logger.debug("✅ tracked_apps Änderungssequenz sichergestellt")
+                return True
+        
+        except Exception as e:
+            logger.error(f"❌ tracked_apps Änderungssequenz fehlgeschlagen: {e}")
+            return False
+
+    def ensure_store_prices_tables(self):
+        """
+        Stellt sicher dass die normalisierte Preis-Speicherung existiert
+    
+        - stores: Store-Dimension (neue Stores sind eine Zeile, keine Schema-Änderung)
+        - price_snapshot_headers: App, Titel und Zeitstempel pro Snapshot
+        - store_prices: eine Zeile pro Snapshot und Store mit Cent-Beträgen
+    
+        Returns:
+            bool: True wenn Tabellen bereit sind, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS stores (
+                        store_id INTEGER PRIMARY KEY,
+                        store_key TEXT NOT NULL UNIQUE,
+                        display_name TEXT,
+                        cheapshark_store_id TEXT
+                    )
+                ''')
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO stores (store_id, store_key, display_name, cheapshark_store_id) VALUES (?, ?, ?, ?)",
+                    STORE_DIMENSION
+                )
+            
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS price_snapshot_headers (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        steam_app_id TEXT NOT NULL,
+                        game_title TEXT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_confirmed_at TIMESTAMP
+                    )
+                ''')
+                cursor.execute("PRAGMA table_info(price_snapshot_headers)")
+                if 'last_confirmed_at' not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE price_snapshot_headers ADD COLUMN last_confirmed_at TIMESTAMP")
+            
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS store_prices (
+                        snapshot_id INTEGER NOT NULL REFERENCES price_snapshot_headers(id) ON DELETE CASCADE,
+                        store_id INTEGER NOT NULL REFERENCES stores(store_id),
+                        price_cents INTEGER,
+                        original_cents INTEGER,
+                        discount INTEGER DEFAULT 0,
+                        available BOOLEAN DEFAULT 0,
+                        PRIMARY KEY (snapshot_id, store_id)
+                    ) WITHOUT ROWID
+                ''')
+            
+                indices = [
+                    "CREATE INDEX IF NOT EXISTS idx_snapshot_headers_app_timestamp ON price_snapshot_headers(steam_app_id, timestamp)",
+                    "CREATE INDEX IF NOT EXISTS idx_snapshot_headers_timestamp ON price_snapshot_headers(timestamp)",
+                    "CREATE INDEX IF NOT EXISTS idx_store_prices_store_price ON store_prices(store_id, price_cents)"
+                ]
+            
+                for index_sql in indices:
+                    cursor.execute(index_sql)
+            
+                conn.commit()
+                logger.debug("✅ stores, price_snapshot_headers und store_prices sichergestellt")
+                return True
+            
+        except Exception as e:
+            logger.error(f"❌ store_prices Tabellen-Sicherstellung fehlgeschlagen: {e}")
+            return False
+
+    def ensure_price_snapshot_triggers(self):
+        """
+        Baut die Snapshot-Trigger passend zu Layout und PRICE_SNAPSHOT_MODE neu auf
+    
+        Wird bei jedem Start ausgeführt, damit Änderungen an Modus oder
+        Trigger-Definition ohne manuelle Migration wirksam werden.
+    
+        Returns:
+            bool: True wenn Trigger bereit sind, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        try:
+            with self.get_connection() as conn:
+                layout = price_storage_layout(conn)
+                change_only = price_snapshot_change_only()
+            
+                for statement in price_snapshot_triggers_sql(layout, change_only):
+                    conn.execute(statement)
+            
+                conn.commit()
+                logger.debug(f"✅ Snapshot-Trigger sichergestellt ({layout}, "
+                             f"{'change-only' if change_only else 'full'})")
+                return True
+            
+        except Exception as e:
+            logger.error(f"❌ Snapshot-Trigger konnten nicht erstellt werden: {e}")
+            return False
+
+    def ensure_price_rollups_table(self):
+        """
+        Stellt sicher dass price_rollups (Tages- und Wochen-Buckets je Store) existiert
+    
+        Returns:
+            bool: True wenn Tabelle bereit ist, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        try:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS price_rollups (
+                        resolution TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        steam_app_id TEXT NOT NULL,
+                        store_id INTEGER NOT NULL REFERENCES stores(store_id),
+                        bucket_start DATE NOT NULL,
+                        min_cents INTEGER,
+                        max_cents INTEGER,
+                        avg_cents REAL,
+                        last_cents INTEGER,
+                        last_original_cents INTEGER,
+                        last_discount INTEGER DEFAULT 0,
+                        samples INTEGER DEFAULT 0,
+                        last_timestamp TIMESTAMP,
+                        PRIMARY KEY (resolution, source, steam_app_id, store_id, bucket_start)
+                    ) WITHOUT ROWID
+                ''')
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_price_rollups_bucket ON price_rollups(resolution, bucket_start)"
+                )
+            
+                conn.commit()
+                logger.debug("✅ price_rollups Tabelle sichergestellt")
+                return True
+            
+        except Exception as e:
+            logger.error(f"❌ price_rollups Tabellen-Sicherstellung fehlgeschlagen: {e}")
+            return False
+
+    def ensure_hot_query_indexes(self):
+        """
+        Legt die verwalteten Indizes für die Hot Queries an (HOT_QUERY_INDEXES)
+    
+        Fehlende Tabellen und Views werden übersprungen (SQLite indiziert keine Views).
+    
+        Returns:
+            bool: True wenn alle vorhandenen Tabellen indiziert sind, False bei Fehler
+        """
+        try:
+            from logging_config import get_database_logger
+            logger = get_database_logger()
+        except ImportError:
+            import logging
+            logger = logging.getLogger(__name__)
+    
+        try:
+            with self.get_connection() as conn:
+                tables = {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                ).fetchall()}
+                
+                failed = []
+                for index_name, table, columns in HOT_QUERY_INDEXES:
+                    if table not in tables:
+                        continue
+                    try:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}{columns}")
+                    except sqlite3.OperationalError as e:
+                        failed.append(index_name)
+                        logger.warning(f"⚠️ Index {index_name} nicht erstellt: {e}")
+            
+                # Statistiken nur bei Bedarf neu erheben, damit der Planer die Indizes wählt
+                conn.execute("PRAGMA optimize")
+                conn.commit()
+                logger.debug("✅ Hot-Query Indizes sichergestellt")
+                return not failed
+            
+        except Exception as e:
+            logger.error(f"❌ Hot-Query Indizes fehlgeschlagen: {e}")
+            return False
+
     def get_schema_version(self) -> Dict[str, Any]:
         """
         Gibt aktuelle Schema-Version und Kompatibilität zurück
@@ -2595,6 +5539,10 @@ class DatabaseBatchWriter:
                 # Prüfe aktuelle Spalten
                 cursor.execute("PRAGMA table_info(steam_charts_tracking)")
                 existing_columns = {row[1] for row in cursor.fetchall()}
+
+                # Tabelle existiert noch nicht - ensure_charts_tracking_table() legt sie vollständig an
+                if not existing_columns:
+                    return
         
                 # Erforderliche Spalten definieren
                 required_columns = {
@@ -2617,10 +5565,30 @@ class DatabaseBatchWriter:
             logger.error(f"❌ Charts-Schema-Check fehlgeschlagen: {e}")
 
     def get_batch_statistics(self) -> Dict:
-        """Performance-Statistiken"""
+        """Performance-Statistiken (inkl. gemessenem Durchsatz pro Operation)"""
+        throughput = {}
+        with self.lock:
+            metrics = list(self.metrics_history)
+        
+        for metric in metrics:
+            entry = throughput.setdefault(metric.operation_type, {'operations': 0, 'rows': 0, 'duration': 0.0})
+            entry['operations'] += 1
+            entry['rows'] += metric.total_items
+            entry['duration'] += metric.total_duration
+            entry['last_rows_per_second'] = round(metric.items_per_second, 1)
+        
+        for entry in throughput.values():
+            entry['avg_rows_per_second'] = round(entry['rows'] / entry['duration'], 1) if entry['duration'] > 0 else 0.0
+            entry['duration'] = round(entry['duration'], 3)
+        
+        if 'prices' in throughput:
+            throughput['prices']['meets_target'] = throughput['prices']['avg_rows_per_second'] >= self.TARGET_PRICE_ITEMS_PER_SECOND
+        
         return {
             'status': 'active' if self.total_operations > 0 else 'no_operations',
             'total_operations': self.total_operations,
+            'throughput': throughput,
+            'staging_enabled': self.use_staging,
             'total_time_saved_seconds': self.total_time_saved,
             'performance_gains': {
                 'estimated_time_saved_minutes': self.total_time_saved / 60,
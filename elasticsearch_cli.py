@@ -27,6 +27,8 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from database_manager import DatabaseManager
+from database_manager import DOC_ID_COLUMN
+from elasticsearch_export import StreamingBulkExporter, export_sources, prepare_document, sync_incremental
 
 class DockerElasticsearchManager:
     """Manager für Elasticsearch Docker-Container"""
@@ -560,140 +562,48 @@ class ElasticsearchManager:
         
         return deleted_count
     
-    def export_sqlite_to_elasticsearch(self, db_manager) -> Dict[str, int]:
-        """Exportiert Daten aus SQLite zu Elasticsearch mit Bulk-API"""
-        stats = {
-            'price_snapshots': 0,
-            'tracked_apps': 0,
-            'name_history': 0,
-            'charts_snapshots': 0,
-            'charts_prices': 0,
-            'statistics': 0,
-            'tracked_apps_price_history': 0,
-            'tracked_apps_latest_prices': 0,
-            'total_exported': 0
-        }
+    def export_sqlite_to_elasticsearch(self, db_manager) -> Dict[str, Any]:
+        """
+        Exportiert Daten aus SQLite zu Elasticsearch (Streaming, parallele Bulk-Requests)
         
-        def prepare_record_for_elasticsearch(record):
-            """Bereitet einen Datensatz für Elasticsearch vor"""
-            # Timestamp-Felder ins ISO8601-Format bringen
-            for field in ['timestamp', 'first_tracked', 'last_updated', 'change_date', 'price_timestamp']:
-                if field in record and isinstance(record[field], str):
-                    if ' ' in record[field] and 'T' not in record[field]:
-                        record[field] = record[field].replace(' ', 'T')
-            # *_available Felder und app_active in Boolean umwandeln
-            for key in record:
-                if key.endswith('_available') or key == 'app_active':
-                    record[key] = True if str(record[key]) in ('1', 'True', 'true', 'yes') else False
-            return record
+        Returns:
+            Dokumente pro Quelle, 'total_exported' und 'index_stats' mit docs/s pro Index
+        """
+        exporter = StreamingBulkExporter(self.es)
         
-        def bulk_export_data(data, index_name, batch_size=10000):
-            """Exportiert Daten in Batches mit Bulk-API"""
-            exported_count = 0
-            total_records = len(data)
-            
-            for i in range(0, total_records, batch_size):
-                batch = data[i:i + batch_size]
-                bulk_data = []
-                
-                for record in batch:
-                    # Datensatz vorbereiten
-                    prepared_record = prepare_record_for_elasticsearch(record.copy())
-                    
-                    # Bulk-Action hinzufügen
-                    bulk_data.append({
-                        'index': {
-                            '_index': index_name
-                        }
-                    })
-                    bulk_data.append(prepared_record)
-                
-                try:
-                    # Bulk-Request senden
-                    response = self.es.bulk(operations=bulk_data, refresh=False)
-                    
-                    # Erfolgreiche Dokumente zählen
-                    if response.get('errors', False):
-                        # Einige Fehler aufgetreten
-                        for item in response['items']:
-                            if 'index' in item and item['index'].get('status', 500) < 400:
-                                exported_count += 1
-                    else:
-                        # Alle erfolgreich
-                        exported_count += len(batch)
-                    
-                    # Fortschritt anzeigen
-                    progress = min(100, (i + len(batch)) / total_records * 100)
-                    print(f"   Fortschritt: {progress:.1f}% ({i + len(batch)}/{total_records})")
-                    
-                except Exception as e:
-                    print(f" Fehler beim Bulk-Export: {e}")
-                    # Fallback: Einzelne Datensätze versuchen
-                    for record in batch:
-                        try:
-                            prepared_record = prepare_record_for_elasticsearch(record.copy())
-                            self.es.index(index=index_name, document=prepared_record)
-                            exported_count += 1
-                        except Exception as e2:
-                            print(f" Fehler beim Exportieren: {e2}")
-            
-            return exported_count
+        def rows(source):
+            return lambda: db_manager.iter_export_rows(source)
         
-        try:
-            # Price Snapshots exportieren
-            print(" Exportiere Price Snapshots...")
-            price_data = db_manager.get_all_price_snapshots()
-            stats['price_snapshots'] = bulk_export_data(price_data, self.indices['price_snapshots'])
-            
-            # Tracked Apps exportieren
-            print(" Exportiere Tracked Apps...")
-            tracked_data = db_manager.get_all_tracked_apps()
-            stats['tracked_apps'] = bulk_export_data(tracked_data, self.indices['tracked_apps'])
-            
-            # Name History exportieren
-            print(" Exportiere Name History...")
-            name_data = db_manager.get_all_name_history()
-            stats['name_history'] = bulk_export_data(name_data, self.indices['name_history'])
-            
-            # Charts Snapshots exportieren
-            print(" Exportiere Charts Snapshots...")
-            charts_data = db_manager.get_all_charts_tracking()
-            stats['charts_snapshots'] = bulk_export_data(charts_data, self.indices['charts_snapshots'])
-            
-            # Charts Prices exportieren
-            print(" Exportiere Charts Prices...")
-            charts_prices_data = db_manager.get_all_charts_prices()
-            stats['charts_prices'] = bulk_export_data(charts_prices_data, self.indices['charts_prices'])
-            
-            # Statistics exportieren
-            print(" Exportiere Statistics...")
-            stats_data = db_manager.get_all_statistics()
-            stats['statistics'] = bulk_export_data(stats_data, self.indices['statistics'])
-            
-            # Tracked Apps Price History exportieren
-            print(" Exportiere Tracked Apps Price History...")
-            price_history_data = db_manager.get_all_tracked_apps_price_history()
-            stats['tracked_apps_price_history'] = bulk_export_data(price_history_data, self.indices['tracked_apps_price_history'])
-            
-            # Tracked Apps Latest Prices exportieren
-            print(" Exportiere Tracked Apps Latest Prices...")
-            latest_prices_data = db_manager.get_all_tracked_apps_latest_prices()
-            stats['tracked_apps_latest_prices'] = bulk_export_data(latest_prices_data, self.indices['tracked_apps_latest_prices'])
-            
-            # Refresh alle Indizes
-            print(" Refreshe Indizes...")
-            for index_name in self.indices.values():
-                try:
-                    self.es.indices.refresh(index=index_name)
-                except Exception as e:
-                    print(f" Fehler beim Refreshen von {index_name}: {e}")
-            
-        except Exception as e:
-            print(f" Export-Fehler: {e}")
+        plan = [
+            (source, self.indices[source], rows(source), DOC_ID_COLUMN, prepare_document)
+            for source in ('price_snapshots', 'tracked_apps', 'name_history', 'charts_snapshots',
+                           'charts_prices', 'statistics', 'tracked_apps_price_history',
+                           'tracked_apps_latest_prices')
+        ]
+        stats = export_sources(exporter, plan)
+        
+        # Refresh alle Indizes
+        print(" Refreshe Indizes...")
+        for index_name in self.indices.values():
+            try:
+                self.es.indices.refresh(index=index_name)
+            except Exception as e:
+                print(f" Fehler beim Refreshen von {index_name}: {e}")
         
-        stats['total_exported'] = sum(v for k, v in stats.items() if k != 'total_exported')
         return stats
-
+    
+    def sync_incremental_to_elasticsearch(self, db_manager, sources: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Inkrementeller Sync: exportiert nur Zeilen oberhalb der gespeicherten High-Water-Marks
+        
+        Args:
+            db_manager: DatabaseManager
+            sources: Quellen (Standard: alle)
+            
+        Returns:
+            Neue Dokumente pro Quelle, 'total_exported', 'duration_seconds' und 'index_stats'
+        """
+        return sync_incremental(StreamingBulkExporter(self.es), db_manager, self.indices, sources)
 
 def create_elasticsearch_manager(host='localhost', port=9200, username=None, password=None) -> Optional[ElasticsearchManager]:
     """Factory-Funktion für ElasticsearchManager"""
@@ -774,6 +684,10 @@ def cmd_delete_indices(args):
     
     deleted_count = es_manager.delete_all_indices()
     print(f" {deleted_count} Indizes gelöscht")
+    
+    # Gelöschte Indizes beim nächsten Sync vollständig neu aufbauen
+    if os.path.exists(args.database):
+        DatabaseManager(args.database).reset_es_sync_state()
 
 
 def cmd_export_data(args):
@@ -800,13 +714,48 @@ def cmd_export_data(args):
     stats = es_manager.export_sqlite_to_elasticsearch(db_manager)
     
     print("\n Export-Statistiken:")
-    for key, count in stats.items():
-        if key != 'total_exported':
-            print(f"  {key}: {count} Datensätze")
+    for key, index_stats in stats['index_stats'].items():
+        print(f"  {key}: {index_stats['docs']} Datensätze ({index_stats['docs_per_second']} docs/s)")
     
     print(f"\n Gesamt exportiert: {stats['total_exported']} Datensätze")
 
 
+
+def cmd_sync_data(args):
+    """Inkrementeller Sync von SQLite zu Elasticsearch"""
+    db_manager = DatabaseManager(args.database)
+    
+    if args.reset:
+        db_manager.reset_es_sync_state()
+        print(" High-Water-Marks zurückgesetzt - vollständiger Sync")
+    
+    es_manager = create_elasticsearch_manager(args.host, args.port, args.username, args.password)
+    if not es_manager:
+        return
+    
+    def run_once():
+        stats = es_manager.sync_incremental_to_elasticsearch(db_manager)
+        for key, index_stats in stats['index_stats'].items():
+            if index_stats['status'] in ('synced', 'partial'):
+                deleted = f", {index_stats['deleted']} gelöscht" if index_stats.get('deleted') else ""
+                print(f"  {key}: {index_stats['docs']} neue Dokumente{deleted} ({index_stats['docs_per_second']} docs/s, "
+                      f"Watermark {index_stats['watermark_from']} → {index_stats['watermark_to']})")
+            elif index_stats['status'] == 'error':
+                print(f"  {key}: Fehler - {index_stats['first_error']}")
+        print(f" Sync abgeschlossen: {stats['total_exported']} Dokumente in {stats['duration_seconds']}s")
+    
+    if not args.continuous:
+        run_once()
+        return
+    
+    print(f" Kontinuierlicher Sync alle {args.interval} Minuten (Strg+C zum Beenden)")
+    try:
+        while True:
+            run_once()
+            time.sleep(args.interval * 60)
+    except KeyboardInterrupt:
+        print("\n Sync beendet")
+
 def cmd_setup(args):
     """Vollständiges Setup"""
     print(" Vollständiges Elasticsearch-Setup...")
@@ -1035,6 +984,7 @@ def main():
     # Delete Indices
     delete_parser = subparsers.add_parser('delete-indices', help='Löscht alle Indizes')
     delete_parser.add_argument('--confirm', action='store_true', help='Bestätigung überspringen')
+    delete_parser.add_argument('--database', default='steam_price_tracker.db', help='Pfad zur SQLite-Datenbank (Sync-Status)')
     delete_parser.set_defaults(func=cmd_delete_indices)
     
     # Export Data
@@ -1042,6 +992,14 @@ def main():
     export_parser.add_argument('--database', default='steam_price_tracker.db', help='Pfad zur SQLite-Datenbank')
     export_parser.set_defaults(func=cmd_export_data)
     
+    # Incremental Sync
+    sync_parser = subparsers.add_parser('sync', help='Inkrementeller Sync (nur neue/geänderte Daten)')
+    sync_parser.add_argument('--database', default='steam_price_tracker.db', help='Pfad zur SQLite-Datenbank')
+    sync_parser.add_argument('--reset', action='store_true', help='High-Water-Marks zurücksetzen (alles neu senden)')
+    sync_parser.add_argument('--continuous', action='store_true', help='Im Intervall wiederholen')
+    sync_parser.add_argument('--interval', type=int, default=15, help='Intervall in Minuten (default: 15)')
+    sync_parser.set_defaults(func=cmd_sync_data)
+    
     # Setup
     setup_parser = subparsers.add_parser('setup', help='Vollständiges Setup')
     setup_parser.add_argument('--database', default='steam_price_tracker.db', help='Pfad zur SQLite-Datenbank')
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Elasticsearch Streaming Export - SQLite Cursor → parallele Bulk-Worker
+Steam Price Tracker - Konstanter Speicher unabhängig von der Tabellengröße
+
+- Zeilen werden per fetchmany aus dem SQLite-Cursor gelesen (DatabaseManager.iter_query)
+- Dokumente werden nach Anzahl und Bytes zu NDJSON-Bulk-Requests gebündelt
+- Mehrere Worker-Threads senden parallel; eine begrenzte Queue bremst den Leser (Backpressure)
+- Report mit Dokumenten/s pro Index
+- Inkrementeller Sync über High-Water-Marks (es_sync_state) mit deterministischen IDs
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time as time_module
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database_manager import DOC_ID_COLUMN, SYNC_QUERIES
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("elasticsearch_export", "elasticsearch.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# Tunables
+ES_EXPORT_WORKERS = int(os.getenv('ES_EXPORT_WORKERS', '4'))
+ES_EXPORT_BULK_DOCS = int(os.getenv('ELASTICSEARCH_BULK_SIZE', '1000'))
+ES_EXPORT_BULK_MB = float(os.getenv('ES_EXPORT_BULK_MB', '5'))
+ES_EXPORT_QUEUE_SIZE = int(os.getenv('ES_EXPORT_QUEUE_SIZE', '0'))  # 0 = 2 × Worker
+ES_EXPORT_RETRIES = int(os.getenv('ES_EXPORT_RETRIES', '3'))
+
+TIMESTAMP_FIELDS = ('timestamp', 'first_tracked', 'last_updated', 'change_date', 'price_timestamp')
+
+def prepare_document(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bereitet einen Datensatz für Elasticsearch vor (arbeitet direkt auf dem Dict)
+
+    - SQLite-Zeitstempel ins ISO8601-Format ('YYYY-MM-DD HH:MM:SS' → 'YYYY-MM-DDTHH:MM:SS')
+    - *_available Felder und app_active als Boolean
+    """
+    for field in TIMESTAMP_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str) and ' ' in value and 'T' not in value:
+            record[field] = value.replace(' ', 'T')
+
+    for key in record:
+        if key.endswith('_available') or key == 'app_active':
+            record[key] = str(record[key]) in ('1', 'True', 'true', 'yes')
+
+    return record
+
+class StreamingBulkExporter:
+    """
+    Streamt Dokumente in parallelen Bulk-Requests zu Elasticsearch
+
+    Der aufrufende Thread liest die Zeilen, serialisiert sie und bündelt sie,
+    bis ES_EXPORT_BULK_DOCS Dokumente oder ES_EXPORT_BULK_MB erreicht sind. Die
+    fertigen Bulks landen in einer begrenzten Queue; ist sie voll, wartet der
+    Leser, bis ein Worker wieder frei ist. Im Speicher liegen damit höchstens
+    (Queue-Größe + Worker + 1) Bulks, egal wie groß die Tabelle ist.
+    """
+
+    def __init__(self, client, workers: Optional[int] = None, bulk_docs: Optional[int] = None,
+                 bulk_mb: Optional[float] = None, queue_size: Optional[int] = None,
+                 retries: Optional[int] = None):
+        """
+        Initialisiert Exporter
+
+        Args:
+            client: Elasticsearch Client
+            workers: Parallele Bulk-Worker (Standard: ES_EXPORT_WORKERS)
+            bulk_docs: Maximale Dokumente pro Bulk (Standard: ELASTICSEARCH_BULK_SIZE)
+            bulk_mb: Maximale Größe pro Bulk in MB (Standard: ES_EXPORT_BULK_MB)
+            queue_size: Wartende Bulks, bevor der Leser blockiert (Standard: 2 × Worker)
+            retries: Wiederholungen pro Bulk bei Verbindungsfehlern oder 429
+        """
+        self.client = client
+        self.workers = max(1, workers or ES_EXPORT_WORKERS)
+        self.bulk_docs = max(1, bulk_docs or ES_EXPORT_BULK_DOCS)
+        self.bulk_bytes = int((bulk_mb or ES_EXPORT_BULK_MB) * 1024 * 1024)
+        self.queue_size = queue_size or ES_EXPORT_QUEUE_SIZE or self.workers * 2
+        self.retries = ES_EXPORT_RETRIES if retries is None else retries
+
+    def export(self, index_name: str, rows: Iterable[Dict[str, Any]], id_field: Optional[str] = None,
+               transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Exportiert alle Zeilen eines Iterators in einen Index
+
+        Args:
+            index_name: Ziel-Index
+            rows: Zeilen (z.B. DatabaseManager.iter_export_rows)
+            id_field: Feld für die Dokument-ID (None = ID von Elasticsearch;
+                      DOC_ID_COLUMN wird aus dem Dokument entfernt)
+            transform: Aufbereitung pro Zeile (Standard: prepare_document)
+
+        Returns:
+            Dict mit docs, failed, bulks, bytes, duration_seconds, docs_per_second, first_error
+        """
+        transform = transform or prepare_document
+        stats = self._run(self._bulks(index_name, rows, id_field, transform))
+
+        if stats['failed']:
+            logger.warning(f"⚠️ {index_name}: {stats['failed']} Dokumente fehlgeschlagen ({stats['first_error']})")
+        logger.info(f"📤 {index_name}: {stats['docs']} Dokumente in {stats['duration_seconds']:.2f}s "
+                    f"({stats['docs_per_second']} docs/s, {stats['bulks']} Bulks)")
+        return stats
+
+    def delete(self, index_name: str, doc_ids: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Löscht Dokumente per ID in parallelen Bulk-Requests
+
+        Bereits fehlende Dokumente (404) zählen als gelöscht.
+
+        Returns:
+            Dict wie export() (docs = gelöschte Dokumente)
+        """
+        stats = self._run(self._delete_bulks(index_name, doc_ids))
+
+        if stats['failed']:
+            logger.warning(f"⚠️ {index_name}: {stats['failed']} Löschungen fehlgeschlagen ({stats['first_error']})")
+        if stats['docs']:
+            logger.info(f"🗑️ {index_name}: {stats['docs']} Dokumente gelöscht")
+        return stats
+
+    def _run(self, bulks: Iterable[Tuple[str, int]]) -> Dict[str, Any]:
+        """Verteilt fertige Bulks über die begrenzte Queue an die Worker"""
+        bulk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stats = {'docs': 0, 'failed': 0, 'bulks': 0, 'bytes': 0, 'first_error': None}
+        stats_lock = threading.Lock()
+
+        def worker():
+            while True:
+                item = bulk_queue.get()
+                if item is None:
+                    break
+                payload, doc_count = item
+                ok, failed, error = self._send(payload, doc_count)
+                with stats_lock:
+                    stats['docs'] += ok
+                    stats['failed'] += failed
+                    stats['bulks'] += 1
+                    stats['bytes'] += len(payload)
+                    if error and not stats['first_error']:
+                        stats['first_error'] = error
+
+        threads = [threading.Thread(target=worker, name=f"es-bulk-{i}", daemon=True) for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        start_time = time_module.time()
+        try:
+            for bulk in bulks:
+                bulk_queue.put(bulk)
+        finally:
+            for _ in threads:
+                bulk_queue.put(None)
+            for thread in threads:
+                thread.join()
+
+        duration = time_module.time() - start_time
+        stats['duration_seconds'] = round(duration, 3)
+        stats['docs_per_second'] = round(stats['docs'] / duration, 1) if duration > 0 else 0.0
+        return stats
+
+    def _bulks(self, index_name: str, rows: Iterable[Dict[str, Any]], id_field: Optional[str],
+               transform: Callable) -> Iterator[Tuple[str, int]]:
+        """Bündelt Zeilen nach Anzahl und Bytes zu NDJSON-Payloads"""
+        lines: List[str] = []
+        size = 0
+
+        for row in rows:
+            doc_id = row.pop(DOC_ID_COLUMN, None) if id_field == DOC_ID_COLUMN else row.get(id_field) if id_field else None
+            doc = transform(row)
+            action = {'_index': index_name}
+            if doc_id is not None:
+                action['_id'] = str(doc_id)
+
+            chunk = f"{json.dumps({'index': action})}\n{json.dumps(doc, default=str)}\n"
+            if lines and (len(lines) >= self.bulk_docs or size + len(chunk) > self.bulk_bytes):
+                yield ''.join(lines), len(lines)
+                lines, size = [], 0
+
+            lines.append(chunk)
+            size += len(chunk)
+
+        if lines:
+            yield ''.join(lines), len(lines)
+
+    def _delete_bulks(self, index_name: str, doc_ids: Iterable[Any]) -> Iterator[Tuple[str, int]]:
+        """Bündelt Lösch-Aktionen (ohne Dokument-Zeile) zu NDJSON-Payloads"""
+        lines: List[str] = []
+
+        for doc_id in doc_ids:
+            lines.append(f"{json.dumps({'delete': {'_index': index_name, '_id': str(doc_id)}})}\n")
+            if len(lines) >= self.bulk_docs:
+                yield ''.join(lines), len(lines)
+                lines = []
+
+        if lines:
+            yield ''.join(lines), len(lines)
+
+    def _send(self, payload: str, doc_count: int) -> Tuple[int, int, Optional[str]]:
+        """
+        Sendet einen Bulk-Request mit Wiederholung bei Verbindungsfehlern und 429
+
+        Returns:
+            (erfolgreiche Dokumente, fehlgeschlagene Dokumente, erster Fehler)
+        """
+        last_error = None
+
+        for attempt in range(self.retries + 1):
+            try:
+                try:
+                    response = self.client.bulk(operations=payload, refresh=False)
+                except TypeError:
+                    # Ältere Clients (7.x) kennen nur body=
+                    response = self.client.bulk(body=payload, refresh=False)
+            except Exception as e:
+                last_error = str(e)
+                if attempt < self.retries:
+                    time_module.sleep(min(30, 2 ** attempt))
+                continue
+
+            if not response.get('errors'):
+                return doc_count, 0, None
+
+            # Löschen eines fehlenden Dokuments (404 not_found) ist kein Fehler
+            failed = [
+                result for item in response.get('items', [])
+                for result in item.values()
+                if result.get('status', 500) >= 400 and result.get('result') != 'not_found'
+            ]
+            error = failed[0].get('error') if failed else None
+            return doc_count - len(failed), len(failed), json.dumps(error) if error else None
+
+        return 0, doc_count, last_error
+
+def export_sources(exporter: StreamingBulkExporter, plan: List[Tuple[str, str, Callable[[], Iterable[Dict]], Optional[str], Optional[Callable]]]) -> Dict[str, Any]:
+    """
+    Exportiert mehrere Datenquellen nacheinander (jede Quelle parallel in Bulks)
+
+    Args:
+        exporter: StreamingBulkExporter
+        plan: Liste von (Quelle, Index, Zeilen-Factory, ID-Feld, Transform)
+
+    Returns:
+        Dict Quelle -> Anzahl exportierter Dokumente, 'total_exported' und
+        'index_stats' (Quelle -> Statistik inkl. docs_per_second)
+    """
+    result: Dict[str, Any] = {'index_stats': {}}
+
+    for source, index_name, rows_factory, id_field, transform in plan:
+        print(f" Exportiere {source} → {index_name}...")
+        try:
+            stats = exporter.export(index_name, rows_factory(), id_field, transform)
+        except Exception as e:
+            # z.B. fehlende Tabelle in älteren Datenbanken
+            logger.error(f"❌ Export von {source} fehlgeschlagen: {e}")
+            stats = {'docs': 0, 'failed': 0, 'duration_seconds': 0.0, 'docs_per_second': 0.0, 'first_error': str(e)}
+
+        result[source] = stats['docs']
+        result['index_stats'][source] = stats
+        print(f"   {stats['docs']} Dokumente, {stats['docs_per_second']} docs/s"
+              + (f", {stats['failed']} fehlgeschlagen" if stats['failed'] else ""))
+
+    result['total_exported'] = sum(stats['docs'] for stats in result['index_stats'].values())
+    return result
+
+def exported_at_transform(drop_field: Optional[str] = None) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Transform, das ein Feld (z.B. die als _id genutzte Spalte) entfernt und exported_at setzt"""
+    exported_at = datetime.now().isoformat()
+
+    def transform(row: Dict[str, Any]) -> Dict[str, Any]:
+        doc = {key: value for key, value in row.items() if key != drop_field}
+        doc['exported_at'] = exported_at
+        return doc
+
+    return transform
+
+# =====================================================================
+# INKREMENTELLER SYNC
+# =====================================================================
+
+ES_SYNC_INTERVAL_MINUTES = int(os.getenv('ES_SYNC_INTERVAL_MINUTES', '15'))
+
+def _scalar(db_manager, sql: str, params: tuple = ()):
+    with db_manager.get_connection(readonly=True) as conn:
+        row = conn.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+def sync_source(exporter: StreamingBulkExporter, db_manager, source: str, index_name: str,
+                state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Synchronisiert eine Quelle aus SYNC_QUERIES ab ihrer High-Water-Mark
+
+    Die neue Watermark wird nur gespeichert, wenn alle Dokumente angekommen sind;
+    nach einem Fehler exportiert der nächste Lauf denselben Bereich erneut
+    (deterministische IDs überschreiben die bereits gesendeten Dokumente).
+    Quellen mit 'deletes' löschen danach die Dokumente entfernter Einträge.
+
+    Returns:
+        Export-Statistik plus status, deleted, watermark_from und watermark_to
+    """
+    query = SYNC_QUERIES[source]
+    empty = {'docs': 0, 'failed': 0, 'duration_seconds': 0.0, 'docs_per_second': 0.0, 'first_error': None}
+
+    if _scalar(db_manager, "SELECT 1 FROM sqlite_master WHERE name = ?", (query['table'],)) is None:
+        return {**empty, 'status': 'skipped', 'reason': f"{query['table']} existiert nicht"}
+
+    lower = int((state or {}).get('watermark') or 0)
+    upper = int(_scalar(db_manager, query['watermark']) or 0)
+
+    if upper < lower:
+        # Tabelle neu aufgebaut (IDs wieder klein) - vollständig neu synchronisieren
+        logger.warning(f"⚠️ {index_name}: Watermark {lower} > aktuelle ID {upper}, starte bei 0")
+        lower = 0
+
+    if upper == lower:
+        return {**empty, 'status': 'up_to_date', 'watermark_from': lower, 'watermark_to': upper}
+
+    stats = exporter.export(index_name, db_manager.iter_query(query['sql'], (lower, upper)),
+                            DOC_ID_COLUMN, prepare_document)
+
+    stats['deleted'] = 0
+    if query.get('deletes'):
+        deleted = exporter.delete(index_name, (row[DOC_ID_COLUMN] for row in
+                                               db_manager.iter_query(query['deletes'], (lower, upper))))
+        stats['deleted'] = deleted['docs']
+        stats['failed'] += deleted['failed']
+        stats['first_error'] = stats['first_error'] or deleted['first_error']
+
+    if stats['failed']:
+        stats['status'] = 'partial'
+    else:
+        db_manager.save_es_sync_watermark(index_name, source, upper, stats['docs'])
+        stats['status'] = 'synced'
+
+    stats['watermark_from'] = lower
+    stats['watermark_to'] = upper
+    return stats
+
+def sync_incremental(exporter: StreamingBulkExporter, db_manager, indices: Dict[str, str],
+                     sources: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Inkrementeller Sync aller (oder ausgewählter) Quellen
+
+    Args:
+        exporter: StreamingBulkExporter
+        db_manager: DatabaseManager
+        indices: Quelle -> Index-Name
+        sources: Quellen aus SYNC_QUERIES (Standard: alle mit Index)
+
+    Returns:
+        Dict Quelle -> neue Dokumente, 'total_exported', 'duration_seconds' und 'index_stats'
+    """
+    start_time = time_module.time()
+    state = db_manager.get_es_sync_state()
+    result: Dict[str, Any] = {'index_stats': {}}
+
+    for source in sources or [source for source in SYNC_QUERIES if source in indices]:
+        index_name = indices[source]
+        try:
+            stats = sync_source(exporter, db_manager, source, index_name, state.get(index_name))
+        except Exception as e:
+            logger.error(f"❌ Sync von {source} fehlgeschlagen: {e}")
+            stats = {'docs': 0, 'failed': 0, 'duration_seconds': 0.0, 'docs_per_second': 0.0,
+                     'first_error': str(e), 'status': 'error'}
+
+        result[source] = stats['docs']
+        result['index_stats'][source] = stats
+
+    result['total_exported'] = sum(stats['docs'] for stats in result['index_stats'].values())
+    result['duration_seconds'] = round(time_module.time() - start_time, 3)
+    logger.info(f"🔄 Elasticsearch Sync: {result['total_exported']} Dokumente in {result['duration_seconds']}s")
+    return result
+
+def run_continuous_sync(exporter: StreamingBulkExporter, db_manager, indices: Dict[str, str],
+                        interval_minutes: Optional[int] = None,
+                        stop_event: Optional[threading.Event] = None) -> None:
+    """Führt sync_incremental im Intervall aus, bis stop_event gesetzt wird"""
+    stop_event = stop_event or threading.Event()
+    interval = (interval_minutes or ES_SYNC_INTERVAL_MINUTES) * 60
+
+    while not stop_event.is_set():
+        try:
+            sync_incremental(exporter, db_manager, indices)
+        except Exception as e:
+            logger.error(f"❌ Elasticsearch Sync Fehler: {e}")
+        stop_event.wait(interval)
@@ -1,10 +1,11 @@
 
 import json
 import logging
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from elasticsearch_export import StreamingBulkExporter, export_sources, exported_at_transform
+
 try:
     from elasticsearch import Elasticsearch
     from elasticsearch.exceptions import ConnectionError, RequestError
@@ -26,6 +27,79 @@ class ElasticsearchConfig:
     scheme: str = "http"
     verify_certs: bool = False
 
+# Quelle -> (SELECT, Feld für die Dokument-ID); ohne ORDER BY, damit direkt aus dem Cursor gestreamt wird
+EXPORT_SOURCES = {
+    'price_snapshots': ("""
+        SELECT id, steam_app_id, game_title, timestamp, steam_price, steam_original_price,
+               steam_discount_percent, steam_available, greenmangaming_price,
+               greenmangaming_original_price, greenmangaming_discount_percent,
+               greenmangaming_available, gog_price, gog_original_price,
+               gog_discount_percent, gog_available, humblestore_price,
+               humblestore_original_price, humblestore_discount_percent,
+               humblestore_available, fanatical_price, fanatical_original_price,
+               fanatical_discount_percent, fanatical_available, gamesplanet_price,
+               gamesplanet_original_price, gamesplanet_discount_percent,
+               gamesplanet_available
+        FROM price_snapshots
+    """, 'id'),
+    'tracked_apps': ("""
+        SELECT steam_app_id, name, added_at, last_price_update, active,
+               last_name_update, name_update_attempts, source, target_price, notes
+        FROM tracked_apps
+    """, 'steam_app_id'),
+    'name_history': ("""
+        SELECT id, steam_app_id, old_name, new_name, updated_at, update_source
+        FROM app_name_history
+    """, 'id'),
+    'charts_tracking': ("""
+        SELECT id, steam_app_id, name, chart_type, current_rank, best_rank,
+               first_seen, last_seen, total_appearances, active, metadata,
+               days_in_charts, rank_trend, updated_at, peak_players, current_players
+        FROM steam_charts_tracking
+    """, 'id'),
+    'charts_prices': ("""
+        SELECT id, steam_app_id, chart_type, current_price, original_price,
+               discount_percent, store, deal_url, timestamp
+        FROM steam_charts_prices
+    """, 'id'),
+    'statistics': ("""
+        SELECT id, metric_name, metric_value, metric_unit, timestamp
+        FROM performance_metrics
+    """, 'id'),
+    'price_alerts': ("""
+        SELECT id, steam_app_id, target_price, store_name, active,
+               created_at, triggered_at
+        FROM price_alerts
+    """, 'id'),
+    'tracking_sessions': ("""
+        SELECT id, started_at, completed_at, apps_processed, apps_successful,
+               errors_count, session_type
+        FROM tracking_sessions
+    """, 'id'),
+    'charts_history': ("""
+        SELECT id, steam_app_id, chart_type, rank_position, snapshot_timestamp,
+               additional_data
+        FROM charts_history
+    """, 'id'),
+    'charts_price_snapshots': ("""
+        SELECT id, steam_app_id, game_title, timestamp, steam_price, steam_original_price,
+               steam_discount_percent, steam_available, greenmangaming_price,
+               greenmangaming_original_price, greenmangaming_discount_percent,
+               greenmangaming_available, gog_price, gog_original_price,
+               gog_discount_percent, gog_available, humblestore_price,
+               humblestore_original_price, humblestore_discount_percent,
+               humblestore_available, fanatical_price, fanatical_original_price,
+               fanatical_discount_percent, fanatical_available, gamesplanet_price,
+               gamesplanet_original_price, gamesplanet_discount_percent,
+               gamesplanet_available, is_chart_game, chart_types
+        FROM charts_price_snapshots
+    """, 'id'),
+    'performance_metrics': ("""
+        SELECT id, metric_name, metric_value, metric_unit, timestamp
+        FROM performance_metrics
+    """, 'id'),
+}
+
 class ElasticsearchManager:
     """Elasticsearch Manager für Steam Price Tracker"""
     
@@ -164,580 +238,28 @@ class ElasticsearchManager:
         
         return deleted_count
     
-    def export_sqlite_to_elasticsearch(self, db_manager) -> Dict[str, int]:
-        """SQLite Daten zu Elasticsearch exportieren"""
-        export_stats = {
-            'price_snapshots': 0,
-            'tracked_apps': 0,
-            'name_history': 0,
-            'charts_tracking': 0,
-            'charts_prices': 0,
-            'statistics': 0,
-            'price_alerts': 0,
-            'tracking_sessions': 0,
-            'charts_history': 0,
-            'charts_price_snapshots': 0,
-            'performance_metrics': 0,
-            'total_exported': 0
-        }
+    def export_sqlite_to_elasticsearch(self, db_manager) -> Dict[str, Any]:
+        """
+        SQLite Daten zu Elasticsearch exportieren (Streaming, parallele Bulk-Requests)
+        
+        Returns:
+            Dokumente pro Quelle, 'total_exported' und 'index_stats' mit docs/s pro Index
+        """
+        exporter = StreamingBulkExporter(self.client)
+        
+        def rows(query):
+            return lambda: db_manager.iter_query(query)
+        
+        plan = [
+            (source, self.indices[source], rows(query), id_field, exported_at_transform('id'))
+            for source, (query, id_field) in EXPORT_SOURCES.items()
+        ]
         
         try:
-            # Price Snapshots exportieren
-            export_stats['price_snapshots'] = self._export_price_snapshots(db_manager)
-            
-            # Tracked Apps exportieren
-            export_stats['tracked_apps'] = self._export_tracked_apps(db_manager)
-            
-            # Name History exportieren
-            export_stats['name_history'] = self._export_name_history(db_manager)
-            
-            # Charts Tracking exportieren
-            export_stats['charts_tracking'] = self._export_charts_tracking(db_manager)
-            
-            # Charts Prices exportieren
-            export_stats['charts_prices'] = self._export_charts_prices(db_manager)
-            
-            # Statistics exportieren
-            export_stats['statistics'] = self._export_statistics(db_manager)
-            
-            # Price Alerts exportieren
-            export_stats['price_alerts'] = self._export_price_alerts(db_manager)
-            
-            # Tracking Sessions exportieren
-            export_stats['tracking_sessions'] = self._export_tracking_sessions(db_manager)
-            
-            # Charts History exportieren
-            export_stats['charts_history'] = self._export_charts_history(db_manager)
-            
-            # Charts Price Snapshots exportieren
-            export_stats['charts_price_snapshots'] = self._export_charts_price_snapshots(db_manager)
-            
-            # Performance Metrics exportieren
-            export_stats['performance_metrics'] = self._export_performance_metrics(db_manager)
-            
-            # Gesamtsumme
-            export_stats['total_exported'] = sum(export_stats.values()) - export_stats['total_exported']
-            
+            return export_sources(exporter, plan)
         except Exception as e:
             logger.error(f"Export-Fehler: {e}")
             raise
-        
-        return export_stats
-    
-    def _export_price_snapshots(self, db_manager) -> int:
-        """Price Snapshots exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, game_title, timestamp, steam_price, steam_original_price, 
-                   steam_discount_percent, steam_available, greenmangaming_price, 
-                   greenmangaming_original_price, greenmangaming_discount_percent, 
-                   greenmangaming_available, gog_price, gog_original_price, 
-                   gog_discount_percent, gog_available, humblestore_price, 
-                   humblestore_original_price, humblestore_discount_percent, 
-                   humblestore_available, fanatical_price, fanatical_original_price, 
-                   fanatical_discount_percent, fanatical_available, gamesplanet_price, 
-                   gamesplanet_original_price, gamesplanet_discount_percent, 
-                   gamesplanet_available
-            FROM price_snapshots 
-            ORDER BY timestamp DESC LIMIT 10000
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['price_snapshots']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'game_title': row.get('game_title'),
-                    'timestamp': row.get('timestamp'),
-                    'steam_price': row.get('steam_price'),
-                    'steam_original_price': row.get('steam_original_price'),
-                    'steam_discount_percent': row.get('steam_discount_percent'),
-                    'steam_available': row.get('steam_available'),
-                    'greenmangaming_price': row.get('greenmangaming_price'),
-                    'greenmangaming_original_price': row.get('greenmangaming_original_price'),
-                    'greenmangaming_discount_percent': row.get('greenmangaming_discount_percent'),
-                    'greenmangaming_available': row.get('greenmangaming_available'),
-                    'gog_price': row.get('gog_price'),
-                    'gog_original_price': row.get('gog_original_price'),
-                    'gog_discount_percent': row.get('gog_discount_percent'),
-                    'gog_available': row.get('gog_available'),
-                    'humblestore_price': row.get('humblestore_price'),
-                    'humblestore_original_price': row.get('humblestore_original_price'),
-                    'humblestore_discount_percent': row.get('humblestore_discount_percent'),
-                    'humblestore_available': row.get('humblestore_available'),
-                    'fanatical_price': row.get('fanatical_price'),
-                    'fanatical_original_price': row.get('fanatical_original_price'),
-                    'fanatical_discount_percent': row.get('fanatical_discount_percent'),
-                    'fanatical_available': row.get('fanatical_available'),
-                    'gamesplanet_price': row.get('gamesplanet_price'),
-                    'gamesplanet_original_price': row.get('gamesplanet_original_price'),
-                    'gamesplanet_discount_percent': row.get('gamesplanet_discount_percent'),
-                    'gamesplanet_available': row.get('gamesplanet_available'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Price Snapshots: {e}")
-            return 0
-    
-    def _export_tracked_apps(self, db_manager) -> int:
-        """Tracked Apps exportieren"""
-        try:
-            query = """
-            SELECT steam_app_id, name, added_at, last_price_update, active, 
-                   last_name_update, name_update_attempts, source, target_price, notes
-            FROM tracked_apps
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['tracked_apps']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'name': row.get('name'),
-                    'added_at': row.get('added_at'),
-                    'last_price_update': row.get('last_price_update'),
-                    'active': row.get('active'),
-                    'last_name_update': row.get('last_name_update'),
-                    'name_update_attempts': row.get('name_update_attempts'),
-                    'source': row.get('source'),
-                    'target_price': row.get('target_price'),
-                    'notes': row.get('notes'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('steam_app_id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Tracked Apps: {e}")
-            return 0
-    
-    def _export_name_history(self, db_manager) -> int:
-        """Name History exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, old_name, new_name, updated_at, update_source
-            FROM app_name_history
-            ORDER BY updated_at DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['name_history']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'old_name': row.get('old_name'),
-                    'new_name': row.get('new_name'),
-                    'updated_at': row.get('updated_at'),
-                    'update_source': row.get('update_source'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Name History: {e}")
-            return 0
-    
-    def _export_charts_tracking(self, db_manager) -> int:
-        """Charts Tracking exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, name, chart_type, current_rank, best_rank, 
-                   first_seen, last_seen, total_appearances, active, metadata, 
-                   days_in_charts, rank_trend, updated_at, peak_players, current_players
-            FROM steam_charts_tracking
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['charts_tracking']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'name': row.get('name'),
-                    'chart_type': row.get('chart_type'),
-                    'current_rank': row.get('current_rank'),
-                    'best_rank': row.get('best_rank'),
-                    'first_seen': row.get('first_seen'),
-                    'last_seen': row.get('last_seen'),
-                    'total_appearances': row.get('total_appearances'),
-                    'active': row.get('active'),
-                    'metadata': row.get('metadata'),
-                    'days_in_charts': row.get('days_in_charts'),
-                    'rank_trend': row.get('rank_trend'),
-                    'updated_at': row.get('updated_at'),
-                    'peak_players': row.get('peak_players'),
-                    'current_players': row.get('current_players'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Charts Tracking: {e}")
-            return 0
-    
-    def _export_charts_prices(self, db_manager) -> int:
-        """Charts Prices exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, chart_type, current_price, original_price, 
-                   discount_percent, store, deal_url, timestamp
-            FROM steam_charts_prices
-            ORDER BY timestamp DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['charts_prices']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'chart_type': row.get('chart_type'),
-                    'current_price': row.get('current_price'),
-                    'original_price': row.get('original_price'),
-                    'discount_percent': row.get('discount_percent'),
-                    'store': row.get('store'),
-                    'deal_url': row.get('deal_url'),
-                    'timestamp': row.get('timestamp'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Charts Prices: {e}")
-            return 0
-    
-    def _export_statistics(self, db_manager) -> int:
-        """Statistics exportieren"""
-        try:
-            query = """
-            SELECT id, metric_name, metric_value, metric_unit, timestamp
-            FROM performance_metrics
-            ORDER BY timestamp DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['statistics']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'metric_name': row.get('metric_name'),
-                    'metric_value': row.get('metric_value'),
-                    'metric_unit': row.get('metric_unit'),
-                    'timestamp': row.get('timestamp'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Statistics: {e}")
-            return 0
-    
-    def _export_price_alerts(self, db_manager) -> int:
-        """Price Alerts exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, target_price, store_name, active, 
-                   created_at, triggered_at
-            FROM price_alerts
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['price_alerts']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'target_price': row.get('target_price'),
-                    'store_name': row.get('store_name'),
-                    'active': row.get('active'),
-                    'created_at': row.get('created_at'),
-                    'triggered_at': row.get('triggered_at'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Price Alerts: {e}")
-            return 0
-    
-    def _export_tracking_sessions(self, db_manager) -> int:
-        """Tracking Sessions exportieren"""
-        try:
-            query = """
-            SELECT id, started_at, completed_at, apps_processed, apps_successful, 
-                   errors_count, session_type
-            FROM tracking_sessions
-            ORDER BY started_at DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['tracking_sessions']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'started_at': row.get('started_at'),
-                    'completed_at': row.get('completed_at'),
-                    'apps_processed': row.get('apps_processed'),
-                    'apps_successful': row.get('apps_successful'),
-                    'errors_count': row.get('errors_count'),
-                    'session_type': row.get('session_type'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Tracking Sessions: {e}")
-            return 0
-    
-    def _export_charts_history(self, db_manager) -> int:
-        """Charts History exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, chart_type, rank_position, snapshot_timestamp, 
-                   additional_data
-            FROM charts_history
-            ORDER BY snapshot_timestamp DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['charts_history']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'chart_type': row.get('chart_type'),
-                    'rank_position': row.get('rank_position'),
-                    'snapshot_timestamp': row.get('snapshot_timestamp'),
-                    'additional_data': row.get('additional_data'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Charts History: {e}")
-            return 0
-    
-    def _export_charts_price_snapshots(self, db_manager) -> int:
-        """Charts Price Snapshots exportieren"""
-        try:
-            query = """
-            SELECT id, steam_app_id, game_title, timestamp, steam_price, steam_original_price, 
-                   steam_discount_percent, steam_available, greenmangaming_price, 
-                   greenmangaming_original_price, greenmangaming_discount_percent, 
-                   greenmangaming_available, gog_price, gog_original_price, 
-                   gog_discount_percent, gog_available, humblestore_price, 
-                   humblestore_original_price, humblestore_discount_percent, 
-                   humblestore_available, fanatical_price, fanatical_original_price, 
-                   fanatical_discount_percent, fanatical_available, gamesplanet_price, 
-                   gamesplanet_original_price, gamesplanet_discount_percent, 
-                   gamesplanet_available, is_chart_game, chart_types
-            FROM charts_price_snapshots
-            ORDER BY timestamp DESC LIMIT 10000
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['charts_price_snapshots']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'steam_app_id': row.get('steam_app_id'),
-                    'game_title': row.get('game_title'),
-                    'timestamp': row.get('timestamp'),
-                    'steam_price': row.get('steam_price'),
-                    'steam_original_price': row.get('steam_original_price'),
-                    'steam_discount_percent': row.get('steam_discount_percent'),
-                    'steam_available': row.get('steam_available'),
-                    'greenmangaming_price': row.get('greenmangaming_price'),
-                    'greenmangaming_original_price': row.get('greenmangaming_original_price'),
-                    'greenmangaming_discount_percent': row.get('greenmangaming_discount_percent'),
-                    'greenmangaming_available': row.get('greenmangaming_available'),
-                    'gog_price': row.get('gog_price'),
-                    'gog_original_price': row.get('gog_original_price'),
-                    'gog_discount_percent': row.get('gog_discount_percent'),
-                    'gog_available': row.get('gog_available'),
-                    'humblestore_price': row.get('humblestore_price'),
-                    'humblestore_original_price': row.get('humblestore_original_price'),
-                    'humblestore_discount_percent': row.get('humblestore_discount_percent'),
-                    'humblestore_available': row.get('humblestore_available'),
-                    'fanatical_price': row.get('fanatical_price'),
-                    'fanatical_original_price': row.get('fanatical_original_price'),
-                    'fanatical_discount_percent': row.get('fanatical_discount_percent'),
-                    'fanatical_available': row.get('fanatical_available'),
-                    'gamesplanet_price': row.get('gamesplanet_price'),
-                    'gamesplanet_original_price': row.get('gamesplanet_original_price'),
-                    'gamesplanet_discount_percent': row.get('gamesplanet_discount_percent'),
-                    'gamesplanet_available': row.get('gamesplanet_available'),
-                    'is_chart_game': row.get('is_chart_game'),
-                    'chart_types': row.get('chart_types'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Charts Price Snapshots: {e}")
-            return 0
-    
-    def _export_performance_metrics(self, db_manager) -> int:
-        """Performance Metrics exportieren"""
-        try:
-            query = """
-            SELECT id, metric_name, metric_value, metric_unit, timestamp
-            FROM performance_metrics
-            ORDER BY timestamp DESC
-            """
-            results = db_manager.execute_query(query)
-            
-            if not results:
-                return 0
-            
-            index_name = self.indices['performance_metrics']
-            count = 0
-            
-            for row in results:
-                doc = {
-                    'metric_name': row.get('metric_name'),
-                    'metric_value': row.get('metric_value'),
-                    'metric_unit': row.get('metric_unit'),
-                    'timestamp': row.get('timestamp'),
-                    'exported_at': datetime.now().isoformat()
-                }
-                
-                self.client.index(
-                    index=index_name,
-                    body=doc,
-                    id=row.get('id')
-                )
-                count += 1
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Exportieren von Performance Metrics: {e}")
-            return 0
     
     def _get_index_mappings(self) -> Dict[str, Dict]:
         """Index Mappings definieren"""
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Event Scheduler - Gemeinsamer, ereignisgesteuerter Scheduler-Kern
+Steam Price Tracker - Ersetzt die 60-Sekunden Polling-Schleifen aller Scheduler
+
+- Zeitlich sortierter Heap (heapq) statt periodischem Durchlaufen aller Tasks
+- Ein Dispatcher-Thread schläft per threading.Condition genau bis zum nächsten
+  fälligen Job und wird beim Hinzufügen/Entfernen/Stoppen sofort geweckt
+  (ohne Jobs: kein Timeout, keine CPU-Last im Leerlauf)
+- Jitter pro Job gegen gleichzeitige Starts mehrerer Scheduler
+- Catch-up Policies für verpasste Läufe (skip / coalesce / all)
+- Concurrency-Limits global (Worker) und pro Gruppe (z.B. 'steam_api'),
+  damit sich Scheduler nicht überlappen und dieselbe API nicht parallel fluten
+"""
+
+import heapq
+import logging
+import os
+import random
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("event_scheduler", "scheduler.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# Tunables
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '2'))
+SCHEDULER_JITTER_SECONDS = float(os.getenv('SCHEDULER_JITTER_SECONDS', '30'))
+SCHEDULER_CATCH_UP = os.getenv('SCHEDULER_CATCH_UP', 'coalesce').lower()
+SCHEDULER_MISFIRE_GRACE_SECONDS = float(os.getenv('SCHEDULER_MISFIRE_GRACE_SECONDS', '300'))
+SCHEDULER_MAX_CATCH_UP_RUNS = int(os.getenv('SCHEDULER_MAX_CATCH_UP_RUNS', '3'))
+# Gleichzeitige Läufe pro Gruppe, z.B. "steam_api=1,price_api=1" (nicht aufgeführte Gruppen: 1)
+SCHEDULER_GROUP_LIMITS = os.getenv('SCHEDULER_GROUP_LIMITS', 'steam_api=1,price_api=1,database=1,elasticsearch=1')
+
+# skip: verspätete Läufe verwerfen, coalesce: einmal nachholen, all: jeden verpassten Lauf nachholen
+CATCH_UP_POLICIES = ('skip', 'coalesce', 'all')
+
+DAY_SECONDS = 24 * 60 * 60
+
+def parse_group_limits(value: str) -> Dict[str, int]:
+    """Parst 'gruppe=limit,gruppe=limit' in ein Dict"""
+    limits = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        group, limit = item.split('=', 1)
+        try:
+            limits[group.strip()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"⚠️ Ungültiges Gruppen-Limit ignoriert: {item}")
+    return limits
+
+def _next_daily(at: str, after: float) -> float:
+    """Nächster Zeitpunkt der Uhrzeit 'HH:MM' nach after (Epoch-Sekunden, lokale Zeit)"""
+    hour, minute = (int(part) for part in at.split(':', 1))
+    base = datetime.fromtimestamp(after)
+    candidate = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate.timestamp() <= after:
+        candidate += timedelta(days=1)
+    return candidate.timestamp()
+
+# =====================================================================
+# JOB
+# =====================================================================
+
+@dataclass(eq=False)
+class ScheduledJob:
+    """Ein wiederkehrender Job im Scheduler-Kern (Zeiten als Epoch-Sekunden)"""
+    name: str
+    func: Callable[[], Any]
+    interval_seconds: Optional[float] = None
+    at: Optional[str] = None  # tägliche Uhrzeit 'HH:MM' statt Intervall
+    jitter_seconds: float = 0.0
+    catch_up: str = 'coalesce'
+    group: Optional[str] = None
+    owner: Optional[str] = None
+    nominal_run: Optional[float] = None  # Soll-Zeitpunkt im Raster (ohne Jitter)
+    next_run: Optional[float] = None  # tatsächlicher Startzeitpunkt (mit Jitter)
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_delay: Optional[float] = None  # Start-Verzögerung gegenüber next_run
+    last_error: Optional[str] = None
+    running: bool = False
+    waiting: bool = False
+    waiting_since: Optional[float] = None
+    backlog: int = 0
+    run_count: int = 0
+    missed_runs: int = 0
+    skipped_runs: int = 0
+    version: int = 0
+    removed: bool = False
+
+    def period(self) -> float:
+        return DAY_SECONDS if self.at else float(self.interval_seconds)
+
+    def next_nominal(self, now: float) -> float:
+        """Nächster Raster-Zeitpunkt nach now"""
+        if self.at:
+            return _next_daily(self.at, now)
+        nominal = self.nominal_run if self.nominal_run is not None else now
+        if nominal > now:
+            return nominal
+        steps = int((now - nominal) // self.interval_seconds) + 1
+        return nominal + steps * self.interval_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        def iso(value):
+            return datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+        return {
+            'name': self.name,
+            'owner': self.owner,
+            'group': self.group,
+            'interval_seconds': self.interval_seconds,
+            'at': self.at,
+            'catch_up': self.catch_up,
+            'jitter_seconds': self.jitter_seconds,
+            'next_run': iso(self.next_run),
+            'last_run': iso(self.last_run),
+            'last_duration': self.last_duration,
+            'last_delay': self.last_delay,
+            'last_error': self.last_error,
+            'running': self.running,
+            'waiting': self.waiting,
+            'run_count': self.run_count,
+            'missed_runs': self.missed_runs,
+            'skipped_runs': self.skipped_runs
+        }
+
+# =====================================================================
+# SCHEDULER-KERN
+# =====================================================================
+
+class EventScheduler:
+    """
+    Ereignisgesteuerter Scheduler mit Heap und Condition-Variable
+
+    Der Heap enthält (next_run, seq, version, job). Verschobene oder entfernte Jobs
+    werden nicht aus dem Heap gelöscht, sondern über die Version als veraltet
+    erkannt. Fällige Jobs starten sofort, sobald ein Worker und ein Platz in ihrer
+    Gruppe frei sind, sonst warten sie in FIFO-Reihenfolge auf das Ende eines Laufs.
+    """
+
+    def __init__(self, workers: Optional[int] = None, group_limits: Optional[Dict[str, int]] = None,
+                 misfire_grace_seconds: Optional[float] = None):
+        """
+        Initialisiert Scheduler-Kern
+
+        Args:
+            workers: Maximal gleichzeitig laufende Jobs (Standard: SCHEDULER_WORKERS)
+            group_limits: Gleichzeitige Läufe pro Gruppe (Standard: SCHEDULER_GROUP_LIMITS)
+            misfire_grace_seconds: Verspätung, ab der ein Lauf als verpasst gilt
+        """
+        self.workers = max(1, workers or SCHEDULER_WORKERS)
+        self.group_limits = parse_group_limits(SCHEDULER_GROUP_LIMITS) if group_limits is None else group_limits
+        self.misfire_grace = SCHEDULER_MISFIRE_GRACE_SECONDS if misfire_grace_seconds is None else misfire_grace_seconds
+
+        self.condition = threading.Condition()
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[tuple] = []
+        self._seq = 0
+        self._waiting: List[ScheduledJob] = []
+        self._active = 0
+        self._group_active: Dict[str, int] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {
+            'wakeups': 0,
+            'started': 0,
+            'completed': 0,
+            'failed': 0,
+            'skipped': 0,
+            'deferred': 0,
+            'max_delay_seconds': 0.0
+        }
+
+    # -----------------------------------------------------------------
+    # Lebenszyklus
+    # -----------------------------------------------------------------
+
+    def start(self):
+        """Startet Dispatcher-Thread und Worker-Pool (idempotent)"""
+        with self.condition:
+            if self._running:
+                return
+            self._running = True
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scheduler-job')
+            self._thread = threading.Thread(target=self._dispatch_loop, name='EventScheduler', daemon=True)
+            self._thread.start()
+        logger.info(f"🚀 Event Scheduler gestartet ({self.workers} Worker, Gruppen: {self.group_limits})")
+
+    def stop(self, wait: bool = True):
+        """Stoppt den Dispatcher; laufende Jobs werden zu Ende ausgeführt"""
+        with self.condition:
+            if not self._running:
+                return
+            self._running = False
+            self.condition.notify_all()
+            thread, pool = self._thread, self._pool
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if pool:
+            pool.shutdown(wait=wait)
+        logger.info("⏹️ Event Scheduler gestoppt")
+
+    def is_running(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    # -----------------------------------------------------------------
+    # Jobs verwalten
+    # -----------------------------------------------------------------
+
+    def add_job(self, name: str, func: Callable[[], Any], interval_seconds: Optional[float] = None,
+                at: Optional[str] = None, run_immediately: bool = False,
+                jitter_seconds: Optional[float] = None, catch_up: Optional[str] = None,
+                group: Optional[str] = None, owner: Optional[str] = None) -> ScheduledJob:
+        """
+        Plant einen wiederkehrenden Job (ersetzt einen gleichnamigen Job)
+
+        Args:
+            name: Eindeutiger Job-Name
+            func: Aufruf ohne Argumente
+            interval_seconds: Intervall (oder at)
+            at: Tägliche Uhrzeit 'HH:MM'
+            run_immediately: Ersten Lauf sofort statt nach einem Intervall
+            jitter_seconds: Zufällige Verzögerung 0..jitter pro Lauf (Standard: SCHEDULER_JITTER_SECONDS)
+            catch_up: 'skip', 'coalesce' oder 'all' (Standard: SCHEDULER_CATCH_UP)
+            group: Concurrency-Gruppe (z.B. 'steam_api'); None = nur globales Worker-Limit
+            owner: Besitzer für remove_jobs/get_jobs
+
+        Returns:
+            Geplanter ScheduledJob
+        """
+        if not interval_seconds and not at:
+            raise ValueError(f"Job '{name}' benötigt interval_seconds oder at")
+
+        catch_up = (catch_up or SCHEDULER_CATCH_UP).lower()
+        if catch_up not in CATCH_UP_POLICIES:
+            logger.warning(f"⚠️ Unbekannte Catch-up Policy '{catch_up}' für {name} - verwende 'coalesce'")
+            catch_up = 'coalesce'
+
+        job = ScheduledJob(
+            name=name,
+            func=func,
+            interval_seconds=float(interval_seconds) if interval_seconds else None,
+            at=at,
+            jitter_seconds=SCHEDULER_JITTER_SECONDS if jitter_seconds is None else max(0.0, jitter_seconds),
+            catch_up=catch_up,
+            group=group,
+            owner=owner
+        )
+
+        with self.condition:
+            previous = self.jobs.get(name)
+            if previous:
+                self._discard(previous)
+
+            now = time_module.time()
+            if run_immediately:
+                first_run = now
+            elif at:
+                first_run = _next_daily(at, now)
+            else:
+                first_run = now + job.interval_seconds
+
+            self.jobs[name] = job
+            self._push(job, first_run)
+            self.condition.notify_all()
+
+        logger.debug(f"📅 Job '{name}' geplant für {datetime.fromtimestamp(job.next_run):%Y-%m-%d %H:%M:%S}")
+        self.start()
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        """Entfernt einen Job; ein laufender Lauf wird noch beendet"""
+        with self.condition:
+            job = self.jobs.get(name)
+            if not job:
+                return False
+            self._discard(job)
+            self.condition.notify_all()
+            return True
+
+    def remove_jobs(self, owner: str) -> int:
+        """Entfernt alle Jobs eines Besitzers"""
+        with self.condition:
+            jobs = [job for job in self.jobs.values() if job.owner == owner]
+            for job in jobs:
+                self._discard(job)
+            self.condition.notify_all()
+            return len(jobs)
+
+    def run_job_now(self, name: str) -> bool:
+        """Zieht den nächsten Lauf eines Jobs auf jetzt vor"""
+        with self.condition:
+            job = self.jobs.get(name)
+            if not job:
+                return False
+            job.nominal_run = time_module.time()
+            self._push(job, job.nominal_run, jitter=False)
+            self.condition.notify_all()
+            return True
+
+    def get_job(self, name: str) -> Optional[ScheduledJob]:
+        with self.condition:
+            return self.jobs.get(name)
+
+    def get_jobs(self, owner: Optional[str] = None) -> List[ScheduledJob]:
+        with self.condition:
+            return sorted((job for job in self.jobs.values() if owner is None or job.owner == owner),
+                          key=lambda job: job.next_run or 0)
+
+    def next_run(self, owner: Optional[str] = None) -> Optional[datetime]:
+        """Nächster geplanter Start (optional nur für einen Besitzer)"""
+        jobs = [job for job in self.get_jobs(owner) if job.next_run]
+        return datetime.fromtimestamp(jobs[0].next_run) if jobs else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.condition:
+            return {
+                'running': self.is_running(),
+                'workers': self.workers,
+                'active': self._active,
+                'waiting': len(self._waiting),
+                'jobs': len(self.jobs),
+                'group_limits': dict(self.group_limits),
+                'group_active': {group: count for group, count in self._group_active.items() if count},
+                **self.stats
+            }
+
+    # -----------------------------------------------------------------
+    # Intern (alle _-Methoden außer _dispatch_loop/_run_job mit gehaltenem Lock)
+    # -----------------------------------------------------------------
+
+    def _push(self, job: ScheduledJob, nominal: float, jitter: bool = True):
+        job.version += 1
+        job.nominal_run = nominal
+        job.next_run = nominal + (random.uniform(0, job.jitter_seconds) if jitter and job.jitter_seconds else 0.0)
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_run, self._seq, job.version, job))
+
+    def _discard(self, job: ScheduledJob):
+        job.removed = True
+        job.version += 1
+        job.next_run = None
+        self.jobs.pop(job.name, None)
+        if job in self._waiting:
+            self._waiting.remove(job)
+            job.waiting = False
+
+    def _dispatch_loop(self):
+        logger.info("🔄 Event Scheduler Dispatcher gestartet")
+
+        with self.condition:
+            while self._running:
+                now = time_module.time()
+
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, version, job = heapq.heappop(self._heap)
+                    if job.removed or version != job.version:
+                        continue
+                    self._fire(job, now)
+
+                # Veraltete Einträge entfernen, damit sie keine unnötigen Wakeups auslösen
+                while self._heap and (self._heap[0][3].removed or self._heap[0][2] != self._heap[0][3].version):
+                    heapq.heappop(self._heap)
+
+                # Schlafen bis zum nächsten Job; ohne Jobs nur Aufwachen per notify
+                timeout = self._heap[0][0] - now if self._heap else None
+                self.condition.wait(timeout)
+                self.stats['wakeups'] += 1
+
+        logger.info("⏹️ Event Scheduler Dispatcher beendet")
+
+    def _fire(self, job: ScheduledJob, now: float):
+        """Wendet Catch-up Policy und Overlap-Regeln auf einen fälligen Job an"""
+        due = job.nominal_run
+        scheduled_for = job.next_run
+
+        if job.running or job.waiting:
+            # Vorheriger Lauf noch aktiv: keine parallele Instanz desselben Jobs
+            if job.catch_up == 'all':
+                job.backlog = min(job.backlog + 1, SCHEDULER_MAX_CATCH_UP_RUNS)
+            else:
+                job.skipped_runs += 1
+                self.stats['skipped'] += 1
+            self._push(job, job.next_nominal(now))
+            return
+
+        lateness = now - scheduled_for
+        if lateness > self.misfire_grace:
+            missed = int((now - due) // job.period())
+            if job.catch_up == 'skip':
+                job.skipped_runs += 1 + missed
+                self.stats['skipped'] += 1 + missed
+                logger.info(f"⏭️ Job '{job.name}' {lateness:.0f}s verspätet - übersprungen")
+                self._push(job, job.next_nominal(now))
+                return
+            job.missed_runs += missed
+            if job.catch_up == 'all':
+                job.backlog = min(job.backlog + missed, SCHEDULER_MAX_CATCH_UP_RUNS)
+            logger.info(f"⏰ Job '{job.name}' {lateness:.0f}s verspätet ({missed} verpasste Läufe, {job.catch_up})")
+
+        self._push(job, job.next_nominal(now))
+        self._start_or_wait(job, scheduled_for)
+
+    def _has_capacity(self, job: ScheduledJob) -> bool:
+        if self._active >= self.workers:
+            return False
+        if job.group is None:
+            return True
+        return self._group_active.get(job.group, 0) < self.group_limits.get(job.group, 1)
+
+    def _start_or_wait(self, job: ScheduledJob, scheduled_for: float):
+        if self._has_capacity(job):
+            self._launch(job, scheduled_for)
+        else:
+            job.waiting = True
+            job.waiting_since = scheduled_for
+            self._waiting.append(job)
+            self.stats['deferred'] += 1
+            logger.debug(f"⏳ Job '{job.name}' wartet auf freien Platz (Gruppe: {job.group})")
+
+    def _launch(self, job: ScheduledJob, scheduled_for: float):
+        job.running = True
+        job.waiting = False
+        job.last_delay = round(max(0.0, time_module.time() - scheduled_for), 3)
+        self.stats['max_delay_seconds'] = max(self.stats['max_delay_seconds'], job.last_delay)
+        self._active += 1
+        if job.group:
+            self._group_active[job.group] = self._group_active.get(job.group, 0) + 1
+        self.stats['started'] += 1
+        self._pool.submit(self._run_job, job)
+
+    def _drain_waiting(self):
+        if not self._running:
+            return
+        now = time_module.time()
+        for job in list(self._waiting):
+            if self._active >= self.workers:
+                break
+            if not self._has_capacity(job):
+                continue
+            self._waiting.remove(job)
+            if job.catch_up == 'skip' and now - job.waiting_since > self.misfire_grace:
+                # Zu lange auf einen freien Platz gewartet - Lauf verwerfen
+                job.waiting = False
+                job.skipped_runs += 1
+                self.stats['skipped'] += 1
+                continue
+            self._launch(job, job.waiting_since)
+
+    def _run_job(self, job: ScheduledJob):
+        started = time_module.time()
+        job.last_run = started
+        error = None
+
+        try:
+            job.func()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ Job '{job.name}' fehlgeschlagen: {e}")
+
+        with self.condition:
+            job.running = False
+            job.last_duration = round(time_module.time() - started, 3)
+            job.last_error = error
+            job.run_count += 1
+            self._active -= 1
+            if job.group:
+                self._group_active[job.group] -= 1
+            self.stats['failed' if error else 'completed'] += 1
+
+            if job.backlog and not job.removed and self._running:
+                job.backlog -= 1
+                self._start_or_wait(job, time_module.time())
+            self._drain_waiting()
+            self.condition.notify_all()
+
+# =====================================================================
+# PROZESSWEITER SCHEDULER
+# =====================================================================
+
+_event_scheduler: Optional[EventScheduler] = None
+_event_scheduler_lock = threading.Lock()
+
+def get_event_scheduler() -> EventScheduler:
+    """Prozessweiter Scheduler-Kern, geteilt von Background Scheduler, Price Tracker und Charts Manager"""
+    global _event_scheduler
+    with _event_scheduler_lock:
+        if _event_scheduler is None:
+            _event_scheduler = EventScheduler()
+        return _event_scheduler
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache - Persistenter Response-Cache für appdetails und CheapShark
+Steam Price Tracker - Vermeidet doppelte Abrufe durch Charts-, Scheduler- und manuelle Updates
+
+- SQLite-Datei als Speicher (überlebt Prozess-Neustarts)
+- Schlüssel: URL + sortierte Query-Parameter
+- Frische pro Endpoint konfigurierbar (HTTP_CACHE_TTL_*)
+- Revalidierung via If-None-Match / If-Modified-Since (304)
+- LRU-Verdrängung bei Überschreitung von HTTP_CACHE_MAX_MB
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time as time_module
+from pathlib import Path
+from typing import Dict, Optional, Any
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("http_cache", "http_cache.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# FRISCHE PRO ENDPOINT
+# =====================================================================
+
+# (host, path-prefix) -> (env-Variable, Standard-Frische in Sekunden)
+ENDPOINT_FRESHNESS = {
+    ('store.steampowered.com', '/api/appdetails'): ('HTTP_CACHE_TTL_APPDETAILS', 600),
+    ('www.cheapshark.com', '/api/1.0/games'): ('HTTP_CACHE_TTL_CHEAPSHARK', 900),
+}
+
+# appdetails-Responses mit "success": false werden nicht gespeichert (oft nur vorübergehend)
+APPDETAILS_HOST_PATH = ('store.steampowered.com', '/api/appdetails')
+
+# Header, die mit der Response gespeichert werden
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+class HTTPResponseCache:
+    """
+    Persistenter, größenbegrenzter HTTP Response-Cache
+
+    Gespeichert werden nur 200-Responses von Endpoints aus ENDPOINT_FRESHNESS,
+    appdetails nur wenn alle enthaltenen Apps "success": true melden.
+    Abgelaufene Einträge mit ETag/Last-Modified werden per Conditional Request
+    revalidiert; ein 304 verlängert den Eintrag ohne erneuten Download.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_size_mb: Optional[float] = None):
+        """
+        Initialisiert Response-Cache
+
+        Args:
+            db_path: Pfad zur Cache-Datenbank (Standard: HTTP_CACHE_PATH)
+            max_size_mb: Maximale Größe aller Bodies in MB (Standard: HTTP_CACHE_MAX_MB)
+        """
+        self.db_path = db_path or os.getenv('HTTP_CACHE_PATH', 'cache/http_cache.db')
+        self.max_size_bytes = int(float(max_size_mb or os.getenv('HTTP_CACHE_MAX_MB', '64')) * 1024 * 1024)
+        self.lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_responses (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size_bytes INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_http_responses_access ON http_responses(last_access)")
+        self.conn.commit()
+
+        row = self.conn.execute("SELECT COALESCE(SUM(size_bytes), 0), COUNT(*) FROM http_responses").fetchone()
+        self.total_size = row[0]
+
+        # Statistiken
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+
+        logger.info(f"✅ HTTP Response-Cache: {self.db_path} ({row[1]} Einträge, "
+                    f"{self.total_size / 1024 / 1024:.1f}/{self.max_size_bytes / 1024 / 1024:.0f} MB)")
+
+    # =====================================================================
+    # SCHLÜSSEL / FRISCHE
+    # =====================================================================
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Erzeugt Cache-Schlüssel aus URL und sortierten Parametern"""
+        normalized = json.dumps(
+            {str(k): str(v) for k, v in (params or {}).items()},
+            sort_keys=True
+        )
+        return hashlib.sha256(f"GET {url} {normalized}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def freshness_for(url: str) -> Optional[int]:
+        """
+        Frische in Sekunden für einen Endpoint
+
+        URLs eines Stand-in Servers (config.upstream_url_aliases) zählen wie die des ersetzten Upstreams.
+
+        Returns:
+            Sekunden oder None wenn der Endpoint nicht gecacht wird
+        """
+        host, path = HTTPResponseCache._host_and_path(url)
+
+        for (rule_host, path_prefix), (env_name, default_ttl) in ENDPOINT_FRESHNESS.items():
+            if host == rule_host and path.startswith(path_prefix):
+                try:
+                    return int(os.getenv(env_name, str(default_ttl)))
+                except ValueError:
+                    return default_ttl
+
+        return None
+
+    @staticmethod
+    def _host_and_path(url: str) -> tuple:
+        """Host und Pfad der (kanonischen) Upstream-URL"""
+        try:
+            from config import canonical_upstream_url
+            url = canonical_upstream_url(url)
+        except ImportError:
+            pass
+
+        parsed = urlparse(url)
+        return (parsed.hostname or '').lower(), parsed.path
+
+    @staticmethod
+    def is_cacheable(url: str, response: requests.Response) -> bool:
+        """
+        Prüft ob eine 200-Response gespeichert werden darf
+
+        appdetails liefert für einzelne Apps gelegentlich vorübergehend "success": false;
+        solche Bodies würden den Preis bis zum Ablauf des Eintrags verdecken.
+        """
+        host, path = HTTPResponseCache._host_and_path(url)
+        if host != APPDETAILS_HOST_PATH[0] or not path.startswith(APPDETAILS_HOST_PATH[1]):
+            return True
+
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+
+        if not isinstance(data, dict):
+            return False
+
+        return all(isinstance(entry, dict) and entry.get('success', False) for entry in data.values())
+
+    # =====================================================================
+    # LESEN / SCHREIBEN
+    # =====================================================================
+
+    def lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Liest Cache-Eintrag (ohne Frische-Prüfung)"""
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT url, status_code, headers, body, etag, last_modified, stored_at
+                FROM http_responses WHERE cache_key = ?
+            """, (cache_key,)).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            'cache_key': cache_key,
+            'url': row[0],
+            'status_code': row[1],
+            'headers': json.loads(row[2] or '{}'),
+            'body': row[3],
+            'etag': row[4],
+            'last_modified': row[5],
+            'stored_at': row[6]
+        }
+
+    def get_fresh(self, cache_key: str, ttl_seconds: int) -> Optional[requests.Response]:
+        """
+        Gibt gecachte Response zurück, wenn der Eintrag noch frisch ist
+
+        Returns:
+            requests.Response (from_cache=True) oder None
+        """
+        entry = self.lookup(cache_key)
+
+        if entry and time_module.time() - entry['stored_at'] < ttl_seconds:
+            self._touch(cache_key, refresh=False)
+            with self.lock:
+                self.hits += 1
+            return self._to_response(entry)
+
+        return None
+
+    def conditional_headers(self, cache_key: str) -> Dict[str, str]:
+        """Header für Revalidierung eines abgelaufenen Eintrags"""
+        entry = self.lookup(cache_key)
+        headers = {}
+
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+    def handle_response(self, cache_key: str, url: str, response: requests.Response) -> requests.Response:
+        """
+        Verarbeitet Upstream-Response: speichert 200, beantwortet 304 aus dem Cache
+
+        Returns:
+            Response für den Aufrufer
+        """
+        if response.status_code == 304:
+            entry = self.lookup(cache_key)
+            if entry:
+                self._touch(cache_key, refresh=True)
+                with self.lock:
+                    self.revalidated += 1
+                return self._to_response(entry)
+
+        with self.lock:
+            self.misses += 1
+
+        if response.status_code == 200 and self.is_cacheable(url, response):
+            self.store(cache_key, url, response)
+
+        return response
+
+    def store(self, cache_key: str, url: str, response: requests.Response):
+        """Speichert 200-Response und verdrängt ggf. alte Einträge (LRU)"""
+        body = response.content or b''
+        size = len(body)
+
+        if size > self.max_size_bytes:
+            return
+
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        now = time_module.time()
+
+        try:
+            with self.lock:
+                old = self.conn.execute(
+                    "SELECT size_bytes FROM http_responses WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO http_responses
+                    (cache_key, url, status_code, headers, body, etag, last_modified, stored_at, last_access, size_bytes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (cache_key, url, response.status_code, json.dumps(headers), sqlite3.Binary(body),
+                      headers.get('ETag'), headers.get('Last-Modified'), now, now, size))
+
+                self.total_size += size - (old[0] if old else 0)
+                self.stores += 1
+
+                if self.total_size > self.max_size_bytes:
+                    self._evict()
+
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            logger.debug(f"⚠️ HTTP Cache Schreibfehler: {e}")
+
+    def _evict(self):
+        """Entfernt am längsten nicht genutzte Einträge bis 90% der Maximalgröße (Lock muss gehalten werden)"""
+        target = int(self.max_size_bytes * 0.9)
+        cursor = self.conn.execute("SELECT cache_key, size_bytes FROM http_responses ORDER BY last_access ASC")
+
+        evicted_keys = []
+        for cache_key, size in cursor:
+            if self.total_size <= target:
+                break
+            evicted_keys.append((cache_key,))
+            self.total_size -= size
+
+        self.conn.executemany("DELETE FROM http_responses WHERE cache_key = ?", evicted_keys)
+        self.evictions += len(evicted_keys)
+        logger.debug(f"🗑️ HTTP Cache: {len(evicted_keys)} Einträge verdrängt")
+
+    def _touch(self, cache_key: str, refresh: bool):
+        """Aktualisiert LRU-Zeitstempel (und bei Revalidierung auch stored_at)"""
+        now = time_module.time()
+
+        try:
+            with self.lock:
+                if refresh:
+                    self.conn.execute(
+                        "UPDATE http_responses SET stored_at = ?, last_access = ? WHERE cache_key = ?",
+                        (now, now, cache_key)
+                    )
+                else:
+                    self.conn.execute(
+                        "UPDATE http_responses SET last_access = ? WHERE cache_key = ?",
+                        (now, cache_key)
+                    )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"⚠️ HTTP Cache Zugriffszeit nicht aktualisiert: {e}")
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any]) -> requests.Response:
+        """Baut requests.Response aus einem Cache-Eintrag"""
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response._content = bytes(entry['body'] or b'')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = entry['url']
+        response.encoding = 'utf-8'
+        response.from_cache = True
+        return response
+
+    # =====================================================================
+    # VERWALTUNG
+    # =====================================================================
+
+    def clear(self) -> int:
+        """Leert den Cache komplett"""
+        with self.lock:
+            deleted = self.conn.execute("DELETE FROM http_responses").rowcount
+            self.conn.commit()
+            self.total_size = 0
+
+        logger.info(f"🗑️ HTTP Cache geleert: {deleted} Einträge")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Cache-Statistiken zurück (inkl. Hit-Rate)"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM http_responses").fetchone()[0]
+            served = self.hits + self.revalidated
+            lookups = served + self.misses
+
+            return {
+                'entries': entries,
+                'size_mb': round(self.total_size / 1024 / 1024, 2),
+                'max_size_mb': round(self.max_size_bytes / 1024 / 1024, 2),
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': round(served / lookups * 100, 1) if lookups else 0.0
+            }
+
+# =====================================================================
+# GLOBALE INSTANZ
+# =====================================================================
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+def get_http_cache() -> Optional[HTTPResponseCache]:
+    """
+    Gibt den prozessweit geteilten Response-Cache zurück
+
+    Returns:
+        HTTPResponseCache oder None wenn deaktiviert (HTTP_CACHE_ENABLED=false)
+    """
+    global _http_cache
+
+    if os.getenv('HTTP_CACHE_ENABLED', 'true').lower() not in ['true', '1', 'yes']:
+        return None
+
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                try:
+                    _http_cache = HTTPResponseCache()
+                except Exception as e:
+                    logger.warning(f"⚠️ HTTP Response-Cache nicht verfügbar: {e}")
+                    return None
+
+    return _http_cache
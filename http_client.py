@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Gemeinsame, gepoolte HTTP-Schicht für alle Fetcher
+Steam Price Tracker - Keep-Alive Sessions statt einzelner requests.get() Aufrufe
+
+- Ein Connection-Pool pro Host mit festem Limit (pool_block)
+- Retries und Timeouts aus SteamAPIConfig / CheapSharkConfig (config.py)
+- Rate Limiting über die gemeinsamen Token-Buckets aus rate_limiter.py
+- Pool-Hit/Miss Zähler für Performance-Auswertung
+- Optionaler persistenter Response-Cache (http_cache.py) pro Aufruf
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import get_host_limiter, _host_from
+from http_cache import get_http_cache
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("http_client", "http_client.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# Fallback für Hosts ohne eigene Konfiguration
+DEFAULT_HOST_SETTINGS = {
+    'timeout_seconds': 15,
+    'retry_attempts': 2,
+    'pool_maxsize': 4
+}
+
+class PooledHTTPClient:
+    """
+    Gepoolter HTTP Client für Steam, CheapShark und weitere Hosts
+
+    Jeder konfigurierte Host bekommt einen eigenen HTTPAdapter. Dadurch gelten
+    Connection-Limits, Retries und Timeouts pro Host, während alle Manager im
+    Prozess dieselben Keep-Alive Verbindungen teilen.
+    """
+
+    def __init__(self, user_agent: Optional[str] = None):
+        """
+        Initialisiert HTTP Client
+
+        Args:
+            user_agent: User-Agent Header (Standard: USER_AGENT aus .env)
+        """
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent or os.getenv('USER_AGENT', 'SteamPriceTracker/1.1')
+        })
+
+        self.lock = threading.Lock()
+        self.host_settings: Dict[str, Dict[str, Any]] = {}
+        self.adapters: Dict[str, HTTPAdapter] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.error_counts: Dict[str, int] = {}
+
+        self._configure_from_config()
+
+        logger.info(f"✅ HTTP Client initialisiert ({len(self.adapters)} Host-Pools)")
+
+    def _configure_from_config(self):
+        """Konfiguriert Steam- und CheapShark-Pools aus config.py"""
+        try:
+            from config import get_config
+            config = get_config()
+            steam_api = config.steam_api
+            cheapshark = config.cheapshark
+        except Exception as e:
+            logger.warning(f"⚠️ Konfiguration nicht verfügbar, verwende Standardwerte: {e}")
+            from config import SteamAPIConfig, CheapSharkConfig
+            steam_api = SteamAPIConfig()
+            cheapshark = CheapSharkConfig()
+
+        for url in (steam_api.store_url, steam_api.base_url):
+            self.configure_host(
+                url,
+                timeout_seconds=steam_api.timeout_seconds,
+                retry_attempts=steam_api.retry_attempts,
+                pool_maxsize=steam_api.pool_maxsize
+            )
+
+        self.configure_host(
+            cheapshark.base_url,
+            timeout_seconds=cheapshark.timeout_seconds,
+            retry_attempts=cheapshark.retry_attempts,
+            pool_maxsize=cheapshark.pool_maxsize
+        )
+
+    def configure_host(self, url_or_host: str, timeout_seconds: float = 15,
+                       retry_attempts: int = 2, pool_maxsize: int = 4) -> HTTPAdapter:
+        """
+        Registriert einen Host-Pool mit eigenen Limits
+
+        Args:
+            url_or_host: URL oder Hostname
+            timeout_seconds: Standard-Timeout für Requests an den Host
+            retry_attempts: Retries bei Verbindungsfehlern und 5xx
+            pool_maxsize: Maximale Anzahl offener Verbindungen zum Host
+
+        Returns:
+            Gemounteter HTTPAdapter
+        """
+        host = _host_from(url_or_host)
+
+        # 429 wird bewusst nicht hier wiederholt - das übernimmt der Rate Limiter;
+        # 503 + Retry-After wartet nur dieser Retry ab (nicht zusätzlich der Rate Limiter)
+        retry = Retry(
+            total=retry_attempts,
+            connect=retry_attempts,
+            read=retry_attempts,
+            status=retry_attempts,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, int(pool_maxsize)),
+            pool_block=True,
+            max_retries=retry
+        )
+
+        with self.lock:
+            self.session.mount(f"https://{host}/", adapter)
+            self.session.mount(f"http://{host}/", adapter)
+            self.adapters[host] = adapter
+            self.host_settings[host] = {
+                'timeout_seconds': timeout_seconds,
+                'retry_attempts': retry_attempts,
+                'pool_maxsize': pool_maxsize
+            }
+
+        logger.debug(f"🔧 HTTP Pool für {host}: {pool_maxsize} Verbindungen, "
+                     f"Timeout {timeout_seconds}s, {retry_attempts} Retries")
+        return adapter
+
+    def get_timeout(self, url: str) -> float:
+        """Gibt das konfigurierte Timeout für den Host der URL zurück"""
+        settings = self.host_settings.get(_host_from(url), DEFAULT_HOST_SETTINGS)
+        return settings['timeout_seconds']
+
+    def get_pool_size(self, url: str) -> int:
+        """Gibt die maximale Anzahl offener Verbindungen zum Host der URL zurück"""
+        settings = self.host_settings.get(_host_from(url), DEFAULT_HOST_SETTINGS)
+        return settings['pool_maxsize']
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None,
+            rate_limited: bool = True, cache: bool = False, **kwargs) -> requests.Response:
+        """
+        GET-Request über den gepoolten Session-Adapter des Hosts
+
+        Args:
+            url: Ziel-URL
+            params: Query-Parameter
+            timeout: Timeout in Sekunden (Standard: Host-Konfiguration)
+            rate_limited: Gemeinsamen Token-Bucket des Hosts verwenden
+            cache: Persistenten Response-Cache verwenden (nur für Endpoints mit Frische-Regel)
+
+        Returns:
+            requests.Response (bei Cache-Treffer mit from_cache=True)
+
+        Raises:
+            requests.RequestException bei Verbindungsfehlern
+        """
+        response_cache = get_http_cache() if cache else None
+        ttl = response_cache.freshness_for(url) if response_cache else None
+
+        if ttl is None:
+            return self._send(url, params, timeout, rate_limited, **kwargs)
+
+        cache_key = response_cache.make_key(url, params)
+        cached = response_cache.get_fresh(cache_key, ttl)
+        if cached is not None:
+            return cached
+
+        # Abgelaufenen Eintrag per ETag / Last-Modified revalidieren
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(response_cache.conditional_headers(cache_key))
+
+        response = self._send(url, params, timeout, rate_limited, headers=headers, **kwargs)
+        return response_cache.handle_response(cache_key, url, response)
+
+    def _send(self, url: str, params: Optional[Dict], timeout: Optional[float],
+              rate_limited: bool, **kwargs) -> requests.Response:
+        """Führt den eigentlichen Request inkl. Rate Limiting und Zählern aus"""
+        host = _host_from(url)
+
+        if host not in self.adapters:
+            self.configure_host(host, **DEFAULT_HOST_SETTINGS)
+
+        limiter = get_host_limiter(host) if rate_limited else None
+        if limiter:
+            limiter.acquire()
+
+        with self.lock:
+            self.request_counts[host] = self.request_counts.get(host, 0) + 1
+
+        try:
+            response = self.session.get(
+                url,
+                params=params,
+                timeout=timeout or self.get_timeout(url),
+                **kwargs
+            )
+        except requests.RequestException:
+            with self.lock:
+                self.error_counts[host] = self.error_counts.get(host, 0) + 1
+            raise
+
+        if limiter:
+            limiter.observe_response(response)
+
+        return response
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Pool-Statistiken pro Host
+
+        Ein Pool-Hit ist ein Request über eine wiederverwendete Keep-Alive
+        Verbindung, ein Miss ein Request der eine neue Verbindung aufbauen musste.
+
+        Returns:
+            Dict host -> Statistiken
+        """
+        stats = {}
+
+        with self.lock:
+            adapters = dict(self.adapters)
+
+        for host, adapter in adapters.items():
+            connections = 0
+            pooled_requests = 0
+
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections += getattr(pool, 'num_connections', 0)
+                pooled_requests += getattr(pool, 'num_requests', 0)
+
+            stats[host] = {
+                'requests': self.request_counts.get(host, 0),
+                'errors': self.error_counts.get(host, 0),
+                'pool_hits': max(0, pooled_requests - connections),
+                'pool_misses': connections,
+                'hit_rate': round((pooled_requests - connections) / pooled_requests * 100, 1) if pooled_requests else 0.0,
+                'pool_maxsize': self.host_settings.get(host, {}).get('pool_maxsize')
+            }
+
+        return stats
+
+    def close(self):
+        """Schließt alle Pool-Verbindungen"""
+        self.session.close()
+
+# =====================================================================
+# GLOBALE INSTANZ
+# =====================================================================
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> PooledHTTPClient:
+    """
+    Gibt den prozessweit geteilten HTTP Client zurück
+
+    Returns:
+        PooledHTTPClient Instanz
+    """
+    global _http_client
+
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = PooledHTTPClient()
+
+    return _http_client
+
+def http_get(url: str, params: Optional[Dict] = None, timeout: Optional[float] = None,
+             **kwargs) -> requests.Response:
+    """Convenience: GET über den geteilten HTTP Client"""
+    return get_http_client().get(url, params=params, timeout=timeout, **kwargs)
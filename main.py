@@ -35,6 +35,12 @@ except ImportError:
     VALID_CHART_TYPES = ['most_played', 'top_releases', 'most_concurrent_players']
     print("⚠️ steam_charts_manager nicht verfügbar - verwende Fallback Chart-Typen")
 
+# Vektorisierte Preis-Analysen (optional, benötigt NumPy)
+try:
+    from price_analytics import NUMPY_AVAILABLE as PRICE_ANALYTICS_AVAILABLE, create_price_analytics
+except ImportError:
+    PRICE_ANALYTICS_AVAILABLE = False
+
 # Logging Konfiguration
 try:
     from logging_config import get_main_logger
@@ -150,8 +156,19 @@ def create_tracker_with_fallback():
                 except Exception as retry_error:
                     print(f"ℹ️ Nachträgliche Charts-Aktivierung fehlgeschlagen: {retry_error}")
         
-        # Elasticsearch Manager entfernt - wird nicht mehr über main.py verwaltet
+        # Elasticsearch Manager nur bei ELASTICSEARCH_ENABLED=true (Export/Sync-Menüs)
         es_manager = None
+        if os.getenv('ELASTICSEARCH_ENABLED', 'false').lower() in ['true', '1', 'yes']:
+            try:
+                from elasticsearch_cli import create_elasticsearch_manager
+                es_manager = create_elasticsearch_manager(
+                    os.getenv('ELASTICSEARCH_HOST', 'localhost'),
+                    int(os.getenv('ELASTICSEARCH_PORT', '9200')),
+                    os.getenv('ELASTICSEARCH_USERNAME') or None,
+                    os.getenv('ELASTICSEARCH_PASSWORD') or None
+                )
+            except ImportError as e:
+                print(f"ℹ️ Elasticsearch nicht verfügbar: {e}")
         
         return tracker, charts_manager, es_manager
     
@@ -262,8 +279,8 @@ def load_stats_safe(tracker):
                     result = cursor.fetchone()
                     total_snapshots = result[0] if result else 0
                     
-                    # Neuester Snapshot
-                    cursor.execute('SELECT timestamp FROM price_snapshots ORDER BY timestamp DESC LIMIT 1')
+                    # Neuester Snapshot (latest_prices hat eine Zeile pro App)
+                    cursor.execute('SELECT MAX(timestamp) FROM latest_prices')
                     result = cursor.fetchone()
                     newest_snapshot = result[0] if result else None
                     
@@ -283,7 +300,7 @@ def load_stats_safe(tracker):
                     for store_name, price_column in store_columns:
                         try:
                             # Prüfe ob diese Store-Spalte existiert und Daten enthält
-                            cursor.execute(f'SELECT COUNT(*) FROM price_snapshots WHERE {price_column} IS NOT NULL AND {price_column} > 0')
+                            cursor.execute(f'SELECT COUNT(*) FROM latest_prices WHERE {price_column} IS NOT NULL AND {price_column} > 0')
                             count = cursor.fetchone()[0]
                             if count > 0:
                                 available_stores.append(store_name)
@@ -408,7 +425,7 @@ def menu_import_wishlist(tracker):
             print("💡 Trage deinen API Key in die .env Datei ein")
             return
         
-        wishlist_manager = SteamWishlistManager(api_key)
+        wishlist_manager = SteamWishlistManager(api_key, tracker.db_manager)
         
         steam_id = safe_input("Steam ID oder Benutzername: ")
         if not steam_id:
@@ -430,6 +447,12 @@ def menu_import_wishlist(tracker):
                     if add_app_safe(tracker, app_id, name, "wishlist"):
                         added += 1
                 
+                # Wishlist-Priorität fließt in den Score der Update-Queue ein
+                if hasattr(tracker, 'db_manager') and hasattr(tracker.db_manager, 'set_wishlist_priorities'):
+                    tracker.db_manager.set_wishlist_priorities(
+                        {item['steam_app_id']: item.get('priority', 0) for item in wishlist}
+                    )
+                
                 print(f"✅ {added} Apps erfolgreich hinzugefügt!")
             else:
                 print("❌ Import abgebrochen")
@@ -470,11 +493,21 @@ def menu_show_best_deals(tracker):
     print("=" * 15)
     
     try:
-        if hasattr(tracker, 'get_best_deals'):
-            deals = tracker.get_best_deals(min_discount_percent=25, limit=15)
-        else:
-            print("❌ Deal-Funktion nicht verfügbar")
-            return
+        deals = None
+        
+        # Mit NumPy: Deals inkl. Allzeit-Tief und Sale-Historie, sortiert nach Nähe zum Tief
+        if PRICE_ANALYTICS_AVAILABLE and hasattr(tracker, 'db_manager'):
+            try:
+                deals = create_price_analytics(tracker.db_manager).get_deals(min_discount=25, limit=15)
+            except Exception as e:
+                logger.warning(f"⚠️ Preis-Analyse nicht verfügbar, nutze Standard-Deals: {e}")
+        
+        if deals is None:
+            if hasattr(tracker, 'get_best_deals'):
+                deals = tracker.get_best_deals(min_discount_percent=25, limit=15)
+            else:
+                print("❌ Deal-Funktion nicht verfügbar")
+                return
         
         if deals:
             print(f"🔥 {len(deals)} Top-Deals gefunden:")
@@ -486,6 +519,10 @@ def menu_show_best_deals(tracker):
                 
                 print(f"{i:2d}. {name}")
                 print(f"    💰 €{price:.2f} • {discount:>3.0f}% Rabatt • {store}")
+                
+                if deal.get('all_time_low') is not None:
+                    low_marker = "🏆 Allzeit-Tief" if deal.get('at_all_time_low') else f"📉 Tief €{deal['all_time_low']:.2f}"
+                    print(f"    {low_marker} • {deal.get('sale_count', 0)} Sales bisher")
         else:
             print("❌ Keine Deals gefunden")
             print("💡 Führe zuerst ein Preis-Update durch")
@@ -613,7 +650,7 @@ def menu_update_names_all_apps(tracker):
             print("❌ Steam API Key nicht verfügbar")
             return
         
-        names_result = bulk_get_app_names(app_ids, api_key)
+        names_result = bulk_get_app_names(app_ids, api_key, tracker.db_manager)
         
         # Namen in DB aktualisieren
         updated = 0
@@ -731,6 +768,21 @@ def menu_detailed_statistics(tracker):
     
     if stats['newest_snapshot']:
         print(f"🕒 Letztes Update: {stats['newest_snapshot']}")
+    
+    if PRICE_ANALYTICS_AVAILABLE and hasattr(tracker, 'db_manager'):
+        try:
+            analysis = create_price_analytics(tracker.db_manager).get_statistics()
+            
+            print(f"\n📈 PREIS-ANALYSE ({analysis['priced_apps']} Apps mit Preis):")
+            print(f"🔥 Aktuell im Sale: {analysis['apps_on_sale']}")
+            print(f"🏆 Im Sale auf Allzeit-Tief: {analysis['apps_at_all_time_low']}")
+            print(f"🏷️ Ø Zeitanteil reduziert: {analysis['avg_discount_share']:.1%}")
+            print(f"📊 Median-Volatilität: {analysis['median_volatility']:.3f}")
+            
+            for app in analysis['most_volatile']:
+                print(f"   ⚡ {app['name'][:35]}: €{app['all_time_low']:.2f} - €{app['all_time_high']:.2f}")
+        except Exception as e:
+            logger.warning(f"⚠️ Preis-Analyse fehlgeschlagen: {e}")
 
 def menu_show_charts(charts_manager, tracker):
     """Option 13: Charts anzeigen - REAKTIVIERT"""
@@ -861,6 +913,14 @@ def menu_charts_statistics(charts_manager, tracker):
                 print(f"  {icon} {readable_key}")
         else:
             print("📊 Charts-Statistiken nicht verfügbar")
+        
+        if PRICE_ANALYTICS_AVAILABLE:
+            trending = create_price_analytics(tracker.db_manager).get_trending(limit=10)
+            if trending:
+                print(f"\n📈 Trending (Rang-Gewinn in {trending[0]['window_days']} Tagen):")
+                for game in trending:
+                    print(f"  #{game['window_start_rank']:>3} → #{game['current_rank']:<3} "
+                          f"{game['name'][:35]} [{game['chart_type']}]")
     
     except Exception as e:
         print(f"❌ Fehler beim Laden der Charts-Statistiken: {e}")
@@ -1178,8 +1238,28 @@ def menu_elasticsearch_sync(es_manager, tracker):
         print("❌ Elasticsearch Manager nicht verfügbar")
         return
     
-    print("🔄 Synchronisiere Daten mit Elasticsearch...")
-    print("💡 Diese Funktion ist noch in Entwicklung")
+    print("🔄 Synchronisiere neue und geänderte Daten mit Elasticsearch...")
+    
+    reset = input("Vollständig neu synchronisieren? (j/N): ").strip().lower() in ['j', 'ja', 'y', 'yes']
+    if reset:
+        tracker.db_manager.reset_es_sync_state()
+    
+    try:
+        stats = es_manager.sync_incremental_to_elasticsearch(tracker.db_manager)
+    except Exception as e:
+        print(f"❌ Sync fehlgeschlagen: {e}")
+        return
+    
+    for source, index_stats in stats['index_stats'].items():
+        if index_stats['status'] == 'up_to_date':
+            print(f"   ✅ {source}: aktuell")
+        elif index_stats['status'] in ('synced', 'partial'):
+            failed = f", ❌ {index_stats['failed']} fehlgeschlagen" if index_stats['failed'] else ""
+            print(f"   📤 {source}: {index_stats['docs']} Dokumente ({index_stats['docs_per_second']} docs/s{failed})")
+        elif index_stats['status'] == 'error':
+            print(f"   ❌ {source}: {index_stats['first_error']}")
+    
+    print(f"\n✅ Sync abgeschlossen: {stats['total_exported']} Dokumente in {stats['duration_seconds']}s")
 
 # System-Tools 
 def menu_system_tools(tracker):
@@ -0,0 +1,757 @@
+#!/usr/bin/env python3
+"""
+Price Analytics - Vektorisierte Preis- und Rang-Auswertungen mit NumPy
+Steam Price Tracker - Alle Apps in einem Durchlauf statt Zeile für Zeile
+
+- Preis- und Rang-Historie werden spaltenweise in NumPy-Arrays geladen,
+  ein zusammenhängender Block pro Serie (offsets: Serie i = [offsets[i], offsets[i+1]))
+- Allzeit-Tief/-Hoch, gleitende Tiefs (ANALYTICS_LOW_WINDOWS_DAYS), Rabatt-Häufigkeit,
+  Preis-Volatilität und Verhältnis aktueller Preis / Allzeit-Tief für alle Apps
+- Rang-Trends je App und Chart-Typ (Rang zu Fensterbeginn vs. aktueller Rang)
+- API für die Deals- und Statistik-Menüs, CLI über batch_processor.py analytics
+
+Change-only Snapshots: ein Wert gilt bis zum nächsten Snapshot der App, daher
+werden Mittelwerte und Rabatt-Anteile nach Gültigkeitsdauer gewichtet.
+"""
+
+import logging
+import os
+import time as time_module
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from database_manager import PRICE_STORES, STORE_DIMENSION, STREAM_FETCH_SIZE, price_storage_layout
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("price_analytics", "price_analytics.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# KONFIGURATION
+# =====================================================================
+
+# Fenster der gleitenden Tiefs in Tagen (je Fenster eine Kennzahl low_<N>d_cents)
+ANALYTICS_LOW_WINDOWS_DAYS = tuple(
+    int(days) for days in os.getenv('ANALYTICS_LOW_WINDOWS_DAYS', '30,90').split(',') if days.strip()
+)
+# Fenster für Rang-Trends in Tagen
+ANALYTICS_TREND_WINDOW_DAYS = int(os.getenv('ANALYTICS_TREND_WINDOW_DAYS', '7'))
+# Aktueller Preis höchstens X-mal das Allzeit-Tief gilt als "nahe Allzeit-Tief"
+ANALYTICS_NEAR_LOW_RATIO = float(os.getenv('ANALYTICS_NEAR_LOW_RATIO', '1.1'))
+
+PRICE_SOURCES = ('tracked', 'charts')
+# Rang-Historie: (Tabelle, Zeitstempel-Spalte)
+RANK_HISTORY_TABLES = (('charts_history', 'snapshot_timestamp'), ('steam_charts_rank_history', 'timestamp'))
+SECONDS_PER_DAY = 86400
+# Tracker-Snapshots speichern Ortszeit (datetime.now()), Charts-Tabellen CURRENT_TIMESTAMP (UTC)
+LOCAL_TIME_SOURCES = ('tracked',)
+
+# =====================================================================
+# SPALTENWEISE HISTORIE
+# =====================================================================
+
+@dataclass
+class PriceHistory:
+    """Preis-Historie aller Apps, sortiert nach (App, Zeit)"""
+    app_ids: Any              # np.ndarray[str], eine Serie pro App
+    offsets: Any              # np.ndarray[int64], len(app_ids) + 1
+    timestamps: Any           # np.ndarray[int64], Unix-Sekunden
+    price_cents: Any          # np.ndarray[float64], günstigster Preis > 0, NaN = kein Preis
+    discount: Any             # np.ndarray[int64], höchster Rabatt eines bepreisten Stores
+
+    def __len__(self) -> int:
+        return len(self.app_ids)
+
+    @property
+    def samples(self) -> int:
+        return int(self.timestamps.size)
+
+@dataclass
+class RankHistory:
+    """Rang-Historie aller (App, Chart-Typ) Serien, sortiert nach (Serie, Zeit)"""
+    app_ids: Any              # np.ndarray[str]
+    chart_types: Any          # np.ndarray[str], parallel zu app_ids
+    offsets: Any              # np.ndarray[int64], len(app_ids) + 1
+    timestamps: Any           # np.ndarray[int64], Unix-Sekunden
+    ranks: Any                # np.ndarray[float64]
+
+    def __len__(self) -> int:
+        return len(self.app_ids)
+
+    @property
+    def samples(self) -> int:
+        return int(self.timestamps.size)
+
+def _group_series(keys: Sequence, timestamps) -> Tuple[Any, Any, Any]:
+    """
+    Gruppiert unsortierte Zeilen zu zusammenhängenden Serien
+
+    Args:
+        keys: Schlüssel-Spalten (je ein Array), z.B. [app_ids] oder [app_ids, chart_types]
+        timestamps: Zeitstempel der Zeilen
+
+    Returns:
+        (eindeutige Schlüssel, Sortier-Reihenfolge der Zeilen, offsets)
+    """
+    if len(keys) == 1:
+        unique_keys, codes = np.unique(keys[0], return_inverse=True)
+    else:
+        unique_keys, codes = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+    codes = codes.reshape(-1)
+
+    order = np.lexsort((timestamps, codes))
+    counts = np.bincount(codes, minlength=len(unique_keys))
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return unique_keys, order, offsets
+
+def _series_ids(offsets):
+    """Serien-Index jedes Samples"""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+def _effective_starts(timestamps, offsets, cutoff: float):
+    """
+    Index des zum Zeitpunkt cutoff gültigen Samples je Serie
+
+    Das ist das letzte Sample mit timestamp <= cutoff (Change-only: der Wert gilt bis
+    zum nächsten Snapshot), bzw. der Serienbeginn wenn die Serie erst danach startet.
+    Eine einzige searchsorted-Suche über den Schlüssel (Serie, Zeit) für alle Serien.
+    """
+    starts = offsets[:-1]
+    if timestamps.size == 0:
+        return starts.copy()
+
+    base = int(timestamps.min())
+    span = int(timestamps.max()) - base + 1
+    keys = _series_ids(offsets) * span + (timestamps - base)
+    offset = min(max(int(cutoff) - base, 0), span - 1)
+    targets = np.arange(len(starts), dtype=np.int64) * span + offset
+
+    return np.maximum(np.searchsorted(keys, targets, side='right') - 1, starts)
+
+def _range_reduce(ufunc, values, starts, ends):
+    """ufunc.reduceat über die geschlossenen Bereiche [starts[i], ends[i]] (starts <= ends)"""
+    # reduceat verlangt Indizes < len, das Paar (start, end + 1) braucht daher ein Element Puffer
+    padded = np.append(values, values[:1])
+    indices = np.empty(2 * len(starts), dtype=np.int64)
+    indices[0::2] = starts
+    indices[1::2] = ends + 1
+    return ufunc.reduceat(padded, indices)[0::2]
+
+def _durations(timestamps, offsets, now: float):
+    """Gültigkeitsdauer je Sample in Sekunden (bis zum nächsten Sample der Serie bzw. bis now, min. 1)"""
+    ends = offsets[1:] - 1
+    durations = np.empty(timestamps.size, dtype=np.float64)
+    durations[:-1] = np.diff(timestamps)
+    durations[ends] = now - timestamps[ends]
+    return np.maximum(durations, 1.0)
+
+# =====================================================================
+# VEKTORISIERTE KENNZAHLEN
+# =====================================================================
+
+def compute_price_metrics(history: PriceHistory, low_windows_days: Sequence[int] = None,
+                          now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Preis-Kennzahlen für alle Apps in einem Durchlauf (ein Array-Eintrag pro App)
+
+    Args:
+        history: Spaltenweise Preis-Historie
+        low_windows_days: Fenster der gleitenden Tiefs (Standard: ANALYTICS_LOW_WINDOWS_DAYS)
+        now: Referenzzeitpunkt als Unix-Sekunden (Standard: jetzt)
+
+    Returns:
+        Dict Kennzahl -> np.ndarray, Preise in Cent (NaN = nie bepreist)
+    """
+    now = time_module.time() if now is None else now
+    windows = ANALYTICS_LOW_WINDOWS_DAYS if low_windows_days is None else tuple(low_windows_days)
+
+    offsets = history.offsets
+    starts, ends = offsets[:-1], offsets[1:] - 1
+    prices = history.price_cents
+    timestamps = history.timestamps
+
+    if len(history) == 0:
+        metrics = {name: np.empty(0, dtype=np.int64) for name in (
+            'samples', 'current_discount', 'sale_count', 'first_seen', 'last_seen'
+        )}
+        metrics.update({name: np.empty(0, dtype=np.float64) for name in (
+            'current_cents', 'all_time_low_cents', 'all_time_high_cents', 'mean_cents',
+            'volatility', 'discount_share', 'low_ratio'
+        )})
+        metrics['at_all_time_low'] = np.empty(0, dtype=bool)
+        metrics.update({f'low_{days}d_cents': np.empty(0, dtype=np.float64) for days in windows})
+        return metrics
+
+    priced = ~np.isnan(prices)
+    weights = _durations(timestamps, offsets, now)
+    priced_weights = np.where(priced, weights, 0.0)
+    values = np.where(priced, prices, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Zeitgewichteter Mittelwert und Standardabweichung (zentriert, numerisch stabil)
+        weight_sums = np.add.reduceat(priced_weights, starts)
+        mean = np.add.reduceat(priced_weights * values, starts) / weight_sums
+        deviation = np.where(priced, values - mean[_series_ids(offsets)], 0.0)
+        std = np.sqrt(np.add.reduceat(priced_weights * deviation * deviation, starts) / weight_sums)
+        volatility = std / mean
+
+        # Rabatt-Häufigkeit: Zeitanteil im Sale und Anzahl Sale-Beginne
+        on_sale = history.discount > 0
+        discount_share = np.add.reduceat(weights * on_sale, starts) / np.add.reduceat(weights, starts)
+        previous_on_sale = np.concatenate(([False], on_sale[:-1]))
+        previous_on_sale[starts] = False
+        sale_count = np.add.reduceat((on_sale & ~previous_on_sale).astype(np.int64), starts)
+
+        all_time_low = np.fmin.reduceat(prices, starts)
+        current = prices[ends]
+        low_ratio = current / all_time_low
+
+    metrics = {
+        'samples': np.diff(offsets),
+        'current_cents': current,
+        'current_discount': history.discount[ends],
+        'all_time_low_cents': all_time_low,
+        'all_time_high_cents': np.fmax.reduceat(prices, starts),
+        'mean_cents': mean,
+        'volatility': volatility,
+        'discount_share': discount_share,
+        'sale_count': sale_count,
+        'low_ratio': low_ratio,
+        'at_all_time_low': current <= all_time_low,
+        'first_seen': timestamps[starts],
+        'last_seen': timestamps[ends]
+    }
+
+    # Gleitende Tiefs: Minimum aller im Fenster gültigen Preise (inkl. des Preises zu Fensterbeginn)
+    for days in windows:
+        window_starts = _effective_starts(timestamps, offsets, now - days * SECONDS_PER_DAY)
+        metrics[f'low_{days}d_cents'] = _range_reduce(np.fmin, prices, window_starts, ends)
+
+    return metrics
+
+def compute_rank_metrics(history: RankHistory, window_days: Optional[int] = None,
+                         now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Rang-Kennzahlen für alle (App, Chart-Typ) Serien in einem Durchlauf
+
+    rank_change > 0 bedeutet gestiegen (kleinere Rang-Nummer als zu Fensterbeginn).
+
+    Args:
+        history: Spaltenweise Rang-Historie
+        window_days: Trend-Fenster (Standard: ANALYTICS_TREND_WINDOW_DAYS)
+        now: Referenzzeitpunkt als Unix-Sekunden (Standard: jetzt)
+
+    Returns:
+        Dict Kennzahl -> np.ndarray
+    """
+    now = time_module.time() if now is None else now
+    window_days = ANALYTICS_TREND_WINDOW_DAYS if window_days is None else window_days
+    cutoff = now - window_days * SECONDS_PER_DAY
+
+    offsets = history.offsets
+    starts, ends = offsets[:-1], offsets[1:] - 1
+    ranks = history.ranks
+    timestamps = history.timestamps
+
+    if len(history) == 0:
+        metrics = {name: np.empty(0, dtype=np.int64) for name in ('samples', 'first_seen', 'last_seen')}
+        metrics.update({name: np.empty(0, dtype=np.float64) for name in (
+            'current_rank', 'best_rank', 'worst_rank', 'average_rank', 'window_start_rank',
+            'window_best_rank', 'rank_change'
+        )})
+        metrics['in_window'] = np.empty(0, dtype=bool)
+        metrics['trend'] = np.empty(0, dtype=str)
+        return metrics
+
+    counts = np.diff(offsets)
+    window_starts = _effective_starts(timestamps, offsets, cutoff)
+    current = ranks[ends]
+    start_rank = ranks[window_starts]
+    rank_change = start_rank - current
+
+    last_seen = timestamps[ends]
+    in_window = last_seen >= cutoff
+    is_new = timestamps[starts] > cutoff
+    trend = np.select(
+        [~in_window, is_new, rank_change > 0, rank_change < 0],
+        ['dropped', 'new', 'rising', 'falling'],
+        default='stable'
+    )
+
+    return {
+        'samples': counts,
+        'current_rank': current,
+        'best_rank': np.minimum.reduceat(ranks, starts),
+        'worst_rank': np.maximum.reduceat(ranks, starts),
+        'average_rank': np.add.reduceat(ranks, starts) / counts,
+        'window_start_rank': start_rank,
+        'window_best_rank': _range_reduce(np.minimum, ranks, window_starts, ends),
+        'rank_change': rank_change,
+        'in_window': in_window,
+        'trend': trend,
+        'first_seen': timestamps[starts],
+        'last_seen': last_seen
+    }
+
+# =====================================================================
+# LADEN AUS SQLITE
+# =====================================================================
+
+def _fetch_columns(conn, sql: str, params: tuple, dtypes: Sequence) -> List[Any]:
+    """Liest ein Abfrageergebnis per fetchmany spaltenweise in NumPy-Arrays (None -> NaN bei float)"""
+    chunks = [[] for _ in dtypes]
+    cursor = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if not rows:
+                break
+            for index, column in enumerate(zip(*rows)):
+                chunks[index].append(np.array(column, dtype=dtypes[index]))
+    finally:
+        cursor.close()
+
+    return [
+        np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        for parts, dtype in zip(chunks, dtypes)
+    ]
+
+def _table_columns(conn, table: str) -> set:
+    """Spaltennamen einer Tabelle/View (leer wenn nicht vorhanden)"""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+def _epoch_sql(column: str, local_time: bool) -> str:
+    """Unix-Sekunden einer Zeitstempel-Spalte; Ortszeit wird vorher nach UTC umgerechnet (wie time.time())"""
+    modifier = ", 'utc'" if local_time else ""
+    return f"COALESCE(CAST(strftime('%s', {column}{modifier}) AS INTEGER), 0)"
+
+def _since_sql(column: str, local_time: bool) -> str:
+    """Filter 'jünger als ?' im selben Zeitbezug wie die Spalte"""
+    now = "'now', 'localtime'" if local_time else "'now'"
+    return f"{column} >= datetime({now}, ?)"
+
+def _store_price_columns(columns: set, store: Optional[str]) -> List[Tuple[str, str]]:
+    """(Preis-Spalte, Rabatt-Spalte) je Store im breiten Schema; Legacy-Charts nur mit 'price'"""
+    stores = [store] if store else list(PRICE_STORES)
+    pairs = [
+        (f"{key}_price", f"{key}_discount_percent")
+        for key in stores
+        if f"{key}_price" in columns
+    ]
+    if not pairs and 'price' in columns and store in (None, 'steam'):
+        pairs = [('price', 'discount_percent' if 'discount_percent' in columns else '0')]
+    return pairs
+
+def _reduce_wide_prices(price_columns: List[Any], discount_columns: List[Any]) -> Tuple[Any, Any]:
+    """Günstigster Preis > 0 (Cent) und höchster Rabatt eines bepreisten Stores je Zeile"""
+    cents = np.rint(np.column_stack(price_columns) * 100)
+    cents[~(cents > 0)] = np.nan
+    discounts = np.nan_to_num(np.column_stack(discount_columns))
+    discounts[np.isnan(cents)] = 0
+    return np.fmin.reduce(cents, axis=1), discounts.max(axis=1).astype(np.int64)
+
+# =====================================================================
+# ANALYTICS-API
+# =====================================================================
+
+class PriceAnalytics:
+    """
+    Vektorisierte Preis- und Rang-Auswertungen über die gesamte Historie
+
+    Lädt die Historie pro Aufruf frisch (ein sequentieller Lesedurchlauf) und berechnet
+    alle Kennzahlen für alle Apps gemeinsam - keine Schleifen pro App in Python.
+    """
+
+    def __init__(self, db_manager, low_windows_days: Sequence[int] = None,
+                 trend_window_days: Optional[int] = None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy nicht installiert. Installiere mit: pip install numpy")
+
+        self.db_manager = db_manager
+        self.low_windows_days = tuple(low_windows_days) if low_windows_days else ANALYTICS_LOW_WINDOWS_DAYS
+        self.trend_window_days = trend_window_days or ANALYTICS_TREND_WINDOW_DAYS
+        self.store_ids = {store_key: store_id for store_id, store_key, _, _ in STORE_DIMENSION}
+
+    # -----------------------------------------------------------------
+    # Laden
+    # -----------------------------------------------------------------
+
+    def load_price_history(self, source: str = 'tracked', store: Optional[str] = None,
+                           days_back: Optional[int] = None) -> PriceHistory:
+        """
+        Lädt die Preis-Historie spaltenweise (ein Block pro App)
+
+        Args:
+            source: 'tracked' (price_snapshots) oder 'charts' (steam_charts_prices)
+            store: Nur diesen Store auswerten (Standard: günstigster Store je Snapshot)
+            days_back: Nur Snapshots, die in den letzten N Tagen gültig waren
+        """
+        if source not in PRICE_SOURCES:
+            raise ValueError(f"Unbekannte Preis-Quelle: {source} (erlaubt: {', '.join(PRICE_SOURCES)})")
+        if store and store not in self.store_ids:
+            raise ValueError(f"Unbekannter Store: {store} (erlaubt: {', '.join(PRICE_STORES)})")
+
+        since = f"-{int(days_back)} days" if days_back else None
+        local_time = source in LOCAL_TIME_SOURCES
+
+        with self.db_manager.get_connection(readonly=True) as conn:
+            if source == 'tracked' and price_storage_layout(conn) == 'normalized':
+                store_filter = "AND sp.store_id = ?" if store else ""
+                params = (self.store_ids[store],) if store else ()
+                where = ""
+                if since:
+                    where = f"WHERE {_since_sql('COALESCE(h.last_confirmed_at, h.timestamp)', local_time)}"
+                    params += (since,)
+
+                # GROUP BY h.id läuft in rowid-Reihenfolge, store_prices per Primärschlüssel
+                app_ids, timestamps, prices, discount = _fetch_columns(conn, f"""
+                    SELECT h.steam_app_id,
+                           {_epoch_sql('h.timestamp', local_time)},
+                           MIN(CASE WHEN sp.price_cents > 0 THEN sp.price_cents END),
+                           COALESCE(MAX(CASE WHEN sp.price_cents > 0 THEN sp.discount END), 0)
+                    FROM price_snapshot_headers h
+                    LEFT JOIN store_prices sp ON sp.snapshot_id = h.id {store_filter}
+                    {where}
+                    GROUP BY h.id
+                """, params, (str, np.int64, np.float64, np.int64))
+            else:
+                table = 'price_snapshots' if source == 'tracked' else 'steam_charts_prices'
+                columns = _table_columns(conn, table)
+                pairs = _store_price_columns(columns, store)
+                if not pairs:
+                    return self._empty_price_history()
+
+                confirmed = 'COALESCE(last_confirmed_at, timestamp)' if 'last_confirmed_at' in columns else 'timestamp'
+                where = f"WHERE {_since_sql(confirmed, local_time)}" if since else ""
+                selected = ', '.join(f"{price}, {discount}" for price, discount in pairs)
+
+                fetched = _fetch_columns(conn, f"""
+                    SELECT steam_app_id, {_epoch_sql('timestamp', local_time)}, {selected}
+                    FROM {table}
+                    {where}
+                """, (since,) if since else (), [str, np.int64] + [np.float64, np.float64] * len(pairs))
+
+                app_ids, timestamps = fetched[0], fetched[1]
+                if not app_ids.size:
+                    return self._empty_price_history()
+                prices, discount = _reduce_wide_prices(fetched[2::2], fetched[3::2])
+
+        if not app_ids.size:
+            return self._empty_price_history()
+
+        unique_apps, order, offsets = _group_series([app_ids], timestamps)
+        return PriceHistory(
+            app_ids=unique_apps,
+            offsets=offsets,
+            timestamps=timestamps[order],
+            price_cents=prices[order],
+            discount=discount[order]
+        )
+
+    def load_rank_history(self, chart_type: Optional[str] = None,
+                          days_back: Optional[int] = None) -> RankHistory:
+        """
+        Lädt die Rang-Historie spaltenweise, ein Block pro App und Chart-Typ
+
+        Quellen: charts_history (Batch-Updates) und steam_charts_rank_history (Einzel-Updates).
+
+        Args:
+            chart_type: Nur diesen Chart-Typ laden
+            days_back: Nur Ränge der letzten N Tage
+        """
+        selects = []
+        params = []
+
+        with self.db_manager.get_connection(readonly=True) as conn:
+            for table, time_column in RANK_HISTORY_TABLES:
+                if time_column not in _table_columns(conn, table):
+                    continue
+
+                conditions = ["rank_position > 0"]
+                if chart_type:
+                    conditions.append("chart_type = ?")
+                    params.append(chart_type)
+                if days_back:
+                    conditions.append(_since_sql(time_column, local_time=False))
+                    params.append(f"-{int(days_back)} days")
+
+                selects.append(f"""
+                    SELECT steam_app_id, chart_type,
+                           {_epoch_sql(time_column, local_time=False)}, rank_position
+                    FROM {table}
+                    WHERE {' AND '.join(conditions)}
+                """)
+
+            if not selects:
+                return self._empty_rank_history()
+
+            app_ids, chart_types, timestamps, ranks = _fetch_columns(
+                conn, ' UNION ALL '.join(selects), tuple(params), (str, str, np.int64, np.float64)
+            )
+
+        if not app_ids.size:
+            return self._empty_rank_history()
+
+        unique_keys, order, offsets = _group_series([app_ids, chart_types], timestamps)
+        return RankHistory(
+            app_ids=unique_keys[:, 0],
+            chart_types=unique_keys[:, 1],
+            offsets=offsets,
+            timestamps=timestamps[order],
+            ranks=ranks[order]
+        )
+
+    @staticmethod
+    def _empty_price_history() -> PriceHistory:
+        return PriceHistory(
+            app_ids=np.empty(0, dtype=str), offsets=np.zeros(1, dtype=np.int64),
+            timestamps=np.empty(0, dtype=np.int64), price_cents=np.empty(0, dtype=np.float64),
+            discount=np.empty(0, dtype=np.int64)
+        )
+
+    @staticmethod
+    def _empty_rank_history() -> RankHistory:
+        return RankHistory(
+            app_ids=np.empty(0, dtype=str), chart_types=np.empty(0, dtype=str),
+            offsets=np.zeros(1, dtype=np.int64), timestamps=np.empty(0, dtype=np.int64),
+            ranks=np.empty(0, dtype=np.float64)
+        )
+
+    # -----------------------------------------------------------------
+    # Auswertungen
+    # -----------------------------------------------------------------
+
+    def analyze_prices(self, source: str = 'tracked', store: Optional[str] = None,
+                       days_back: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Lädt die Preis-Historie und berechnet alle Kennzahlen
+
+        Returns:
+            Dict mit history, metrics, load_seconds und compute_seconds
+        """
+        started = time_module.perf_counter()
+        history = self.load_price_history(source=source, store=store, days_back=days_back)
+        loaded = time_module.perf_counter()
+        metrics = compute_price_metrics(history, self.low_windows_days)
+        computed = time_module.perf_counter()
+
+        logger.info(f"📊 Preis-Analyse: {len(history)} Apps, {history.samples:,} Snapshots "
+                    f"(Laden {loaded - started:.2f}s, Berechnung {computed - loaded:.3f}s)")
+
+        return {
+            'history': history,
+            'metrics': metrics,
+            'load_seconds': round(loaded - started, 3),
+            'compute_seconds': round(computed - loaded, 3)
+        }
+
+    def get_deals(self, min_discount: int = 25, limit: int = 15, max_low_ratio: Optional[float] = None,
+                  source: str = 'tracked', store: Optional[str] = None) -> List[Dict]:
+        """
+        Aktuelle Deals mit historischem Kontext (Allzeit-Tief, gleitende Tiefs, Sale-Häufigkeit)
+
+        Sortierung: Nähe zum Allzeit-Tief (low_ratio) aufsteigend, dann Rabatt absteigend.
+
+        Args:
+            min_discount: Mindest-Rabatt in Prozent
+            limit: Maximum Anzahl Deals
+            max_low_ratio: Nur Deals mit aktuellem Preis <= X * Allzeit-Tief
+            source: 'tracked' oder 'charts'
+            store: Nur diesen Store auswerten
+
+        Returns:
+            Liste im Format von get_best_deals() plus Analyse-Feldern
+        """
+        analysis = self.analyze_prices(source=source, store=store)
+        metrics = analysis['metrics']
+
+        with np.errstate(invalid='ignore'):
+            mask = (metrics['current_discount'] >= min_discount) & (metrics['current_cents'] > 0)
+            if max_low_ratio is not None:
+                mask &= metrics['low_ratio'] <= max_low_ratio
+
+        candidates = np.flatnonzero(mask)
+        order = np.lexsort((-metrics['current_discount'][candidates], metrics['low_ratio'][candidates]))
+        selected = candidates[order][:limit]
+
+        deals = self._price_records(analysis['history'], metrics, selected, source, store)
+        logger.info(f"📊 {len(deals)} Deals mit Preis-Historie (min. {min_discount}% Rabatt)")
+        return deals
+
+    def get_statistics(self, source: str = 'tracked', store: Optional[str] = None,
+                       top: int = 5) -> Dict[str, Any]:
+        """
+        Preis-Statistiken über alle Apps
+
+        Returns:
+            Dict mit Anzahlen, Durchschnitten und den volatilsten Apps
+        """
+        analysis = self.analyze_prices(source=source, store=store)
+        history, metrics = analysis['history'], analysis['metrics']
+
+        priced = ~np.isnan(metrics['all_time_low_cents'])
+        with np.errstate(invalid='ignore'):
+            on_sale = metrics['current_discount'] > 0
+            near_low = metrics['low_ratio'] <= ANALYTICS_NEAR_LOW_RATIO
+
+        volatility = metrics['volatility']
+        volatile = np.flatnonzero(~np.isnan(volatility))
+        most_volatile = volatile[np.argsort(-volatility[volatile], kind='stable')][:top]
+
+        return {
+            'source': source,
+            'store': store or 'best',
+            'apps': len(history),
+            'samples': history.samples,
+            'priced_apps': int(priced.sum()),
+            'apps_on_sale': int(on_sale.sum()),
+            'apps_at_all_time_low': int((metrics['at_all_time_low'] & on_sale).sum()),
+            'apps_near_low': int(near_low.sum()),
+            'avg_discount_share': float(np.nanmean(metrics['discount_share'])) if len(history) else 0.0,
+            'avg_sale_count': float(np.mean(metrics['sale_count'])) if len(history) else 0.0,
+            'median_volatility': float(np.nanmedian(volatility)) if volatile.size else 0.0,
+            'most_volatile': self._price_records(history, metrics, most_volatile, source, store),
+            'load_seconds': analysis['load_seconds'],
+            'compute_seconds': analysis['compute_seconds']
+        }
+
+    def get_trending(self, chart_type: Optional[str] = None, limit: int = 20,
+                     window_days: Optional[int] = None) -> List[Dict]:
+        """
+        Trending Games aus der Rang-Historie (größter Rang-Gewinn im Trend-Fenster)
+
+        Args:
+            chart_type: Optionale Filterung nach Chart-Typ
+            limit: Maximum Anzahl Spiele
+            window_days: Trend-Fenster (Standard: ANALYTICS_TREND_WINDOW_DAYS)
+        """
+        window_days = window_days or self.trend_window_days
+        history = self.load_rank_history(chart_type=chart_type)
+        metrics = compute_rank_metrics(history, window_days)
+
+        rising = np.flatnonzero(metrics['trend'] == 'rising')
+        order = np.lexsort((metrics['current_rank'][rising], -metrics['rank_change'][rising]))
+        selected = rising[order][:limit]
+
+        names = self._app_names([str(app_id) for app_id in history.app_ids[selected]])
+        return [
+            {
+                'steam_app_id': str(history.app_ids[i]),
+                'name': names.get(str(history.app_ids[i]), {}).get('name') or f"App {history.app_ids[i]}",
+                'chart_type': str(history.chart_types[i]),
+                'current_rank': int(metrics['current_rank'][i]),
+                'window_start_rank': int(metrics['window_start_rank'][i]),
+                'rank_change': int(metrics['rank_change'][i]),
+                'best_rank': int(metrics['best_rank'][i]),
+                'average_rank': round(float(metrics['average_rank'][i]), 1),
+                'samples': int(metrics['samples'][i]),
+                'trend_direction': str(metrics['trend'][i]),
+                'window_days': window_days
+            }
+            for i in selected
+        ]
+
+    # -----------------------------------------------------------------
+    # Hilfsfunktionen
+    # -----------------------------------------------------------------
+
+    def _app_names(self, app_ids: List[str]) -> Dict[str, Dict]:
+        """Name und günstigster Store für wenige Apps (tracked_apps, latest_prices, steam_charts_tracking)"""
+        names = {}
+
+        with self.db_manager.get_connection(readonly=True) as conn:
+            has_latest = bool(_table_columns(conn, 'latest_prices'))
+            has_charts = bool(_table_columns(conn, 'steam_charts_tracking'))
+
+            for offset in range(0, len(app_ids), 500):
+                chunk = app_ids[offset:offset + 500]
+                placeholders = ','.join('?' for _ in chunk)
+
+                for row in conn.execute(
+                    f"SELECT steam_app_id, name FROM tracked_apps WHERE steam_app_id IN ({placeholders})", chunk
+                ):
+                    names[row[0]] = {'name': row[1]}
+
+                if has_latest:
+                    for row in conn.execute(f"""
+                        SELECT steam_app_id, game_title, best_store FROM latest_prices
+                        WHERE steam_app_id IN ({placeholders})
+                    """, chunk):
+                        entry = names.setdefault(row[0], {})
+                        entry['name'] = entry.get('name') or row[1]
+                        entry['best_store'] = row[2]
+
+                if has_charts:
+                    for row in conn.execute(f"""
+                        SELECT steam_app_id, MAX(name) FROM steam_charts_tracking
+                        WHERE steam_app_id IN ({placeholders}) GROUP BY steam_app_id
+                    """, chunk):
+                        entry = names.setdefault(row[0], {})
+                        entry['name'] = entry.get('name') or row[1]
+
+        return names
+
+    def _price_records(self, history: PriceHistory, metrics: Dict[str, Any], indices,
+                       source: str, store: Optional[str] = None) -> List[Dict]:
+        """Wandelt ausgewählte Apps in Dicts (Preise in Euro) für Menü und CLI"""
+        app_ids = [str(app_id) for app_id in history.app_ids[indices]]
+        names = self._app_names(app_ids)
+
+        def euros(value) -> Optional[float]:
+            return None if np.isnan(value) else round(float(value) / 100, 2)
+
+        def ratio(value) -> Optional[float]:
+            return None if np.isnan(value) else round(float(value), 3)
+
+        records = []
+        for app_id, i in zip(app_ids, indices):
+            info = names.get(app_id, {})
+            label = store or (info.get('best_store') if source == 'tracked' else None)
+            record = {
+                'steam_app_id': app_id,
+                'name': info.get('name') or f"App {app_id}",
+                'current_price': euros(metrics['current_cents'][i]),
+                'discount_percent': int(metrics['current_discount'][i]),
+                'store': label.title().replace('store', ' Store') if label else 'Steam',
+                'all_time_low': euros(metrics['all_time_low_cents'][i]),
+                'all_time_high': euros(metrics['all_time_high_cents'][i]),
+                'average_price': euros(metrics['mean_cents'][i]),
+                'low_ratio': ratio(metrics['low_ratio'][i]),
+                'at_all_time_low': bool(metrics['at_all_time_low'][i]),
+                'volatility': ratio(metrics['volatility'][i]),
+                'discount_share': ratio(metrics['discount_share'][i]),
+                'sale_count': int(metrics['sale_count'][i]),
+                'samples': int(metrics['samples'][i])
+            }
+            for days in self.low_windows_days:
+                record[f'low_{days}d'] = euros(metrics[f'low_{days}d_cents'][i])
+            records.append(record)
+
+        return records
+
+# =====================================================================
+# CONVENIENCE FUNCTIONS
+# =====================================================================
+
+def create_price_analytics(db_manager=None, **kwargs) -> PriceAnalytics:
+    """
+    Erstellt PriceAnalytics Instanz
+
+    Args:
+        db_manager: DatabaseManager (Standard: neue Instanz auf der Standard-Datenbank)
+        **kwargs: low_windows_days, trend_window_days
+    """
+    if db_manager is None:
+        from database_manager import create_database_manager
+        db_manager = create_database_manager()
+    return PriceAnalytics(db_manager, **kwargs)
@@ -9,7 +9,6 @@ Behebt alle identifizierten API-Probleme:
 """
 
 import logging
-import schedule
 import time as time_module
 import threading
 import requests
@@ -18,9 +17,16 @@ from datetime import datetime, timedelta
 import json
 import os
 import math as math_module
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Lokale Imports
-from database_manager import DatabaseManager, create_database_manager
+from database_manager import PRICE_ROLLUP_INTERVAL_MINUTES, DatabaseManager, create_database_manager
+from event_scheduler import get_event_scheduler
+from update_queue import (UPDATE_QUEUE_BURST_MAX_IN_FLIGHT, UPDATE_QUEUE_BURST_PROBE_MINUTES,
+                          UPDATE_QUEUE_CYCLE_MINUTES, create_update_queue)
+from rate_limiter import saturating_in_flight
+from http_client import get_http_client
+from config import steam_store_url, cheapshark_url
 
 # Logging Setup
 try:
@@ -38,6 +44,16 @@ class SteamPriceTracker:
     Alle APIs funktionieren jetzt korrekt mit main.py und anderen Komponenten
     """
     
+    # Store Mapping für CheapShark storeIDs
+    CHEAPSHARK_STORE_MAPPING = {
+        '1': 'steam',
+        '3': 'greenmangaming',
+        '7': 'gog',
+        '11': 'humblestore',
+        '15': 'fanatical',
+        '25': 'gamesplanet'
+    }
+    
     def __init__(self, db_manager: Optional[DatabaseManager] = None, api_key: Optional[str] = None, 
                  enable_charts: bool = True, enable_scheduler: bool = True):
         """
@@ -77,12 +93,29 @@ class SteamPriceTracker:
             self.scheduler = None
             self.scheduler_thread = None
             self.scheduler_running = False
+            self._scheduler_owner = f"price_tracker#{id(self)}"
             self.charts_manager = None
             self.charts_enabled = False
             self.last_update = None
             self.update_count = 0
             self.error_count = 0
             
+            # Concurrent Fetch-Engine: Worker-Pool und In-Flight-Limits pro Upstream
+            self.fetch_max_workers = int(os.getenv('PRICE_FETCH_WORKERS', '8'))
+            self._host_in_flight = {
+                'steam': int(os.getenv('STEAM_MAX_IN_FLIGHT', '4')),
+                'cheapshark': int(os.getenv('CHEAPSHARK_MAX_IN_FLIGHT', '2'))
+            }
+            self._host_slots = {host: threading.BoundedSemaphore(limit)
+                                for host, limit in self._host_in_flight.items()}
+            self._batch_writer = None
+            
+            # Staleness-priorisierte Update-Queue (Request-Budget pro Zyklus)
+            self.update_queue = create_update_queue(self.db_manager)
+            
+            # Gemeinsamer, gepoolter HTTP Client (Keep-Alive pro Host)
+            self.http = get_http_client()
+            
             # NUR wenn nicht bereits initialisierend
             if not _INITIALIZING or enable_charts:
                 self._init_components()
@@ -177,24 +210,34 @@ class SteamPriceTracker:
         return False
     
     def _init_scheduler(self):
-        """Initialisiert den Scheduler"""
-        try:
-            # Schedule Jobs konfigurieren
-            schedule.clear()
-            
-            # Preis-Updates alle 6 Stunden
-            schedule.every(6).hours.do(self._scheduled_price_update)
-            
-            # Charts-Updates alle 2 Stunden (falls aktiviert)
-            if self.charts_enabled:
-                schedule.every(2).hours.do(self._scheduled_charts_update)
-            
-            # Datenbank-Cleanup einmal täglich
-            schedule.every().day.at("03:00").do(self._scheduled_cleanup)
-            
-            logger.info("✅ Scheduler konfiguriert")
-        except Exception as e:
-            logger.error(f"❌ Fehler bei Scheduler-Initialisierung: {e}")
+        """Initialisiert den Scheduler (Jobs werden erst bei start_scheduler im Event Scheduler geplant)"""
+        logger.info("✅ Scheduler konfiguriert")
+    
+    def _schedule_jobs(self):
+        """Plant die Tracker-Jobs im gemeinsamen Event Scheduler"""
+        core = get_event_scheduler()
+        owner = self._scheduler_owner
+        
+        # Update-Queue Zyklus (heiße Apps stündlich, ruhende wöchentlich)
+        core.add_job(f"{owner}:price_update", self._scheduled_price_update,
+                     interval_seconds=UPDATE_QUEUE_CYCLE_MINUTES * 60, group='price_api', owner=owner)
+        
+        # Sale-Stichprobe: startet bei einem Rabatt-Sprung den Wishlist-Burst
+        core.add_job(f"{owner}:sale_probe", self._scheduled_sale_probe,
+                     interval_seconds=UPDATE_QUEUE_BURST_PROBE_MINUTES * 60, group='price_api', owner=owner)
+        
+        # Charts-Updates alle 2 Stunden (falls aktiviert)
+        if self.charts_enabled:
+            core.add_job(f"{owner}:charts_update", self._scheduled_charts_update,
+                         interval_seconds=2 * 3600, group='steam_api', owner=owner)
+        
+        # Preis-Rollups inkrementell aktualisieren (get_price_rollups liest nur)
+        core.add_job(f"{owner}:price_rollups", self._scheduled_rollups,
+                     interval_seconds=PRICE_ROLLUP_INTERVAL_MINUTES * 60, group='database', owner=owner)
+        
+        # Datenbank-Cleanup einmal täglich
+        core.add_job(f"{owner}:cleanup", self._scheduled_cleanup,
+                     at="03:00", group='database', owner=owner)
     
     
     # =====================================================================
@@ -234,7 +277,27 @@ class SteamPriceTracker:
                 'stores_tracked': [],
                 'newest_snapshot': None
             }
-    
+
+    def get_http_stats(self) -> Dict:
+        """
+        Statistiken des gepoolten HTTP Clients und der Host-Rate-Limiter
+
+        Returns:
+            Dict mit 'pools' (Pool-Hits/Misses pro Host), 'rate_limits' und 'response_cache'
+        """
+        try:
+            from rate_limiter import get_rate_limiter_stats
+            from http_cache import get_http_cache
+            response_cache = get_http_cache()
+            return {
+                'pools': self.http.get_pool_stats(),
+                'rate_limits': get_rate_limiter_stats(),
+                'response_cache': response_cache.get_stats() if response_cache else {}
+            }
+        except Exception as e:
+            logger.error(f"❌ Fehler in get_http_stats: {e}")
+            return {'pools': {}, 'rate_limits': {}, 'response_cache': {}}
+
     def add_app_to_tracking(self, steam_app_id: str, name: Optional[str] = None, 
                            source: str = "manual") -> Tuple[bool, str]:
         """
@@ -307,8 +370,9 @@ class SteamPriceTracker:
             price_data = self._fetch_prices_for_app(steam_app_id, app_name)
             
             if price_data:
+                # False: Preis unverändert (nur bestätigt), None: Fehler
                 success = self.db_manager.save_price_snapshot(steam_app_id, app_name, price_data)
-                if success:
+                if success is not None:
                     logger.info(f"✅ Preise für {app_name} aktualisiert")
                     return True
             
@@ -334,7 +398,7 @@ class SteamPriceTracker:
             # Versuch 1: Vollständige Preisdaten
             price_data = self._fetch_all_prices(steam_app_id)
             if price_data:
-                return self.db_manager.save_price_snapshot(steam_app_id, price_data)
+                return self.db_manager.save_price_snapshot(steam_app_id, price_data) is not None
         
             # Versuch 2: Nur Steam-Preis
             steam_price = self._get_steam_price_direct(steam_app_id)
@@ -350,7 +414,7 @@ class SteamPriceTracker:
                         'available': True
                     }
                 }
-                return self.db_manager.save_price_snapshot(steam_app_id, minimal_data)
+                return self.db_manager.save_price_snapshot(steam_app_id, minimal_data) is not None
         
             # Versuch 3: Nur als "gecheckt" markieren
             with self.db_manager.get_connection() as conn:
@@ -431,59 +495,35 @@ class SteamPriceTracker:
             Liste mit Deal-Informationen
         """
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Hole neueste Deals aus allen Stores
-                stores = ['steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet']
-                deals = []
-                
-                for store in stores:
-                    cursor.execute(f"""
-                        SELECT DISTINCT 
-                            ps.steam_app_id,
-                            ps.game_title,
-                            ps.{store}_price as current_price,
-                            ps.{store}_original_price as original_price,
-                            ps.{store}_discount_percent as discount_percent,
-                            ps.timestamp,
-                            ta.name
-                        FROM price_snapshots ps
-                        JOIN tracked_apps ta ON ps.steam_app_id = ta.steam_app_id
-                        WHERE ps.{store}_discount_percent >= ?
-                        AND ps.{store}_price IS NOT NULL
-                        AND ps.{store}_price > 0
-                        AND ta.active = 1
-                        ORDER BY ps.{store}_discount_percent DESC, ps.timestamp DESC
-                        LIMIT ?
-                    """, (min_discount_percent, limit))
-                    
-                    for row in cursor.fetchall():
-                        deal = {
-                            'steam_app_id': row[0],
-                            'name': row[6] or row[1],
-                            'current_price': row[2],
-                            'original_price': row[3],
-                            'discount_percent': row[4],
-                            'store': store.title().replace('store', ' Store'),
-                            'timestamp': row[5]
-                        }
-                        deals.append(deal)
-                
-                # Nach Rabatt sortieren
-                deals.sort(key=lambda x: x['discount_percent'], reverse=True)
+            # Eine Zeile pro App aus latest_prices statt Scan über die gesamte Historie
+            stores = ['steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet']
+            latest = self.db_manager.get_latest_prices(min_discount=min_discount_percent, limit=limit)
+            
+            result = []
+            for row in latest:
+                # Günstigster Store, der die Rabatt-Schwelle erfüllt
+                qualifying = [
+                    store for store in stores
+                    if (row.get(f'{store}_discount_percent') or 0) >= min_discount_percent
+                    and (row.get(f'{store}_price') or 0) > 0
+                ]
+                if not qualifying:
+                    continue
                 
-                # Duplikate entfernen (gleiche App, niedrigerer Preis bevorzugen)
-                unique_deals = {}
-                for deal in deals:
-                    app_id = deal['steam_app_id']
-                    if app_id not in unique_deals or deal['current_price'] < unique_deals[app_id]['current_price']:
-                        unique_deals[app_id] = deal
-                
-                result = list(unique_deals.values())[:limit]
-                logger.info(f"📊 {len(result)} Deals gefunden (min. {min_discount_percent}% Rabatt)")
-                
-                return result
+                store = min(qualifying, key=lambda s: row[f'{s}_price'])
+                result.append({
+                    'steam_app_id': row['steam_app_id'],
+                    'name': row.get('name') or row.get('game_title'),
+                    'current_price': row[f'{store}_price'],
+                    'original_price': row[f'{store}_original_price'],
+                    'discount_percent': row[f'{store}_discount_percent'],
+                    'store': store.title().replace('store', ' Store'),
+                    'timestamp': row['timestamp']
+                })
+            
+            logger.info(f"📊 {len(result)} Deals gefunden (min. {min_discount_percent}% Rabatt)")
+            
+            return result
                 
         except Exception as e:
             logger.error(f"❌ Fehler beim Laden der Deals: {e}")
@@ -522,6 +562,84 @@ class SteamPriceTracker:
         except Exception as e:
             logger.error(f"❌ Fehler bei Preis-Zusammenfassung: {e}")
     
+    def get_price_history(self, steam_app_id: str, days_back: int = 30, limit: int = 500) -> List[Dict]:
+        """
+        HISTORY-API: Preisverlauf als Reihe (ein Punkt pro Tracking-Intervall)
+        
+        Change-only Snapshots werden über die Datenbank wieder expandiert.
+        
+        Args:
+            steam_app_id: Steam App ID
+            days_back: Zeitraum in Tagen
+            limit: Maximum Anzahl Punkte
+            
+        Returns:
+            Aufsteigend sortierte Liste mit date, price (günstigster Store), store und Store-Spalten
+        """
+        try:
+            stores = ['steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet']
+            history = self.db_manager.get_price_history(steam_app_id, days=days_back, limit=limit, expand=True)
+            
+            series = []
+            for row in reversed(history):
+                offers = [store for store in stores if (row.get(f'{store}_price') or 0) > 0]
+                best_store = min(offers, key=lambda store: row[f'{store}_price']) if offers else None
+                
+                series.append(dict(
+                    row,
+                    date=row.get('timestamp'),
+                    price=row[f'{best_store}_price'] if best_store else 0.0,
+                    store=best_store.title().replace('store', ' Store') if best_store else 'N/A'
+                ))
+            
+            return series
+            
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Laden des Preisverlaufs für {steam_app_id}: {e}")
+            return []
+    
+    def export_to_csv(self, output_file: Optional[str] = None) -> Optional[str]:
+        """
+        EXPORT-API: Exportiert die aktuellen Preise aller getrackten Apps als CSV
+        
+        Liest aus latest_prices (eine Zeile pro App) statt aus der gesamten Historie.
+        
+        Args:
+            output_file: Zieldatei (Standard: EXPORT_DIRECTORY/price_export_<timestamp>.csv)
+            
+        Returns:
+            Pfad der CSV-Datei oder None bei Fehler
+        """
+        import csv
+        
+        try:
+            if not output_file:
+                export_dir = os.getenv('EXPORT_DIRECTORY', 'exports')
+                output_file = os.path.join(export_dir, f"price_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            
+            directory = os.path.dirname(output_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            rows = self.db_manager.get_all_tracked_apps_latest_prices()
+            stores = ['steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet']
+            fieldnames = ['steam_app_id', 'name', 'target_price', 'price_timestamp',
+                          'best_price', 'best_store', 'max_discount']
+            fieldnames += [f"{store}_{field}" for store in stores for field in ('price', 'original_price', 'discount_percent')]
+            
+            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore',
+                                        delimiter=os.getenv('CSV_DELIMITER', ','))
+                writer.writeheader()
+                writer.writerows(rows)
+            
+            logger.info(f"📄 CSV-Export: {len(rows)} Apps nach {output_file}")
+            return output_file
+            
+        except Exception as e:
+            logger.error(f"❌ CSV-Export fehlgeschlagen: {e}")
+            return None
+    
     # =====================================================================
     # SCHEDULER MANAGEMENT
     # =====================================================================
@@ -533,10 +651,9 @@ class SteamPriceTracker:
                 logger.info("ℹ️ Scheduler läuft bereits")
                 return True
             
-            # Scheduler-Thread starten
+            # Jobs im Event Scheduler planen (kein eigener Polling-Thread)
             self.scheduler_running = True
-            self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-            self.scheduler_thread.start()
+            self._schedule_jobs()
             
             logger.info("🚀 Scheduler gestartet")
             return True
@@ -553,11 +670,7 @@ class SteamPriceTracker:
                 return True
             
             self.scheduler_running = False
-            
-            if self.scheduler_thread and self.scheduler_thread.is_alive():
-                self.scheduler_thread.join(timeout=5)
-            
-            schedule.clear()
+            get_event_scheduler().remove_jobs(self._scheduler_owner)
             logger.info("🛑 Scheduler gestoppt")
             return True
             
@@ -571,12 +684,11 @@ class SteamPriceTracker:
         Kompatibel mit main.py
         """
         try:
-            next_run = None
-            jobs_count = len(schedule.jobs)
-            
-            if schedule.jobs:
-                next_job = min(schedule.jobs, key=lambda job: job.next_run)
-                next_run = next_job.next_run.strftime('%Y-%m-%d %H:%M:%S') if next_job.next_run else None
+            core = get_event_scheduler()
+            jobs = core.get_jobs(self._scheduler_owner)
+            next_job = core.next_run(self._scheduler_owner)
+            next_run = next_job.strftime('%Y-%m-%d %H:%M:%S') if next_job else None
+            jobs_count = len(jobs)
             
             return {
                 'scheduler_running': self.scheduler_running,
@@ -608,6 +720,7 @@ class SteamPriceTracker:
                 'api_key_available': bool(self.api_key),
                 'database_status': 'connected',
                 'last_successful_update': self.last_update.isoformat() if self.last_update else None,
+                'jobs': [job.to_dict() for job in get_event_scheduler().get_jobs(self._scheduler_owner)],
                 'performance_metrics': {
                     'updates_completed': self.update_count,
                     'errors_encountered': self.error_count,
@@ -621,44 +734,144 @@ class SteamPriceTracker:
             logger.error(f"❌ Fehler beim erweiterten Scheduler-Status: {e}")
             return self.get_scheduler_status()
     
-    def _run_scheduler(self):
-        """Scheduler-Hauptschleife"""
-        logger.info("🔄 Scheduler-Thread gestartet")
-        
-        while self.scheduler_running:
-            try:
-                schedule.run_pending()
-                time_module.sleep(60)  # Prüfe alle 60 Sekunden
-            except Exception as e:
-                logger.error(f"❌ Fehler im Scheduler: {e}")
-                self.error_count += 1
-                time_module.sleep(60)
-        
-        logger.info("🔄 Scheduler-Thread beendet")
-    
     def _scheduled_price_update(self):
-        """Geplante Preisaktualisierung"""
+        """Geplante Preisaktualisierung (ein Zyklus der Update-Queue)"""
         try:
             logger.info("🔄 Starte geplante Preisaktualisierung...")
-            
-            apps = self.get_tracked_apps()
-            if not apps:
-                logger.info("ℹ️ Keine Apps für Update gefunden")
-                return
-            
-            app_ids = [app['steam_app_id'] for app in apps]
-            results = self.track_app_prices(app_ids[:20])  # Limitiere auf 20 Apps pro Run
-            
-            successful = sum(1 for success in results.values() if success)
-            self.update_count += successful
-            self.last_update = datetime.now()
-            
-            logger.info(f"✅ Geplante Preisaktualisierung abgeschlossen: {successful}/{len(results)} erfolgreich")
+            self.run_update_cycle()
             
         except Exception as e:
             logger.error(f"❌ Fehler bei geplanter Preisaktualisierung: {e}")
             self.error_count += 1
     
+    def run_update_cycle(self, request_budget: Optional[int] = None,
+                         progress_callback=None) -> Dict[str, Any]:
+        """
+        Ein Zyklus der Update-Queue: neu bewerten, fällige Apps mit dem höchsten Wert
+        bis zum Request-Budget aktualisieren und das Ergebnis in der Queue buchen
+        
+        Args:
+            request_budget: Requests für diesen Zyklus (Standard: UPDATE_QUEUE_REQUEST_BUDGET)
+            progress_callback: Optionaler Callback für Progress-Updates
+            
+        Returns:
+            Dict mit apps, refreshed, failed, duration und rescore
+        """
+        start_time = time_module.time()
+        rescore = self.update_queue.rescore()
+        app_ids = self.update_queue.next_batch(request_budget)
+        
+        if not app_ids:
+            logger.info("ℹ️ Update-Queue: keine fälligen Apps")
+            return {'apps': 0, 'refreshed': 0, 'failed': 0, 'duration': 0.0, 'rescore': rescore}
+        
+        before = self.update_queue.last_updates(app_ids)
+        self.batch_update_multiple_apps(app_ids, progress_callback=progress_callback, concurrent=True)
+        booked = self.update_queue.complete(app_ids, before)
+        
+        self.update_count += booked['refreshed']
+        self.last_update = datetime.now()
+        
+        result = {
+            'apps': len(app_ids),
+            **booked,
+            'duration': round(time_module.time() - start_time, 2),
+            'rescore': rescore
+        }
+        logger.info(f"✅ Update-Queue Zyklus: {booked['refreshed']}/{len(app_ids)} Apps aktualisiert "
+                    f"in {result['duration']}s")
+        return result
+    
+    def _scheduled_sale_probe(self):
+        """Geplante Sale-Stichprobe (Burst bei erkanntem Sale)"""
+        try:
+            self.probe_sale_event()
+        except Exception as e:
+            logger.error(f"❌ Fehler bei Sale-Stichprobe: {e}")
+            self.error_count += 1
+    
+    def probe_sale_event(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Prüft per Stichprobe, ob ein Steam Sale begonnen hat, und startet dann den Burst
+        
+        Die Stichprobe kostet einen gebündelten appdetails-Request; dessen Antwortzeit
+        dient als Latenz-Schätzung für die Burst-Parallelität.
+        
+        Args:
+            force: Prüfabstand und Cooldown ignorieren
+            
+        Returns:
+            Dict mit probe (Stichprobe) und burst (Ergebnis von run_burst_refresh oder None)
+        """
+        if not force and not self.update_queue.burst_probe_due():
+            return {'skipped': True}
+        
+        sample = self.update_queue.burst_sample()
+        if not sample:
+            return {'skipped': True}
+        
+        start_time = time_module.time()
+        prices = self._fetch_steam_prices_batch(sample, len(sample))
+        latency = min(time_module.time() - start_time, self.http.get_timeout(steam_store_url('appdetails')))
+        
+        probe = self.update_queue.detect_sale_burst(
+            {app_id: (prices.get(app_id) or {}).get('discount_percent') for app_id in sample}
+        )
+        burst = self.run_burst_refresh(latency) if probe['sale'] else None
+        return {'probe': probe, 'burst': burst}
+    
+    def run_burst_refresh(self, latency_seconds: float = 1.0, progress_callback=None) -> Dict[str, Any]:
+        """
+        Sale-Burst: aktualisiert die gesamte Wishlist in minimaler Wall-Time
+        
+        Das Request-Budget der Queue gilt hier nicht; die Parallelität pro Upstream wird
+        bis zu dem Wert angehoben, der den Token-Bucket des Hosts gerade auslastet
+        (Burst + Latenz/Intervall, begrenzt durch Pool-Größe und UPDATE_QUEUE_BURST_MAX_IN_FLIGHT).
+        Danach gelten wieder die normalen In-Flight-Limits und die Kadenz der Queue.
+        
+        Args:
+            latency_seconds: Geschätzte Antwortzeit eines Requests
+            progress_callback: Optionaler Callback für Progress-Updates
+            
+        Returns:
+            Dict mit apps, refreshed, failed, duration, workers und in_flight
+        """
+        start_time = time_module.time()
+        app_ids, session_id = self.update_queue.plan_burst()
+        if not app_ids:
+            logger.info("ℹ️ Sale-Burst: keine Wishlist-Apps")
+            return {'apps': 0, 'refreshed': 0, 'failed': 0, 'duration': 0.0}
+        
+        in_flight = {}
+        for host, url in (('steam', steam_store_url('appdetails')), ('cheapshark', cheapshark_url('games'))):
+            cap = min(UPDATE_QUEUE_BURST_MAX_IN_FLIGHT, self.http.get_pool_size(url))
+            in_flight[host] = max(self._host_in_flight[host], saturating_in_flight(url, latency_seconds, cap))
+        workers = max(self.fetch_max_workers, sum(in_flight.values()))
+        
+        logger.info(f"🔥 Sale-Burst: {len(app_ids)} Wishlist-Apps, {workers} Worker "
+                    f"(In-Flight Steam {in_flight['steam']}, CheapShark {in_flight['cheapshark']})")
+        
+        before = self.update_queue.last_updates(app_ids)
+        # Eigene Slots nur für diesen Lauf; parallele Updates behalten die normalen Limits
+        burst_slots = {host: threading.BoundedSemaphore(limit) for host, limit in in_flight.items()}
+        self.batch_update_multiple_apps(app_ids, progress_callback=progress_callback,
+                                        concurrent=True, max_workers=workers, host_slots=burst_slots)
+        booked = self.update_queue.complete_burst(session_id, app_ids, before)
+        
+        self.update_count += booked['refreshed']
+        self.last_update = datetime.now()
+        
+        result = {
+            'apps': len(app_ids),
+            **booked,
+            'duration': round(time_module.time() - start_time, 2),
+            'workers': workers,
+            'in_flight': in_flight
+        }
+        logger.info(f"✅ Sale-Burst: {booked['refreshed']}/{len(app_ids)} Apps in {result['duration']}s "
+                    f"aktualisiert, zurück zur normalen Kadenz")
+        return result
+    
     def _scheduled_charts_update(self):
         """Geplante Charts-Aktualisierung"""
         try:
@@ -678,6 +891,13 @@ class SteamPriceTracker:
             logger.error(f"❌ Fehler bei Charts-Aktualisierung: {e}")
             self.error_count += 1
     
+    def _scheduled_rollups(self):
+        """Geplante Aktualisierung der Preis-Rollups"""
+        result = self.db_manager.rollup_prices()
+        if not result['success']:
+            logger.warning(f"⚠️ Preis-Rollups nicht aktualisiert: {result.get('error')}")
+            self.error_count += 1
+    
     def _scheduled_cleanup(self):
         """Geplante Datenbank-Bereinigung"""
         try:
@@ -703,10 +923,10 @@ class SteamPriceTracker:
             if not self.api_key:
                 return None
             
-            url = f"https://store.steampowered.com/api/appdetails"
+            url = steam_store_url('appdetails')
             params = {'appids': steam_app_id}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -728,8 +948,21 @@ class SteamPriceTracker:
         """
         return self._fetch_prices_for_app(steam_app_id, app_name or f"Game {steam_app_id}")
     
-    def _fetch_prices_for_app(self, steam_app_id: str, app_name: str) -> Optional[Dict]:
-        """Holt aktuelle Preise für eine App von allen Stores"""
+    def _fetch_prices_for_app(self, steam_app_id: str, app_name: str,
+                              steam_prices: Optional[Dict] = None, steam_prefetched: bool = False,
+                              cheapshark_prices: Optional[Dict] = None,
+                              host_slots: Optional[Dict[str, threading.BoundedSemaphore]] = None) -> Optional[Dict]:
+        """
+        Holt aktuelle Preise für eine App von allen Stores
+        
+        Args:
+            steam_app_id: Steam App ID
+            app_name: Name der App
+            steam_prices: Bereits über _fetch_steam_prices_batch geladene Steam-Preise
+            steam_prefetched: True wenn steam_prices aus einem Batch stammt (kein eigener Steam-Request)
+            cheapshark_prices: Bereits über _fetch_cheapshark_prices_batch geladene Deals (None = einzeln abrufen)
+            host_slots: In-Flight-Slots pro Upstream (Standard: die normalen Limits der Instanz)
+        """
         try:
             price_data = {
                 'steam_app_id': steam_app_id,
@@ -738,12 +971,16 @@ class SteamPriceTracker:
             }
             
             # Steam Store Preise
-            steam_prices = self._fetch_steam_prices(steam_app_id)
+            if not steam_prefetched:
+                steam_prices = self._call_upstream('steam', self._fetch_steam_prices, steam_app_id,
+                                                   slots=host_slots)
             if steam_prices:
                 price_data['steam'] = steam_prices
             
-            # Weitere Stores über CheapShark API
-            cheapshark_prices = self._fetch_cheapshark_prices(app_name)
+            # Weitere Stores über CheapShark API (erwartet die Steam App ID, nicht den Namen)
+            if cheapshark_prices is None:
+                cheapshark_prices = self._call_upstream('cheapshark', self._fetch_cheapshark_prices, steam_app_id,
+                                                        slots=host_slots)
             if cheapshark_prices:
                 price_data.update(cheapshark_prices)
             
@@ -753,19 +990,39 @@ class SteamPriceTracker:
             logger.error(f"❌ Fehler beim Abrufen der Preise für {steam_app_id}: {e}")
             return None
     
+    def _call_upstream(self, host: str, func, *args,
+                       slots: Optional[Dict[str, threading.BoundedSemaphore]] = None):
+        """
+        Führt einen Upstream-Aufruf innerhalb des In-Flight-Limits des Hosts aus
+        
+        Args:
+            host: Upstream-Name ('steam' oder 'cheapshark')
+            func: Aufzurufende Fetch-Methode
+            slots: In-Flight-Slots pro Upstream (Standard: die normalen Limits der Instanz)
+            
+        Returns:
+            Rückgabewert von func
+        """
+        slot = (slots or self._host_slots).get(host)
+        if slot is None:
+            return func(*args)
+        with slot:
+            return func(*args)
+    
     def _fetch_steam_prices(self, steam_app_id: str) -> Optional[Dict]:
         """
         Holt Preise vom Steam Store
         """
         try:
-            url = f"https://store.steampowered.com/api/appdetails"
+            url = steam_store_url('appdetails')
             params = {
                 'appids': steam_app_id, 
                 'filters': 'price_overview',
                 'cc': 'de'  # Deutsche Preise
             }
         
-            response = requests.get(url, params=params, timeout=15)
+            # Gepoolter Client übernimmt Rate Limiting, Retries und Timeout
+            response = self.http.get(url, params=params, cache=True)
             response.raise_for_status()
         
             data = response.json()
@@ -775,173 +1032,161 @@ class SteamPriceTracker:
                 logger.debug(f"Steam API gab unerwarteten Datentyp zurück: {type(data)} für App {steam_app_id}")
                 return None
         
-            # App-spezifische Daten extrahieren
-            app_data = data.get(str(steam_app_id))
+            return self._parse_steam_app_price(steam_app_id, data.get(str(steam_app_id)))
         
-            # Weitere Validierung
-            if not app_data:
-                logger.debug(f"Keine App-Daten für {steam_app_id} in Response")
-                return None
-            
-            if not isinstance(app_data, dict):
-                logger.debug(f"App-Daten sind kein Dictionary für {steam_app_id}: {type(app_data)}")
-                return None
+        except requests.RequestException as e:
+            logger.debug(f"Request-Fehler bei Steam API für {steam_app_id}: {e}")
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Parsing-Fehler bei Steam API für {steam_app_id}: {e}")
+            return None
+        except Exception as e:
+            logger.debug(f"Unerwarteter Fehler bei Steam API für {steam_app_id}: {e}")
+            return None
+    
+    def _fetch_steam_prices_batch(self, app_ids: List[str], batch_size: Optional[int] = None,
+                                  single_fallback: bool = True,
+                                  host_slots: Optional[Dict[str, threading.BoundedSemaphore]] = None) -> Dict[str, Optional[Dict]]:
+        """
+        Holt Steam-Preise für mehrere Apps mit einem appdetails-Request pro Gruppe
         
-            # Success-Flag prüfen
-            if not app_data.get('success', False):
-                logger.debug(f"Steam API success=False für {steam_app_id}")
-                return None
+        Steam akzeptiert bei filters=price_overview komma-separierte appids. Die Response
+        wird pro App aufgeteilt; Apps aus fehlgeschlagenen Requests oder ohne Eintrag in
+        der Response werden einzeln über _fetch_steam_prices nachgeladen.
         
-            # Price Overview extrahieren
-            if 'data' not in app_data:
-                logger.debug(f"Keine 'data'-Sektion für {steam_app_id}")
-                return None
-            
-            app_info = app_data['data']
-            if not isinstance(app_info, dict):
-                logger.debug(f"App-Info ist kein Dictionary für {steam_app_id}: {type(app_info)}")
-                return None
+        Args:
+            app_ids: Liste von Steam App IDs
+            batch_size: Apps pro Request (Standard: STEAM_APPDETAILS_BATCH_SIZE oder 50)
+            single_fallback: Fehlgeschlagene Apps hier einzeln nachladen; bei False fehlen sie
+                im Ergebnis und der Aufrufer lädt sie selbst (z.B. parallel im Worker-Pool)
+            host_slots: In-Flight-Slots pro Upstream (Standard: die normalen Limits der Instanz)
             
-            price_overview = app_info.get('price_overview')
+        Returns:
+            Dict app_id -> Steam-Preisdaten (None wenn kein Preis verfügbar)
+        """
+        batch_size = batch_size or int(os.getenv('STEAM_APPDETAILS_BATCH_SIZE', '50'))
+        app_ids = list(dict.fromkeys(str(app_id) for app_id in app_ids))
+        
+        results = {}
+        retry_single = []
+        url = steam_store_url('appdetails')
+        steam_slot = (host_slots or self._host_slots)['steam']
         
-            if price_overview and isinstance(price_overview, dict):
-                # Preise in Euro umrechnen (Steam gibt Cent zurück)
-                final_price = price_overview.get('final', 0) / 100
-                initial_price = price_overview.get('initial', final_price * 100) / 100
-                discount_percent = price_overview.get('discount_percent', 0)
+        for i in range(0, len(app_ids), batch_size):
+            chunk = app_ids[i:i + batch_size]
+            params = {
+                'appids': ','.join(chunk),
+                'filters': 'price_overview',
+                'cc': 'de'
+            }
             
-                return {
-                    'price': final_price,
-                    'original_price': initial_price,
-                    'discount_percent': discount_percent,
-                    'available': True,
-                    'currency': price_overview.get('currency', 'EUR')
-                }
+            try:
+                with steam_slot:
+                    response = self.http.get(url, params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                if not isinstance(data, dict):
+                    raise ValueError(f"Unerwarteter Datentyp: {type(data)}")
+                
+                for app_id in chunk:
+                    if app_id in data:
+                        results[app_id] = self._parse_steam_app_price(app_id, data[app_id])
+                    else:
+                        retry_single.append(app_id)
+                        
+            except Exception as e:
+                logger.debug(f"⚠️ Steam Batch-Request für {len(chunk)} Apps fehlgeschlagen: {e}")
+                retry_single.extend(chunk)
         
-            # App verfügbar aber kein Preis (möglicherweise kostenlos)
-            if app_info.get('is_free', False):
-                return {
-                    'price': 0.0,
-                    'original_price': 0.0,
-                    'discount_percent': 0,
-                    'available': True,
-                    'currency': 'EUR'
-                }
+        # Fallback: Einzelabfragen für fehlgeschlagene Apps
+        if retry_single and single_fallback:
+            logger.debug(f"🔄 Steam Einzel-Fallback für {len(retry_single)} Apps")
+            for app_id in retry_single:
+                results[app_id] = self._call_upstream('steam', self._fetch_steam_prices, app_id,
+                                                      slots=host_slots)
+        
+        requests_saved = len(app_ids) - math_module.ceil(len(app_ids) / batch_size) - len(retry_single)
+        logger.debug(f"📦 Steam Batch-Preise: {len(app_ids)} Apps, {max(requests_saved, 0)} Requests eingespart")
+        
+        return results
+    
+    def _parse_steam_app_price(self, steam_app_id: str, app_data: Any) -> Optional[Dict]:
+        """
+        Extrahiert Preisdaten aus dem appdetails-Eintrag einer App
         
+        Args:
+            steam_app_id: Steam App ID
+            app_data: Eintrag der App aus der appdetails-Response
+            
+        Returns:
+            Steam-Preisdaten oder None
+        """
+        # Eintrag validieren
+        if not app_data:
+            logger.debug(f"Keine App-Daten für {steam_app_id} in Response")
             return None
         
-        except requests.RequestException as e:
-            logger.debug(f"Request-Fehler bei Steam API für {steam_app_id}: {e}")
+        if not isinstance(app_data, dict):
+            logger.debug(f"App-Daten sind kein Dictionary für {steam_app_id}: {type(app_data)}")
             return None
-        except (ValueError, KeyError, TypeError) as e:
-            logger.debug(f"Parsing-Fehler bei Steam API für {steam_app_id}: {e}")
+    
+        # Success-Flag prüfen
+        if not app_data.get('success', False):
+            logger.debug(f"Steam API success=False für {steam_app_id}")
             return None
-        except Exception as e:
-            logger.debug(f"Unerwarteter Fehler bei Steam API für {steam_app_id}: {e}")
+    
+        # Price Overview extrahieren
+        if 'data' not in app_data:
+            logger.debug(f"Keine 'data'-Sektion für {steam_app_id}")
+            return None
+        
+        app_info = app_data['data']
+        if not isinstance(app_info, dict):
+            logger.debug(f"App-Info ist kein Dictionary für {steam_app_id}: {type(app_info)}")
             return None
+        
+        price_overview = app_info.get('price_overview')
+    
+        if price_overview and isinstance(price_overview, dict):
+            # Preise in Euro umrechnen (Steam gibt Cent zurück)
+            final_price = price_overview.get('final', 0) / 100
+            initial_price = price_overview.get('initial', final_price * 100) / 100
+            discount_percent = price_overview.get('discount_percent', 0)
+        
+            return {
+                'price': final_price,
+                'original_price': initial_price,
+                'discount_percent': discount_percent,
+                'available': True,
+                'currency': price_overview.get('currency', 'EUR')
+            }
+    
+        # App verfügbar aber kein Preis (möglicherweise kostenlos)
+        if app_info.get('is_free', False):
+            return {
+                'price': 0.0,
+                'original_price': 0.0,
+                'discount_percent': 0,
+                'available': True,
+                'currency': 'EUR'
+            }
+    
+        return None
     
     def _fetch_cheapshark_prices(self, steam_app_id: str) -> Optional[Dict]:
         """
         Holt Preise von CheapShark API für eine App mit Steam-Only Fallback bei Überlastung
+        
+        Nutzt das gespeicherte steamAppID -> gameID Mapping; nur unbekannte Apps
+        kosten einen zusätzlichen games?steamAppID Request.
         """
-    
+        steam_app_id = str(steam_app_id)
+        
         try:
-            # Rate Limit aus .env lesen (NICHT hardcoded!)
-            if not hasattr(self, '_cheapshark_current_rate'):
-                self._cheapshark_current_rate = float(os.getenv('CHEAPSHARK_RATE_LIMIT', '2.5'))
-                self._cheapshark_last_request = 0
-                self._cheapshark_success_count = 0
-                self._cheapshark_error_count = 0
-    
-            max_retries = 3  # Reduziert von 6 auf 3 für schnellere Fallbacks
-            base_timeout = int(os.getenv('CHEAPSHARK_TIMEOUT', '25'))
-    
-            for attempt in range(max_retries + 1):
-                try:
-                    # Rate Limiting
-                    current_time = time_module.time()
-                    time_since_last = current_time - self._cheapshark_last_request
-            
-                    if time_since_last < self._cheapshark_current_rate:
-                        wait_time = self._cheapshark_current_rate - time_since_last
-                        logger.debug(f"⏳ CheapShark Rate Limit: warte {wait_time:.1f}s")
-                        time_module.sleep(wait_time)
-            
-                    self._cheapshark_last_request = time_module.time()
-            
-                    # Request mit adaptivem Timeout
-                    timeout = base_timeout + (attempt * 5)
-                    url = "https://www.cheapshark.com/api/1.0/games"
-                    params = {'steamAppID': steam_app_id, 'format': 'json'}
-            
-                    response = requests.get(url, params=params, timeout=timeout)
-            
-                    if response.status_code == 200:
-                        # Erfolg - optimiere Rate
-                        self._cheapshark_success_count += 1
-                        if self._cheapshark_success_count % 5 == 0 and self._cheapshark_current_rate > 1.0:
-                            self._cheapshark_current_rate = max(1.0, self._cheapshark_current_rate * 0.9)
-                            logger.debug(f"✅ CheapShark Rate optimiert: {self._cheapshark_current_rate:.1f}s")
-                
-                        # Parse Response
-                        games = response.json()
-                        if not games:
-                            return {}
-                
-                        # Store Mapping für CheapShark
-                        store_mapping = {
-                            '1': 'steam',
-                            '3': 'greenmangaming', 
-                            '7': 'gog',
-                            '11': 'humblestore',
-                            '15': 'fanatical',
-                            '25': 'gamesplanet'
-                        }
-                
-                        prices = {}
-                        for game in games:
-                            if game.get('steamAppID') == steam_app_id:
-                                deals_url = f"https://www.cheapshark.com/api/1.0/games?id={game['gameID']}"
-                                deals_response = requests.get(deals_url, timeout=timeout)
-                            
-                                if deals_response.status_code == 200:
-                                    deals_data = deals_response.json()
-                                
-                                    for deal in deals_data.get('deals', []):
-                                        store_id = deal.get('storeID')
-                                        store_name = store_mapping.get(store_id, f'store_{store_id}')
-                                    
-                                        prices[store_name] = {
-                                            'price': float(deal.get('price', 0)),
-                                            'original_price': float(deal.get('retailPrice', 0)),
-                                            'discount_percent': int(float(deal.get('savings', 0))),
-                                            'available': True
-                                        }
-                    
-                        return prices
-                
-                    elif response.status_code == 429:
-                        # Rate Limit Hit - exponential backoff
-                        self._cheapshark_error_count += 1
-                        retry_delay = min(self._cheapshark_current_rate * (2 ** attempt), 20.0)
-                        self._cheapshark_current_rate = min(self._cheapshark_current_rate * 1.5, 5.0)
-                    
-                        logger.warning(f"⚠️ CheapShark Rate Limit: {self._cheapshark_current_rate:.1f}s")
-                    
-                        if attempt < max_retries:
-                            logger.warning(f"🔄 CheapShark 429 Retry in {retry_delay}s")
-                            time_module.sleep(retry_delay)
-                        else:
-                            logger.error(f"❌ CheapShark 429 nach {max_retries} Versuchen")
-                            break
-                    else:
-                        logger.warning(f"⚠️ CheapShark HTTP {response.status_code}")
-                        break
-                    
-                except Exception as e:
-                    logger.debug(f"⚠️ CheapShark Request-Fehler: {e}")
-                    if attempt == max_retries:
-                        break
+            prices = self._fetch_cheapshark_prices_batch([steam_app_id], resolve_missing=True)
+            if steam_app_id in prices:
+                return prices[steam_app_id]
                     
             # FALLBACK: Steam-Only wenn CheapShark fehlschlägt
             logger.info(f"🔄 CheapShark fehlgeschlagen - verwende Steam-Only für {steam_app_id}")
@@ -962,31 +1207,159 @@ class SteamPriceTracker:
         except Exception as e:
             logger.debug(f"⚠️ CheapShark Fehler für {steam_app_id}: {e}")
             return {}
+    
+    def _fetch_cheapshark_prices_batch(self, app_ids: List[str], resolve_missing: bool = False,
+                                       batch_size: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Holt CheapShark-Deals für viele Apps über games?ids= (bis zu 25 gameIDs pro Request)
+        
+        Args:
+            app_ids: Steam App IDs
+            resolve_missing: Unbekannte Apps per games?steamAppID auflösen und Mapping speichern
+            batch_size: gameIDs pro Request (Standard: CHEAPSHARK_IDS_BATCH_SIZE bzw. 25)
+            
+        Returns:
+            Dict app_id -> Store-Preise ({} wenn CheapShark die App nicht führt).
+            Apps ohne bekanntes Mapping oder mit fehlgeschlagenem Request fehlen.
+        """
+        batch_size = min(25, batch_size or int(os.getenv('CHEAPSHARK_IDS_BATCH_SIZE', '25')))
+        negative_ttl = int(os.getenv('CHEAPSHARK_MAPPING_NEGATIVE_TTL_HOURS', '168'))
+        app_ids = list(dict.fromkeys(str(app_id) for app_id in app_ids))
+        
+        mapping = self.db_manager.get_cheapshark_game_ids(app_ids, negative_ttl_hours=negative_ttl)
+        
+        if resolve_missing:
+            resolved = {}
+            for app_id in app_ids:
+                if app_id not in mapping:
+                    game_id = self._resolve_cheapshark_game_id(app_id)
+                    if game_id is not False:
+                        resolved[app_id] = game_id
+            
+            if resolved:
+                self.db_manager.save_cheapshark_game_ids(resolved)
+                mapping.update(resolved)
+        
+        results = {app_id: {} for app_id, game_id in mapping.items() if not game_id}
+        
+        apps_by_game = {}
+        for app_id, game_id in mapping.items():
+            if game_id:
+                apps_by_game.setdefault(str(game_id), []).append(app_id)
+        
+        game_ids = list(apps_by_game.keys())
+        url = cheapshark_url('games')
+        
+        for i in range(0, len(game_ids), batch_size):
+            chunk = game_ids[i:i + batch_size]
+            games = self._cheapshark_request(url, {'ids': ','.join(chunk)})
+            
+            if not isinstance(games, dict):
+                continue
+            
+            for game_id in chunk:
+                game = games.get(game_id) or {}
+                prices = self._parse_cheapshark_deals(game.get('deals', []))
+                for app_id in apps_by_game[game_id]:
+                    results[app_id] = prices
+        
+        if len(app_ids) > 1:
+            logger.debug(f"🦈 CheapShark Bulk: {len(results)}/{len(app_ids)} Apps mit "
+                         f"{(len(game_ids) + batch_size - 1) // batch_size} Requests")
+        
+        return results
+    
+    def _resolve_cheapshark_game_id(self, steam_app_id: str):
+        """
+        Löst Steam App ID zu CheapShark gameID auf
+        
+        Returns:
+            gameID, None wenn CheapShark die App nicht führt, False bei Fehler
+        """
+        games = self._cheapshark_request(
+            cheapshark_url('games'),
+            {'steamAppID': steam_app_id, 'format': 'json'}
+        )
+        
+        if games is None:
+            return False
+        
+        for game in games if isinstance(games, list) else []:
+            if str(game.get('steamAppID')) == str(steam_app_id) and game.get('gameID'):
+                return str(game['gameID'])
+        
+        return None
+    
+    def _cheapshark_request(self, url: str, params: Dict):
+        """
+        GET an CheapShark mit Retry bei 429
+        
+        Rate Limit (CHEAPSHARK_RATE_LIMIT), Timeout und 5xx-Retries kommen aus dem gepoolten Client.
+        
+        Returns:
+            Geparstes JSON oder None bei Fehler
+        """
+        max_retries = 3  # Reduziert von 6 auf 3 für schnellere Fallbacks
+        base_timeout = self.http.get_timeout(url)
+        
+        for attempt in range(max_retries + 1):
+            try:
+                # Request mit adaptivem Timeout
+                timeout = base_timeout + (attempt * 5)
+                response = self.http.get(url, params=params, timeout=timeout, cache=True)
+                
+                if response.status_code == 200:
+                    return response.json()
+                
+                elif response.status_code == 429:
+                    # Rate Limit Hit - Bucket pausiert bis Retry-After bzw. adaptiv
+                    if attempt < max_retries:
+                        logger.warning(f"🔄 CheapShark 429 Retry {attempt + 1}/{max_retries}")
+                    else:
+                        logger.error(f"❌ CheapShark 429 nach {max_retries} Versuchen")
+                else:
+                    logger.warning(f"⚠️ CheapShark HTTP {response.status_code}")
+                    return None
+                
+            except Exception as e:
+                # Verbindungsfehler wurden bereits im HTTPAdapter wiederholt
+                logger.debug(f"⚠️ CheapShark Request-Fehler: {e}")
+                return None
+        
+        return None
+    
+    def _parse_cheapshark_deals(self, deals: List[Dict]) -> Dict:
+        """Wandelt CheapShark-Deals in das Store-Preisformat um"""
+        prices = {}
+        
+        for deal in deals or []:
+            store_id = str(deal.get('storeID'))
+            store_name = self.CHEAPSHARK_STORE_MAPPING.get(store_id, f'store_{store_id}')
+            
+            prices[store_name] = {
+                'price': float(deal.get('price', 0)),
+                'original_price': float(deal.get('retailPrice', 0)),
+                'discount_percent': int(float(deal.get('savings', 0))),
+                'available': True
+            }
+        
+        return prices
         
     def _get_steam_price_direct(self, app_id: str) -> Optional[float]:
         """
         Holt Preis direkt von Steam Store API (Fallback)
         """
         try:
-            # Rate Limiting
-            if not hasattr(self, '_steam_last_request'):
-                self._steam_last_request = 0
-    
-            current_time = time_module.time()
-            if current_time - self._steam_last_request < 1.2:
-                time_module.sleep(1.2 - (current_time - self._steam_last_request))
-    
-            self._steam_last_request = time_module.time()
-    
             # Steam API Call
-            url = f"https://store.steampowered.com/api/appdetails"
+            url = steam_store_url('appdetails')
             params = {
                 'appids': str(app_id),
                 'filters': 'price_overview',
                 'cc': 'de'
             }
     
-            response = requests.get(url, params=params, timeout=15)
+            # Gepoolter Client übernimmt Rate Limiting, Retries und Timeout
+            response = self.http.get(url, params=params, cache=True)
     
             if response.status_code == 200:
                 data = response.json()
@@ -1181,7 +1554,9 @@ class SteamPriceTracker:
     
         return entry
 
-    def batch_update_multiple_apps(self, app_ids: List[str], progress_callback=None) -> Dict[str, Any]:
+    def batch_update_multiple_apps(self, app_ids: List[str], progress_callback=None,
+                                   concurrent: bool = False, max_workers: Optional[int] = None,
+                                   host_slots: Optional[Dict[str, threading.BoundedSemaphore]] = None) -> Dict[str, Any]:
         """
         Batch-Update für mehrere Apps mit ProgressTracker-Integration
         Diese Methode aktualisiert Preise für mehrere Apps in Batches und verwendet den Batch-Writer
@@ -1189,6 +1564,9 @@ class SteamPriceTracker:
         Args:
             app_ids: Liste von Steam App IDs
             progress_callback: Optionaler Callback für Progress-Updates (ProgressTracker-kompatibel)
+            concurrent: Parallele Fetch-Engine statt sequenzieller Verarbeitung verwenden
+            max_workers: Anzahl Worker-Threads der Fetch-Engine (Standard: PRICE_FETCH_WORKERS)
+            host_slots: In-Flight-Slots pro Upstream für die Fetch-Engine (Standard: normale Limits)
         
         Returns:
             Dictionary mit Ergebnissen:
@@ -1205,6 +1583,9 @@ class SteamPriceTracker:
         if not app_ids:
             return {'success': False, 'error': 'Keine App-IDs angegeben'}
 
+        if concurrent:
+            return self._batch_update_concurrent(app_ids, progress_callback, max_workers, host_slots)
+
         start_time = time_module.time()
         successful_updates = 0
         failed_updates = 0
@@ -1236,12 +1617,21 @@ class SteamPriceTracker:
             batch_successful = 0
             batch_failed = 0
         
+            # Steam-Preise des ganzen Batches mit einem appdetails-Request holen,
+            # CheapShark-Deals für bereits gemappte Apps mit einem games?ids= Request
+            batch_steam_prices = self._fetch_steam_prices_batch(batch_apps) if not steam_only_mode else {}
+            batch_cheapshark_prices = self._fetch_cheapshark_prices_batch(batch_apps) if not steam_only_mode else {}
+        
             for app_id in batch_apps:
                 try:
                     # Preis-Update für einzelne App
                     if not steam_only_mode:
-                        # Versuche CheapShark + Steam
-                        price_data = self._fetch_all_prices(app_id)
+                        # Versuche CheapShark + Steam (Steam bereits per Batch geladen)
+                        price_data = self._fetch_prices_for_app(
+                            str(app_id), f"Game {app_id}",
+                            batch_steam_prices.get(str(app_id)), steam_prefetched=True,
+                            cheapshark_prices=batch_cheapshark_prices.get(str(app_id))
+                        )
                     else:
                         # Nur Steam verwenden
                         steam_price = self._get_steam_price_direct(app_id)
@@ -1277,24 +1667,17 @@ class SteamPriceTracker:
                 logger.warning(f"⚠️ CheapShark komplett fehlgeschlagen - aktiviere Steam-Only Modus")
                 steam_only_mode = True
             
-                # Steam-Only Fallback für alle verbleibenden Apps
+                # Steam-Only Fallback für alle verbleibenden Apps (gebündelte appdetails-Requests)
                 remaining_apps = app_ids[end_idx:]
+                remaining_steam_prices = self._fetch_steam_prices_batch(remaining_apps)
                 for app_id in remaining_apps:
                     try:
-                        steam_price = self._get_steam_price_direct(app_id)
-                        if steam_price is not None:
-                            entry = {
-                                'steam_app_id': app_id,
+                        steam_prices = remaining_steam_prices.get(str(app_id))
+                        if steam_prices:
+                            entry = self._prepare_price_entry(app_id, {
                                 'game_title': f'App {app_id}',
-                                'timestamp': time_module.time(),
-                                'steam_price': steam_price,
-                                'steam_original_price': steam_price,
-                                'steam_discount_percent': 0,
-                                'steam_available': True,
-                                'best_price': steam_price,
-                                'best_store': 'steam',
-                                'total_stores_available': 1
-                            }
+                                'steam': steam_prices
+                            })
                             price_data_list.append(entry)
                             successful_updates += 1
                         else:
@@ -1308,25 +1691,7 @@ class SteamPriceTracker:
         # Batch-Write in Datenbank
         if price_data_list:
             try:
-                # Batch-Writer verwenden falls verfügbar
-                if hasattr(self.db_manager, 'batch_write'):
-                    batch_result = self.db_manager.batch_write(price_data_list, 'prices')
-                    database_writes = batch_result.get('successful_writes', 0)
-                else:
-                    # Fallback: Einzelne Writes
-                    database_writes = 0
-                    for entry in price_data_list:
-                        try:
-                            self.db_manager.update_price(
-                                entry['steam_app_id'],
-                                entry['best_price'],
-                                entry['best_store'],
-                                datetime.now().isoformat()
-                            )
-                            database_writes += 1
-                        except Exception as write_error:
-                            logger.debug(f"Write-Fehler: {write_error}")
-                        
+                database_writes = self._write_price_entries(price_data_list)
                 logger.info(f"💾 Batch-Write: {database_writes} Preise in Datenbank geschrieben")
             except Exception as e:
                 logger.error(f"❌ Batch-Write fehlgeschlagen: {e}")
@@ -1346,13 +1711,234 @@ class SteamPriceTracker:
             'database_writes': database_writes,
             'duration': duration,
             'apps_per_second': len(app_ids) / duration if duration > 0 else 0,
-            'steam_only_mode': steam_only_mode
+            'steam_only_mode': steam_only_mode,
+            'fetch_mode': 'sequential'
         }
     
         logger.info(f"✅ BATCH-Update abgeschlossen: {successful_updates}/{len(app_ids)} Apps erfolgreich")
     
         return result
         
+    def _batch_update_concurrent(self, app_ids: List[str], progress_callback=None,
+                                 max_workers: Optional[int] = None,
+                                 host_slots: Optional[Dict[str, threading.BoundedSemaphore]] = None) -> Dict[str, Any]:
+        """
+        Parallele Fetch-Engine für batch_update_multiple_apps
+        
+        Hält pro Upstream (Steam, CheapShark) höchstens so viele Requests gleichzeitig
+        offen wie das In-Flight-Limit erlaubt und schreibt fertige Ergebnisse in Chunks
+        direkt über den Batch-Writer in die Datenbank. Die Gruppen-Abfragen (Steam
+        appdetails, CheapShark games?ids=) laufen ebenfalls im Pool, die nächste Gruppe
+        wird geladen, während die Apps der aktuellen noch abgearbeitet werden.
+        
+        Args:
+            app_ids: Liste von Steam App IDs
+            progress_callback: Optionaler Callback für Progress-Updates
+            max_workers: Anzahl Worker-Threads (Standard: PRICE_FETCH_WORKERS)
+            host_slots: In-Flight-Slots pro Upstream (Standard: die normalen Limits der Instanz)
+            
+        Returns:
+            Dictionary im Format von batch_update_multiple_apps
+        """
+        start_time = time_module.time()
+        max_workers = max(1, max_workers or self.fetch_max_workers)
+        write_chunk_size = int(os.getenv('PRICE_WRITE_CHUNK_SIZE', '50'))
+        total_apps = len(app_ids)
+        
+        app_names = self._load_app_names(app_ids)
+        pending_entries = []
+        stats = {'successful': 0, 'failed': 0, 'processed': 0, 'database_writes': 0, 'write_batches': 0}
+        
+        logger.info(f"🚀 CONCURRENT Preis-Update für {total_apps} Apps gestartet ({max_workers} Worker)...")
+        
+        def flush_entries():
+            if pending_entries:
+                stats['database_writes'] += self._write_price_entries(list(pending_entries))
+                stats['write_batches'] += 1
+                pending_entries.clear()
+        
+        app_ids = [str(app_id) for app_id in app_ids]
+        steam_batch_size = int(os.getenv('STEAM_APPDETAILS_BATCH_SIZE', '50'))
+        groups = [app_ids[i:i + steam_batch_size] for i in range(0, total_apps, steam_batch_size)]
+        steam_prices = {}
+        cheapshark_prices = {}
+        prefetched = set()
+        cursor = {'next': 0, 'prefetch': 0}
+        in_flight = {}
+        prefetches = {}
+        
+        def prefetch_group(group: List[str]):
+            # Ohne Einzel-Fallback: fehlende Apps lädt ihr eigener Fetch-Task über _call_upstream
+            steam = self._fetch_steam_prices_batch(group, steam_batch_size, single_fallback=False,
+                                                   host_slots=host_slots)
+            cheapshark = self._call_upstream('cheapshark', self._fetch_cheapshark_prices_batch, group,
+                                             slots=host_slots)
+            return steam, cheapshark
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='price-fetch') as executor:
+            def request_prefetch(current_group: int):
+                # Aktuelle und nächste Gruppe im Pool vorladen, während die Apps davor laufen
+                while cursor['prefetch'] < len(groups) and cursor['prefetch'] <= current_group + 1:
+                    future = executor.submit(prefetch_group, groups[cursor['prefetch']])
+                    prefetches[future] = cursor['prefetch']
+                    cursor['prefetch'] += 1
+            
+            def submit_next() -> bool:
+                if cursor['next'] >= total_apps:
+                    return False
+                
+                group_index = cursor['next'] // steam_batch_size
+                request_prefetch(group_index)
+                if group_index not in prefetched:
+                    return False
+                
+                app_id = app_ids[cursor['next']]
+                cursor['next'] += 1
+                steam_prefetched = app_id in steam_prices
+                
+                future = executor.submit(self._fetch_prices_for_app, app_id,
+                                         app_names.get(app_id) or f"Game {app_id}",
+                                         steam_prices.pop(app_id, None), steam_prefetched,
+                                         cheapshark_prices.pop(app_id, None), host_slots)
+                in_flight[future] = app_id
+                return True
+            
+            def fill_queue():
+                # Queue begrenzen statt alle Apps auf einmal einzureihen
+                while len(in_flight) < max_workers * 2 and submit_next():
+                    pass
+            
+            request_prefetch(0)
+            
+            while in_flight or prefetches:
+                done, _ = wait(list(in_flight) + list(prefetches), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    if future in prefetches:
+                        group_index = prefetches.pop(future)
+                        try:
+                            group_steam, group_cheapshark = future.result()
+                            steam_prices.update(group_steam)
+                            cheapshark_prices.update(group_cheapshark)
+                        except Exception as e:
+                            logger.debug(f"⚠️ Prefetch für Gruppe {group_index} fehlgeschlagen: {e}")
+                        prefetched.add(group_index)
+                        continue
+                    
+                    app_id = in_flight.pop(future)
+                    stats['processed'] += 1
+                    
+                    try:
+                        price_data = future.result()
+                    except Exception as e:
+                        logger.debug(f"⚠️ Fehler bei App {app_id}: {e}")
+                        price_data = None
+                    
+                    if price_data:
+                        pending_entries.append(self._prepare_price_entry(app_id, price_data))
+                        stats['successful'] += 1
+                    else:
+                        stats['failed'] += 1
+                
+                fill_queue()
+                
+                # Fertige Ergebnisse streamen statt bis zum Ende zu sammeln
+                if len(pending_entries) >= write_chunk_size:
+                    flush_entries()
+                
+                if progress_callback:
+                    elapsed = time_module.time() - start_time
+                    progress_callback({
+                        'progress_percent': (stats['processed'] / total_apps) * 100,
+                        'status': f"{stats['processed']}/{total_apps} Apps",
+                        'processed_apps': stats['processed'],
+                        'total_apps': total_apps,
+                        'apps_per_second': stats['processed'] / elapsed if elapsed > 0 else 0
+                    })
+        
+        flush_entries()
+        
+        duration = time_module.time() - start_time
+        apps_per_second = total_apps / duration if duration > 0 else 0
+        
+        logger.info(f"✅ CONCURRENT-Update abgeschlossen: {stats['successful']}/{total_apps} Apps erfolgreich")
+        logger.info(f"   ⚡ {apps_per_second:.2f} Apps/s, 💾 {stats['database_writes']} Writes in {stats['write_batches']} Batches")
+        
+        return {
+            'success': True,
+            'successful_updates': stats['successful'],
+            'failed_updates': stats['failed'],
+            'total_apps': total_apps,
+            'database_writes': stats['database_writes'],
+            'write_batches': stats['write_batches'],
+            'duration': duration,
+            'apps_per_second': apps_per_second,
+            'steam_only_mode': False,
+            'fetch_mode': 'concurrent',
+            'max_workers': max_workers
+        }
+    
+    def _load_app_names(self, app_ids: List[str]) -> Dict[str, str]:
+        """Lädt bekannte App-Namen aus tracked_apps mit wenigen IN-Queries"""
+        names = {}
+        app_ids = [str(app_id) for app_id in app_ids]
+        
+        try:
+            with self.db_manager.get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
+                for i in range(0, len(app_ids), 500):
+                    chunk = app_ids[i:i + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(
+                        f"SELECT steam_app_id, name FROM tracked_apps WHERE steam_app_id IN ({placeholders})",
+                        chunk
+                    )
+                    for row in cursor.fetchall():
+                        if row[1]:
+                            names[str(row[0])] = row[1]
+        except Exception as e:
+            logger.debug(f"⚠️ App-Namen konnten nicht geladen werden: {e}")
+        
+        return names
+    
+    def _write_price_entries(self, entries: List[Dict]) -> int:
+        """
+        Schreibt vorbereitete Preis-Entries über den DatabaseBatchWriter
+        
+        Args:
+            entries: Entries im Format von _prepare_price_entry
+            
+        Returns:
+            Anzahl neu gespeicherter Snapshots (unveränderte Preise zählen nicht)
+        """
+        if not entries:
+            return 0
+        
+        try:
+            if self._batch_writer is None:
+                from database_manager import create_batch_writer
+                self._batch_writer = create_batch_writer(self.db_manager)
+            
+            result = self._batch_writer.batch_write_prices(entries)
+            if result.get('success'):
+                return result.get('total_items', len(entries))
+            
+            logger.warning(f"⚠️ Batch-Writer fehlgeschlagen: {result.get('error')} - schreibe einzeln")
+        except Exception as e:
+            logger.warning(f"⚠️ Batch-Writer nicht verfügbar: {e} - schreibe einzeln")
+        
+        # Fallback: Einzelne Snapshots
+        database_writes = 0
+        for entry in entries:
+            try:
+                if self.db_manager.save_price_snapshot(entry['steam_app_id'], entry.get('game_title'),
+                                                       self._convert_batch_to_standard_format(entry)) is True:
+                    database_writes += 1
+            except Exception as write_error:
+                logger.debug(f"Write-Fehler: {write_error}")
+        
+        return database_writes
+        
     def _create_batch_price_entry_for_batch_writer(self, app_id: str, price_data: Dict) -> Dict:
         """
         Erstellt Price-Entry im Format das der Batch-Writer erwartet
@@ -1471,11 +2057,18 @@ class SteamPriceTracker:
     
         return standard_entry
     
-    def process_all_pending_apps_optimized(self, hours_threshold: int = 6, batch_size: int = 25) -> Dict:
+    def process_all_pending_apps_optimized(self, hours_threshold: int = 6, batch_size: int = 25,
+                                           concurrent: bool = False, max_workers: Optional[int] = None) -> Dict:
         """
         🚀 REVOLUTIONÄRER OPTIMIERTER BATCH-PROCESSOR für alle ausstehenden Apps
     
         Verarbeitet alle Apps die Updates benötigen mit maximaler Batch-Performance
+        
+        Args:
+            hours_threshold: Apps älter als X Stunden aktualisieren
+            batch_size: Batch-Größe für die Statistik
+            concurrent: Parallele Fetch-Engine verwenden
+            max_workers: Anzahl Worker-Threads der Fetch-Engine
         """
         start_time = time_module.time()
     
@@ -1502,10 +2095,13 @@ class SteamPriceTracker:
             logger.info(f"📊 {len(app_ids)} Apps benötigen Updates")
         
             # 🚀 NUTZE BATCH-UPDATE METHODE!
-            batch_result = self.batch_update_multiple_apps(app_ids, batch_size)
+            batch_result = self.batch_update_multiple_apps(app_ids, concurrent=concurrent, max_workers=max_workers)
         
             total_duration = time_module.time() - start_time
-            total_batches = (len(app_ids) + batch_size - 1) // batch_size  # Ceiling division
+            if concurrent:
+                total_batches = batch_result.get('write_batches', 0)
+            else:
+                total_batches = (len(app_ids) + batch_size - 1) // batch_size  # Ceiling division
         
             # Erweiterte Statistiken
             result = {
@@ -1516,6 +2112,7 @@ class SteamPriceTracker:
                 'total_duration': total_duration,
                 'total_batches': total_batches,
                 'apps_per_second': len(app_ids) / total_duration if total_duration > 0 else 0,
+                'fetch_mode': batch_result.get('fetch_mode', 'sequential'),
                 'performance_metrics': {
                     'batch_performance': batch_result.get('performance_multiplier', '1x'),
                     'time_saved': batch_result.get('time_saved', 0),
@@ -1565,17 +2162,18 @@ class SteamPriceTracker:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
             
+                # last_price_update ist lokale Zeit (datetime.now()) - wie NOW_SQL der Update-Queue
                 cursor.execute("""
-                    SELECT ta.steam_app_id, ta.name, ta.last_price_update, ta.added_date,
-                           COALESCE(ta.last_price_update, ta.added_date) as effective_last_update
+                    SELECT ta.steam_app_id, ta.name, ta.last_price_update, ta.added_at,
+                           COALESCE(ta.last_price_update, ta.added_at) as effective_last_update
                     FROM tracked_apps ta
                     WHERE ta.active = 1
                     AND (
                         ta.last_price_update IS NULL 
-                        OR ta.last_price_update < datetime('now', '-{} hours')
+                        OR ta.last_price_update < datetime('now', 'localtime', ?)
                     )
                     ORDER BY effective_last_update ASC
-                """.format(hours_threshold))
+                """, (f'-{int(hours_threshold)} hours',))
             
                 results = cursor.fetchall()
             
@@ -1585,7 +2183,7 @@ class SteamPriceTracker:
                         'steam_app_id': row[0],
                         'name': row[1],
                         'last_price_update': row[2],
-                        'added_date': row[3],
+                        'added_at': row[3],
                         'effective_last_update': row[4]
                     })
             
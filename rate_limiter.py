@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Gemeinsames Token-Bucket Rate Limiting pro Host
+Steam Price Tracker - Ersetzt die verteilten Sleep-Schleifen in allen Managern
+
+- Ein Bucket pro Host (store.steampowered.com, api.steampowered.com, www.cheapshark.com, ...)
+- Thread-sicher (threading.Lock) und asyncio-tauglich (acquire_async)
+- Burst-Handling über Bucket-Kapazität
+- Adaptive Rate bei HTTP 429 inkl. Retry-After Unterstützung
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time as time_module
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any
+from urllib.parse import urlparse
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("rate_limiter", "rate_limiter.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# STANDARD-LIMITS PRO HOST
+# =====================================================================
+
+# interval: Sekunden pro Request im Dauerbetrieb, burst: maximale Anzahl sofortiger Requests
+DEFAULT_HOST_LIMITS = {
+    'store.steampowered.com': {'interval_env': 'STEAM_RATE_LIMIT', 'interval': 1.2, 'burst': 3},
+    'api.steampowered.com': {'interval_env': 'STEAM_RATE_LIMIT', 'interval': 1.0, 'burst': 5},
+    'www.cheapshark.com': {'interval_env': 'CHEAPSHARK_RATE_LIMIT', 'interval': 2.5, 'burst': 2},
+    'steamspy.com': {'interval_env': 'STEAMSPY_RATE_LIMIT', 'interval': 1.0, 'burst': 1},
+}
+
+FALLBACK_HOST_LIMIT = {'interval_env': None, 'interval': 1.0, 'burst': 1}
+
+# =====================================================================
+# TOKEN BUCKET
+# =====================================================================
+
+class TokenBucket:
+    """
+    Token-Bucket für einen Host
+
+    Tokens werden mit 1/interval pro Sekunde nachgefüllt, bis zur Kapazität burst.
+    Bei 429 wird das Intervall vergrößert und ggf. bis Retry-After pausiert;
+    erfolgreiche Requests führen das Intervall langsam zum Basiswert zurück.
+    """
+
+    def __init__(self, host: str, interval_seconds: float, burst: int = 1,
+                 max_interval_seconds: float = 30.0):
+        """
+        Initialisiert Token-Bucket
+
+        Args:
+            host: Hostname für Logging/Statistiken
+            interval_seconds: Basis-Abstand zwischen Requests im Dauerbetrieb
+            burst: Maximale Anzahl Requests ohne Wartezeit
+            max_interval_seconds: Obergrenze für das adaptive Intervall
+        """
+        self.host = host
+        self.base_interval = max(0.0, float(interval_seconds))
+        self.interval = self.base_interval
+        self.max_interval = max(max_interval_seconds, self.base_interval)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.last_refill = time_module.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+        # Statistiken
+        self.total_requests = 0
+        self.total_wait_time = 0.0
+        self.rate_limit_hits = 0
+        self._success_streak = 0
+
+    def _refill(self, now: float):
+        """Füllt Tokens seit dem letzten Aufruf auf (Lock muss gehalten werden)"""
+        if now < self.last_refill:
+            # Host pausiert (429) - während der Pause sammeln sich keine Tokens an
+            return
+        if self.interval <= 0:
+            self.tokens = float(self.capacity)
+        else:
+            elapsed = now - self.last_refill
+            self.tokens = min(float(self.capacity), self.tokens + elapsed / self.interval)
+        self.last_refill = now
+
+    def _reserve(self) -> float:
+        """
+        Versucht ein Token zu nehmen
+
+        Returns:
+            0.0 wenn ein Token genommen wurde, sonst Wartezeit bis zum nächsten Versuch
+        """
+        with self.lock:
+            now = time_module.monotonic()
+            self._refill(now)
+
+            if now < self.blocked_until:
+                return self.blocked_until - now
+
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                self.total_requests += 1
+                return 0.0
+
+            return (1.0 - self.tokens) * self.interval
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Blockiert bis ein Request erlaubt ist
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden (None = unbegrenzt)
+
+        Returns:
+            Tatsächliche Wartezeit in Sekunden
+
+        Raises:
+            TimeoutError: Wenn timeout überschritten würde
+        """
+        waited = 0.0
+        while True:
+            wait_time = self._reserve()
+            if wait_time <= 0:
+                break
+            if timeout is not None and waited + wait_time > timeout:
+                raise TimeoutError(f"Rate Limit für {self.host}: Timeout nach {waited:.1f}s")
+            if wait_time >= 1.0:
+                logger.debug(f"⏳ {self.host} Rate Limit: warte {wait_time:.1f}s")
+            time_module.sleep(wait_time)
+            waited += wait_time
+
+        if waited > 0:
+            with self.lock:
+                self.total_wait_time += waited
+        return waited
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> float:
+        """
+        Asyncio-Variante von acquire() - blockiert den Event-Loop nicht
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden (None = unbegrenzt)
+
+        Returns:
+            Tatsächliche Wartezeit in Sekunden
+        """
+        waited = 0.0
+        while True:
+            wait_time = self._reserve()
+            if wait_time <= 0:
+                break
+            if timeout is not None and waited + wait_time > timeout:
+                raise TimeoutError(f"Rate Limit für {self.host}: Timeout nach {waited:.1f}s")
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+
+        if waited > 0:
+            with self.lock:
+                self.total_wait_time += waited
+        return waited
+
+    def report_success(self):
+        """Meldet erfolgreichen Request - Intervall nähert sich wieder dem Basiswert"""
+        with self.lock:
+            self._success_streak += 1
+            if self.interval > self.base_interval and self._success_streak % 5 == 0:
+                self.interval = max(self.base_interval, self.interval * 0.9)
+                logger.debug(f"✅ {self.host} Rate optimiert: {self.interval:.2f}s")
+
+    def report_rate_limited(self, retry_after: Optional[float] = None):
+        """
+        Meldet HTTP 429 - vergrößert Intervall und pausiert den Host
+
+        Args:
+            retry_after: Wartezeit aus dem Retry-After Header in Sekunden
+        """
+        with self.lock:
+            self.rate_limit_hits += 1
+            self._success_streak = 0
+            self.interval = min(self.max_interval, max(self.interval, 0.5) * 1.5)
+
+            pause = retry_after if retry_after is not None else self.interval
+            self.blocked_until = max(self.blocked_until, time_module.monotonic() + pause)
+
+            # Nach der Pause ist genau ein Request frei, danach einer pro (vergrößertem) Intervall
+            self.tokens = 1.0
+            self.last_refill = self.blocked_until
+
+        logger.warning(f"⚠️ {self.host} Rate Limit (429): Intervall {self.interval:.1f}s, Pause {pause:.1f}s")
+
+    def observe_response(self, response) -> bool:
+        """
+        Wertet eine HTTP-Response aus (429 + Retry-After)
+
+        503 + Retry-After wartet bereits der urllib3-Retry des HTTP Clients ab
+        (respect_retry_after_header) und zählt hier nicht noch einmal.
+
+        Args:
+            response: requests.Response (oder Objekt mit status_code/headers)
+
+        Returns:
+            True wenn der Request rate-limitiert wurde
+        """
+        status_code = getattr(response, 'status_code', None)
+
+        if status_code == 429:
+            self.report_rate_limited(parse_retry_after(getattr(response, 'headers', {}).get('Retry-After')))
+            return True
+
+        if status_code is not None and status_code < 500:
+            self.report_success()
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Statistiken des Buckets zurück"""
+        with self.lock:
+            return {
+                'host': self.host,
+                'base_interval': self.base_interval,
+                'current_interval': self.interval,
+                'burst': self.capacity,
+                'available_tokens': round(self.tokens, 2),
+                'total_requests': self.total_requests,
+                'total_wait_time': round(self.total_wait_time, 2),
+                'rate_limit_hits': self.rate_limit_hits
+            }
+
+# =====================================================================
+# HELPER
+# =====================================================================
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parst Retry-After Header (Sekunden oder HTTP-Datum)
+
+    Returns:
+        Wartezeit in Sekunden oder None
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _host_from(url_or_host: str) -> str:
+    """
+    Extrahiert Hostnamen aus URL oder gibt Host unverändert zurück
+
+    Ein expliziter Port gehört zum Host (z.B. 127.0.0.1:8301), damit mehrere
+    lokale Stand-in Upstreams eigene Buckets und Pools bekommen.
+    """
+    if '://' in url_or_host:
+        parsed = urlparse(url_or_host)
+        host = (parsed.hostname or url_or_host).lower()
+        return f"{host}:{parsed.port}" if parsed.port else host
+    return url_or_host.lower()
+
+def _limits_for(host: str) -> Dict[str, Any]:
+    """Standard-Limits eines Hosts; ein Stand-in Server übernimmt die Limits des ersetzten Upstreams"""
+    limits = DEFAULT_HOST_LIMITS.get(host)
+    if limits is not None:
+        return limits
+
+    try:
+        from config import upstream_url_aliases
+        for configured, default in upstream_url_aliases().items():
+            if _host_from(configured) == host:
+                return DEFAULT_HOST_LIMITS.get(_host_from(default), FALLBACK_HOST_LIMIT)
+    except ImportError:
+        pass
+
+    return FALLBACK_HOST_LIMIT
+
+# =====================================================================
+# GLOBALE REGISTRY
+# =====================================================================
+
+_limiters: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+def get_host_limiter(url_or_host: str) -> TokenBucket:
+    """
+    Gibt den prozessweit geteilten Token-Bucket für einen Host zurück
+
+    Args:
+        url_or_host: Vollständige URL oder Hostname
+
+    Returns:
+        TokenBucket des Hosts
+    """
+    host = _host_from(url_or_host)
+
+    with _registry_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limits = _limits_for(host)
+            interval = limits['interval']
+
+            if limits['interval_env'] and os.getenv(limits['interval_env']):
+                try:
+                    interval = float(os.getenv(limits['interval_env']))
+                except ValueError:
+                    pass
+
+            limiter = TokenBucket(host, interval, limits['burst'])
+            _limiters[host] = limiter
+            logger.debug(f"🔧 Rate Limiter für {host}: {interval:.2f}s, Burst {limits['burst']}")
+
+        return limiter
+
+def configure_host(url_or_host: str, interval_seconds: float, burst: int = 1) -> TokenBucket:
+    """
+    Setzt das Limit eines Hosts explizit (ersetzt bestehenden Bucket)
+
+    Args:
+        url_or_host: Vollständige URL oder Hostname
+        interval_seconds: Basis-Abstand zwischen Requests
+        burst: Maximale Anzahl sofortiger Requests
+
+    Returns:
+        Neuer TokenBucket
+    """
+    host = _host_from(url_or_host)
+    limiter = TokenBucket(host, interval_seconds, burst)
+
+    with _registry_lock:
+        _limiters[host] = limiter
+
+    logger.info(f"🔧 Rate Limiter für {host} gesetzt: {interval_seconds:.2f}s, Burst {burst}")
+    return limiter
+
+def saturating_in_flight(url_or_host: str, latency_seconds: float, cap: Optional[int] = None) -> int:
+    """
+    Gleichzeitige Requests, die den Bucket eines Hosts gerade auslasten
+
+    Der Bucket gibt burst Requests sofort und danach einen pro Intervall frei.
+    Solange ein Request latency_seconds unterwegs ist, werden weitere Tokens frei;
+    mehr In-Flight-Requests als burst + Latenz/Intervall warten nur auf Tokens.
+
+    Args:
+        url_or_host: Vollständige URL oder Hostname
+        latency_seconds: Beobachtete Antwortzeit eines Requests
+        cap: Obergrenze (z.B. Pool-Größe)
+
+    Returns:
+        Anzahl gleichzeitiger Requests (mindestens 1)
+    """
+    limiter = get_host_limiter(url_or_host)
+    with limiter.lock:
+        interval = max(limiter.interval, 0.01)
+        capacity = limiter.capacity
+    in_flight = int(capacity + math.ceil(max(latency_seconds, 0.0) / interval))
+    if cap is not None:
+        in_flight = min(in_flight, cap)
+    return max(1, in_flight)
+
+def wait_for_host(url_or_host: str, timeout: Optional[float] = None) -> float:
+    """Convenience: Wartet auf ein Token für den Host der URL"""
+    return get_host_limiter(url_or_host).acquire(timeout)
+
+async def wait_for_host_async(url_or_host: str, timeout: Optional[float] = None) -> float:
+    """Convenience: Asyncio-Variante von wait_for_host"""
+    return await get_host_limiter(url_or_host).acquire_async(timeout)
+
+def observe_response(url_or_host: str, response) -> bool:
+    """Convenience: Meldet Response-Status an den Bucket des Hosts"""
+    return get_host_limiter(url_or_host).observe_response(response)
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Gibt Statistiken aller aktiven Host-Buckets zurück"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.get_stats() for limiter in limiters}
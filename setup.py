@@ -626,7 +626,6 @@ class SteamPriceTrackerSetup:
                 "# Core Dependencies",
                 "requests>=2.31.0",
                 "python-dotenv>=1.0.0", 
-                "schedule>=1.2.0",
                 "",
                 "# Web Scraping",
                 "beautifulsoup4>=4.12.0",
@@ -693,7 +692,7 @@ class SteamPriceTrackerSetup:
                 error_msg = process.stderr.strip()
                 
                 # Fallback für kritische Dependencies
-                critical_deps = ["requests", "python-dotenv", "schedule"]
+                critical_deps = ["requests", "python-dotenv"]
                 
                 missing_critical = []
                 for dep in critical_deps:
@@ -2081,7 +2080,7 @@ def check_python_version():
 
 def check_dependencies():
     """Prüft kritische Dependencies"""
-    critical = ["requests", "schedule"]
+    critical = ["requests"]
     missing = []
     
     for dep in critical:
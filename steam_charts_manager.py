@@ -8,13 +8,15 @@ import requests
 import time as time_module
 import json
 import threading
-import schedule
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple, Any
 import logging
 from pathlib import Path
 from database_manager import create_batch_writer
+from http_client import get_http_client
+from event_scheduler import get_event_scheduler
+from config import steam_api_url, steam_store_url, cheapshark_url
 import json
 import math as math_module
 
@@ -40,20 +42,20 @@ class SteamChartsManager:
     Verwaltet automatisches Tracking von Steam Charts und deren Preise
     """
     
-    # Steam Store API Endpoints
+    # Steam Web API Endpoints (relativ zu SteamAPIConfig.base_url, siehe config.steam_api_url)
     STEAM_API_ENDPOINTS = {
         'most_played': {
-            'endpoint': 'https://api.steampowered.com/ISteamChartsService/GetMostPlayedGames/v1/',
+            'endpoint': 'ISteamChartsService/GetMostPlayedGames/v1/',
             'params': {'format': 'json'},
             'status': 'tested_working'
         },
         'top_releases': {
-            'endpoint': 'https://api.steampowered.com/ISteamChartsService/GetTopReleasesPages/v1/',
+            'endpoint': 'ISteamChartsService/GetTopReleasesPages/v1/',
             'params': {'format': 'json'},
             'status': 'fixed_parsing'
         },
         'most_concurrent_players': {
-            'endpoint': 'https://api.steampowered.com/ISteamChartsService/GetGamesByConcurrentPlayers/v1/',
+            'endpoint': 'ISteamChartsService/GetGamesByConcurrentPlayers/v1/',
             'params': {'format': 'json'},
             'status': 'new_api'
         }
@@ -67,7 +69,7 @@ class SteamChartsManager:
         Args:
             api_key: Steam API Key
             db_manager: DatabaseManager Instanz
-            price_tracker: Optionale PriceTracker Instanz
+            price_tracker: Optionale PriceTracker Instanz (Standard: neue Instanz auf db_manager.db_path)
         """
         try:
             from logging_config import get_steam_charts_logger
@@ -87,51 +89,35 @@ class SteamChartsManager:
         from database_manager import create_batch_writer
         self.batch_writer = create_batch_writer(self.db_manager)
         
-        db_manager.init_charts_tables()  # Sicherstellen, dass Charts-Tabellen existieren
+        self.db_manager.init_charts_tables()  # Sicherstellen, dass Charts-Tabellen existieren
         
-        # Price Tracker
-        try:
-            from price_tracker import create_price_tracker
-            self.price_tracker = create_price_tracker()
-        except ImportError:
-            self.price_tracker = None
-            self.logger.warning("⚠️ Price Tracker nicht verfügbar")
+        # Price Tracker: übergebene Instanz verwenden, sonst einen auf derselben Datenbank anlegen
+        if price_tracker is not None:
+            self.price_tracker = price_tracker
+        else:
+            try:
+                from price_tracker import create_price_tracker
+                self.price_tracker = create_price_tracker(db_path=self.db_manager.db_path, enable_charts=False)
+            except ImportError:
+                self.price_tracker = None
+                self.logger.warning("⚠️ Price Tracker nicht verfügbar")
 
         # Charts-Konfiguration
         self.charts_config = self._load_charts_config()
 
-        # HTTP Session für API-Requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'SteamPriceTracker-Charts'
-        })
-        
-        # Rate Limiting für Steam API
-        self.last_steam_request = 0
-        self.steam_rate_limit = 1.0  # 1 Sekunde zwischen Steam-Requests
+        # Gepoolter HTTP Client (Keep-Alive, Retries, Rate Limiting pro Host)
+        self.http = get_http_client()
+        self.session = self.http.session
                
         
         # Background Scheduler Integration
         self.charts_scheduler_running = False
         self.charts_scheduler_thread = None
         self.stop_charts_scheduler_event = threading.Event()
+        self._scheduler_owner = f"charts_manager#{id(self)}"
         
         logger.info("✅ Steam Charts Manager initialisiert")
     
-    def _wait_for_steam_rate_limit(self):
-        """
-        Steam API Rate Limiting basierend auf steam_wishlist_manager.py Pattern
-        """
-        current_time = time_module.time()
-        time_since_last_call = current_time - self.last_api_call
-    
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            logger.debug(f"⏳ Steam API Rate Limiting: {sleep_time:.2f}s")
-            time_module.sleep(sleep_time)
-    
-        self.last_api_call = time_module.time()
-
     def set_price_tracker(self, price_tracker):
         """
         Setzt Price Tracker Referenz
@@ -207,17 +193,6 @@ class SteamChartsManager:
         except Exception as e:
             logger.error(f"❌ Fehler beim Speichern der Charts-Konfiguration: {e}")
     
-    def _wait_for_steam_rate_limit(self):
-        """Wartet für Steam API Rate Limiting"""
-        elapsed = time_module.time() - self.last_steam_request
-        rate_limit = self.charts_config.get('rate_limit_seconds', 1.0)
-        
-        if elapsed < rate_limit:
-            wait_time = rate_limit - elapsed
-            time_module.sleep(wait_time)
-        
-        self.last_steam_request = time_module.time()
-    
     # =====================================================================
     # CHARTS DATA RETRIEVAL FUNKTIONEN
     # =====================================================================
@@ -233,15 +208,13 @@ class SteamChartsManager:
             Liste mit Spiel-Informationen
         """
         try:
-            self._wait_for_steam_rate_limit()
-        
             api_config = self.STEAM_API_ENDPOINTS['most_played']
             params = api_config['params'].copy()
         
             if self.api_key:
                 params['key'] = self.api_key
         
-            response = self.session.get(api_config['endpoint'], params=params, timeout=15)
+            response = self.http.get(steam_api_url(api_config['endpoint']), params=params)
             response.raise_for_status()
         
             data = response.json()
@@ -287,15 +260,13 @@ class SteamChartsManager:
             Liste mit Spiel-Informationen
         """
         try:
-            self._wait_for_steam_rate_limit()
-    
             api_config = self.STEAM_API_ENDPOINTS['top_releases']
             params = api_config['params'].copy()
     
             if self.api_key:
                 params['key'] = self.api_key
     
-            response = self.session.get(api_config['endpoint'], params=params, timeout=15)
+            response = self.http.get(steam_api_url(api_config['endpoint']), params=params)
             response.raise_for_status()
     
             data = response.json()
@@ -317,7 +288,7 @@ class SteamChartsManager:
                     # Import der existierenden Funktion
                     from steam_wishlist_manager import bulk_get_app_names
                 
-                    names_data = bulk_get_app_names(collected_appids[:count], self.api_key)
+                    names_data = bulk_get_app_names(collected_appids[:count], self.api_key, self.db_manager)
                 
                     for i, app_id in enumerate(collected_appids[:count], 1):
                         name = names_data.get(app_id, f'Steam Game {app_id}')
@@ -361,10 +332,8 @@ class SteamChartsManager:
             Liste mit aktuell meistgespielten Games (nach gleichzeitigen Spielern)
         """
         try:
-            self._wait_for_steam_rate_limit()
-        
             # GetGamesByConcurrentPlayers API
-            endpoint = 'https://api.steampowered.com/ISteamChartsService/GetGamesByConcurrentPlayers/v1/'
+            endpoint = steam_api_url('ISteamChartsService/GetGamesByConcurrentPlayers/v1/')
         
             # Context für deutsche/englische Sprachinhalte und Deutschland als Zielland
             context = {
@@ -380,7 +349,7 @@ class SteamChartsManager:
             if self.api_key:
                 params['key'] = self.api_key
     
-            response = self.session.get(endpoint, params=params, timeout=15)
+            response = self.http.get(endpoint, params=params)
             response.raise_for_status()
     
             data = response.json()
@@ -418,7 +387,7 @@ class SteamChartsManager:
                     # Import der existierenden Funktion
                     from steam_wishlist_manager import bulk_get_app_names
                 
-                    names_data = bulk_get_app_names(collected_appids[:count], self.api_key)
+                    names_data = bulk_get_app_names(collected_appids[:count], self.api_key, self.db_manager)
                 
                     for i, app_id in enumerate(collected_appids[:count], 1):
                         name = names_data.get(app_id, f'Trending Game {app_id}')
@@ -718,69 +687,55 @@ class SteamChartsManager:
         """
         Aktualisiert einen einzelnen Chart-Typ
         
+        Der abgerufene Chart wird set-basiert übernommen (DatabaseBatchWriter.ingest_chart):
+        neue, aktualisierte und herausgefallene Spiele, Rang-Historie und Cleanup
+        in einer Transaktion statt einer Abfrage pro Spiel.
+        
         Args:
-            chart_type: Chart-Typ ('most_played', 'best_sellers', 'top_releases')
+            chart_type: Chart-Typ ('most_played', 'top_releases', 'most_concurrent_players')
             
         Returns:
             Update-Ergebnis Dictionary
         """
         try:
-            logger.info(f"🔄 Aktualisiere {CHART_TYPES.get(chart_type, chart_type)}...")
+            if chart_type not in CHART_TYPES:
+                return {'success': False, 'error': f'Unbekannter Chart-Typ: {chart_type}'}
+            
+            logger.info(f"🔄 Aktualisiere {CHART_TYPES[chart_type]}...")
             
             count = self.charts_config.get('chart_counts', {}).get(chart_type, 100)
             
             # Spiele für Chart-Typ abrufen
-            if chart_type == 'most_played':
-                games = self.get_most_played_games(count)
-            elif chart_type == 'best_sellers':
-                games = self.get_best_sellers_games(count)
-            elif chart_type == 'top_releases':
-                games = self.get_top_releases_games(count)
-            else:
-                return {'success': False, 'error': f'Unbekannter Chart-Typ: {chart_type}'}
+            fetch_start = time_module.time()
+            games = self._fetch_chart_data(chart_type, count)
+            fetch_duration = time_module.time() - fetch_start
             
             if not games:
                 return {'success': False, 'error': f'Keine Spiele für {chart_type} erhalten'}
             
-            # Spiele in Datenbank speichern
-            new_games = 0
-            updated_games = 0
-            errors = []
-            
-            for game in games:
-                try:
-                    # Prüfen ob Spiel bereits existiert
-                    with self.db_manager.get_connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            SELECT steam_app_id FROM steam_charts_tracking
-                            WHERE steam_app_id = ? AND chart_type = ?
-                        """, (game['steam_app_id'], chart_type))
-                        
-                        if cursor.fetchone():
-                            updated_games += 1
-                        else:
-                            new_games += 1
-                    
-                    # Spiel speichern
-                    self.save_chart_game(game)
-                    
-                except Exception as e:
-                    errors.append(f"Fehler bei {game.get('steam_app_id', 'Unknown')}: {str(e)}")
+            ingest = self.batch_writer.ingest_chart(
+                chart_type, games,
+                auto_track=self.charts_config.get('auto_track_charts', True),
+                cleanup_days=self.charts_config.get('cleanup_days', 30),
+                fetch_duration=fetch_duration
+            )
             
-            # Update-Statistiken speichern
-            self._save_update_statistics(chart_type, len(games), new_games, updated_games)
+            if not ingest.get('success'):
+                return {'success': False, 'error': ingest.get('error', 'Charts-Ingestion fehlgeschlagen')}
             
             result = {
                 'success': True,
                 'chart_type': chart_type,
                 'total_games_found': len(games),
-                'new_games_added': new_games,
-                'existing_games_updated': updated_games,
-                'errors': errors
+                'new_games_added': ingest['new'],
+                'existing_games_updated': ingest['updated'],
+                'dropped_games': ingest['dropped'],
+                'removed_games': ingest['removed'],
+                'errors': [f"{ingest['rejected']} ungültige Datensätze verworfen"] if ingest['rejected'] else []
             }
             
-            logger.info(f"✅ {chart_type}: {new_games} neu, {updated_games} aktualisiert")
+            logger.info(f"✅ {chart_type}: {ingest['new']} neu, {ingest['updated']} aktualisiert, "
+                        f"{ingest['dropped']} herausgefallen")
             return result
             
         except Exception as e:
@@ -925,7 +880,6 @@ class SteamChartsManager:
             Liste mit Most Played Games
         """
         try:
-            import requests
         
             # Verwende Steam Spy API als Fallback (kostenlos und zuverlässig)
             url = "https://steamspy.com/api.php"
@@ -934,7 +888,7 @@ class SteamChartsManager:
                 'format': 'json'
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -1006,7 +960,7 @@ class SteamChartsManager:
             logger.info("🔄 Fallback 1: Versuche SteamSpy API...")
         
             url = "https://steamspy.com/api.php?request=top100in2weeks&format=json"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
         
             if response.status_code == 200:
                 data = response.json()
@@ -1144,12 +1098,11 @@ class SteamChartsManager:
             Liste mit Top Releases
         """
         try:
-            import requests
         
             # Verwende Recent Releases von Steam Store
-            url = "https://store.steampowered.com/api/featuredcategories"
+            url = steam_store_url('featuredcategories')
 
-            response = requests.get(url, timeout=20)
+            response = self.http.get(url, timeout=20)
 
             if response.status_code == 200:
                 data = response.json()
@@ -1273,7 +1226,6 @@ class SteamChartsManager:
             Liste mit Concurrent Players
         """ 
         try:
-            import requests
         
             # Verwende SteamSpy für aktuelle Spielerzahlen
             url = "https://steamspy.com/api.php"
@@ -1282,7 +1234,7 @@ class SteamChartsManager:
                 'format': 'json'
             }
 
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -1316,6 +1268,9 @@ class SteamChartsManager:
         """
         Bereinigt alte Charts-Spiele die nicht mehr in Charts sind
         
+        Preise, Rang-Historie und Tracking-Einträge werden kaskadierend mit je
+        einem DELETE in einer Transaktion entfernt.
+        
         Args:
             days_threshold: Spiele älter als X Tage entfernen
             
@@ -1323,54 +1278,17 @@ class SteamChartsManager:
             Anzahl entfernter Spiele
         """
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Alte Charts-Spiele finden
-                cursor.execute("""
-                    SELECT steam_app_id, chart_type, name
-                    FROM steam_charts_tracking
-                    WHERE last_seen < datetime('now', '-{} days')
-                """.format(days_threshold))
-                
-                old_games = cursor.fetchall()
-                
-                if not old_games:
-                    logger.info("✅ Keine alten Charts-Spiele zum Entfernen")
-                    return 0
-                
-                # Alte Spiele entfernen
-                removed_count = 0
-                for game in old_games:
-                    app_id = game['steam_app_id']
-                    chart_type = game['chart_type']
-                    name = game['name']
-                    
-                    # Charts-Tracking Eintrag entfernen
-                    cursor.execute("""
-                        DELETE FROM steam_charts_tracking
-                        WHERE steam_app_id = ? AND chart_type = ?
-                    """, (app_id, chart_type))
-                    
-                    # Zugehörige Preis-Einträge entfernen
-                    cursor.execute("""
-                        DELETE FROM steam_charts_prices
-                        WHERE steam_app_id = ? AND chart_type = ?
-                    """, (app_id, chart_type))
-                    
-                    # Zugehörige Rank-Historie entfernen
-                    cursor.execute("""
-                        DELETE FROM steam_charts_rank_history
-                        WHERE steam_app_id = ? AND chart_type = ?
-                    """, (app_id, chart_type))
-                    
-                    removed_count += 1
-                    logger.debug(f"🗑️ Entfernt: {name} ({app_id}) aus {chart_type}")
-                
-                conn.commit()
+            counts = self.db_manager.write_statements(
+                self.batch_writer.chart_cleanup_statements(days_threshold)
+            )
+            removed_count = counts[-1]
+            
+            if removed_count:
                 logger.info(f"🧹 {removed_count} alte Charts-Spiele entfernt (>{days_threshold} Tage)")
-                
-                return removed_count
+            else:
+                logger.info("✅ Keine alten Charts-Spiele zum Entfernen")
+            
+            return removed_count
                 
         except Exception as e:
             logger.error(f"❌ Fehler beim Bereinigen alter Charts-Spiele: {e}")
@@ -1601,7 +1519,7 @@ class SteamChartsManager:
                               cleanup_hours: int = 24,
                               price_update_hours: int = 4):
         """
-        LEGACY: Startet automatisches Charts-Tracking mit robuster Thread-Verwaltung
+        LEGACY: Startet automatisches Charts-Tracking über den gemeinsamen Event Scheduler
         Für Kompatibilität mit älteren Versionen - nutzt Enhanced Background Scheduler
         
         Args:
@@ -1615,29 +1533,24 @@ class SteamChartsManager:
             logger.warning("⚠️ Charts-Scheduler läuft bereits")
             return
         
-        # Bestehende Charts-Jobs löschen
-        charts_jobs = [job for job in schedule.jobs if 'charts' in str(job.job_func)]
-        for job in charts_jobs:
-            schedule.cancel_job(job)
+        # Jobs im gemeinsamen Event Scheduler planen (gleichnamige Jobs werden ersetzt);
+        # die Gruppen verhindern Überschneidungen mit Price Tracker und Background Scheduler
+        core = get_event_scheduler()
+        owner = self._scheduler_owner
+        self.stop_charts_scheduler_event.clear()
         
         # Charts-Update Job
-        schedule.every(charts_update_hours).hours.do(self._scheduled_charts_update)
+        core.add_job(f"{owner}:charts_update", self._scheduled_charts_update,
+                     interval_seconds=charts_update_hours * 3600, group='steam_api', owner=owner)
         
         # Cleanup Job
-        schedule.every(cleanup_hours).hours.do(self._scheduled_charts_cleanup)
+        core.add_job(f"{owner}:charts_cleanup", self._scheduled_charts_cleanup,
+                     interval_seconds=cleanup_hours * 3600, group='database', owner=owner)
         
         # Preis-Update Job für Charts-Spiele
         if hasattr(self, 'price_tracker') and self.price_tracker:
-            schedule.every(price_update_hours).hours.do(self._scheduled_charts_price_update)
-        
-        # Scheduler-Thread sicher starten
-        if self.charts_scheduler_thread is not None and self.charts_scheduler_thread.is_alive():
-            logger.info("📊 Charts-Scheduler-Thread läuft bereits")
-        else:
-            self.stop_charts_scheduler_event.clear()
-            self.charts_scheduler_thread = threading.Thread(target=self._run_charts_scheduler, daemon=True)
-            self.charts_scheduler_thread.start()
-            logger.info("🚀 Charts-Scheduler-Thread gestartet")
+            core.add_job(f"{owner}:charts_price_update", self._scheduled_charts_price_update,
+                         interval_seconds=price_update_hours * 3600, group='price_api', owner=owner)
         
         self.charts_scheduler_running = True
         logger.info(f"✅ Charts-Scheduler aktiviert:")
@@ -1646,7 +1559,7 @@ class SteamChartsManager:
         logger.info(f"   💰 Preis-Updates alle {price_update_hours}h")
     
     def stop_charts_scheduler(self):
-        """LEGACY: Stoppt den Charts-Scheduler mit robuster Thread-Verwaltung"""
+        """LEGACY: Stoppt den Charts-Scheduler (entfernt seine Jobs aus dem Event Scheduler)"""
         if not self.charts_scheduler_running:
             logger.info("ℹ️ Charts-Scheduler war nicht aktiv")
             return
@@ -1655,33 +1568,12 @@ class SteamChartsManager:
         self.stop_charts_scheduler_event.set()
         
         # Charts-Jobs entfernen
-        charts_jobs = [job for job in schedule.jobs if 'charts' in str(job.job_func)]
-        for job in charts_jobs:
-            schedule.cancel_job(job)
-        
-        # Auf Thread-Ende warten mit Timeout
-        if self.charts_scheduler_thread is not None and self.charts_scheduler_thread.is_alive():
-            self.charts_scheduler_thread.join(timeout=5)
+        get_event_scheduler().remove_jobs(self._scheduler_owner)
         
         self.charts_scheduler_running = False
-        self.charts_scheduler_thread = None
         
         logger.info("⏹️ Charts-Scheduler gestoppt")
     
-    def _run_charts_scheduler(self):
-        """Führt Charts-Scheduler in eigenem Thread aus"""
-        logger.info("🚀 Charts-Scheduler-Thread gestartet")
-        
-        while not self.stop_charts_scheduler_event.is_set():
-            try:
-                schedule.run_pending()
-                time_module.sleep(60)  # Prüfe jede Minute
-            except Exception as e:
-                logger.error(f"❌ Charts-Scheduler-Fehler: {e}")
-                time_module.sleep(60)
-        
-        logger.info("⏹️ Charts-Scheduler-Thread beendet")
-    
     def _scheduled_charts_update(self):
         """Automatisches Charts-Update"""
         try:
@@ -1695,6 +1587,9 @@ class SteamChartsManager:
         """Automatisches Charts-Cleanup"""
         try:
             logger.info("🧹 Automatisches Charts-Cleanup gestartet")
+            # Charts-Preise vor dem Löschen in die Rollups übernehmen (get_price_rollups liest nur)
+            self.db_manager.rollup_prices()
+            
             removed = self.cleanup_old_chart_games(days_threshold=30)
             logger.info(f"✅ Automatisches Charts-Cleanup: {removed} alte Spiele entfernt")
         except Exception as e:
@@ -1719,10 +1614,13 @@ class SteamChartsManager:
         Returns:
             Dictionary mit Scheduler-Status
         """
+        core = get_event_scheduler()
+        jobs = core.get_jobs(self._scheduler_owner)
         return {
             'scheduler_running': self.charts_scheduler_running,
-            'thread_alive': self.charts_scheduler_thread is not None and self.charts_scheduler_thread.is_alive(),
-            'scheduled_jobs': len([job for job in schedule.jobs if 'charts' in str(job.job_func)]),
+            'thread_alive': core.is_running(),
+            'scheduled_jobs': len(jobs),
+            'jobs': [job.to_dict() for job in jobs],
             'configuration': self.charts_config
         }
     
@@ -2191,8 +2089,8 @@ class SteamChartsManager:
         
             if api_key:
                 from steam_wishlist_manager import SteamWishlistManager
-                # Ohne db_manager Parameter!
-                temp_manager = SteamWishlistManager(api_key)
+                # Name-Cache über die Datenbank der Charts (kein zweiter DatabaseManager)
+                temp_manager = SteamWishlistManager(api_key, self.db_manager)
             
                 app_names = temp_manager.get_multiple_app_names(app_ids)
                 successful_updates = self._update_names_in_database(app_names)
@@ -2271,7 +2169,6 @@ class SteamChartsManager:
         Returns:
             Anzahl der erfolgreich aktualisierten Namen
         """
-        import requests
         import time as time_module
     
         successful_updates = 0
@@ -2279,10 +2176,6 @@ class SteamChartsManager:
     
         for i, app_id in enumerate(app_ids):
             try:
-                # Rate Limiting - wichtig!
-                if i > 0:
-                    time_module.sleep(1.5)  # 1.5 Sekunden zwischen Requests
-
                 # Progress Update
                 if progress_callback and i % 5 == 0:  # Alle 5 Apps
                     progress_callback({
@@ -2291,14 +2184,14 @@ class SteamChartsManager:
                         'current_task': f'App {i+1}/{len(app_ids)}: {app_id}'
                     })
             
-                url = f"https://store.steampowered.com/api/appdetails"
+                url = steam_store_url('appdetails')
                 params = {
                     'appids': str(app_id),
                     'filters': 'basic',
                     'cc': 'de'  # Deutsche Region
                 }
             
-                response = requests.get(url, params=params, timeout=10)
+                response = self.http.get(url, params=params, timeout=10)
             
                 if response.status_code == 200:
                     data = response.json()
@@ -2403,70 +2296,70 @@ class SteamChartsManager:
         
             logger.info("📊 Sammle Preisdaten für steam_charts_prices...")
         
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
+            # Steam-Preise gebündelt über appdetails (mehrere appids pro Request)
+            steam_prices_by_app = {}
+            cheapshark_prices_by_app = {}
+            if hasattr(self.price_tracker, '_fetch_steam_prices_batch'):
+                steam_prices_by_app = self.price_tracker._fetch_steam_prices_batch(app_ids)
             
-                for app_id in app_ids:
-                    try:
-                        chart_info = chart_apps_info.get(app_id, {})
-                        chart_type = chart_info.get('chart_type', 'unknown')
-                        app_name = chart_info.get('name', f'Steam App {app_id}')
-
+            # CheapShark-Deals für gemappte Apps gebündelt über games?ids=
+            if hasattr(self.price_tracker, '_fetch_cheapshark_prices_batch'):
+                cheapshark_prices_by_app = self.price_tracker._fetch_cheapshark_prices_batch(app_ids)
+            
+            # Alle Preise (inkl. Auflösung fehlender CheapShark-Mappings, die selbst
+            # über den Writer gespeichert werden) vor dem Schreiben abrufen - keine
+            # offene Transaktion während der Upstream-Requests
+            price_rows = []
+            store_columns = ('steam', 'greenmangaming', 'gog', 'humblestore', 'fanatical', 'gamesplanet')
+            
+            for app_id in app_ids:
+                try:
+                    chart_info = chart_apps_info.get(app_id, {})
+                    chart_type = chart_info.get('chart_type', 'unknown')
+                    app_name = chart_info.get('name', f'Steam App {app_id}')
                     
-                        if hasattr(self.price_tracker, '_fetch_prices_for_app'):
-                            price_data = self.price_tracker._fetch_prices_for_app(app_id, app_name)
+                    if not hasattr(self.price_tracker, '_fetch_prices_for_app'):
+                        charts_failed += 1
+                        continue
                     
-                            if price_data and any(store_data.get('price', 0) > 0 for store_data in price_data.values() if isinstance(store_data, dict)):
-                                # In steam_charts_prices schreiben
-                                steam_data = price_data.get('steam', {})
-                                gmg_data = price_data.get('greenmangaming', {})
-                                gog_data = price_data.get('gog', {})
-                                humble_data = price_data.get('humblestore', {})
-                                fanatical_data = price_data.get('fanatical', {})
-                                gamesplanet_data = price_data.get('gamesplanet', {})
-                        
-                                cursor.execute("""
-                                    INSERT OR REPLACE INTO steam_charts_prices 
-                                    (steam_app_id, chart_type, game_title, timestamp,
-                                     steam_price, steam_original_price, steam_discount_percent, steam_available,
-                                     greenmangaming_price, greenmangaming_original_price, greenmangaming_discount_percent, greenmangaming_available,
-                                     gog_price, gog_original_price, gog_discount_percent, gog_available,
-                                     humblestore_price, humblestore_original_price, humblestore_discount_percent, humblestore_available,
-                                     fanatical_price, fanatical_original_price, fanatical_discount_percent, fanatical_available,
-                                     gamesplanet_price, gamesplanet_original_price, gamesplanet_discount_percent, gamesplanet_available)
-                                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (
-                                    app_id, chart_type, app_name,
-                                    # Steam
-                                    steam_data.get('price', 0), steam_data.get('original_price', 0), 
-                                    steam_data.get('discount_percent', 0), steam_data.get('available', False),
-                                    # GMG
-                                    gmg_data.get('price', 0), gmg_data.get('original_price', 0),
-                                    gmg_data.get('discount_percent', 0), gmg_data.get('available', False),
-                                    # GOG
-                                    gog_data.get('price', 0), gog_data.get('original_price', 0),
-                                    gog_data.get('discount_percent', 0), gog_data.get('available', False),
-                                    # Humble
-                                    humble_data.get('price', 0), humble_data.get('original_price', 0),
-                                    humble_data.get('discount_percent', 0), humble_data.get('available', False),
-                                    # Fanatical  
-                                    fanatical_data.get('price', 0), fanatical_data.get('original_price', 0),
-                                    fanatical_data.get('discount_percent', 0), fanatical_data.get('available', False),
-                                    # GamesPlanet
-                                    gamesplanet_data.get('price', 0), gamesplanet_data.get('original_price', 0),
-                                    gamesplanet_data.get('discount_percent', 0), gamesplanet_data.get('available', False)
-                                ))
-                                charts_written += 1
-                            else:
-                                charts_failed += 1
-                        else:
-                            charts_failed += 1
+                    if str(app_id) in steam_prices_by_app:
+                        price_data = self.price_tracker._fetch_prices_for_app(
+                            app_id, app_name, steam_prices_by_app[str(app_id)], steam_prefetched=True,
+                            cheapshark_prices=cheapshark_prices_by_app.get(str(app_id))
+                        )
+                    else:
+                        price_data = self.price_tracker._fetch_prices_for_app(app_id, app_name)
                     
-                    except Exception as app_error:
-                        logger.debug(f"❌ Charts-Preis für {app_id} fehlgeschlagen: {app_error}")
+                    if price_data and any(store_data.get('price', 0) > 0 for store_data in price_data.values() if isinstance(store_data, dict)):
+                        row = [app_id, chart_type, app_name]
+                        for store in store_columns:
+                            store_data = price_data.get(store, {})
+                            row.extend([
+                                store_data.get('price', 0), store_data.get('original_price', 0),
+                                store_data.get('discount_percent', 0), store_data.get('available', False)
+                            ])
+                        price_rows.append(tuple(row))
+                    else:
                         charts_failed += 1
-        
-                conn.commit()
+                
+                except Exception as app_error:
+                    logger.debug(f"❌ Charts-Preis für {app_id} fehlgeschlagen: {app_error}")
+                    charts_failed += 1
+            
+            # In steam_charts_prices schreiben: ein Job über den Writer
+            if price_rows:
+                self.db_manager.write_statements([("""
+                    INSERT OR REPLACE INTO steam_charts_prices 
+                    (steam_app_id, chart_type, game_title, timestamp,
+                     steam_price, steam_original_price, steam_discount_percent, steam_available,
+                     greenmangaming_price, greenmangaming_original_price, greenmangaming_discount_percent, greenmangaming_available,
+                     gog_price, gog_original_price, gog_discount_percent, gog_available,
+                     humblestore_price, humblestore_original_price, humblestore_discount_percent, humblestore_available,
+                     fanatical_price, fanatical_original_price, fanatical_discount_percent, fanatical_available,
+                     gamesplanet_price, gamesplanet_original_price, gamesplanet_discount_percent, gamesplanet_available)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, price_rows, True)])
+                charts_written = len(price_rows)
 
             # SCHRITT 5: Ergebnisse zurückgeben
         
@@ -3108,11 +3001,10 @@ class SteamChartsManager:
 
         try:
             # API Check - teste Steam API Erreichbarkeit
-            import requests
-            test_url = "https://store.steampowered.com/api/appdetails"
+            test_url = steam_store_url('appdetails')
             test_params = {'appids': '413150', 'filters': 'basic'}
 
-            response = requests.get(test_url, params=test_params, timeout=10)
+            response = self.http.get(test_url, params=test_params, timeout=10)
 
             if response.status_code == 200:
                 health_status['api_status'] = 'healthy'
@@ -3253,11 +3145,9 @@ class SteamChartsManager:
         EINFACHER Preis-Abruf (CheapShark)
         """
         try:
-            import requests
         
-            url = f"https://www.cheapshark.com/api/1.0/games"
-            response = requests.get(url, params={'steamAppID': app_id}, timeout=10)
-            time_module.sleep(0.1)
+            url = cheapshark_url('games')
+            response = self.http.get(url, params={'steamAppID': app_id}, timeout=10)
         
             if response.status_code == 200:
                 data = response.json()
@@ -3290,14 +3180,12 @@ class SteamChartsManager:
             Basis-Preis-Daten oder None
         """
         try:
-            import requests
         
             # CheapShark API
-            url = f"https://www.cheapshark.com/api/1.0/games"
+            url = cheapshark_url('games')
             params = {'steamAppID': app_id}
         
-            response = requests.get(url, params=params, timeout=15)
-            time_module.sleep(0.1)  # Rate limiting
+            response = self.http.get(url, params=params)
         
             if response.status_code == 200:
                 data = response.json()
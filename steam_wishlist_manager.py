@@ -5,11 +5,15 @@ Fokussiert auf Steam API Integration mit optimierten Namen-Abfragen
 
 import requests
 import os
-import time as time_module
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
 
+from http_client import get_http_client
+from config import steam_api_url, steam_store_url
+
 try:
     from logging_config import get_steam_wishlist_logger
     logger = get_steam_wishlist_logger()
@@ -57,34 +61,26 @@ class SteamWishlistManager:
     Fokussiert auf Steam API Integration für Preis-Tracking und Namen-Updates
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, db_manager=None):
         """
         Initialisiert Steam Wishlist Manager
         
         Args:
             api_key: Steam Web API Key
+            db_manager: DatabaseManager für den App-Name Cache (ohne: kein Cache)
         """
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'SteamPriceTracker/1.1'
-        })
-        
-        # Rate Limiting für Steam API
-        self.last_request_time = 0
-        self.rate_limit = 1.0  # 1 Sekunde zwischen Requests
-    
-    def _wait_for_rate_limit(self):
-        """Wartet für Steam API Rate Limiting"""
-        current_time = time_module.time()
-        time_since_last = current_time - self.last_request_time
         
-        if time_since_last < self.rate_limit:
-            wait_time = self.rate_limit - time_since_last
-            logger.debug(f"⏳ Steam API Rate Limit: Warte {wait_time:.2f}s")
-            time_module.sleep(wait_time)
+        # Gepoolter HTTP Client - Rate Limiting, Retries und Keep-Alive pro Host
+        self.http = get_http_client()
+        self.session = self.http.session
         
-        self.last_request_time = time_module.time()
+        # App-Name Cache (SQLite) - nur über den DatabaseManager des Aufrufers
+        self.db_manager = db_manager
+        self._name_cache_warned = False
+        self.name_cache_ttl_hours = int(os.getenv('APP_NAME_CACHE_TTL_HOURS', '720'))
+        self.name_cache_negative_ttl_hours = int(os.getenv('APP_NAME_NEGATIVE_TTL_HOURS', '24'))
+        self.name_fetch_workers = int(os.getenv('APP_NAME_FETCH_WORKERS', '4'))
     
     def get_steam_id_64(self, steam_id_input: str) -> Optional[str]:
         """
@@ -117,16 +113,14 @@ class SteamWishlistManager:
         Returns:
             SteamID64 oder None
         """
-        self._wait_for_rate_limit()
-        
-        url = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/"
+        url = steam_api_url('ISteamUser/ResolveVanityURL/v0001/')
         params = {
             'key': self.api_key,
             'vanityurl': vanity_url
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -163,9 +157,7 @@ class SteamWishlistManager:
             logger.error(f"❌ Ungültige Steam ID: {steam_id}")
             return []
 
-        self._wait_for_rate_limit()
-
-        url = "https://api.steampowered.com/IWishlistService/GetWishlist/v1/"
+        url = steam_api_url('IWishlistService/GetWishlist/v1/')
         params = {
             "key": self.api_key,
             "steamid": steam_id_64
@@ -173,7 +165,7 @@ class SteamWishlistManager:
 
         try:
             logger.info(f"🔍 Lade Wishlist über Steam Web API für Steam ID: {steam_id_64}")
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params)
 
             if response.status_code == 200:
                 try:
@@ -185,10 +177,11 @@ class SteamWishlistManager:
                         return []
 
                     wishlist_items = []
+                    app_names = self.get_multiple_app_names([str(item.get("appid")) for item in items])
 
                     for item in items:
                         app_id = str(item.get("appid"))
-                        name = self.get_app_name_only(app_id)
+                        name = app_names.get(app_id)
 
                         wishlist_items.append({
                             "steam_app_id": app_id,
@@ -228,9 +221,7 @@ class SteamWishlistManager:
         Returns:
             App-Details oder None
         """
-        self._wait_for_rate_limit()
-        
-        url = "https://store.steampowered.com/api/appdetails"
+        url = steam_store_url('appdetails')
         params = {
             'appids': app_id,
             'cc': 'DE',  # Country Code für deutsche Preise
@@ -238,7 +229,7 @@ class SteamWishlistManager:
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, cache=True)
             
             if response.status_code == 200:
                 data = response.json()
@@ -274,7 +265,7 @@ class SteamWishlistManager:
     
     def get_app_name_only(self, app_id: str) -> Optional[str]:
         """
-        Holt nur den Namen einer Steam App (optimiert)
+        Holt nur den Namen einer Steam App (optimiert, über App-Name Cache)
         
         Args:
             app_id: Steam App ID
@@ -282,20 +273,19 @@ class SteamWishlistManager:
         Returns:
             App-Name oder None
         """
-        app_details = self.get_app_details(app_id)
-        
-        if app_details and app_details.get('name'):
-            return app_details['name'].strip()
-        
-        return None
+        return self.get_multiple_app_names([str(app_id)]).get(str(app_id))
     
     def get_multiple_app_names(self, app_ids: List[str], max_batch_size: int = 100) -> Dict[str, str]:
         """
         Holt Namen für mehrere Apps optimiert
         
+        Bekannte Namen kommen aus dem SQLite App-Name Cache (inkl. tracked_apps
+        und app_name_history); nur fehlende Apps werden gebündelt und parallel
+        bei Steam abgefragt und anschließend im Cache gespeichert.
+        
         Args:
             app_ids: Liste von Steam App IDs
-            max_batch_size: Maximale Anzahl Apps pro Batch (für Rate Limiting)
+            max_batch_size: Maximale Anzahl Apps pro Bulk-Request
             
         Returns:
             Dict mit app_id -> name Mapping
@@ -303,47 +293,152 @@ class SteamWishlistManager:
         if not app_ids:
             return {}
         
+        app_ids = list(dict.fromkeys(str(app_id) for app_id in app_ids))
         logger.info(f"🔍 Hole Namen für {len(app_ids)} Apps...")
         
-        results = {}
-        failed_apps = []
-        
-        # Apps in Batches verarbeiten
-        for i in range(0, len(app_ids), max_batch_size):
-            batch = app_ids[i:i + max_batch_size]
-            batch_num = (i // max_batch_size) + 1
-            total_batches = (len(app_ids) + max_batch_size - 1) // max_batch_size
-            
-            logger.info(f"📦 Batch {batch_num}/{total_batches}: {len(batch)} Apps")
+        # 1. Cache (kein Netzwerk)
+        db_manager = self._get_name_cache_db()
+        cached = {}
+        if db_manager:
+            cached = db_manager.get_cached_app_names(
+                app_ids,
+                ttl_hours=self.name_cache_ttl_hours,
+                negative_ttl_hours=self.name_cache_negative_ttl_hours
+            )
+        
+        results = {app_id: name for app_id, name in cached.items() if name}
+        negative_hits = len(cached) - len(results)
+        missing = [app_id for app_id in app_ids if app_id not in cached]
+        
+        # 2. Fehlende Namen gebündelt nachladen
+        fetched = {}
+        if missing:
+            logger.info(f"🌐 {len(missing)} Namen nicht im Cache - lade von Steam ({len(results)} Cache-Treffer)")
+            fetched = self._fetch_app_names_bulk(missing, max_batch_size)
             
-            for app_id in batch:
-                try:
-                    app_name = self.get_app_name_only(app_id)
-                    
-                    if app_name:
-                        results[app_id] = app_name
-                        logger.debug(f"✅ {app_id}: {app_name}")
-                    else:
-                        failed_apps.append(app_id)
-                        logger.warning(f"⚠️ Kein Name für App {app_id}")
-                        
-                except Exception as e:
-                    failed_apps.append(app_id)
-                    logger.error(f"❌ Fehler bei App {app_id}: {e}")
+            if db_manager and fetched:
+                db_manager.cache_app_names(fetched, source='steam_api')
             
-            # Pause zwischen Batches
-            if i + max_batch_size < len(app_ids):
-                logger.debug("⏳ Pause zwischen Batches...")
-                time_module.sleep(2)
+            results.update({app_id: name for app_id, name in fetched.items() if name})
         
+        failed_apps = [app_id for app_id in app_ids if app_id not in results]
         success_rate = len(results) / len(app_ids) * 100 if app_ids else 0
-        logger.info(f"✅ Namen-Abruf abgeschlossen: {len(results)}/{len(app_ids)} erfolgreich ({success_rate:.1f}%)")
+        logger.info(f"✅ Namen-Abruf abgeschlossen: {len(results)}/{len(app_ids)} erfolgreich ({success_rate:.1f}%), "
+                    f"Cache: {len(cached) - negative_hits} Treffer / {negative_hits} negativ, Netzwerk: {len(missing)}")
         
         if failed_apps:
-            logger.warning(f"⚠️ {len(failed_apps)} Apps fehlgeschlagen: {failed_apps[:5]}{'...' if len(failed_apps) > 5 else ''}")
+            logger.warning(f"⚠️ {len(failed_apps)} Apps ohne Namen: {failed_apps[:5]}{'...' if len(failed_apps) > 5 else ''}")
+        
+        return results
+    
+    def _get_name_cache_db(self):
+        """
+        Gibt DatabaseManager für den App-Name Cache zurück (None falls nicht übergeben)
+        
+        Bewusst kein eigener create_database_manager(): ein zweiter Manager hätte eigenen
+        Pool und Writer-Thread und würde bei abweichendem Pfad in die falsche Datei schreiben.
+        """
+        if self.db_manager is None and not self._name_cache_warned:
+            logger.info("ℹ️ Kein DatabaseManager übergeben - App-Name Cache deaktiviert")
+            self._name_cache_warned = True
+        
+        return self.db_manager
+    
+    def _fetch_app_names_bulk(self, app_ids: List[str], batch_size: int = 100) -> Dict[str, Optional[str]]:
+        """
+        Lädt App-Namen gebündelt über IStoreBrowseService/GetItems
+        
+        Apps, die im Bulk-Request fehlen, werden parallel einzeln über
+        appdetails (filters=basic) nachgeladen.
+        
+        Returns:
+            Dict app_id -> Name bzw. None wenn Steam die App nicht kennt.
+            Apps mit Netzwerkfehlern fehlen (werden nicht negativ gecacht).
+        """
+        chunks = [app_ids[i:i + batch_size] for i in range(0, len(app_ids), batch_size)]
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.name_fetch_workers),
+                                thread_name_prefix='app-names') as executor:
+            for chunk_result in executor.map(self._fetch_store_items_names, chunks):
+                results.update(chunk_result)
+            
+            leftovers = [app_id for app_id in app_ids if app_id not in results]
+            if leftovers:
+                logger.debug(f"🔄 {len(leftovers)} Apps nicht im Bulk-Ergebnis - Einzelabfrage")
+                for app_id, name in zip(leftovers, executor.map(self._fetch_app_name_basic, leftovers)):
+                    if name is not False:
+                        results[app_id] = name
         
         return results
     
+    def _fetch_store_items_names(self, app_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Ein Bulk-Request an IStoreBrowseService/GetItems für mehrere Apps
+        
+        Returns:
+            Dict app_id -> Name (None wenn Steam die App explizit nicht kennt)
+        """
+        url = steam_api_url('IStoreBrowseService/GetItems/v1/')
+        params = {
+            'input_json': json.dumps({
+                'ids': [{'appid': int(app_id)} for app_id in app_ids if app_id.isdigit()],
+                'context': {'language': 'german', 'country_code': 'DE'}
+            })
+        }
+        
+        if self.api_key:
+            params['key'] = self.api_key
+        
+        try:
+            response = self.http.get(url, params=params)
+            
+            if response.status_code != 200:
+                logger.debug(f"⚠️ GetItems HTTP {response.status_code} für {len(app_ids)} Apps")
+                return {}
+            
+            names = {}
+            for item in response.json().get('response', {}).get('store_items', []):
+                app_id = str(item.get('appid') or item.get('id') or '')
+                if not app_id:
+                    continue
+                
+                name = (item.get('name') or '').strip()
+                names[app_id] = name if item.get('success') == 1 and name else None
+            
+            return names
+            
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"⚠️ GetItems Fehler für {len(app_ids)} Apps: {e}")
+            return {}
+    
+    def _fetch_app_name_basic(self, app_id: str):
+        """
+        Einzelabfrage des Namens über appdetails mit filters=basic
+        
+        Returns:
+            Name, None wenn Steam die App nicht kennt, False bei Netzwerkfehler
+        """
+        url = steam_store_url('appdetails')
+        params = {'appids': app_id, 'filters': 'basic', 'l': 'german'}
+        
+        try:
+            response = self.http.get(url, params=params)
+            
+            if response.status_code != 200:
+                return False
+            
+            app_data = (response.json() or {}).get(app_id) or {}
+            if not app_data.get('success'):
+                return None
+            
+            name = (app_data.get('data', {}).get('name') or '').strip()
+            return name or None
+            
+        except (requests.RequestException, ValueError, AttributeError) as e:
+            logger.debug(f"⚠️ Namen-Abruf für App {app_id} fehlgeschlagen: {e}")
+            return False
+    
     def validate_api_key(self) -> bool:
         """
         Validiert Steam API Key
@@ -351,17 +446,15 @@ class SteamWishlistManager:
         Returns:
             True wenn API Key gültig ist
         """
-        self._wait_for_rate_limit()
-        
         # Test mit GetPlayerSummaries
-        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/"
+        url = steam_api_url('ISteamUser/GetPlayerSummaries/v0002/')
         params = {
             'key': self.api_key,
             'steamids': '76561197960435530'  # Gabe Newell's SteamID für Test
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -398,16 +491,14 @@ class SteamWishlistManager:
         if not steam_id_64:
             return None
         
-        self._wait_for_rate_limit()
-        
-        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/"
+        url = steam_api_url('ISteamUser/GetPlayerSummaries/v0002/')
         params = {
             'key': self.api_key,
             'steamids': steam_id_64
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -455,9 +546,7 @@ class SteamWishlistManager:
         if not steam_id_64:
             return []
         
-        self._wait_for_rate_limit()
-        
-        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
+        url = steam_api_url('IPlayerService/GetOwnedGames/v0001/')
         params = {
             'key': self.api_key,
             'steamid': steam_id_64,
@@ -466,7 +555,7 @@ class SteamWishlistManager:
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -558,13 +647,14 @@ def quick_wishlist_import(steam_id: str, api_key: str = None) -> List[Dict]:
     manager = SteamWishlistManager(api_key)
     return manager.get_simple_wishlist(steam_id)
 
-def bulk_get_app_names(app_ids: List[str], api_key: str = None) -> Dict[str, str]:
+def bulk_get_app_names(app_ids: List[str], api_key: str = None, db_manager=None) -> Dict[str, str]:
     """
     Bulk-Abfrage für App-Namen
     
     Args:
         app_ids: Liste von Steam App IDs
         api_key: Steam API Key (optional, falls in .env)
+        db_manager: DatabaseManager für den App-Name Cache (optional)
         
     Returns:
         Dict mit app_id -> name Mapping
@@ -576,7 +666,7 @@ def bulk_get_app_names(app_ids: List[str], api_key: str = None) -> Dict[str, str
         logger.error("❌ Kein Steam API Key verfügbar")
         return {}
     
-    manager = SteamWishlistManager(api_key)
+    manager = SteamWishlistManager(api_key, db_manager)
     return manager.get_multiple_app_names(app_ids)
 
 def validate_steam_api_key(api_key: str = None) -> bool:
@@ -0,0 +1,12 @@
+"""
+Gemeinsame Test-Konfiguration
+
+Logs der Testläufe werden in ein temporäres Verzeichnis geschrieben, damit
+logs/ im Projektverzeichnis unberührt bleibt. Muss vor dem ersten Import
+von logging_config gesetzt werden.
+"""
+
+import os
+import tempfile
+
+os.environ['LOG_FILE'] = tempfile.mkdtemp(prefix='steam_price_tracker_test_logs_')
@@ -0,0 +1,30 @@
+"""
+Regressionstests für benchmark.py
+
+Ein Benchmark-Lauf gegen eine synthetische Datenbank darf die produktive
+Standard-Datenbank im Arbeitsverzeichnis nicht anfassen.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import benchmark
+
+
+def test_benchmark_run_leaves_default_db_untouched(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    default_db = tmp_path / benchmark.DEFAULT_DB_PATH
+    with sqlite3.connect(default_db) as conn:
+        conn.execute("CREATE TABLE marker (id INTEGER)")
+    before = benchmark._file_fingerprint(benchmark.DEFAULT_DB_PATH)
+
+    bench_db = str(tmp_path / "bench.db")
+    benchmark.generate_synthetic_database(bench_db, apps=20, snapshots=400)
+    report = benchmark.run_benchmark(bench_db, ['deals', 'history', 'charts_update'], None, iterations=2)
+
+    assert report['default_db_untouched'] is True
+    assert benchmark._file_fingerprint(benchmark.DEFAULT_DB_PATH) == before
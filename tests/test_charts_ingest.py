@@ -0,0 +1,88 @@
+"""
+Regressionstests für DatabaseBatchWriter.ingest_chart
+
+Zwei Chart-Generationen: Zähler für neue, aktualisierte, herausgefallene und
+entfernte Spiele, Rang-Trends, Auto-Tracking und kaskadierendes Cleanup.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager, create_batch_writer
+
+CHART = 'most_played'
+
+
+def _chart(*ranked_ids):
+    return [{'steam_app_id': app_id, 'name': f'Game {app_id}', 'rank': rank}
+            for rank, app_id in enumerate(ranked_ids, start=1)]
+
+
+def _count(conn, sql, params=()):
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def test_ingest_two_generations(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "charts.db"))
+    writer = create_batch_writer(db)
+
+    try:
+        first = writer.ingest_chart(CHART, _chart('10', '20', '30', '40'), cleanup_days=30)
+        assert (first['new'], first['updated'], first['dropped'], first['removed']) == (4, 0, 0, 0)
+
+        # 30 fällt heraus; 40 fällt heraus und wurde seit 40 Tagen nicht gesehen (Cleanup)
+        db.write_statements([
+            ("UPDATE steam_charts_tracking SET last_seen = datetime('now', '-40 days') WHERE steam_app_id = '40'", ()),
+            ("INSERT INTO steam_charts_prices (steam_app_id, chart_type) VALUES ('40', ?)", (CHART,)),
+            ("INSERT INTO steam_charts_prices (steam_app_id, chart_type) VALUES ('30', ?)", (CHART,)),
+        ])
+
+        second = writer.ingest_chart(CHART, _chart('20', '10', '50'), cleanup_days=30)
+        assert second['success'] is True
+        assert (second['total'], second['new'], second['updated']) == (3, 1, 2)
+        assert second['dropped'] == 2
+        assert second['removed'] == 1
+
+        with db.get_connection(readonly=True) as conn:
+            trends = dict(conn.execute(
+                "SELECT steam_app_id, rank_trend FROM steam_charts_tracking WHERE chart_type = ? AND active = 1",
+                (CHART,)
+            ).fetchall())
+            assert trends == {'10': 'falling', '20': 'rising', '50': 'new'}
+            assert _count(conn, "SELECT active FROM steam_charts_tracking WHERE steam_app_id = '30'") == 0
+
+            # Cascade: Tracking, Preise und Rang-Historie von 40 entfernt, 30 bleibt erhalten
+            for table in ('steam_charts_tracking', 'steam_charts_prices', 'steam_charts_rank_history'):
+                assert _count(conn, f"SELECT COUNT(*) FROM {table} WHERE steam_app_id = '40'") == 0
+            assert _count(conn, "SELECT COUNT(*) FROM steam_charts_prices WHERE steam_app_id = '30'") == 1
+            assert _count(conn, "SELECT COUNT(*) FROM steam_charts_rank_history WHERE steam_app_id = '10'") == 2
+
+            # Auto-Tracking für alle neuen Spiele beider Generationen
+            tracked = {row[0] for row in conn.execute("SELECT steam_app_id FROM tracked_apps WHERE source = 'charts'")}
+            assert tracked == {'10', '20', '30', '40', '50'}
+    finally:
+        db.close_connections()
+
+
+def test_batch_write_charts_prices_uses_ensured_schema(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "charts.db"))
+    writer = create_batch_writer(db)
+
+    try:
+        writer.ingest_chart(CHART, _chart('10'))
+        result = writer.batch_write_charts_prices([
+            {'steam_app_id': '10', 'chart_type': CHART, 'price': 9.99, 'original_price': 19.99, 'discount_percent': 50},
+            {'steam_app_id': '20', 'price': 4.99}  # ohne chart_type verworfen
+        ])
+        assert (result['success'], result['written_count'], result['rejected_count']) == (True, 1, 1)
+
+        with db.get_connection(readonly=True) as conn:
+            row = conn.execute("SELECT steam_price, steam_original_price, steam_discount_percent "
+                               "FROM steam_charts_prices WHERE steam_app_id = '10'").fetchone()
+            assert tuple(row) == (9.99, 19.99, 50)
+    finally:
+        db.close_connections()
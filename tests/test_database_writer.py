@@ -0,0 +1,65 @@
+"""
+Regressionstests für den Single-Writer (DatabaseWriter)
+
+Schreibzugriffe über den Writer aus einer offenen Schreib-Transaktion des
+aufrufenden Threads dürfen nicht auf das Datei-Lock des Aufrufers warten.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+
+
+def test_writer_routed_call_inside_open_transaction(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "writer.db"))
+
+    try:
+        start = time.monotonic()
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO tracked_apps (steam_app_id, name) VALUES ('1', 'Game 1')")
+            saved = db.save_cheapshark_game_ids({'2': None})
+        duration = time.monotonic() - start
+
+        assert saved == 1
+        assert duration < 5.0
+
+        with db.get_connection(readonly=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM tracked_apps WHERE steam_app_id = '1'").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM cheapshark_game_map WHERE steam_app_id = '2'").fetchone()[0] == 1
+    finally:
+        db.close_connections()
+
+
+def test_writer_routed_call_rolls_back_with_caller(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "writer.db"))
+
+    try:
+        try:
+            with db.get_connection() as conn:
+                conn.execute("INSERT INTO tracked_apps (steam_app_id, name) VALUES ('1', 'Game 1')")
+                db.save_cheapshark_game_ids({'2': None})
+                raise RuntimeError("Abbruch")
+        except RuntimeError:
+            pass
+
+        with db.get_connection(readonly=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cheapshark_game_map").fetchone()[0] == 0
+    finally:
+        db.close_connections()
+
+
+def test_writer_server_requires_authkey(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_WRITER_PORT', '47391')
+    monkeypatch.delenv('DB_WRITER_AUTHKEY', raising=False)
+    db = DatabaseManager(str(tmp_path / "writer.db"))
+
+    try:
+        assert db.get_writer().get_stats()['server_active'] is False
+    finally:
+        db.close_connections()
@@ -0,0 +1,87 @@
+"""
+Regressionstests für den inkrementellen Elasticsearch-Sync
+
+tracked_apps_latest_prices folgt der Änderungssequenz von tracked_apps:
+Bearbeitungen erreichen den Index ohne neuen Preis-Snapshot, deaktivierte
+und gelöschte Apps werden aus dem Index entfernt.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+from elasticsearch_export import StreamingBulkExporter, sync_source
+
+SOURCE = 'tracked_apps_latest_prices'
+INDEX = 'steam-tracked-apps-latest-prices'
+
+
+class FakeBulkClient:
+    """Sammelt Bulk-Aktionen wie ein Elasticsearch-Client"""
+
+    def __init__(self):
+        self.actions = []
+
+    def bulk(self, operations, refresh=False):
+        lines = [json.loads(line) for line in operations.splitlines() if line]
+        items = []
+        index = 0
+        while index < len(lines):
+            action = lines[index]
+            op = next(iter(action))
+            self.actions.append((op, action[op]['_id'], lines[index + 1] if op == 'index' else None))
+            items.append({op: {'status': 200}})
+            index += 2 if op == 'index' else 1
+        return {'errors': False, 'items': items}
+
+    def take(self):
+        actions, self.actions = self.actions, []
+        return actions
+
+
+def _sync(db, client):
+    state = db.get_es_sync_state().get(INDEX)
+    return sync_source(StreamingBulkExporter(client, workers=1), db, SOURCE, INDEX, state)
+
+
+def test_sync_follows_app_edits_and_removals(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "sync.db"))
+    client = FakeBulkClient()
+
+    try:
+        for app_id in ('1', '2', '3'):
+            db.add_tracked_app(app_id, f'Game {app_id}')
+            db.write_statements([("""
+                INSERT INTO price_snapshots (
+                    steam_app_id, game_title, steam_price, steam_original_price, steam_discount_percent, steam_available
+                ) VALUES (?, ?, 9.99, 19.99, 50, 1)
+            """, (app_id, f'Game {app_id}'))])
+
+        assert _sync(db, client)['status'] == 'synced'
+        assert sorted(doc_id for op, doc_id, _ in client.take() if op == 'index') == ['1', '2', '3']
+        assert _sync(db, client)['status'] == 'up_to_date'
+
+        # Bearbeitung ohne neuen Snapshot
+        db.write_statements([("UPDATE tracked_apps SET target_price = 5.0 WHERE steam_app_id = '1'", ())])
+        # Deaktivieren und Löschen
+        db.write_statements([
+            ("UPDATE tracked_apps SET active = 0 WHERE steam_app_id = '2'", ()),
+            ("DELETE FROM tracked_apps WHERE steam_app_id = '3'", ())
+        ])
+
+        stats = _sync(db, client)
+        actions = client.take()
+        assert [(op, doc_id) for op, doc_id, _ in actions if op == 'index'] == [('index', '1')]
+        assert actions[0][2]['target_price'] == 5.0
+        assert sorted(doc_id for op, doc_id, _ in actions if op == 'delete') == ['2', '3']
+        assert stats['deleted'] == 2
+
+        # Unveränderte Updates erhöhen die Sequenz nicht
+        db.write_statements([("UPDATE tracked_apps SET target_price = 5.0 WHERE steam_app_id = '1'", ())])
+        assert _sync(db, client)['status'] == 'up_to_date'
+    finally:
+        db.close_connections()
@@ -0,0 +1,138 @@
+"""
+Tests für den Scheduler-Kern (event_scheduler.py)
+
+Catch-up Policies, Gruppen-Limits, Entfernen wartender Jobs und Jitter mit
+kleinen Intervallen. Verpasste Läufe werden simuliert, indem der Soll-Zeitpunkt
+eines Jobs in die Vergangenheit gelegt wird.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_scheduler import EventScheduler
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def scheduler():
+    core = EventScheduler(workers=2, group_limits={'steam_api': 1}, misfire_grace_seconds=1.0)
+    yield core
+    core.stop()
+
+
+def _miss_runs(core, job, seconds_late):
+    """Legt den nächsten Lauf seconds_late in die Vergangenheit (wie nach Standby)"""
+    with core.condition:
+        core._push(job, time.time() - seconds_late, jitter=False)
+        core.condition.notify_all()
+
+
+def _counting_job(core, catch_up):
+    runs = []
+    job = core.add_job(f'job_{catch_up}', lambda: runs.append(time.time()), interval_seconds=10,
+                       jitter_seconds=0, catch_up=catch_up)
+    return job, runs
+
+
+def test_catch_up_skip_drops_late_run(scheduler):
+    job, runs = _counting_job(scheduler, 'skip')
+    _miss_runs(scheduler, job, 25)
+
+    assert wait_until(lambda: job.skipped_runs == 3)
+    time.sleep(0.1)
+    assert runs == []
+    assert job.next_run > time.time()
+
+
+def test_catch_up_coalesce_runs_once(scheduler):
+    job, runs = _counting_job(scheduler, 'coalesce')
+    _miss_runs(scheduler, job, 25)
+
+    assert wait_until(lambda: job.run_count == 1)
+    time.sleep(0.1)
+    assert len(runs) == 1
+    assert job.missed_runs == 2
+
+
+def test_catch_up_all_replays_missed_runs(scheduler):
+    job, runs = _counting_job(scheduler, 'all')
+    _miss_runs(scheduler, job, 25)
+
+    # Fälliger Lauf plus zwei verpasste
+    assert wait_until(lambda: job.run_count == 3)
+    time.sleep(0.1)
+    assert len(runs) == 3
+    assert job.backlog == 0
+
+
+def test_group_limit_serializes_jobs(scheduler):
+    spans = []
+    lock = threading.Lock()
+
+    def work():
+        start = time.monotonic()
+        time.sleep(0.2)
+        with lock:
+            spans.append((start, time.monotonic()))
+
+    for name in ('first', 'second'):
+        scheduler.add_job(name, work, interval_seconds=60, run_immediately=True,
+                          jitter_seconds=0, group='steam_api')
+
+    assert wait_until(lambda: len(spans) == 2)
+    spans.sort()
+    assert spans[0][1] <= spans[1][0]
+    assert scheduler.get_stats()['deferred'] >= 1
+
+
+def test_remove_job_while_waiting(scheduler):
+    release = threading.Event()
+    ran = []
+
+    scheduler.add_job('blocker', release.wait, interval_seconds=60, run_immediately=True,
+                      jitter_seconds=0, group='steam_api')
+    assert wait_until(lambda: scheduler.get_job('blocker').running)
+
+    waiting = scheduler.add_job('waiting', lambda: ran.append(True), interval_seconds=60,
+                                run_immediately=True, jitter_seconds=0, group='steam_api')
+    assert wait_until(lambda: waiting.waiting)
+
+    assert scheduler.remove_job('waiting') is True
+    assert waiting.waiting is False
+    assert scheduler.get_stats()['waiting'] == 0
+
+    release.set()
+    assert wait_until(lambda: scheduler.get_job('blocker').run_count == 1)
+    time.sleep(0.1)
+    assert ran == []
+    assert scheduler.get_job('waiting') is None
+
+
+def test_jitter_stays_within_bounds(scheduler):
+    for _ in range(50):
+        job = scheduler.add_job('jittered', lambda: None, interval_seconds=60, jitter_seconds=5)
+        assert 0.0 <= job.next_run - job.nominal_run <= 5.0
+
+    # Manuell vorgezogene Läufe starten ohne Jitter
+    scheduler.remove_job('jittered')
+    job = scheduler.add_job('manual', lambda: None, interval_seconds=60, jitter_seconds=5)
+    release = threading.Event()
+    job.func = release.wait
+    assert scheduler.run_job_now('manual')
+    assert wait_until(lambda: job.running)
+    assert job.last_delay < 1.0
+    release.set()
@@ -0,0 +1,53 @@
+"""
+Regressionstests für http_cache.py
+
+appdetails-Responses mit "success": false dürfen nicht gecacht werden,
+sonst verdeckt ein vorübergehender Fehler den Preis bis zum Ablauf.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_cache import HTTPResponseCache
+
+APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
+
+def _response(payload) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+def test_appdetails_success_false_not_stored(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / "http_cache.db"))
+    key = cache.make_key(APPDETAILS_URL, {'appids': '10,20'})
+
+    cache.handle_response(key, APPDETAILS_URL, _response({
+        '10': {'success': True, 'data': {}},
+        '20': {'success': False}
+    }))
+    assert cache.lookup(key) is None
+
+    cache.handle_response(key, APPDETAILS_URL, _response({
+        '10': {'success': True, 'data': {}},
+        '20': {'success': True, 'data': {}}
+    }))
+    assert cache.get_fresh(key, 600) is not None
+
+
+def test_other_endpoints_still_stored(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / "http_cache.db"))
+    url = "https://www.cheapshark.com/api/1.0/games"
+    key = cache.make_key(url, {'ids': '1'})
+
+    cache.handle_response(key, url, _response({'1': {'deals': []}}))
+    assert cache.lookup(key) is not None
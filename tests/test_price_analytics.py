@@ -0,0 +1,200 @@
+"""
+Tests für price_analytics.py
+
+Die Kennzahlen werden auf handgebauten Serien mit von Hand gerechneten
+Erwartungen geprüft (Einzel-Sample, nie bepreiste Serie, Fenstergrenzen).
+"""
+
+import math
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+from price_analytics import (PriceAnalytics, PriceHistory, RankHistory, SECONDS_PER_DAY,
+                             compute_price_metrics, compute_rank_metrics)
+
+DAY = SECONDS_PER_DAY
+NAN = float('nan')
+
+
+def _price_history(series):
+    """series: Liste von (app_id, [(timestamp, price_cents, discount), ...])"""
+    rows = [row for _, samples in series for row in samples]
+    return PriceHistory(
+        app_ids=np.array([app_id for app_id, _ in series]),
+        offsets=np.concatenate(([0], np.cumsum([len(samples) for _, samples in series]))).astype(np.int64),
+        timestamps=np.array([row[0] for row in rows], dtype=np.int64),
+        price_cents=np.array([row[1] for row in rows], dtype=np.float64),
+        discount=np.array([row[2] for row in rows], dtype=np.int64)
+    )
+
+
+def _rank_history(series):
+    """series: Liste von (app_id, chart_type, [(timestamp, rank), ...])"""
+    rows = [row for _, _, samples in series for row in samples]
+    return RankHistory(
+        app_ids=np.array([app_id for app_id, _, _ in series]),
+        chart_types=np.array([chart_type for _, chart_type, _ in series]),
+        offsets=np.concatenate(([0], np.cumsum([len(samples) for _, _, samples in series]))).astype(np.int64),
+        timestamps=np.array([row[0] for row in rows], dtype=np.int64),
+        ranks=np.array([row[1] for row in rows], dtype=np.float64)
+    )
+
+
+@pytest.fixture
+def price_metrics():
+    history = _price_history([
+        # Drei Preise, je 10 Tage gültig (der letzte bis now)
+        ('a', [(0, 1000.0, 0), (10 * DAY, 500.0, 50), (20 * DAY, 800.0, 20)]),
+        # Einzel-Sample im Sale direkt nach einer Serie, die im Sale endet
+        ('b', [(25 * DAY, 1999.0, 25)]),
+        # Nie bepreist
+        ('c', [(5 * DAY, NAN, 0), (6 * DAY, NAN, 0)]),
+    ])
+    return compute_price_metrics(history, low_windows_days=(5, 10, 15, 20, 40), now=30 * DAY)
+
+
+def test_price_metrics_multi_sample_series(price_metrics):
+    mean = (1000 + 500 + 800) / 3
+    std = math.sqrt(((1000 - mean) ** 2 + (500 - mean) ** 2 + (800 - mean) ** 2) / 3)
+
+    assert price_metrics['samples'][0] == 3
+    assert price_metrics['current_cents'][0] == 800
+    assert price_metrics['current_discount'][0] == 20
+    assert price_metrics['all_time_low_cents'][0] == 500
+    assert price_metrics['all_time_high_cents'][0] == 1000
+    assert price_metrics['mean_cents'][0] == pytest.approx(mean)
+    assert price_metrics['volatility'][0] == pytest.approx(std / mean)
+    assert price_metrics['discount_share'][0] == pytest.approx(2 / 3)
+    assert price_metrics['sale_count'][0] == 1
+    assert price_metrics['low_ratio'][0] == pytest.approx(1.6)
+    assert not price_metrics['at_all_time_low'][0]
+    assert price_metrics['first_seen'][0] == 0
+    assert price_metrics['last_seen'][0] == 20 * DAY
+
+
+def test_price_metrics_low_window_boundaries(price_metrics):
+    # Fensterbeginn 25d: nur der letzte Preis gilt
+    assert price_metrics['low_5d_cents'][0] == 800
+    # Fensterbeginn genau auf dem letzten Snapshot (20d)
+    assert price_metrics['low_10d_cents'][0] == 800
+    # Fensterbeginn 15d: der Preis von 10d gilt noch
+    assert price_metrics['low_15d_cents'][0] == 500
+    # Fensterbeginn genau auf dem Snapshot bei 10d
+    assert price_metrics['low_20d_cents'][0] == 500
+    # Fenster vor Serienbeginn: ganze Serie, keine Samples der Nachbarserie
+    assert price_metrics['low_40d_cents'][0] == 500
+    assert price_metrics['low_40d_cents'][1] == 1999
+
+
+def test_price_metrics_single_sample_series(price_metrics):
+    assert price_metrics['samples'][1] == 1
+    assert price_metrics['current_cents'][1] == 1999
+    assert price_metrics['all_time_low_cents'][1] == 1999
+    assert price_metrics['all_time_high_cents'][1] == 1999
+    assert price_metrics['mean_cents'][1] == 1999
+    assert price_metrics['volatility'][1] == 0
+    assert price_metrics['discount_share'][1] == 1
+    # Sale-Beginn zählt, obwohl die vorherige Serie im Sale endet
+    assert price_metrics['sale_count'][1] == 1
+    assert price_metrics['low_ratio'][1] == 1
+    assert price_metrics['at_all_time_low'][1]
+    for days in (5, 10, 15, 20, 40):
+        assert price_metrics[f'low_{days}d_cents'][1] == 1999
+
+
+def test_price_metrics_never_priced_series(price_metrics):
+    assert price_metrics['samples'][2] == 2
+    for name in ('current_cents', 'all_time_low_cents', 'all_time_high_cents', 'mean_cents',
+                 'volatility', 'low_ratio', 'low_5d_cents', 'low_40d_cents'):
+        assert np.isnan(price_metrics[name][2]), name
+    assert not price_metrics['at_all_time_low'][2]
+    assert price_metrics['discount_share'][2] == 0
+    assert price_metrics['sale_count'][2] == 0
+    assert price_metrics['first_seen'][2] == 5 * DAY
+    assert price_metrics['last_seen'][2] == 6 * DAY
+
+
+def test_price_metrics_skip_unpriced_samples_in_mean():
+    # 10 Tage 1000, 10 Tage ohne Preis, 10 Tage 400 -> Mittel nur über bepreiste Dauer
+    history = _price_history([('a', [(0, 1000.0, 0), (10 * DAY, NAN, 0), (20 * DAY, 400.0, 60)])])
+    metrics = compute_price_metrics(history, low_windows_days=(15,), now=30 * DAY)
+
+    assert metrics['mean_cents'][0] == pytest.approx(700)
+    assert metrics['volatility'][0] == pytest.approx(300 / 700)
+    assert metrics['discount_share'][0] == pytest.approx(1 / 3)
+    assert metrics['all_time_low_cents'][0] == 400
+    assert metrics['at_all_time_low'][0]
+    # Zu Fensterbeginn (15d) gilt "kein Preis", danach 400
+    assert metrics['low_15d_cents'][0] == 400
+
+
+def test_price_metrics_empty_history():
+    history = _price_history([])
+    metrics = compute_price_metrics(history, low_windows_days=(30,), now=0)
+
+    assert metrics['samples'].size == 0
+    assert metrics['low_30d_cents'].size == 0
+
+
+def test_rank_metrics_trends_and_window_boundaries():
+    history = _rank_history([
+        # Fensterbeginn 3d liegt zwischen 0d und 5d: Startrang 10
+        ('a', 'top_sellers', [(0, 10.0), (5 * DAY, 4.0), (8 * DAY, 6.0)]),
+        # Einzel-Sample nach Fensterbeginn
+        ('b', 'most_played', [(9 * DAY, 3.0)]),
+        # Letzter Rang vor Fensterbeginn
+        ('c', 'top_sellers', [(0, 5.0), (DAY, 2.0)]),
+        # Sample genau auf dem Fensterbeginn ist der Startrang
+        ('d', 'top_sellers', [(2 * DAY, 1.0), (3 * DAY, 5.0)]),
+        ('e', 'most_played', [(DAY, 2.0), (9 * DAY, 7.0)]),
+    ])
+    metrics = compute_rank_metrics(history, window_days=7, now=10 * DAY)
+
+    assert list(metrics['trend']) == ['rising', 'new', 'dropped', 'stable', 'falling']
+    assert list(metrics['samples']) == [3, 1, 2, 2, 2]
+    assert list(metrics['current_rank']) == [6, 3, 2, 5, 7]
+    assert list(metrics['best_rank']) == [4, 3, 2, 1, 2]
+    assert list(metrics['worst_rank']) == [10, 3, 5, 5, 7]
+    assert metrics['average_rank'] == pytest.approx([20 / 3, 3, 3.5, 3, 4.5])
+    assert list(metrics['window_start_rank']) == [10, 3, 2, 5, 2]
+    assert list(metrics['window_best_rank']) == [4, 3, 2, 5, 2]
+    assert list(metrics['rank_change']) == [4, 0, 0, 0, -5]
+    assert list(metrics['in_window']) == [True, True, False, True, True]
+    assert list(metrics['first_seen']) == [0, 9 * DAY, 0, 2 * DAY, DAY]
+    assert list(metrics['last_seen']) == [8 * DAY, 9 * DAY, DAY, 3 * DAY, 9 * DAY]
+
+
+def test_load_price_history_converts_local_timestamps(tmp_path, monkeypatch):
+    # Snapshots speichern Ortszeit, Kennzahlen rechnen mit time.time()
+    if not hasattr(time, 'tzset'):
+        pytest.skip("time.tzset nicht verfügbar")
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('TZ', 'Etc/GMT+6')
+    time.tzset()
+
+    db = DatabaseManager(str(tmp_path / "analytics.db"))
+    try:
+        db.write_statements([("""
+            INSERT INTO price_snapshots (steam_app_id, game_title, timestamp, steam_price,
+                                         steam_original_price, steam_discount_percent, steam_available)
+            VALUES ('1', 'Game 1', ?, 9.99, 19.99, 50, 1)
+        """, (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))])
+
+        history = PriceAnalytics(db).load_price_history(days_back=1)
+
+        assert list(history.app_ids) == ['1']
+        assert abs(int(history.timestamps[0]) - time.time()) < 60
+        assert history.price_cents[0] == 999
+    finally:
+        db.close_connections()
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,114 @@
+"""
+Regressionstests für get_price_history und get_price_rollups
+
+expand=True muss die expandierte Reihe liefern (auf limit gekürzt) statt
+stillschweigend auf Tages-Buckets auszuweichen; Rollup-Abfragen lesen nur.
+Rollups speichern nur die Ränder der Snapshot-Intervalle, der Leser füllt auf.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+
+
+def test_expand_is_truncated_instead_of_rolled_up(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('TRACKING_INTERVAL_HOURS', '6')
+    monkeypatch.setenv('PRICE_SNAPSHOT_MODE', 'changes')
+    db = DatabaseManager(str(tmp_path / "history.db"))
+
+    try:
+        now = datetime.now().replace(microsecond=0)
+        insert = """
+            INSERT INTO price_snapshots (
+                steam_app_id, game_title, timestamp,
+                steam_price, steam_original_price, steam_discount_percent, steam_available
+            ) VALUES ('1', 'Game 1', ?, 9.99, 19.99, 50, 1)
+        """
+        # Change-only: der zweite, unveränderte Snapshot bestätigt nur den ersten
+        db.write_statements([
+            (insert, ((now - timedelta(days=29)).strftime('%Y-%m-%d %H:%M:%S'),)),
+            (insert, (now.strftime('%Y-%m-%d %H:%M:%S'),))
+        ])
+        db.rollup_prices()
+
+        history = db.get_price_history('1', days=30, limit=100, expand=True)
+
+        assert len(history) == 100
+        assert all(row['resolution'] == 'raw' for row in history)
+        assert history[0]['timestamp'] == now.strftime('%Y-%m-%d %H:%M:%S')
+        assert all(row['steam_price'] == 9.99 for row in history)
+    finally:
+        db.close_connections()
+
+
+def test_price_rollups_read_does_not_aggregate(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db = DatabaseManager(str(tmp_path / "history.db"))
+
+    try:
+        db.write_statements([("""
+            INSERT INTO price_snapshots (
+                steam_app_id, game_title, steam_price, steam_original_price, steam_discount_percent, steam_available
+            ) VALUES ('1', 'Game 1', 9.99, 19.99, 50, 1)
+        """, ())])
+
+        assert db.get_price_rollups('1', 'daily', days=7) == []
+
+        assert db.rollup_prices()['success'] is True
+        buckets = db.get_price_rollups('1', 'daily', days=7)
+        assert len(buckets) == 1
+        assert buckets[0]['steam_min_price'] == 9.99
+    finally:
+        db.close_connections()
+
+
+def test_rollups_store_only_interval_edges_and_reader_fills_gaps(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('PRICE_SNAPSHOT_MODE', 'changes')
+    db = DatabaseManager(str(tmp_path / "history.db"))
+
+    try:
+        now = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        insert = """
+            INSERT INTO price_snapshots (
+                steam_app_id, game_title, timestamp,
+                steam_price, steam_original_price, steam_discount_percent, steam_available
+            ) VALUES ('1', 'Game 1', ?, ?, 19.99, 0, 1)
+        """
+        fmt = '%Y-%m-%d %H:%M:%S'
+        # 19.99 über 20 Tage bestätigt, danach 9.99
+        db.write_statements([
+            (insert, ((now - timedelta(days=20)).strftime(fmt), 19.99)),
+            (insert, ((now - timedelta(days=10)).strftime(fmt), 19.99)),
+            (insert, ((now - timedelta(hours=2)).strftime(fmt), 19.99)),
+            (insert, (now.strftime(fmt), 9.99))
+        ])
+
+        result = db.rollup_prices()
+        with db.get_connection(readonly=True) as conn:
+            stored = dict(conn.execute(
+                "SELECT resolution, COUNT(*) FROM price_rollups WHERE source = 'tracked' GROUP BY resolution"
+            ).fetchall())
+
+        # Nur Beginn (vor 20 Tagen) und Ende/Preiswechsel (heute), keine 21 Tages-Buckets
+        assert stored['daily'] == 2
+        assert result['buckets']['tracked'] == {'daily': stored['daily'], 'weekly': stored['weekly']}
+
+        buckets = db.get_price_rollups('1', 'daily', days=30)
+        assert len(buckets) == 21
+        assert [bucket['interpolated'] for bucket in (buckets[0], buckets[10], buckets[-1])] == [False, True, False]
+        assert buckets[0]['steam_price'] == 9.99
+        assert buckets[0]['steam_max_price'] == 19.99
+        assert all(bucket['steam_price'] == 19.99 for bucket in buckets[1:])
+
+        # Beginn außerhalb des Zeitraums: Startwert wird in den Zeitraum fortgeführt
+        recent = db.get_price_rollups('1', 'daily', days=5)
+        assert len(recent) == 6
+        assert recent[-1]['steam_price'] == 19.99 and recent[-1]['interpolated'] is True
+    finally:
+        db.close_connections()
@@ -0,0 +1,171 @@
+"""
+Regressionstests für die Preis-Speicherung
+
+Der Start des DatabaseManager darf bestehende Historie nicht migrieren;
+das erledigt der explizite Befehl (migrate_price_storage).
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager, create_batch_writer
+
+
+def _wide_database(db_path, monkeypatch):
+    """Legt eine Datenbank mit breiter price_snapshots Tabelle und einem Snapshot an"""
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', 'wide')
+    db = DatabaseManager(db_path)
+    db.write_statements([("""
+        INSERT INTO price_snapshots (steam_app_id, game_title, steam_price, steam_original_price,
+                                     steam_discount_percent, steam_available)
+        VALUES ('1', 'Game 1', 9.99, 19.99, 50, 1)
+    """, ())])
+    db.close_connections()
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', 'normalized')
+
+
+def test_new_database_starts_normalized(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', 'normalized')
+    db = DatabaseManager(str(tmp_path / "prices.db"))
+
+    try:
+        assert db.get_price_storage_layout() == 'normalized'
+    finally:
+        db.close_connections()
+
+
+def test_startup_does_not_migrate_existing_history(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db_path = str(tmp_path / "prices.db")
+    _wide_database(db_path, monkeypatch)
+
+    db = DatabaseManager(db_path)
+    try:
+        assert db.get_price_storage_layout() == 'wide'
+
+        result = db.migrate_price_storage(chunk_size=1)
+        assert result['success'] is True
+        assert result['migrated'] == 1
+        assert db.get_price_storage_layout() == 'normalized'
+    finally:
+        db.close_connections()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT steam_price FROM price_snapshots").fetchall() == [(9.99,)]
+
+
+@pytest.mark.parametrize('layout', ['wide', 'normalized'])
+def test_mixed_writers_store_unchanged_price_once(tmp_path, monkeypatch, layout):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', layout)
+    monkeypatch.setenv('PRICE_SNAPSHOT_MODE', 'changes')
+    db = DatabaseManager(str(tmp_path / "prices.db"))
+    writer = create_batch_writer(db)
+    # Batch-Writer: 0.0/False für Stores ohne Angebot
+    batch_row = {'steam_app_id': '1', 'game_title': 'Game 1', 'steam_price': 19.99,
+                 'steam_original_price': 19.99, 'steam_discount_percent': 0, 'steam_available': True}
+    # save_price_snapshot: NULL für alle anderen Stores
+    single = {'steam': {'price': 19.99, 'original_price': 19.99, 'discount_percent': 0, 'available': True}}
+
+    try:
+        assert db.get_price_storage_layout() == layout
+        assert writer.batch_write_prices([batch_row])['total_items'] == 1
+        assert writer.batch_write_prices([batch_row])['total_items'] == 0
+        assert db.save_price_snapshot('1', 'Game 1', single) is False
+        assert db.save_price_snapshot('1', 'Game 1', single) is False
+
+        single['steam']['price'] = 9.99
+        assert db.save_price_snapshot('1', 'Game 1', single) is True
+        result = writer.batch_write_prices([dict(batch_row, steam_price=9.99)])
+        assert (result['total_items'], result['confirmed_count']) == (0, 1)
+
+        with db.get_connection(readonly=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM price_snapshots").fetchone()[0] == 2
+            latest = conn.execute("SELECT * FROM latest_prices WHERE steam_app_id = '1'").fetchone()
+        assert latest['steam_price'] == 9.99
+        assert latest['gog_price'] is None and latest['gog_available'] == 0
+    finally:
+        db.close_connections()
+
+
+def _insert_snapshot(db, **stores):
+    """Schreibt einen Snapshot über price_snapshots (Tabelle oder View) und gibt dessen id zurück"""
+    columns = ['steam_app_id', 'game_title', 'timestamp']
+    values = ['1', 'Game 1', '2024-01-01 12:00:00']
+    for store, (price, discount, available) in stores.items():
+        columns += [f'{store}_price', f'{store}_original_price', f'{store}_discount_percent', f'{store}_available']
+        values += [price, price, discount, available]
+    db.write_statements([(
+        f"INSERT INTO price_snapshots ({', '.join(columns)}) VALUES ({', '.join('?' * len(values))})",
+        tuple(values)
+    )])
+    with db.get_connection(readonly=True) as conn:
+        return conn.execute("SELECT MAX(id) FROM price_snapshots").fetchone()[0]
+
+
+def _latest(db):
+    with db.get_connection(readonly=True) as conn:
+        row = conn.execute("""
+            SELECT snapshot_id, best_price, best_store, max_discount
+            FROM latest_prices WHERE steam_app_id = '1'
+        """).fetchone()
+    return tuple(row) if row else None
+
+
+@pytest.mark.parametrize('layout', ['wide', 'normalized'])
+def test_latest_prices_follow_inserts_and_deletes(tmp_path, monkeypatch, layout):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', layout)
+    monkeypatch.setenv('PRICE_SNAPSHOT_MODE', 'full')
+    db = DatabaseManager(str(tmp_path / "prices.db"))
+
+    try:
+        assert db.get_price_storage_layout() == layout
+
+        first = _insert_snapshot(db, steam=(19.99, 0, 1), gog=(14.99, 25, 1))
+        assert _latest(db) == (first, 14.99, 'gog', 25)
+
+        # Günstigster verfügbarer Store gewinnt; ein nicht verfügbarer Preis zählt nicht
+        second = _insert_snapshot(db, steam=(9.99, 50, 1), gog=(14.99, 25, 1), fanatical=(4.99, 0, 0))
+        assert _latest(db) == (second, 9.99, 'steam', 50)
+
+        # Ohne verfügbares Angebot kein bester Preis, Rabatt nur von bepreisten Stores
+        third = _insert_snapshot(db, steam=(0.0, 90, 0), gog=(12.99, 10, 0))
+        assert _latest(db) == (third, None, None, 10)
+
+        # Löschen eines älteren Snapshots ändert nichts
+        db.write_statements([("DELETE FROM price_snapshots WHERE id = ?", (first,))])
+        assert _latest(db) == (third, None, None, 10)
+
+        # Löschen des aktuellen Snapshots: der neueste verbliebene rückt nach
+        db.write_statements([("DELETE FROM price_snapshots WHERE id = ?", (third,))])
+        assert _latest(db) == (second, 9.99, 'steam', 50)
+
+        db.write_statements([("DELETE FROM price_snapshots WHERE id = ?", (second,))])
+        assert _latest(db) is None
+    finally:
+        db.close_connections()
+
+
+@pytest.mark.parametrize('layout', ['wide', 'normalized'])
+def test_cleanup_keeps_latest_prices_consistent(tmp_path, monkeypatch, layout):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    monkeypatch.setenv('PRICE_STORAGE_LAYOUT', layout)
+    monkeypatch.setenv('PRICE_SNAPSHOT_MODE', 'full')
+    db = DatabaseManager(str(tmp_path / "prices.db"))
+
+    try:
+        _insert_snapshot(db, steam=(19.99, 0, 1))
+        assert _latest(db) is not None
+
+        # cleanup_old_prices löscht im normalisierten Layout direkt auf den Basistabellen
+        assert db.cleanup_old_prices(days=90) == 1
+        assert _latest(db) is None
+    finally:
+        db.close_connections()
@@ -0,0 +1,30 @@
+"""
+Regressionstests für DatabaseManager.check_query_plans
+
+Auf einer generierten Datenbank mit Charts dürfen die Hot Queries keine
+vollen Tabellen-Scans zeigen und keine Query darf übersprungen werden.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import benchmark
+from database_manager import DatabaseManager, HOT_QUERIES
+
+
+def test_hot_queries_use_indexes_on_generated_database(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    db_path = str(tmp_path / "plans.db")
+    benchmark.generate_synthetic_database(db_path, apps=20, snapshots=400)
+
+    db = DatabaseManager(db_path)
+    try:
+        report = db.check_query_plans(repeat=1)
+        assert report['success'] is True, report['regressions'] + report['skipped']
+        assert set(report['queries']) == set(HOT_QUERIES)
+        assert any('idx_charts_prices_max_discount' in detail
+                   for detail in report['queries']['charts_deals']['plan'])
+    finally:
+        db.close_connections()
@@ -0,0 +1,229 @@
+"""
+Tests für rate_limiter.py
+
+Der Token-Bucket läuft gegen eine simulierte Uhr (monotonic/sleep), damit
+Refill, Intervall-Wachstum und Retry-After Pausen exakt prüfbar sind.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import rate_limiter
+from rate_limiter import TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    """Ersetzt time_module in rate_limiter: sleep() stellt die Uhr vor"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time_module', fake)
+    return fake
+
+
+def _response(status_code, retry_after=None):
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    return SimpleNamespace(status_code=status_code, headers=headers)
+
+
+def test_burst_then_refill_at_interval(clock):
+    bucket = TokenBucket('example.com', interval_seconds=2.0, burst=3)
+
+    # Burst: drei Requests ohne Wartezeit
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    # Danach ein Request pro Intervall
+    assert bucket.acquire() == pytest.approx(2.0)
+    assert bucket.acquire() == pytest.approx(2.0)
+
+    # Nach langer Pause wieder höchstens burst Tokens
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(2.0)
+
+    stats = bucket.get_stats()
+    assert stats['total_requests'] == 9
+    assert stats['total_wait_time'] == pytest.approx(6.0)
+
+
+def test_partial_refill_waits_only_for_remainder(clock):
+    bucket = TokenBucket('example.com', interval_seconds=2.0, burst=1)
+    bucket.acquire()
+
+    clock.now += 1.5
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_acquire_timeout(clock):
+    bucket = TokenBucket('example.com', interval_seconds=5.0, burst=1)
+    bucket.acquire()
+
+    with pytest.raises(TimeoutError):
+        bucket.acquire(timeout=1.0)
+    assert clock.sleeps == []
+
+
+def test_429_grows_interval_and_success_shrinks_it(clock):
+    bucket = TokenBucket('example.com', interval_seconds=1.0, burst=2, max_interval_seconds=3.0)
+
+    assert bucket.observe_response(_response(429)) is True
+    assert bucket.interval == pytest.approx(1.5)
+    # Ohne Retry-After pausiert der Host ein (neues) Intervall, der Burst ist verbraucht
+    assert bucket.acquire() == pytest.approx(1.5)
+    assert bucket.get_stats()['available_tokens'] == 0
+
+    bucket.report_rate_limited()
+    assert bucket.interval == pytest.approx(2.25)
+    bucket.report_rate_limited()
+    assert bucket.interval == pytest.approx(3.0)  # gedeckelt
+    assert bucket.rate_limit_hits == 3
+
+    # Jeder fünfte Erfolg in Folge nähert das Intervall dem Basiswert
+    for _ in range(4):
+        assert bucket.observe_response(_response(200)) is False
+    assert bucket.interval == pytest.approx(3.0)
+    bucket.observe_response(_response(200))
+    assert bucket.interval == pytest.approx(2.7)
+
+
+def test_429_grows_from_floor_for_unthrottled_host(clock):
+    bucket = TokenBucket('example.com', interval_seconds=0.0, burst=1)
+
+    bucket.report_rate_limited()
+    assert bucket.interval == pytest.approx(0.75)
+
+
+def test_retry_after_seconds_pauses_host(clock):
+    bucket = TokenBucket('example.com', interval_seconds=1.0, burst=5)
+
+    assert bucket.observe_response(_response(429, '7')) is True
+    assert bucket.acquire() == pytest.approx(7.0)
+    # Nach der Pause ist der Bucket leer, der nächste Request wartet ein Intervall
+    assert bucket.acquire() == pytest.approx(1.5)
+
+
+def test_retry_after_http_date_pauses_host(clock):
+    bucket = TokenBucket('example.com', interval_seconds=1.0, burst=5)
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+    bucket.observe_response(_response(429, format_datetime(retry_at, usegmt=True)))
+
+    assert bucket.blocked_until - clock.now == pytest.approx(120, abs=2)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_503_retry_after_left_to_transport_retry(clock):
+    bucket = TokenBucket('example.com', interval_seconds=1.0, burst=2)
+
+    assert bucket.observe_response(_response(503, '30')) is False
+    assert bucket.rate_limit_hits == 0
+    assert bucket.interval == pytest.approx(1.0)
+    assert bucket.acquire() == 0.0
+    # 5xx zählt nicht als Erfolg
+    assert bucket._success_streak == 0
+
+
+def test_acquire_async_spaces_concurrent_callers():
+    bucket = TokenBucket('example.com', interval_seconds=0.05, burst=1)
+
+    async def run():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+    started = time.monotonic()
+    waits = asyncio.run(run())
+    elapsed = time.monotonic() - started
+
+    assert sorted(waits)[0] == 0.0
+    assert sorted(waits)[1] > 0
+    assert elapsed >= 0.09
+    assert bucket.get_stats()['total_requests'] == 3
+
+
+def test_acquire_async_timeout():
+    bucket = TokenBucket('example.com', interval_seconds=10.0, burst=1)
+
+    async def run():
+        await bucket.acquire_async()
+        await bucket.acquire_async(timeout=0.1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    """Antwortet requests_until_ok-mal mit 503 + Retry-After, danach 200"""
+
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        if server.hits <= server.requests_until_ok:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.parametrize('requests_until_ok, expected_status', [(1, 200), (10, 503)])
+def test_http_client_503_counted_once(requests_until_ok, expected_status):
+    pytest.importorskip('requests')
+    from http_client import PooledHTTPClient
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _UnavailableHandler)
+    server.hits = 0
+    server.requests_until_ok = requests_until_ok
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    bucket = rate_limiter.configure_host(url, interval_seconds=0.0, burst=1)
+    client = PooledHTTPClient()
+    try:
+        client.configure_host(url, timeout_seconds=5, retry_attempts=2, pool_maxsize=1)
+        response = client.get(url)
+
+        assert response.status_code == expected_status
+        # Retry-After hat der urllib3-Retry abgewartet, der Bucket pausiert nicht erneut
+        assert bucket.rate_limit_hits == 0
+        assert bucket.blocked_until == 0.0
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,98 @@
+"""
+Regressionstests für update_queue.py
+
+Die Queue vergleicht in lokaler Zeit wie tracked_apps.last_price_update und
+übernimmt Preis-Updates, die außerhalb der Queue stattgefunden haben.
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+import update_queue
+from update_queue import UpdateQueue
+
+
+@pytest.fixture
+def local_tz(monkeypatch):
+    # Lokale Zeit deutlich hinter UTC, damit ein UTC-Vergleich die App fälschlich fällig macht
+    if not hasattr(time, 'tzset'):
+        pytest.skip("time.tzset nicht verfügbar")
+    monkeypatch.setenv('TZ', 'Etc/GMT+6')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_WRITER_PORT', raising=False)
+    manager = DatabaseManager(str(tmp_path / "queue.db"))
+    yield manager
+    manager.close_connections()
+
+
+def _set_last_update(db, app_id, value):
+    db.write_statements([(
+        "UPDATE tracked_apps SET last_price_update = ? WHERE steam_app_id = ?", (value, app_id)
+    )])
+
+
+def _queue_row(db, app_id):
+    with db.get_connection(readonly=True) as conn:
+        return conn.execute(
+            "SELECT last_refreshed_at, failures FROM price_update_queue WHERE steam_app_id = ?", (app_id,)
+        ).fetchone()
+
+
+def test_fresh_local_update_is_not_due(local_tz, db, monkeypatch):
+    monkeypatch.setattr(update_queue, 'UPDATE_QUEUE_MAX_HOURS', 2.0)
+    db.add_tracked_app('1', 'Game 1')
+    _set_last_update(db, '1', datetime.now())
+
+    queue = UpdateQueue(db)
+    queue.rescore(force=True)
+
+    assert queue.next_batch() == []
+
+
+def test_rescore_picks_up_updates_outside_the_queue(local_tz, db):
+    db.add_tracked_app('1', 'Game 1')
+    _set_last_update(db, '1', datetime.now() - timedelta(days=30))
+
+    queue = UpdateQueue(db)
+    queue.rescore(force=True)
+    assert queue.next_batch() == ['1']
+
+    # Fehlgeschlagener Zyklus, danach manuelles Update über das Menü
+    queue.complete(['1'], queue.last_updates(['1']))
+    assert _queue_row(db, '1')['failures'] == 1
+    refreshed_at = datetime.now()
+    _set_last_update(db, '1', refreshed_at)
+
+    queue.rescore(force=True)
+
+    row = _queue_row(db, '1')
+    assert row['last_refreshed_at'] == str(refreshed_at)
+    assert row['failures'] == 0
+    assert queue.next_batch() == []
+
+
+def test_apps_needing_update_compares_local_time(local_tz, db):
+    from database_manager import HOT_QUERIES
+
+    db.add_tracked_app('1', 'Game 1')
+    db.add_tracked_app('2', 'Game 2')
+    _set_last_update(db, '1', datetime.now() - timedelta(hours=1))
+    _set_last_update(db, '2', datetime.now() - timedelta(hours=7))
+
+    with db.get_connection(readonly=True) as conn:
+        due = [row[0] for row in conn.execute(HOT_QUERIES['apps_needing_update']['sql'])]
+    assert due == ['2']
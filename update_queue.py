@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""
+Update Queue - Staleness-priorisierte Preis-Updates für getrackte Apps
+Steam Price Tracker - Ersetzt die feste hours_threshold Auswahl in Anlegereihenfolge
+
+- Persistente Queue (price_update_queue): Score, Update-Intervall und Fälligkeit pro App
+- Score aus der erwarteten Preisänderungs-Wahrscheinlichkeit:
+  Steam Sale-Fenster, historische Volatilität/Sale-Häufigkeit, Wishlist-Priorität,
+  Nähe zum Zielpreis und Charts-Zugehörigkeit
+- Intervall geometrisch zwischen UPDATE_QUEUE_MIN_HOURS (heiß) und UPDATE_QUEUE_MAX_HOURS (ruhend)
+- Pro Zyklus ein festes Request-Budget für die fälligen Apps mit dem höchsten Wert
+  (Score × Überfälligkeit), fehlgeschlagene Apps mit exponentiellem Backoff
+- Sale-Burst: Rabatt-Sprung in einer Stichprobe erkannt → gesamte Wishlist sofort fällig,
+  danach wieder normale Kadenz (Cooldown verhindert Dauer-Bursts während eines Sales)
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from price_analytics import NUMPY_AVAILABLE, create_price_analytics
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("update_queue", "price_tracker.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# KONFIGURATION
+# =====================================================================
+
+UPDATE_QUEUE_MIN_HOURS = float(os.getenv('UPDATE_QUEUE_MIN_HOURS', '1'))
+UPDATE_QUEUE_MAX_HOURS = float(os.getenv('UPDATE_QUEUE_MAX_HOURS', '168'))
+UPDATE_QUEUE_CYCLE_MINUTES = int(os.getenv('UPDATE_QUEUE_CYCLE_MINUTES', '60'))
+# Upstream-Requests pro Zyklus und geschätzte Requests pro App (Steam + CheapShark)
+UPDATE_QUEUE_REQUEST_BUDGET = int(os.getenv('UPDATE_QUEUE_REQUEST_BUDGET', '100'))
+UPDATE_QUEUE_REQUESTS_PER_APP = float(os.getenv('UPDATE_QUEUE_REQUESTS_PER_APP', '2'))
+# Scores werden höchstens so oft neu berechnet (Analyse der gesamten Historie)
+UPDATE_QUEUE_RESCORE_MINUTES = int(os.getenv('UPDATE_QUEUE_RESCORE_MINUTES', '60'))
+# Tage vor einem Sale-Fenster, ab denen dessen Signal ansteigt
+UPDATE_QUEUE_SALE_LOOKAHEAD_DAYS = float(os.getenv('UPDATE_QUEUE_SALE_LOOKAHEAD_DAYS', '3'))
+# Sale-Burst: Stichprobengröße, Prüfabstand und Mindestabstand zwischen zwei Bursts
+UPDATE_QUEUE_BURST_SAMPLE_SIZE = int(os.getenv('UPDATE_QUEUE_BURST_SAMPLE_SIZE', '40'))
+UPDATE_QUEUE_BURST_PROBE_MINUTES = int(os.getenv('UPDATE_QUEUE_BURST_PROBE_MINUTES', '15'))
+UPDATE_QUEUE_BURST_COOLDOWN_HOURS = float(os.getenv('UPDATE_QUEUE_BURST_COOLDOWN_HOURS', '24'))
+# Sale erkannt, wenn der rabattierte Anteil der Stichprobe mindestens MIN_SHARE beträgt
+# und den historisch erwarteten Anteil um SPIKE übersteigt
+UPDATE_QUEUE_BURST_MIN_SHARE = float(os.getenv('UPDATE_QUEUE_BURST_MIN_SHARE', '0.5'))
+UPDATE_QUEUE_BURST_SPIKE = float(os.getenv('UPDATE_QUEUE_BURST_SPIKE', '0.3'))
+# Obergrenze gleichzeitiger Requests pro Host während eines Bursts
+UPDATE_QUEUE_BURST_MAX_IN_FLIGHT = int(os.getenv('UPDATE_QUEUE_BURST_MAX_IN_FLIGHT', '16'))
+
+# Gewichtung der Signale (Summe 1.0)
+SCORE_WEIGHTS = {
+    'sale': 0.25,
+    'volatility': 0.2,
+    'wishlist': 0.2,
+    'target': 0.2,
+    'charts': 0.15
+}
+
+# Wiederkehrende Steam Sales: (Name, Monat, Tag, Dauer in Tagen) - ungefähre Starttermine
+STEAM_SALE_WINDOWS = (
+    ('Spring Sale', 3, 13, 7),
+    ('Summer Sale', 6, 26, 14),
+    ('Autumn Sale', 11, 26, 7),
+    ('Winter Sale', 12, 19, 14),
+)
+
+# Volatilität (Std/Mittel), ab der das Signal voll ausschlägt, und Sales bis zur Sättigung
+VOLATILITY_SATURATION = 0.3
+SALE_COUNT_SATURATION = 6
+# Wishlist-Rang, bei dem das Signal auf die Hälfte gefallen ist
+WISHLIST_HALF_RANK = 10
+# Preis bis X über Zielpreis zählt als "nahe" (linear abfallend)
+TARGET_PROXIMITY_RANGE = 0.5
+# Charts-Rang, bei dem das Signal sein Minimum erreicht
+CHARTS_RANK_RANGE = 200
+# Erwarteter Rabatt-Anteil für Apps ohne Preis-Historie
+DEFAULT_DISCOUNT_SHARE = 0.15
+# Mindestanzahl bepreister Apps in der Stichprobe für eine Sale-Entscheidung
+BURST_MIN_PRICED_SAMPLE = 10
+
+# =====================================================================
+# SIGNALE
+# =====================================================================
+
+def sale_window_signal(now: Optional[datetime] = None,
+                       lookahead_days: Optional[float] = None) -> Tuple[float, Optional[str]]:
+    """
+    Signal für laufende oder bevorstehende Steam Sales (für alle Apps gleich)
+
+    Returns:
+        (Signal 0..1, Name des Sale-Fensters oder None)
+    """
+    now = now or datetime.now()
+    lookahead = UPDATE_QUEUE_SALE_LOOKAHEAD_DAYS if lookahead_days is None else lookahead_days
+    best, best_name = 0.0, None
+
+    for name, month, day, duration in STEAM_SALE_WINDOWS:
+        for year in (now.year - 1, now.year, now.year + 1):
+            start = datetime(year, month, day)
+            # Ein Tag nach Sale-Ende kehren die Preise zurück
+            end = start + timedelta(days=duration + 1)
+            if start <= now <= end:
+                signal = 1.0
+            elif lookahead > 0 and start - timedelta(days=lookahead) <= now < start:
+                signal = 1.0 - (start - now).total_seconds() / (lookahead * 86400)
+            else:
+                continue
+            if signal > best:
+                best, best_name = signal, name
+
+    return best, best_name
+
+def interval_for_score(score: float, min_hours: Optional[float] = None,
+                       max_hours: Optional[float] = None) -> float:
+    """Update-Intervall zum Score: 1.0 → min_hours, 0.0 → max_hours (geometrisch dazwischen)"""
+    min_hours = UPDATE_QUEUE_MIN_HOURS if min_hours is None else min_hours
+    max_hours = UPDATE_QUEUE_MAX_HOURS if max_hours is None else max_hours
+    score = min(1.0, max(0.0, score))
+    return round(max_hours * (min_hours / max_hours) ** score, 3)
+
+def score_app(signals: Dict[str, float]) -> float:
+    """Gewichteter Score aus den Einzelsignalen (jeweils 0..1)"""
+    return round(sum(SCORE_WEIGHTS[name] * min(1.0, max(0.0, signals.get(name, 0.0)))
+                     for name in SCORE_WEIGHTS), 4)
+
+# =====================================================================
+# UPDATE QUEUE
+# =====================================================================
+
+# Queue-Zeitpunkte in lokaler Zeit wie tracked_apps.last_price_update (datetime.now())
+NOW_SQL = "datetime('now', 'localtime')"
+
+class UpdateQueue:
+    """
+    Persistente, nach Wert priorisierte Update-Queue
+
+    rescore() berechnet Score und Intervall aller aktiven Apps und leitet daraus
+    next_due_at ab. next_batch() liefert die fälligen Apps mit dem höchsten
+    Score × Überfälligkeit bis zum Request-Budget, complete() bucht das Ergebnis
+    eines Zyklus (Erfolg: nächste Fälligkeit nach Intervall, Fehler: Backoff).
+    """
+
+    def __init__(self, db_manager, request_budget: Optional[int] = None,
+                 requests_per_app: Optional[float] = None):
+        """
+        Initialisiert Update-Queue
+
+        Args:
+            db_manager: DatabaseManager
+            request_budget: Requests pro Zyklus (Standard: UPDATE_QUEUE_REQUEST_BUDGET)
+            requests_per_app: Geschätzte Requests pro App (Standard: UPDATE_QUEUE_REQUESTS_PER_APP)
+        """
+        self.db_manager = db_manager
+        self.request_budget = request_budget or UPDATE_QUEUE_REQUEST_BUDGET
+        self.requests_per_app = requests_per_app or UPDATE_QUEUE_REQUESTS_PER_APP
+        self.last_rescore: Optional[datetime] = None
+        self._analytics = None
+        self._discount_share: Dict[str, float] = {}
+        self.last_probe: Optional[Dict[str, Any]] = None
+
+    def apps_per_cycle(self, request_budget: Optional[int] = None) -> int:
+        """Anzahl Apps, die ein Zyklus mit dem Request-Budget aktualisieren darf"""
+        budget = request_budget or self.request_budget
+        return max(1, int(budget // max(self.requests_per_app, 0.01)))
+
+    # -----------------------------------------------------------------
+    # Scoring
+    # -----------------------------------------------------------------
+
+    def rescore(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Berechnet Score, Intervall und Fälligkeit aller aktiven Apps neu
+
+        Args:
+            force: Auch wenn der letzte Lauf jünger als UPDATE_QUEUE_RESCORE_MINUTES ist
+
+        Returns:
+            Dict mit apps, removed, sale_window und Score-Verteilung
+        """
+        if (not force and self.last_rescore
+                and datetime.now() - self.last_rescore < timedelta(minutes=UPDATE_QUEUE_RESCORE_MINUTES)):
+            return {'skipped': True}
+
+        sale_signal, sale_window = sale_window_signal()
+        history_signals = self._history_signals()
+
+        with self.db_manager.get_connection(readonly=True) as conn:
+            apps = conn.execute("""
+                SELECT ta.steam_app_id, ta.source, ta.wishlist_priority,
+                       COALESCE(ta.target_price, alerts.target_price) AS target_price,
+                       lp.best_price, COALESCE(lp.max_discount, 0) AS max_discount,
+                       charts.best_rank
+                FROM tracked_apps ta
+                LEFT JOIN latest_prices lp ON lp.steam_app_id = ta.steam_app_id
+                LEFT JOIN (
+                    SELECT steam_app_id, MIN(target_price) AS target_price
+                    FROM price_alerts WHERE active = 1 GROUP BY steam_app_id
+                ) alerts ON alerts.steam_app_id = ta.steam_app_id
+                LEFT JOIN (
+                    SELECT steam_app_id, MIN(current_rank) AS best_rank
+                    FROM steam_charts_tracking WHERE active = 1 GROUP BY steam_app_id
+                ) charts ON charts.steam_app_id = ta.steam_app_id
+                WHERE ta.active = 1
+            """).fetchall()
+
+        rows = []
+        scores = []
+        for app in apps:
+            app_id = str(app['steam_app_id'])
+            volatility_signal, has_sales = history_signals.get(app_id, (None, False))
+
+            signals = {
+                # Sale-Fenster wirken nur auf Apps, die schon einmal rabattiert waren;
+                # laufende Rabatte enden irgendwann und ändern den Preis ebenfalls
+                'sale': max(sale_signal * (1.0 if has_sales or not history_signals else 0.3),
+                            0.7 if app['max_discount'] else 0.0),
+                # Ohne Historie (neue App oder kein NumPy) neutral statt ruhend
+                'volatility': 0.5 if volatility_signal is None else volatility_signal,
+                'wishlist': self._wishlist_signal(app['source'], app['wishlist_priority']),
+                'target': self._target_signal(app['best_price'], app['target_price']),
+                'charts': self._charts_signal(app['best_rank'])
+            }
+            score = score_app(signals)
+            scores.append(score)
+            rows.append((app_id, score, interval_for_score(score),
+                         json.dumps({name: round(value, 3) for name, value in signals.items()})))
+
+        removed = self.db_manager.write_statements([
+            ("""
+                DELETE FROM price_update_queue
+                WHERE steam_app_id NOT IN (SELECT steam_app_id FROM tracked_apps WHERE active = 1)
+            """, ()),
+            # Aktualisierungen außerhalb der Queue (manuell, Menü) übernehmen:
+            # last_refreshed_at = MAX(bisher, tracked_apps.last_price_update), Backoff endet damit
+            (f"""
+                INSERT INTO price_update_queue (steam_app_id, score, interval_hours, signals, last_refreshed_at, scored_at)
+                VALUES (?, ?, ?, ?, (SELECT last_price_update FROM tracked_apps WHERE steam_app_id = ?), {NOW_SQL})
+                ON CONFLICT(steam_app_id) DO UPDATE SET
+                    score = excluded.score,
+                    interval_hours = excluded.interval_hours,
+                    signals = excluded.signals,
+                    scored_at = excluded.scored_at,
+                    failures = CASE
+                        WHEN julianday(excluded.last_refreshed_at) > COALESCE(julianday(last_refreshed_at), 0) THEN 0
+                        ELSE failures
+                    END,
+                    last_refreshed_at = CASE
+                        WHEN julianday(excluded.last_refreshed_at) > COALESCE(julianday(last_refreshed_at), 0)
+                        THEN excluded.last_refreshed_at
+                        ELSE last_refreshed_at
+                    END
+            """, [row + (row[0],) for row in rows], True),
+            # Fällig = letzte Aktualisierung + Intervall (nie aktualisiert: sofort);
+            # Apps im Fehler-Backoff behalten ihre Fälligkeit
+            (f"""
+                UPDATE price_update_queue
+                SET next_due_at = CASE
+                    WHEN last_refreshed_at IS NULL THEN {NOW_SQL}
+                    ELSE datetime(last_refreshed_at, printf('+%d minutes', CAST(interval_hours * 60 AS INTEGER)))
+                END
+                WHERE failures = 0
+            """, ())
+        ])[0]
+
+        self.last_rescore = datetime.now()
+        result = {
+            'apps': len(rows),
+            'removed': removed,
+            'sale_window': sale_window,
+            'sale_signal': round(sale_signal, 3),
+            'hot_apps': sum(1 for score in scores if score >= 0.75),
+            'dormant_apps': sum(1 for score in scores if score < 0.25),
+            'average_score': round(sum(scores) / len(scores), 3) if scores else 0.0
+        }
+        logger.info(f"📊 Update-Queue neu bewertet: {result['apps']} Apps "
+                    f"(Ø Score {result['average_score']}, {result['hot_apps']} heiß, {result['dormant_apps']} ruhend"
+                    + (f", Sale-Fenster: {sale_window}" if sale_window else "") + ")")
+        return result
+
+    def _history_signals(self) -> Dict[str, Tuple[float, bool]]:
+        """Volatilitäts-Signal und 'war schon rabattiert' pro App aus der Preis-Historie"""
+        if not NUMPY_AVAILABLE:
+            return {}
+
+        try:
+            if self._analytics is None:
+                self._analytics = create_price_analytics(self.db_manager)
+            analysis = self._analytics.analyze_prices()
+        except Exception as e:
+            logger.warning(f"⚠️ Preis-Historie für Update-Queue nicht auswertbar: {e}")
+            return {}
+
+        metrics = analysis['metrics']
+        signals = {}
+        self._discount_share = {}
+        for index, app_id in enumerate(analysis['history'].app_ids):
+            share = metrics['discount_share'][index]
+            if share == share:
+                self._discount_share[str(app_id)] = float(share)
+            volatility = metrics['volatility'][index]
+            volatility = 0.0 if volatility != volatility else float(volatility)  # NaN = nie bepreist
+            sale_count = int(metrics['sale_count'][index])
+            signal = 0.5 * min(1.0, volatility / VOLATILITY_SATURATION) + 0.5 * min(1.0, sale_count / SALE_COUNT_SATURATION)
+            signals[str(app_id)] = (signal, sale_count > 0)
+        return signals
+
+    @staticmethod
+    def _wishlist_signal(source: Optional[str], priority: Optional[int]) -> float:
+        if priority is not None:
+            return 1.0 / (1.0 + max(0, priority) / WISHLIST_HALF_RANK)
+        return 0.5 if source == 'wishlist' else 0.0
+
+    @staticmethod
+    def _target_signal(best_price: Optional[float], target_price: Optional[float]) -> float:
+        if not target_price or not best_price:
+            return 0.0
+        ratio = best_price / target_price
+        if ratio <= 1.0:
+            return 1.0
+        return max(0.0, 1.0 - (ratio - 1.0) / TARGET_PROXIMITY_RANGE)
+
+    @staticmethod
+    def _charts_signal(best_rank: Optional[int]) -> float:
+        if best_rank is None:
+            return 0.0
+        return max(0.2, 1.0 - (max(1, best_rank) - 1) / CHARTS_RANK_RANGE)
+
+    # -----------------------------------------------------------------
+    # Zyklus
+    # -----------------------------------------------------------------
+
+    def next_batch(self, request_budget: Optional[int] = None) -> List[str]:
+        """
+        Fällige Apps mit dem höchsten Wert für einen Zyklus
+
+        Priorität = Überfälligkeit (Zeit seit letzter Aktualisierung / Intervall) × (0.5 + Score)
+
+        Args:
+            request_budget: Requests für diesen Zyklus (Standard: request_budget der Queue)
+
+        Returns:
+            Liste von Steam App IDs
+        """
+        limit = self.apps_per_cycle(request_budget)
+        with self.db_manager.get_connection(readonly=True) as conn:
+            rows = conn.execute(f"""
+                SELECT q.steam_app_id
+                FROM price_update_queue q
+                JOIN tracked_apps ta ON ta.steam_app_id = q.steam_app_id
+                WHERE ta.active = 1 AND q.next_due_at <= {NOW_SQL}
+                ORDER BY
+                    CASE WHEN q.last_refreshed_at IS NULL THEN 1e9
+                         ELSE (julianday({NOW_SQL}) - julianday(q.last_refreshed_at)) * 24 / q.interval_hours
+                    END * (0.5 + q.score) DESC
+                LIMIT ?
+            """, (limit,)).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def last_updates(self, app_ids: List[str]) -> Dict[str, Optional[str]]:
+        """tracked_apps.last_price_update pro App (Vorher/Nachher-Vergleich eines Zyklus)"""
+        result = {}
+        with self.db_manager.get_connection(readonly=True) as conn:
+            for i in range(0, len(app_ids), 500):
+                chunk = app_ids[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in conn.execute(
+                    f"SELECT steam_app_id, last_price_update FROM tracked_apps WHERE steam_app_id IN ({placeholders})",
+                    chunk
+                ):
+                    result[str(row[0])] = row[1]
+        return result
+
+    def complete(self, app_ids: List[str], before: Dict[str, Optional[str]]) -> Dict[str, int]:
+        """
+        Bucht das Ergebnis eines Zyklus
+
+        Erfolgreich ist eine App, deren last_price_update sich geändert hat; sie wird
+        nach ihrem Intervall wieder fällig. Sonst wächst der Backoff mit jedem Fehler
+        (UPDATE_QUEUE_MIN_HOURS × 2^Fehler, höchstens ihr Intervall).
+
+        Returns:
+            Dict mit refreshed und failed
+        """
+        after = self.last_updates(app_ids)
+        refreshed = [app_id for app_id in app_ids if after.get(app_id) and after.get(app_id) != before.get(app_id)]
+        failed = [app_id for app_id in app_ids if app_id not in set(refreshed)]
+
+        self.db_manager.write_statements([
+            ("""
+                UPDATE price_update_queue
+                SET last_refreshed_at = ?,
+                    failures = 0,
+                    next_due_at = datetime('now', 'localtime', printf('+%d minutes', CAST(interval_hours * 60 AS INTEGER)))
+                WHERE steam_app_id = ?
+            """, [(after[app_id], app_id) for app_id in refreshed], True),
+            ("""
+                UPDATE price_update_queue
+                SET failures = failures + 1,
+                    next_due_at = datetime('now', 'localtime', printf('+%d minutes', CAST(
+                        MIN(interval_hours, ? * (1 << MIN(failures, 10))) * 60 AS INTEGER)))
+                WHERE steam_app_id = ?
+            """, [(UPDATE_QUEUE_MIN_HOURS, app_id) for app_id in failed], True)
+        ])
+
+        return {'refreshed': len(refreshed), 'failed': len(failed)}
+
+    # -----------------------------------------------------------------
+    # Sale-Burst
+    # -----------------------------------------------------------------
+
+    def last_burst(self) -> Optional[str]:
+        """Startzeit des letzten Sale-Bursts (UTC) aus tracking_sessions"""
+        with self.db_manager.get_connection(readonly=True) as conn:
+            row = conn.execute(
+                "SELECT MAX(started_at) FROM tracking_sessions WHERE session_type = 'sale_burst'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def burst_probe_due(self) -> bool:
+        """True wenn eine neue Sale-Stichprobe fällig ist (Prüfabstand und Cooldown)"""
+        if (self.last_probe and datetime.now() - self.last_probe['probed_at']
+                < timedelta(minutes=UPDATE_QUEUE_BURST_PROBE_MINUTES)):
+            return False
+        # Der Cooldown liegt in der Datenbank, damit kurzlebige Tracker-Instanzen
+        # (Background-Tasks) während eines Sales nicht bei jedem Lauf erneut bursten
+        with self.db_manager.get_connection(readonly=True) as conn:
+            recent = conn.execute("""
+                SELECT 1 FROM tracking_sessions
+                WHERE session_type = 'sale_burst' AND started_at > datetime('now', ?)
+                LIMIT 1
+            """, (f"-{int(UPDATE_QUEUE_BURST_COOLDOWN_HOURS * 60)} minutes",)).fetchone()
+        return recent is None
+
+    def burst_sample(self, size: Optional[int] = None) -> List[str]:
+        """
+        Zufällige Stichprobe aus getrackten Apps und aktiven Charts-Spielen
+
+        Returns:
+            Liste von Steam App IDs (passt in einen gebündelten appdetails-Request)
+        """
+        size = size or UPDATE_QUEUE_BURST_SAMPLE_SIZE
+        with self.db_manager.get_connection(readonly=True) as conn:
+            rows = conn.execute("""
+                SELECT steam_app_id FROM (
+                    SELECT steam_app_id FROM tracked_apps WHERE active = 1
+                    UNION
+                    SELECT steam_app_id FROM steam_charts_tracking WHERE active = 1
+                )
+                ORDER BY RANDOM()
+                LIMIT ?
+            """, (size,)).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def detect_sale_burst(self, discounts: Dict[str, Optional[int]]) -> Dict[str, Any]:
+        """
+        Bewertet die frisch abgerufenen Rabatte einer Stichprobe
+
+        Ein Sale liegt vor, wenn deutlich mehr Apps rabattiert sind, als ihre
+        Preis-Historie erwarten lässt (discount_share aus der Preis-Analyse).
+
+        Args:
+            discounts: App ID -> aktueller Steam-Rabatt in Prozent (None = kein Preis)
+
+        Returns:
+            Dict mit sale, sampled, priced, discounted_share, expected_share und spike
+        """
+        if not self._discount_share:
+            self._history_signals()
+
+        priced = {app_id: discount for app_id, discount in discounts.items() if discount is not None}
+        discounted = sum(1 for discount in priced.values() if discount > 0)
+        share = discounted / len(priced) if priced else 0.0
+        expected = (sum(self._discount_share.get(app_id, DEFAULT_DISCOUNT_SHARE) for app_id in priced) / len(priced)
+                    if priced else DEFAULT_DISCOUNT_SHARE)
+        spike = share - expected
+
+        result = {
+            'sale': (len(priced) >= BURST_MIN_PRICED_SAMPLE
+                     and share >= UPDATE_QUEUE_BURST_MIN_SHARE
+                     and spike >= UPDATE_QUEUE_BURST_SPIKE),
+            'sampled': len(discounts),
+            'priced': len(priced),
+            'discounted_share': round(share, 3),
+            'expected_share': round(expected, 3),
+            'spike': round(spike, 3),
+            'probed_at': datetime.now()
+        }
+        self.last_probe = result
+        logger.info(f"🔎 Sale-Stichprobe: {discounted}/{len(priced)} Apps rabattiert "
+                    f"(erwartet {expected:.0%}, Sprung {spike:+.0%})"
+                    + (" → Sale erkannt" if result['sale'] else ""))
+        return result
+
+    def plan_burst(self) -> Tuple[List[str], int]:
+        """
+        Plant die gesamte Wishlist für sofortige Aktualisierung ein
+
+        Alle Wishlist-Apps werden fällig (Backoff zurückgesetzt); die Reihenfolge
+        folgt dem Score, damit die wertvollsten Apps zuerst aktualisiert werden.
+        Danach gilt wieder die normale Kadenz aus complete(). Der Burst wird als
+        tracking_sessions Eintrag (session_type 'sale_burst') festgehalten.
+
+        Returns:
+            (Liste von Steam App IDs in Burst-Reihenfolge, ID der Tracking-Session)
+        """
+        self.rescore(force=True)
+        self.db_manager.write_statements([
+            (f"""
+                UPDATE price_update_queue
+                SET next_due_at = {NOW_SQL}, failures = 0
+                WHERE steam_app_id IN (SELECT steam_app_id FROM tracked_apps WHERE active = 1 AND source = 'wishlist')
+            """, ()),
+            ("INSERT INTO tracking_sessions (session_type) VALUES ('sale_burst')", ())
+        ])
+        with self.db_manager.get_connection(readonly=True) as conn:
+            rows = conn.execute("""
+                SELECT q.steam_app_id
+                FROM price_update_queue q
+                JOIN tracked_apps ta ON ta.steam_app_id = q.steam_app_id
+                WHERE ta.active = 1 AND ta.source = 'wishlist'
+                ORDER BY q.score DESC
+            """).fetchall()
+            session_id = conn.execute(
+                "SELECT MAX(id) FROM tracking_sessions WHERE session_type = 'sale_burst'"
+            ).fetchone()[0]
+
+        return [str(row[0]) for row in rows], session_id
+
+    def complete_burst(self, session_id: int, app_ids: List[str], before: Dict[str, Optional[str]]) -> Dict[str, int]:
+        """Bucht einen Sale-Burst wie einen Zyklus und schließt seine Tracking-Session ab"""
+        booked = self.complete(app_ids, before)
+        self.db_manager.write_statements([
+            ("""
+                UPDATE tracking_sessions
+                SET completed_at = CURRENT_TIMESTAMP, apps_processed = ?, apps_successful = ?, errors_count = ?
+                WHERE id = ?
+            """, (len(app_ids), booked['refreshed'], booked['failed'], session_id))
+        ])
+        return booked
+
+    # -----------------------------------------------------------------
+    # Auswertung
+    # -----------------------------------------------------------------
+
+    def get_status(self, limit: int = 10) -> Dict[str, Any]:
+        """Queue-Übersicht: Größe, fällige Apps, Intervall-Verteilung und die nächsten Einträge"""
+        with self.db_manager.get_connection(readonly=True) as conn:
+            summary = conn.execute(f"""
+                SELECT COUNT(*) AS apps,
+                       COALESCE(SUM(next_due_at <= {NOW_SQL}), 0) AS due,
+                       COALESCE(SUM(failures > 0), 0) AS backoff,
+                       COALESCE(SUM(interval_hours <= {UPDATE_QUEUE_MIN_HOURS * 2}), 0) AS hourly,
+                       COALESCE(SUM(interval_hours >= {UPDATE_QUEUE_MAX_HOURS / 2}), 0) AS weekly,
+                       AVG(score) AS average_score,
+                       MIN(next_due_at) AS next_due_at,
+                       MAX(scored_at) AS scored_at
+                FROM price_update_queue
+            """).fetchone()
+            top = conn.execute("""
+                SELECT q.steam_app_id, ta.name, q.score, q.interval_hours, q.next_due_at,
+                       q.last_refreshed_at, q.failures, q.signals
+                FROM price_update_queue q
+                LEFT JOIN tracked_apps ta ON ta.steam_app_id = q.steam_app_id
+                ORDER BY q.score DESC, q.next_due_at ASC
+                LIMIT ?
+            """, (limit,)).fetchall()
+
+        status = dict(summary)
+        status['average_score'] = round(status['average_score'] or 0.0, 3)
+        status['apps_per_cycle'] = self.apps_per_cycle()
+        status['request_budget'] = self.request_budget
+        status['top'] = [{**dict(row), 'signals': json.loads(row['signals'] or '{}')} for row in top]
+        status['last_burst'] = self.last_burst()
+        status['last_probe'] = ({**self.last_probe, 'probed_at': self.last_probe['probed_at'].isoformat()}
+                                if self.last_probe else None)
+        return status
+
+def create_update_queue(db_manager=None, **kwargs) -> UpdateQueue:
+    """
+    Erstellt UpdateQueue Instanz
+
+    Args:
+        db_manager: DatabaseManager (Standard: neue Instanz auf der Standard-Datenbank)
+        **kwargs: request_budget, requests_per_app
+    """
+    if db_manager is None:
+        from database_manager import create_database_manager
+        db_manager = create_database_manager()
+    return UpdateQueue(db_manager, **kwargs)
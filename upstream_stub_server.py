@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+"""
+Upstream Stub Server - Lokaler Stand-in für Steam und CheapShark
+Steam Price Tracker - Reproduzierbare Lasttests ohne Internet
+
+- Je ein Port für Steam Web API, Steam Store API und CheapShark (eigene Rate-Limit-Buckets im Client)
+- Synthetische Antworten aus einem deterministischen Preismodell (Sales, Charts-Churn, Wishlists)
+- Aufgezeichnete Antworten (JSON) haben Vorrang vor synthetischen
+- Injizierbare Latenz, 5xx-Fehler, zufällige 429 und serverseitiges Rate Limit mit Retry-After
+- Zähler pro Endpoint unter /__stub__/stats
+
+Die Fetcher werden über die Basis-URLs aus config.py umgeleitet:
+  STEAM_API_BASE_URL=http://127.0.0.1:8300
+  STEAM_STORE_URL=http://127.0.0.1:8301/api
+  CHEAPSHARK_BASE_URL=http://127.0.0.1:8302/api/1.0
+
+Beispiel:
+  python upstream_stub_server.py --port 8300 --latency-ms 80 --rate-limit-ratio 0.02 --requests-per-second 20
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time as time_module
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from database_manager import PRICE_STORES, STORE_DIMENSION
+
+try:
+    from logging_config import setup_module_logger
+    logger = setup_module_logger("upstream_stub_server", "upstream_stub_server.log")
+except ImportError:
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# =====================================================================
+# SYNTHETISCHES PREISMODELL
+# =====================================================================
+
+BASE_PRICES = [4.99, 9.99, 14.99, 19.99, 24.99, 29.99, 39.99, 49.99, 59.99, 69.99]
+SALE_DISCOUNTS = [10, 15, 20, 25, 33, 40, 50, 60, 66, 75, 80, 90]
+CHART_TYPES = ['most_played', 'top_releases', 'most_concurrent_players']
+
+CHEAPSHARK_STORE_IDS = {store_key: cheapshark_id for _, store_key, _, cheapshark_id in STORE_DIMENSION}
+
+FIRST_APP_ID = 100000
+APP_ID_STEP = 10
+
+def synthetic_app_ids(count: int, offset: int = 0) -> List[str]:
+    """Deterministische Steam App IDs für synthetische Apps"""
+    return [str(FIRST_APP_ID + (offset + i) * APP_ID_STEP) for i in range(count)]
+
+class SyntheticPriceModel:
+    """
+    Deterministische Preise je App, Store und Tag
+
+    Jede App hat einen Basispreis, eine Auswahl an Stores und einen Sale-Zyklus
+    (alle cycle_days Tage für sale_days Tage rabattiert). Der Rabatt wird pro
+    Zyklus gewürfelt; andere Stores folgen dem Steam-Sale mit eigener Abweichung.
+    Stub-Server und Benchmark-Generator nutzen dasselbe Modell, damit Abrufe zur
+    generierten Historie passen.
+    """
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, app_id: str) -> Dict[str, Any]:
+        """Feste Eigenschaften einer App (Basispreis, Stores, Sale-Zyklus)"""
+        app_id = str(app_id)
+        profile = self._profiles.get(app_id)
+        if profile is not None:
+            return profile
+
+        rng = random.Random(f"{self.seed}:{app_id}")
+        free = rng.random() < 0.03
+        stores = ['steam'] if free else ['steam'] + [
+            store for store in PRICE_STORES if store != 'steam' and rng.random() < 0.55
+        ]
+
+        profile = {
+            'name': f"Synthetic Game {app_id}",
+            'free': free,
+            'base_price': 0.0 if free else rng.choice(BASE_PRICES),
+            'stores': stores,
+            'store_factors': {
+                store: 1.0 if store == 'steam' else round(rng.uniform(0.82, 1.05), 2)
+                for store in stores
+            },
+            'cycle_days': rng.randint(21, 90),
+            'sale_days': rng.randint(3, 14),
+            'offset': rng.randint(0, 90)
+        }
+
+        with self._lock:
+            self._profiles[app_id] = profile
+        return profile
+
+    def prices_at(self, app_id: str, when: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        Store-Preise einer App zu einem Zeitpunkt
+
+        Returns:
+            Dict store -> {'price', 'original_price', 'discount_percent', 'available'}
+        """
+        profile = self.profile(app_id)
+
+        if profile['free']:
+            return {'steam': {'price': 0.0, 'original_price': 0.0, 'discount_percent': 0, 'available': True}}
+
+        cycle, position = divmod(when.toordinal() + profile['offset'], profile['cycle_days'])
+        on_sale = position < profile['sale_days']
+        sale_rng = random.Random(f"{self.seed}:{app_id}:{cycle}")
+        discount = sale_rng.choice(SALE_DISCOUNTS) if on_sale else 0
+
+        prices = {}
+        for store in profile['stores']:
+            original = round(profile['base_price'] * profile['store_factors'][store], 2)
+            store_discount = discount
+            if discount and store != 'steam':
+                store_discount = max(5, min(95, discount + sale_rng.choice((-10, -5, 0, 0, 5, 10))))
+
+            prices[store] = {
+                'price': round(original * (100 - store_discount) / 100, 2),
+                'original_price': original,
+                'discount_percent': store_discount,
+                'available': True
+            }
+
+        return prices
+
+# =====================================================================
+# AUFGEZEICHNETE ANTWORTEN
+# =====================================================================
+
+# Parameter, die für das Matching keine Rolle spielen
+IGNORED_RECORDING_PARAMS = ('key', 'format', 'cc', 'l')
+
+def _recording_key(upstream: str, path: str, params: Optional[Dict[str, str]]) -> Tuple:
+    relevant = {k: str(v) for k, v in (params or {}).items() if k not in IGNORED_RECORDING_PARAMS}
+    return (upstream, path.rstrip('/'), tuple(sorted(relevant.items())))
+
+def load_recordings(path: str) -> Dict[Tuple, Dict[str, Any]]:
+    """
+    Lädt aufgezeichnete Antworten aus einer JSON-Datei oder allen *.json eines Verzeichnisses
+
+    Format (Liste oder einzelnes Objekt):
+        {"upstream": "steam_store", "path": "/api/appdetails", "params": {"appids": "413150"},
+         "status": 200, "headers": {...}, "body": {...}}
+
+    Ohne "params" gilt die Aufzeichnung für alle Aufrufe des Pfads.
+
+    Returns:
+        Dict (upstream, path, params) -> Aufzeichnung
+    """
+    files = sorted(Path(path).glob('*.json')) if Path(path).is_dir() else [Path(path)]
+    recordings = {}
+
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        for entry in entries if isinstance(entries, list) else [entries]:
+            key = _recording_key(entry['upstream'], entry['path'], entry.get('params'))
+            if 'params' not in entry:
+                key = key[:2] + (None,)
+            recordings[key] = entry
+
+    logger.info(f"📼 {len(recordings)} aufgezeichnete Antworten aus {path} geladen")
+    return recordings
+
+# =====================================================================
+# STUB-LOGIK
+# =====================================================================
+
+UPSTREAMS = ['steam_api', 'steam_store', 'cheapshark']
+
+# Pfad-Präfix je Upstream (entspricht dem Pfad der produktiven Basis-URL)
+UPSTREAM_BASE_PATHS = {'steam_api': '', 'steam_store': '/api', 'cheapshark': '/api/1.0'}
+
+class UpstreamStub:
+    """
+    Beantwortet Steam- und CheapShark-Anfragen synthetisch oder aus Aufzeichnungen
+
+    Reihenfolge pro Anfrage: Latenz → serverseitiges Rate Limit → zufällige 429 →
+    zufällige 503 → Aufzeichnung → synthetische Route → 404.
+    """
+
+    def __init__(self, model: Optional[SyntheticPriceModel] = None, chart_pool: Optional[List[str]] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit_ratio: float = 0.0,
+                 error_ratio: float = 0.0, retry_after: float = 1.0, requests_per_second: float = 0.0,
+                 chart_size: int = 100, churn: float = 0.1, wishlist_size: int = 50,
+                 recordings: Optional[Dict[Tuple, Dict[str, Any]]] = None, seed: int = 42):
+        """
+        Initialisiert Stub
+
+        Args:
+            model: Preismodell (Standard: SyntheticPriceModel(seed))
+            chart_pool: Apps für Charts und Wishlists (Standard: 1000 synthetische IDs)
+            latency_ms / jitter_ms: Antwortzeit und Streuung
+            rate_limit_ratio: Anteil zufälliger 429-Antworten
+            error_ratio: Anteil zufälliger 503-Antworten
+            retry_after: Retry-After Header bei 429 (Sekunden)
+            requests_per_second: Serverseitiges Limit pro Upstream (0 = aus)
+            chart_size: Plätze pro Chart
+            churn: Anteil der Chart-Plätze, der pro Abruf wechselt
+            wishlist_size: Einträge pro synthetischer Wishlist
+            recordings: Aufzeichnungen aus load_recordings()
+            seed: Seed für Fehler-Injektion und Charts
+        """
+        self.model = model or SyntheticPriceModel(seed)
+        self.chart_pool = chart_pool or synthetic_app_ids(1000)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.error_ratio = error_ratio
+        self.retry_after = retry_after
+        self.requests_per_second = requests_per_second
+        self.chart_size = min(chart_size, len(self.chart_pool))
+        self.churn = churn
+        self.wishlist_size = min(wishlist_size, len(self.chart_pool))
+        self.recordings = recordings or {}
+
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.rankings: Dict[str, List[str]] = {}
+        self.request_times: Dict[str, List[float]] = {upstream: [] for upstream in UPSTREAMS}
+        self.stats = {
+            'requests': 0, 'rate_limited': 0, 'throttled': 0, 'errors': 0,
+            'recorded': 0, 'not_found': 0, 'by_endpoint': {}
+        }
+
+        self.routes = {
+            ('steam_store', '/api/appdetails'): self._appdetails,
+            ('steam_store', '/api/featuredcategories'): self._featured,
+            ('steam_api', '/ISteamChartsService/GetMostPlayedGames/v1'): self._most_played,
+            ('steam_api', '/ISteamChartsService/GetTopReleasesPages/v1'): self._top_releases,
+            ('steam_api', '/ISteamChartsService/GetGamesByConcurrentPlayers/v1'): self._concurrent,
+            ('steam_api', '/IStoreBrowseService/GetItems/v1'): self._store_items,
+            ('steam_api', '/IWishlistService/GetWishlist/v1'): self._wishlist,
+            ('steam_api', '/ISteamUser/ResolveVanityURL/v0001'): self._resolve_vanity,
+            ('cheapshark', '/api/1.0/games'): self._cheapshark_games,
+        }
+
+    def handle(self, upstream: str, path: str, params: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Beantwortet eine Anfrage
+
+        Returns:
+            (Status-Code, JSON-Payload, zusätzliche Header)
+        """
+        path = path.rstrip('/') or '/'
+        now = time_module.monotonic()
+
+        with self.lock:
+            roll = self.rng.random()
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            endpoint = f"{upstream}{path}"
+            self.stats['requests'] += 1
+            self.stats['by_endpoint'][endpoint] = self.stats['by_endpoint'].get(endpoint, 0) + 1
+
+            throttled = False
+            if self.requests_per_second > 0:
+                window = [t for t in self.request_times[upstream] if now - t < 1.0]
+                throttled = len(window) >= self.requests_per_second
+                if not throttled:
+                    window.append(now)
+                self.request_times[upstream] = window
+
+        if delay:
+            time_module.sleep(delay)
+
+        if throttled:
+            with self.lock:
+                self.stats['throttled'] += 1
+            return 429, {'error': 'rate limit exceeded'}, {'Retry-After': f"{self.retry_after:g}"}
+
+        if roll < self.rate_limit_ratio:
+            with self.lock:
+                self.stats['rate_limited'] += 1
+            return 429, {'error': 'rate limited'}, {'Retry-After': f"{self.retry_after:g}"}
+
+        if roll < self.rate_limit_ratio + self.error_ratio:
+            with self.lock:
+                self.stats['errors'] += 1
+            return 503, {'error': 'service unavailable'}, {}
+
+        recording = (self.recordings.get(_recording_key(upstream, path, params))
+                     or self.recordings.get((upstream, path, None)))
+        if recording is not None:
+            with self.lock:
+                self.stats['recorded'] += 1
+            return recording.get('status', 200), recording.get('body'), recording.get('headers', {})
+
+        handler = self.routes.get((upstream, path))
+        if handler is None:
+            with self.lock:
+                self.stats['not_found'] += 1
+            return 404, {'error': 'not found'}, {}
+
+        return 200, handler(params), {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return json.loads(json.dumps(self.stats))
+
+    # Steam Store
+
+    def _appdetails(self, params: Dict[str, str]) -> Dict:
+        now = datetime.now()
+        result = {}
+
+        for app_id in params.get('appids', '').split(','):
+            if not app_id.isdigit():
+                continue
+
+            profile = self.model.profile(app_id)
+            data = {'type': 'game', 'name': profile['name'], 'steam_appid': int(app_id), 'is_free': profile['free']}
+
+            steam = self.model.prices_at(app_id, now).get('steam')
+            if steam and not profile['free']:
+                data['price_overview'] = {
+                    'currency': 'EUR',
+                    'initial': int(round(steam['original_price'] * 100)),
+                    'final': int(round(steam['price'] * 100)),
+                    'discount_percent': steam['discount_percent']
+                }
+
+            # Steam liefert bei filters=price_overview nur diesen Teil
+            if params.get('filters') == 'price_overview':
+                data = {'price_overview': data['price_overview']} if 'price_overview' in data else []
+
+            result[app_id] = {'success': True, 'data': data}
+
+        return result
+
+    def _featured(self, params: Dict[str, str]) -> Dict:
+        now = datetime.now()
+        specials = []
+        for app_id in self.chart_pool[:self.chart_size]:
+            steam = self.model.prices_at(app_id, now).get('steam')
+            if steam and steam['discount_percent']:
+                specials.append({
+                    'id': int(app_id), 'name': self.model.profile(app_id)['name'],
+                    'discounted': True, 'discount_percent': steam['discount_percent'],
+                    'original_price': int(round(steam['original_price'] * 100)),
+                    'final_price': int(round(steam['price'] * 100)), 'currency': 'EUR'
+                })
+        return {'specials': {'id': 'cat_specials', 'name': 'Specials', 'items': specials}, 'status': 1}
+
+    # Steam Web API
+
+    def _ranking(self, chart_type: str) -> List[str]:
+        """Aktuelle Rangliste; jeder Abruf verschiebt sie um den Churn-Anteil"""
+        with self.lock:
+            ranking = self.rankings.get(chart_type)
+            if ranking is None:
+                ranking = self.rng.sample(self.chart_pool, self.chart_size)
+            else:
+                current = set(ranking)
+                outside = [app_id for app_id in self.chart_pool if app_id not in current]
+                for position in self.rng.sample(range(len(ranking)), int(len(ranking) * self.churn)):
+                    if outside:
+                        ranking[position] = outside.pop(self.rng.randrange(len(outside)))
+            self.rankings[chart_type] = ranking
+            return list(ranking)
+
+    def _most_played(self, params: Dict[str, str]) -> Dict:
+        ranks = []
+        for rank, app_id in enumerate(self._ranking('most_played'), 1):
+            players = int(250000 / rank ** 0.8)
+            ranks.append({'rank': rank, 'appid': int(app_id), 'concurrent': players,
+                          'concurrent_in_game': players, 'peak_today': int(players * 1.3),
+                          'peak_in_game': int(players * 1.3)})
+        return {'response': {'rollup_date': int(time_module.time()), 'ranks': ranks}}
+
+    def _top_releases(self, params: Dict[str, str]) -> Dict:
+        ranking = self._ranking('top_releases')
+        pages = [{'name': f"Top Releases {page + 1}", 'item_ids': [{'appid': int(app_id)} for app_id in ranking[page::3]]}
+                 for page in range(3)]
+        return {'response': {'pages': pages}}
+
+    def _concurrent(self, params: Dict[str, str]) -> Dict:
+        ranks = []
+        for rank, app_id in enumerate(self._ranking('most_concurrent_players'), 1):
+            players = int(180000 / rank ** 0.8)
+            ranks.append({'rank': rank, 'appid': int(app_id), 'concurrent_in_game': players,
+                          'peak_in_game': int(players * 1.2)})
+        return {'response': {'ranks': ranks}}
+
+    def _store_items(self, params: Dict[str, str]) -> Dict:
+        try:
+            ids = json.loads(params.get('input_json', '{}')).get('ids', [])
+        except ValueError:
+            ids = []
+        items = [{'appid': item.get('appid'), 'success': 1, 'name': self.model.profile(str(item.get('appid')))['name']}
+                 for item in ids if item.get('appid')]
+        return {'response': {'store_items': items}}
+
+    def _wishlist(self, params: Dict[str, str]) -> Dict:
+        rng = random.Random(f"{self.model.seed}:wishlist:{params.get('steamid', '')}")
+        added = int(time_module.time()) - 86400 * 365
+        items = [{'appid': int(app_id), 'priority': priority, 'date_added': added + rng.randint(0, 86400 * 365)}
+                 for priority, app_id in enumerate(rng.sample(self.chart_pool, self.wishlist_size))]
+        return {'response': {'items': items}}
+
+    def _resolve_vanity(self, params: Dict[str, str]) -> Dict:
+        vanity = params.get('vanityurl', '')
+        steam_id = 76561197960265728 + random.Random(f"{self.model.seed}:vanity:{vanity}").randint(1, 10 ** 9)
+        return {'response': {'success': 1, 'steamid': str(steam_id)}}
+
+    # CheapShark (gameID = "9" + Steam App ID)
+
+    def _cheapshark_games(self, params: Dict[str, str]) -> Any:
+        if 'steamAppID' in params:
+            app_id = params['steamAppID']
+            return [{'gameID': f"9{app_id}", 'steamAppID': app_id, 'external': self.model.profile(app_id)['name']}]
+
+        now = datetime.now()
+        games = {}
+        for game_id in params.get('ids', '').split(','):
+            if not game_id.startswith('9'):
+                continue
+            app_id = game_id[1:]
+            deals = [
+                {
+                    'storeID': CHEAPSHARK_STORE_IDS[store],
+                    'price': f"{prices['price']:.2f}",
+                    'retailPrice': f"{prices['original_price']:.2f}",
+                    'savings': f"{prices['discount_percent']:.6f}"
+                }
+                for store, prices in self.model.prices_at(app_id, now).items()
+                if store != 'steam'
+            ]
+            games[game_id] = {'info': {'title': self.model.profile(app_id)['name'], 'steamAppID': app_id},
+                              'deals': deals}
+        return games
+
+# =====================================================================
+# HTTP SERVER
+# =====================================================================
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """GET-Handler; server.stub und server.upstream werden von UpstreamStubServer gesetzt"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+
+        if parsed.path == '/__stub__/stats':
+            status, payload, headers = 200, self.server.stub.get_stats(), {}
+        else:
+            status, payload, headers = self.server.stub.handle(self.server.upstream, parsed.path, params)
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"🌐 {self.server.upstream}: {format % args}")
+
+class UpstreamStubServer:
+    """
+    Startet je Upstream einen ThreadingHTTPServer auf 127.0.0.1
+
+    Getrennte Ports sorgen dafür, dass Rate Limiter und Connection-Pools im
+    Client wie gegen die echten Hosts pro Upstream getrennt arbeiten.
+    """
+
+    def __init__(self, stub: UpstreamStub, host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            stub: UpstreamStub mit Antwort-Logik
+            host: Bind-Adresse
+            port: Erster Port (steam_api, dann +1 steam_store, +2 cheapshark); 0 = freie Ports
+        """
+        self.stub = stub
+        self.host = host
+        self.port = port
+        self.servers: Dict[str, ThreadingHTTPServer] = {}
+        self.threads: List[threading.Thread] = []
+
+    def start(self) -> Dict[str, str]:
+        """Startet die Server im Hintergrund und gibt die Basis-URLs zurück"""
+        for index, upstream in enumerate(UPSTREAMS):
+            server = ThreadingHTTPServer((self.host, self.port + index if self.port else 0), StubRequestHandler)
+            server.daemon_threads = True
+            server.stub = self.stub
+            server.upstream = upstream
+            self.servers[upstream] = server
+
+            thread = threading.Thread(target=server.serve_forever, name=f"stub-{upstream}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+        logger.info(f"✅ Upstream Stub gestartet: {self.base_urls}")
+        return self.base_urls
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """Basis-URLs im Format von config.get_upstream_base_urls()"""
+        return {
+            upstream: f"http://{self.host}:{server.server_address[1]}{UPSTREAM_BASE_PATHS[upstream]}"
+            for upstream, server in self.servers.items()
+        }
+
+    def apply_to_config(self):
+        """Leitet die Fetcher dieses Prozesses auf den Stub um"""
+        from config import set_upstream_base_urls
+        set_upstream_base_urls(**self.base_urls)
+
+    def env_exports(self) -> List[str]:
+        """Umgebungsvariablen, um andere Prozesse auf den Stub umzuleiten"""
+        urls = self.base_urls
+        return [
+            f"STEAM_API_BASE_URL={urls['steam_api']}",
+            f"STEAM_STORE_URL={urls['steam_store']}",
+            f"CHEAPSHARK_BASE_URL={urls['cheapshark']}",
+        ]
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.servers.clear()
+        self.threads.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Upstream Stub Server - Lokaler Stand-in für Steam und CheapShark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Beispiele:
+  %(prog)s --port 8300
+  %(prog)s --port 8300 --latency-ms 120 --jitter-ms 40 --error-ratio 0.01
+  %(prog)s --port 8300 --requests-per-second 10 --retry-after 2
+  %(prog)s --port 8300 --recordings recordings/
+        """
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Bind-Adresse (Standard: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8300, help='Erster Port, belegt 3 Ports (Standard: 8300)')
+    parser.add_argument('--apps', type=int, default=1000, help='Synthetische Apps für Charts/Wishlists')
+    parser.add_argument('--chart-size', type=int, default=100, help='Plätze pro Chart (Standard: 100)')
+    parser.add_argument('--churn', type=float, default=0.1, help='Chart-Churn pro Abruf (Standard: 0.1)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Antwortzeit in ms')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Streuung der Antwortzeit in ms')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='Anteil zufälliger 429 (0-1)')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='Anteil zufälliger 503 (0-1)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After bei 429 in Sekunden')
+    parser.add_argument('--requests-per-second', type=float, default=0.0,
+                        help='Serverseitiges Limit pro Upstream (0 = aus)')
+    parser.add_argument('--recordings', help='JSON-Datei oder Verzeichnis mit aufgezeichneten Antworten')
+    parser.add_argument('--seed', type=int, default=42, help='Seed (Standard: 42)')
+    args = parser.parse_args()
+
+    stub = UpstreamStub(
+        chart_pool=synthetic_app_ids(args.apps), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_limit_ratio=args.rate_limit_ratio, error_ratio=args.error_ratio, retry_after=args.retry_after,
+        requests_per_second=args.requests_per_second, chart_size=args.chart_size, churn=args.churn,
+        recordings=load_recordings(args.recordings) if args.recordings else None, seed=args.seed
+    )
+    server = UpstreamStubServer(stub, args.host, args.port)
+    server.start()
+
+    print("🌐 Upstream Stub läuft - Fetcher umleiten mit:")
+    for line in server.env_exports():
+        print(f"   {line}")
+    print(f"📊 Statistiken: http://{args.host}:{args.port}/__stub__/stats")
+
+    try:
+        while True:
+            time_module.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n⏹️ Stub wird beendet")
+        server.stop()
+
+if __name__ == "__main__":
+    main()